@@ -1,17 +1,17 @@
 from discord.ext import commands
 import os
-import json
 from pathlib import Path
 
+from json_store import store
+
 BASE_DIR = Path(__file__).resolve().parents[1]
 COGS_STATUS_FILE = str(BASE_DIR / "JSON" / "cogs_status.json")
 
-def update_cogs_status(bot):
+async def update_cogs_status(bot):
     status = {
         "loaded": list(bot.extensions.keys())
     }
-    with open(COGS_STATUS_FILE, "w") as f:
-        json.dump(status, f)
+    await store.write(COGS_STATUS_FILE, status)
 
 
 ADMIN_CHANNEL_ID = 1385997807680356372
@@ -39,15 +39,15 @@ class AdminControl(commands.Cog):
                         return
                     if action == "reload":
                         await self.bot.reload_extension(f"COGS.{cog}")
-                        update_cogs_status(self.bot)
+                        await update_cogs_status(self.bot)
                         await message.channel.send(f":white_check_mark: Reloaded `{cog}`.")
                     elif action == "load":
                         await self.bot.load_extension(f"COGS.{cog}")
-                        update_cogs_status(self.bot)
+                        await update_cogs_status(self.bot)
                         await message.channel.send(f":white_check_mark: Loaded `{cog}`.")
                     elif action == "unload":
                         await self.bot.unload_extension(f"COGS.{cog}")
-                        update_cogs_status(self.bot)
+                        await update_cogs_status(self.bot)
                         await message.channel.send(f":white_check_mark: Unloaded `{cog}`.")
                     else:
                         await message.channel.send("Invalid action.")
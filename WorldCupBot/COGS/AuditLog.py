@@ -1,5 +1,4 @@
 import asyncio
-import json
 import logging
 from copy import deepcopy
 from datetime import datetime, timedelta, timezone
@@ -10,6 +9,8 @@ from uuid import uuid4
 import discord
 from discord.ext import commands
 
+from json_store import store
+
 MAX_AUDIT_LOG_ENTRIES = 10000
 MESSAGE_CONTENT_LIMIT = 500
 AUDIT_CHANNEL_NAME = "bot-audit-log"
@@ -36,9 +37,7 @@ class AuditLogCog(commands.Cog):
         await self.log_system_event("cog_unloaded", details={"cog": self.__class__.__name__})
 
     async def _ensure_store(self) -> None:
-        self._audit_file.parent.mkdir(parents=True, exist_ok=True)
-        if not self._audit_file.exists():
-            await self._write_entries([])
+        await store.ensure(self._audit_file, [])
 
     @staticmethod
     def _utc_now_iso() -> str:
@@ -73,25 +72,25 @@ class AuditLogCog(commands.Cog):
                 return cleaned_reason[:500]
 
     async def _read_entries(self) -> list[dict[str, Any]]:
-        try:
-            raw = self._audit_file.read_text(encoding="utf-8")
-            data = json.loads(raw)
-            if isinstance(data, list):
-                return data
-        except (FileNotFoundError, json.JSONDecodeError, OSError):
-            return []
-        return []
+        data = await store.read(self._audit_file, [])
+        return data if isinstance(data, list) else []
 
     async def _write_entries(self, entries: list[dict[str, Any]]) -> None:
-        payload = entries[-MAX_AUDIT_LOG_ENTRIES:]
-        self._audit_file.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+        await store.write(self._audit_file, entries[-MAX_AUDIT_LOG_ENTRIES:])
+
+    async def _append_entry(self, entry: dict[str, Any]) -> None:
+        def append(entries):
+            if not isinstance(entries, list):
+                entries = []
+            entries.append(entry)
+            return entries[-MAX_AUDIT_LOG_ENTRIES:]
+
+        # Every gateway event lands here, so let the store coalesce the rewrites.
+        await store.update(self._audit_file, append, [], defer=True)
 
     async def _backup_entries(self, entries: list[dict[str, Any]]) -> None:
         try:
-            self._backup_file.write_text(
-                json.dumps(entries, indent=2, ensure_ascii=False),
-                encoding="utf-8",
-            )
+            await store.write(self._backup_file, entries, pretty=True)
             await self.log_system_event("json_backup_created")
         except OSError:
             await self.log_system_event("json_write_failed", details={"file": str(self._backup_file)})
@@ -132,9 +131,7 @@ class AuditLogCog(commands.Cog):
 
         async with self._write_lock:
             try:
-                entries = await self._read_entries()
-                entries.append(entry)
-                await self._write_entries(entries)
+                await self._append_entry(entry)
             except OSError:
                 self._logger.exception("Failed to write audit log entry")
                 await self.log_system_event("json_write_failed", details={"file": str(self._audit_file)})
@@ -847,7 +844,8 @@ class AuditLogCog(commands.Cog):
     async def auditlog_export(self, ctx: commands.Context):
         entries = await self._read_entries()
         await self._backup_entries(entries)
-        await ctx.send(file=discord.File(self._audit_file))
+        # The backup copy is the pretty-printed one; the live log is stored compact.
+        await ctx.send(file=discord.File(self._backup_file, filename=self._audit_file.name))
 
     @auditlog_group.command(name="clear")
     async def auditlog_clear(self, ctx: commands.Context, confirm: str):
@@ -6,34 +6,27 @@ import logging
 import discord
 from discord.ext import commands, tasks
 
-from queue_utils import compact_command_queue
+from bot_telemetry import get_telemetry, timed_loop
+from embed_refresher import get_embed_refresher
+from json_store import store
+from queue_utils import compact_command_queue, read_queue_chunk
 
 log = logging.getLogger(__name__)
 
-def _json_read(path: str, default):
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        return default
-
-
-def _json_write_atomic(path: str, data) -> None:
-    dir_name = os.path.dirname(path)
-    os.makedirs(dir_name, exist_ok=True)
-    # Use a deterministic sidecar tmp file so we don't leave behind many
-    # uniquely named temp files if the process is interrupted mid-write.
-    tmp_path = f"{path}.tmp"
-    try:
-        with open(tmp_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        os.replace(tmp_path, path)
-    finally:
-        try:
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
-        except Exception:
-            pass
+def _match_bet(bets: list, bet_id: str):
+    for b in bets:
+        if isinstance(b, dict) and str(b.get("bet_id") or "").strip() == str(bet_id).strip():
+            return b
+    return None
+
+
+def _bets_list(data) -> list:
+    """The bet records inside bets.json, which may be a bare list or {"bets": [...]}."""
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict) and isinstance(data.get("bets"), list):
+        return data["bets"]
+    return []
 
 
 class BetPageAnnouncer(commands.Cog):
@@ -58,8 +51,11 @@ class BetPageAnnouncer(commands.Cog):
         self.bets_path = os.path.join(self.json_dir, "bets.json")
 
         self._offset = 0
+        get_telemetry(bot).register_consumer("BetPageAnnouncer", self.queue_path, lambda: self._offset)
         self._saved_offset = None
-        self._load_state()
+
+    async def cog_load(self):
+        await self._load_state()
         self._loop.start()
 
     def cog_unload(self):
@@ -68,33 +64,33 @@ class BetPageAnnouncer(commands.Cog):
         except Exception:
             pass
 
-    def _load_state(self):
-        data = _json_read(self.state_path, {})
+    async def _load_state(self):
+        data = await store.read(self.state_path, {})
         self._offset = int(data.get("offset") or 0) if isinstance(data, dict) else 0
         self._saved_offset = self._offset
 
-    def _save_state(self):
+    async def _save_state(self):
         # Avoid rewriting state on every poll when no new commands were read.
         # This significantly reduces filesystem churn on busy/long-lived hosts.
         if self._saved_offset == int(self._offset):
             return
-        _json_write_atomic(self.state_path, {"offset": int(self._offset)})
+        await store.write(self.state_path, {"offset": int(self._offset)})
         self._saved_offset = int(self._offset)
 
-    def _load_config(self) -> dict:
-        return _json_read(os.path.join(self.base_dir, "config.json"), {})
+    async def _load_config(self) -> dict:
+        return await store.read(os.path.join(self.base_dir, "config.json"), {}, copy=False)
 
-    def _load_settings(self) -> dict:
-        return _json_read(os.path.join(self.json_dir, "admin_settings.json"), {})
+    async def _load_settings(self) -> dict:
+        return await store.read(os.path.join(self.json_dir, "admin_settings.json"), {}, copy=False)
 
-    def _selected_guild_id(self) -> str:
-        settings = self._load_settings()
+    async def _selected_guild_id(self) -> str:
+        settings = await self._load_settings()
         if isinstance(settings, dict):
             return str(settings.get("SELECTED_GUILD_ID") or "").strip()
         return ""
 
-    def _config_guild_id(self) -> str:
-        cfg = self._load_config()
+    async def _config_guild_id(self) -> str:
+        cfg = await self._load_config()
         if not isinstance(cfg, dict):
             return ""
         for key in ("DISCORD_GUILD_ID", "GUILD_ID", "PRIMARY_GUILD_ID", "ADMIN_GUILD_ID", "GUILD", "GUILDID"):
@@ -103,8 +99,8 @@ class BetPageAnnouncer(commands.Cog):
                 return gid
         return ""
 
-    def _get_guild(self) -> Optional[discord.Guild]:
-        for gid in (self._selected_guild_id(), self._config_guild_id()):
+    async def _get_guild(self) -> Optional[discord.Guild]:
+        for gid in (await self._selected_guild_id(), await self._config_guild_id()):
             if gid:
                 try:
                     return self.bot.get_guild(int(gid))
@@ -116,8 +112,8 @@ class BetPageAnnouncer(commands.Cog):
         if not guild:
             return None
 
-        settings = self._load_settings()
-        cfg = self._load_config()
+        settings = await self._load_settings()
+        cfg = await self._load_config()
 
         # Explicit IDs are still supported, but we intentionally force the
         # default to the dedicated #bets channel.
@@ -155,23 +151,25 @@ class BetPageAnnouncer(commands.Cog):
         # Do not fall back to arbitrary channels; requirement is to post in #bets.
         return None
 
-    def _load_bets(self):
-        data = _json_read(self.bets_path, [])
-        if isinstance(data, list):
-            return data
-        if isinstance(data, dict) and isinstance(data.get("bets"), list):
-            return data["bets"]
-        return []
+    async def _find_bet(self, bet_id: str):
+        return _match_bet(_bets_list(await store.read(self.bets_path, [])), bet_id)
+
+    async def _update_bet(self, bet_id: str, mutate):
+        """Apply ``mutate(bet)`` to the current record under the store's writer lock.
+
+        Returns the updated bet, or None when it no longer exists or
+        ``mutate`` returned False.
+        """
+        result = {}
 
-    def _save_bets(self, bets):
-        _json_write_atomic(self.bets_path, bets)
+        def apply(data):
+            bet = _match_bet(_bets_list(data), bet_id)
+            if bet is not None and mutate(bet) is not False:
+                result["bet"] = bet
+            return data
 
-    def _find_bet(self, bet_id: str):
-        bets = self._load_bets()
-        for b in bets:
-            if isinstance(b, dict) and str(b.get("bet_id") or "").strip() == str(bet_id).strip():
-                return bets, b
-        return bets, None
+        await store.update(self.bets_path, apply, [])
+        return result.get("bet")
 
     def _mention_or_name(self, uid, uname):
         sid = str(uid or "").strip()
@@ -193,21 +191,29 @@ class BetPageAnnouncer(commands.Cog):
         Handle in-Discord claim button interactions for web-posted bets so the
         same claim state is reflected in JSON and on the Bets page.
         """
-        bets, bet = self._find_bet(bet_id)
-        if not bet:
-            return False, "Bet not found in records."
-
         claimer_id = str(getattr(user, "id", "") or "").strip()
         if not claimer_id:
             return False, "Unable to identify your account."
-        if claimer_id == str(bet.get("option1_user_id") or "").strip():
-            return False, "You cannot claim your own bet."
-        if str(bet.get("option2_user_id") or "").strip():
-            return False, "This bet has already been claimed."
-
-        bet["option2_user_id"] = claimer_id
-        bet["option2_user_name"] = self._display_name(user)
-        self._save_bets(bets)
+        refusal = {}
+
+        def claim(bet):
+            # Checked against the record as stored right now, not an earlier
+            # read, so two people clicking at once cannot both claim it.
+            if claimer_id == str(bet.get("option1_user_id") or "").strip():
+                refusal["message"] = "You cannot claim your own bet."
+            elif str(bet.get("option2_user_id") or "").strip():
+                refusal["message"] = "This bet has already been claimed."
+            else:
+                bet["option2_user_id"] = claimer_id
+                bet["option2_user_name"] = self._display_name(user)
+                return True
+            return False
+
+        bet = await self._update_bet(bet_id, claim)
+        if refusal:
+            return False, refusal["message"]
+        if not bet:
+            return False, "Bet not found in records."
         return True, f'You claimed: **{bet.get("option2") or "Option 2"}**'
 
     async def _bet_message_view(self, bet_id: str, *, claimable: bool):
@@ -224,10 +230,13 @@ class BetPageAnnouncer(commands.Cog):
                 return
 
             # Reload from JSON to guarantee the embed reflects persisted state.
-            _, fresh = self._find_bet(bet_id)
+            fresh = await self._find_bet(bet_id)
             if fresh and interaction.message:
+                embed = self._build_bet_embed(fresh)
                 try:
-                    await interaction.message.edit(embed=self._build_bet_embed(fresh), view=None)
+                    await interaction.message.edit(embed=embed, view=None)
+                    # A queued claim event for this bet then finds nothing to change.
+                    get_embed_refresher(self.bot).remember(interaction.message.id, embed)
                 except Exception:
                     pass
             await interaction.followup.send(message, ephemeral=True)
@@ -271,7 +280,7 @@ class BetPageAnnouncer(commands.Cog):
         return embed
 
     async def _handle_bet_created(self, bet_id: str):
-        bets, bet = self._find_bet(bet_id)
+        bet = await self._find_bet(bet_id)
         if not bet:
             return
 
@@ -280,7 +289,7 @@ class BetPageAnnouncer(commands.Cog):
         if str(bet.get("message_id") or "").strip():
             return
 
-        guild = self._get_guild()
+        guild = await self._get_guild()
         if not guild:
             return
 
@@ -295,12 +304,15 @@ class BetPageAnnouncer(commands.Cog):
         except Exception:
             return
 
-        bet["message_id"] = str(sent.id)
-        bet["channel_id"] = str(channel.id)
-        self._save_bets(bets)
+        def record_message(current):
+            current["message_id"] = str(sent.id)
+            current["channel_id"] = str(channel.id)
 
-    async def _fetch_bet_message(self, bet: dict):
-        """Return the Discord message backing a bet record, if it still exists."""
+        await self._update_bet(bet_id, record_message)
+
+    @staticmethod
+    def _bet_message_ids(bet: dict):
+        """(channel_id, message_id) of a bet's Discord message, or None if it has none."""
         try:
             channel_id = int(str(bet.get("channel_id") or "0"))
             message_id = int(str(bet.get("message_id") or "0"))
@@ -308,6 +320,14 @@ class BetPageAnnouncer(commands.Cog):
             return None
         if not channel_id or not message_id:
             return None
+        return channel_id, message_id
+
+    async def _fetch_bet_message(self, bet: dict):
+        """Return the Discord message backing a bet record, if it still exists."""
+        ids = self._bet_message_ids(bet)
+        if not ids:
+            return None
+        channel_id, message_id = ids
 
         channel = self.bot.get_channel(channel_id)
         if channel is None:
@@ -322,18 +342,19 @@ class BetPageAnnouncer(commands.Cog):
             return None
 
     async def _handle_bet_claimed(self, bet_id: str):
-        bets, bet = self._find_bet(bet_id)
+        bet = await self._find_bet(bet_id)
         if not bet:
             return
-
-        msg = await self._fetch_bet_message(bet)
-        if not msg:
+        ids = self._bet_message_ids(bet)
+        if not ids:
             return
 
-        try:
-            await msg.edit(embed=self._build_bet_embed(bet), view=None)
-        except Exception:
-            return
+        async def render():
+            # Rendered when the refresh window closes, so a claim followed by a
+            # result shows both in a single edit.
+            return self._build_bet_embed(await self._find_bet(bet_id) or bet)
+
+        get_embed_refresher(self.bot).request(*ids, render, view=None)
 
     async def _handle_bet_deleted(self, data: dict):
         """Delete the Discord announcement for a bet removed from the Bets page."""
@@ -347,26 +368,12 @@ class BetPageAnnouncer(commands.Cog):
             return
 
     @tasks.loop(seconds=2.5)
+    @timed_loop("BetPageAnnouncer._loop")
     async def _loop(self):
-        if not os.path.isfile(self.queue_path):
-            return
-
-        try:
-            size = os.path.getsize(self.queue_path)
-            if self._offset > size:
-                self._offset = 0
-        except Exception:
-            return
-
-        try:
-            with open(self.queue_path, "r", encoding="utf-8", errors="ignore") as f:
-                f.seek(self._offset)
-                chunk = f.read()
-                self._offset = f.tell()
-        except Exception:
+        chunk, self._offset = await store.run(read_queue_chunk, self.queue_path, self._offset)
+        if chunk is None:
             return
-        finally:
-            self._save_state()
+        await self._save_state()
 
         if not chunk:
             return
@@ -396,7 +403,8 @@ class BetPageAnnouncer(commands.Cog):
             elif kind == "bet_deleted":
                 await self._handle_bet_deleted(data)
 
-        compact_command_queue(
+        await store.run(
+            compact_command_queue,
             self.queue_path,
             [self.state_path, self.commands_state_path, self.fanzone_state_path, self.stage_state_path],
         )
@@ -1,66 +1,47 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
-import json
-import os
-import asyncio
-import tempfile
-import shutil
 import random
 import logging
 from pathlib import Path
 
+from json_store import store
+
 BASE_DIR = Path(__file__).resolve().parents[1]
 BETS_FILE = str(BASE_DIR / "JSON" / "bets.json")
 
 log = logging.getLogger(__name__)
 
-def ensure_bets_file():
-    os.makedirs(os.path.dirname(BETS_FILE), exist_ok=True)
-    try:
-        if not os.path.isfile(BETS_FILE):
-            with open(BETS_FILE, "w") as f:
-                json.dump([], f)
-        else:
-            with open(BETS_FILE, "r") as f:
-                data = json.load(f)
-            if not isinstance(data, list):
-                with open(BETS_FILE, "w") as f:
-                    json.dump([], f)
-    except Exception:
-        with open(BETS_FILE, "w") as f:
-            json.dump([], f)
+BET_ID_KEYS = ("bet_id", "message_id", "option1_user_id", "option2_user_id", "winner_user_id", "channel_id")
 
-async def read_bets():
-    loop = asyncio.get_running_loop()
-    def _read():
-        try:
-            with open(BETS_FILE, "r") as f:
-                data = json.load(f)
-                if not isinstance(data, list):
-                    return []
-                for b in data:
-                    for key in ("bet_id", "message_id", "option1_user_id", "option2_user_id", "winner_user_id", "channel_id"):
-                        if key in b and b[key] is not None:
-                            b[key] = str(b[key])
-                return data
-        except (json.JSONDecodeError, FileNotFoundError):
-            return []
-    return await loop.run_in_executor(None, _read)
-
-async def write_bets(bets):
-    for b in bets:
-        for key in ("bet_id", "message_id", "option1_user_id", "option2_user_id", "winner_user_id", "channel_id"):
+def _normalize_bets(data):
+    if not isinstance(data, list):
+        return []
+    for b in data:
+        for key in BET_ID_KEYS:
             if key in b and b[key] is not None:
                 b[key] = str(b[key])
-    loop = asyncio.get_running_loop()
-    def _write():
-        dir_name = os.path.dirname(BETS_FILE)
-        with tempfile.NamedTemporaryFile('w', delete=False, dir=dir_name, encoding='utf-8') as tf:
-            json.dump(list(bets), tf, indent=4)
-            tempname = tf.name
-        shutil.move(tempname, BETS_FILE)
-    await loop.run_in_executor(None, _write)
+    return data
+
+async def ensure_bets_file():
+    data = await store.ensure(BETS_FILE, [])
+    if not isinstance(data, list):
+        await store.write(BETS_FILE, [])
+
+async def read_bets():
+    return _normalize_bets(await store.read(BETS_FILE, []))
+
+async def update_bets(mutate):
+    """Read-modify-write bets.json under the store's writer lock.
+
+    ``mutate(bets)`` edits the list in place. WinnerWatcher rewrites the same
+    file, so claims must not work from a copy read before an await.
+    """
+    def apply(data):
+        bets = _normalize_bets(data)
+        mutate(bets)
+        return bets
+    return await store.update(BETS_FILE, apply, [])
 
 def generate_bet_id(existing_bets):
     while True:
@@ -123,19 +104,26 @@ class ClaimBetButton(discord.ui.View):
             await interaction.followup.send("You cannot claim your own bet!", ephemeral=True)
             return
 
-        bets = await read_bets()
-        bet = next((b for b in bets if str(b.get('bet_id')) == self.bet_id), None)
+        outcome = {}
+
+        def claim(bets):
+            bet = next((b for b in bets if str(b.get('bet_id')) == self.bet_id), None)
+            outcome["bet"] = bet
+            if bet is None or bet.get("option2_user_id"):
+                return
+            bet["option2_user_id"] = user_id
+            bet["option2_user_name"] = str(interaction.user)
+            outcome["claimed"] = True
+
+        await update_bets(claim)
+        bet = outcome.get("bet")
         if bet is None:
             await interaction.followup.send("Bet not found in records.", ephemeral=True)
             return
-        if bet.get("option2_user_id"):
+        if not outcome.get("claimed"):
             await interaction.followup.send("This bet has already been claimed!", ephemeral=True)
             return
 
-        bet["option2_user_id"] = user_id
-        bet["option2_user_name"] = str(interaction.user)
-        await write_bets(bets)
-
         button.disabled = True
         embed = interaction.message.embeds[0]
         embed.color = discord.Color.green()
@@ -154,7 +142,9 @@ class ClaimBetButton(discord.ui.View):
 class BettingCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        ensure_bets_file()
+
+    async def cog_load(self):
+        await ensure_bets_file()
 
     @app_commands.command(name="makebet", description="Create a new public bet for others to claim.")
     async def makebet(self, interaction: discord.Interaction):
@@ -211,8 +201,7 @@ class BettingCog(commands.Cog):
             "channel_id": channel_id,
             "winner": ""
         }
-        bets.append(bet_data)
-        await write_bets(bets)
+        await update_bets(lambda current: current.append(bet_data))
         log.info(
             "Bet created (bet_id=%s creator_id=%s channel_id=%s title=%s option1=%s option2=%s)",
             bet_id,
@@ -2,6 +2,7 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 
+from guild_ops import BulkExecutor, channel_overwrite_ops, overwrites_match
 from stage_constants import STAGE_CHANNEL_SLUGS
 
 IGNORED_TEXT_CHANNEL_ID = 1389403009766920325
@@ -67,7 +68,7 @@ class ChannelManage(commands.Cog):
         everyone = guild.default_role
         return players, spectators, referees, everyone
 
-    async def set_channel_perms(self, channel, players, spectators, referees, everyone, visible: bool, is_divider=False):
+    def build_channel_overwrites(self, players, spectators, referees, everyone, visible: bool, is_divider=False):
         thread_deny = {
             "create_public_threads": False,
             "create_private_threads": False,
@@ -135,6 +136,12 @@ class ChannelManage(commands.Cog):
             view_channel=False, send_messages=False, read_message_history=False, connect=False, speak=False,
             create_public_threads=False, create_private_threads=False, send_messages_in_threads=False
         )
+        return overwrite
+
+    async def set_channel_perms(self, channel, players, spectators, referees, everyone, visible: bool, is_divider=False):
+        overwrite = self.build_channel_overwrites(players, spectators, referees, everyone, visible, is_divider)
+        if overwrites_match(channel.overwrites, overwrite):
+            return
         await channel.edit(overwrites=overwrite)
 
     async def toggle_category_stage(self, category, players, spectators, referees, everyone, stage, show, is_voice: bool = False):
@@ -170,6 +177,7 @@ class ChannelManage(commands.Cog):
                 break
 
         changed = 0
+        plans = []
         for i, channel in enumerate(all_channels):
             # Ignore permission changing on this text channel
             if not is_voice and channel.id == IGNORED_TEXT_CHANNEL_ID:
@@ -181,12 +189,17 @@ class ChannelManage(commands.Cog):
             is_divider = channel.name == DIVIDER_CHANNEL_NAME
 
             if is_stage:
-                await self.set_channel_perms(channel, players, spectators, referees, everyone, show, is_divider=False)
+                plans.append((channel, self.build_channel_overwrites(players, spectators, referees, everyone, show, is_divider=False)))
                 changed += 1
             elif is_above_divider or is_below_divider:
-                await self.set_channel_perms(channel, players, spectators, referees, everyone, show, is_divider=True)
+                plans.append((channel, self.build_channel_overwrites(players, spectators, referees, everyone, show, is_divider=True)))
             elif is_divider:
-                await self.set_channel_perms(channel, players, spectators, referees, everyone, False, is_divider=True)
+                plans.append((channel, self.build_channel_overwrites(players, spectators, referees, everyone, False, is_divider=True)))
+
+        # Only channels whose cached overwrites differ are edited, a few at a
+        # time instead of one awaited edit per channel.
+        job = f"stage:{category.id}:{stage}:{'show' if show else 'hide'}"
+        await BulkExecutor(job).run(channel_overwrite_ops(plans))
         return changed
 
 
@@ -1,10 +1,13 @@
+import asyncio
 import discord
 from discord.ext import commands
 from discord import app_commands
-import json
 from pathlib import Path
 import logging
 
+from embed_refresher import get_embed_refresher, leaderboard_pages
+from json_store import store
+
 BASE_DIR = Path(__file__).resolve().parents[1]
 JSON_DIR = BASE_DIR / "JSON"
 PLAYERS_FILE = JSON_DIR / "players.json"
@@ -15,22 +18,23 @@ ENTRIES_CHANNEL = "entries"
 
 log = logging.getLogger(__name__)
 
-def load_json(path):
-    if not path.exists():
-        return {}
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+async def load_json(path):
+    return await store.read(path, {})
 
-def save_json(path, data):
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4)
+async def save_json(path, data):
+    await store.write(path, data)
 
 class EntriesTracker(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-
-    def get_entries_data(self):
-        players = load_json(PLAYERS_FILE)
+        # guild id -> future of the refresh queued for that guild
+        self._refreshes: dict[int, asyncio.Future] = {}
+        # guild id -> lock held while the tracker messages are replaced
+        self._repost_locks: dict[int, asyncio.Lock] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    async def get_entries_data(self):
+        players = await load_json(PLAYERS_FILE)
         data = []
         for uid, pdata in players.items():
             count = len(pdata.get("teams", []))
@@ -48,57 +52,111 @@ class EntriesTracker(commands.Cog):
                         return chan
         return None
 
-    async def ensure_embed(self, guild: discord.Guild):
-        tracker = load_json(TRACKER_FILE)
-        guild_id = str(guild.id)
-        entries_channel = await self.get_entries_channel(guild)
-        if not entries_channel:
-            return None, None
-
-        message_id = tracker.get(guild_id, {}).get("message_id")
-        message = None
-
-        # Try to fetch old embed
-        if message_id:
+    async def post_embeds(self, guild: discord.Guild, entries_channel, pages=None, old_ids=()):
+        """Post the tracker (one message per page), remove the old messages and record the new ones."""
+        refresher = get_embed_refresher(self.bot)
+        for message_id in old_ids:
+            refresher.discard(entries_channel.id, message_id)
             try:
-                message = await entries_channel.fetch_message(message_id)
-                return message, entries_channel
+                await entries_channel.get_partial_message(int(message_id)).delete()
             except Exception:
                 pass
-
-        # Create a new embed if not found
-        embed = self.build_embed()
-        msg = await entries_channel.send(embed=embed)
-        log.info("Entries tracker embed posted (guild_id=%s channel_id=%s message_id=%s)", guild.id, entries_channel.id, msg.id)
-        tracker[guild_id] = {
-            "message_id": msg.id,
+        pages = pages or await self.build_embeds()
+        message_ids = []
+        for page in pages:
+            msg = await entries_channel.send(embed=page)
+            refresher.remember(msg.id, page)
+            message_ids.append(msg.id)
+        log.info("Entries tracker embed posted (guild_id=%s channel_id=%s message_ids=%s)", guild.id, entries_channel.id, message_ids)
+        tracker = await load_json(TRACKER_FILE)
+        tracker[str(guild.id)] = {
+            "message_id": message_ids[0],
+            "message_ids": message_ids,
             "channel_id": entries_channel.id
         }
-        save_json(TRACKER_FILE, tracker)
-        return msg, entries_channel
-
-    def build_embed(self):
-        data = self.get_entries_data()
-        embed = discord.Embed(
-            title="World Cup 2026 - Entry Tracker",
-            description="Live list of all players and how many entries (teams) they currently have.",
-            colour=discord.Colour.gold()
-        )
+        await save_json(TRACKER_FILE, tracker)
+        return message_ids
+
+    async def build_embeds(self):
+        data = await self.get_entries_data()
+        title = "World Cup 2026 - Entry Tracker"
+        description = "Live list of all players and how many entries (teams) they currently have."
+        footer = "Updated after each /addplayer. Use /updateentries to refresh manually."
         if not data:
+            embed = discord.Embed(title=title, description=description, colour=discord.Colour.gold())
             embed.add_field(name="No entries yet!", value="Players will appear here when added.", inline=False)
-        else:
-            leaderboard = []
-            for uid, name, count in data:
-                leaderboard.append(f"<@{uid}> - **{count}** entry{'ies' if count != 1 else ''}")
-            embed.add_field(name="Leaderboard", value="\n".join(leaderboard), inline=False)
-        embed.set_footer(text="Updated after each /addplayer. Use /updateentries to refresh manually.")
-        return embed
+            embed.set_footer(text=footer)
+            return [embed]
+        leaderboard = [f"<@{uid}> - **{count}** entry{'ies' if count != 1 else ''}" for uid, name, count in data]
+        # A long leaderboard continues on further messages instead of overflowing one embed.
+        return leaderboard_pages(title, leaderboard, description=description, colour=discord.Colour.gold(), footer=footer)
+
+    async def tracked_message_ids(self, guild) -> list[int]:
+        tracker = await load_json(TRACKER_FILE)
+        record = tracker.get(str(guild.id), {})
+        message_ids = record.get("message_ids") or ([record["message_id"]] if record.get("message_id") else [])
+        return [int(message_id) for message_id in message_ids]
+
+    async def repost(self, guild, entries_channel, stale_ids, pages=None):
+        """Replace the tracker messages, unless another call already replaced ``stale_ids``."""
+        lock = self._repost_locks.setdefault(guild.id, asyncio.Lock())
+        async with lock:
+            # Re-read under the lock: a concurrent repost may have posted a fresh set.
+            if await self.tracked_message_ids(guild) != list(stale_ids):
+                return None
+            return await self.post_embeds(guild, entries_channel, pages, stale_ids)
 
     async def update_entries_embed(self, guild):
-        msg, channel = await self.ensure_embed(guild)
-        if msg:
-            await msg.edit(embed=self.build_embed())
-            log.info("Entries tracker embed updated (guild_id=%s channel_id=%s message_id=%s)", guild.id, channel.id, msg.id)
+        """Queue a refresh of the guild's tracker; bursts of /addplayer calls become one render.
+
+        Calls within the refresher's window share one future and one
+        ``build_embeds``; the pages are then handed to the refresher as is.
+        """
+        pending = self._refreshes.get(guild.id)
+        if pending is not None:
+            return pending
+        loop = asyncio.get_running_loop()
+        future = self._refreshes[guild.id] = loop.create_future()
+        window = get_embed_refresher(self.bot).window
+        loop.call_later(window, self._start_refresh, guild, future)
+        return future
+
+    def _start_refresh(self, guild, future):
+        task = asyncio.ensure_future(self._run_refresh(guild, future))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_refresh(self, guild, future):
+        # Calls from here on queue the next refresh.
+        self._refreshes.pop(guild.id, None)
+        try:
+            result = await self.refresh_entries_embed(guild)
+        except Exception as e:
+            log.warning("Entries tracker refresh failed (guild_id=%s error=%s)", guild.id, e)
+            result = None
+        if not future.done():
+            future.set_result(result)
+
+    async def refresh_entries_embed(self, guild):
+        entries_channel = await self.get_entries_channel(guild)
+        if not entries_channel:
+            return None
+        pages = await self.build_embeds()
+        message_ids = await self.tracked_message_ids(guild)
+        if len(pages) != len(message_ids):
+            # First post, or the leaderboard gained or lost a page.
+            await self.repost(guild, entries_channel, message_ids, pages)
+            return None
+
+        async def repost():
+            # Every page reports its own missing message; only the first reposts.
+            await self.repost(guild, entries_channel, message_ids)
+
+        refresher = get_embed_refresher(self.bot)
+        return await asyncio.gather(*(
+            refresher.request(entries_channel.id, message_id, lambda page=page: page, on_missing=repost, delay=0)
+            for message_id, page in zip(message_ids, pages)
+        ))
 
     @app_commands.command(
         name="updateentries",
@@ -114,7 +172,7 @@ class EntriesTracker(commands.Cog):
             return
 
         await self.update_entries_embed(interaction.guild)
-        await interaction.response.send_message("Entries tracker updated.", ephemeral=True)
+        await interaction.response.send_message("Entries tracker refresh queued.", ephemeral=True)
         log.info("Entries tracker updated by %s (guild_id=%s)", interaction.user.id, interaction.guild.id if interaction.guild else "unknown")
 
 async def setup(bot):
@@ -136,18 +194,8 @@ async def post_country_assignments_embed(bot, guild):
     PLAYERS_FILE = JSON_DIR / "players.json"
     TEAMS_FILE = JSON_DIR / "teams.json"
 
-    def load_json(path):
-        if not path.exists():
-            return {}
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-
-    players = load_json(PLAYERS_FILE)
-    try:
-        with open(TEAMS_FILE, "r", encoding="utf-8") as f:
-            all_teams = json.load(f)
-    except Exception:
-        all_teams = []
+    players = await load_json(PLAYERS_FILE)
+    all_teams = await store.read(TEAMS_FILE, [])
 
     # Map: country -> user mention(s)
     country_map = {}
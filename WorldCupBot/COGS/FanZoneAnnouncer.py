@@ -2,8 +2,12 @@ import os, json
 import discord
 from discord.ext import commands, tasks
 
+from bot_telemetry import get_telemetry, timed_loop
 from match_events import sort_match_events
-from queue_utils import compact_command_queue
+from json_store import store
+import match_timeline
+from outbound_scheduler import get_outbound_scheduler
+from queue_utils import compact_command_queue, read_queue_chunk
 
 class FanZoneAnnouncer(commands.Cog):
     def __init__(self, bot: commands.Bot):
@@ -16,12 +20,18 @@ class FanZoneAnnouncer(commands.Cog):
         self.state_path = os.path.join(self.json_dir, "fanzone_queue_state.json")
         self.commands_state_path = os.path.join(self.json_dir, "bot_commands_state.json")
         self.stage_state_path = os.path.join(self.json_dir, "stage_queue_state.json")
+        self.matches_path = os.path.join(self.json_dir, "matches.json")
+        self.timelines_dir = os.path.join(self.json_dir, "match_timelines")
 
         self.team_iso_path = os.path.join(self.base_dir, "team_iso.json")
-        self.team_iso = self._load_team_iso()
+        self.team_iso = {}
 
         self._offset = 0
-        self._load_state()
+        get_telemetry(bot).register_consumer("FanZoneAnnouncer", self.queue_path, lambda: self._offset)
+
+    async def cog_load(self):
+        self.team_iso = await store.run(self._load_team_iso)
+        await self._load_state()
         self._loop.start()
 
     def cog_unload(self):
@@ -39,10 +49,7 @@ class FanZoneAnnouncer(commands.Cog):
         )
         for path in candidate_paths:
             try:
-                if not os.path.isfile(path):
-                    continue
-                with open(path, "r", encoding="utf-8") as f:
-                    m = json.load(f)
+                m = store.read_blocking(path, None, copy=False)
                 if isinstance(m, dict):
                     # normalize keys and codes
                     out = {}
@@ -55,26 +62,20 @@ class FanZoneAnnouncer(commands.Cog):
                 continue
         return {}
 
-    def _load_settings(self) -> dict:
+    async def _load_settings(self) -> dict:
         path = os.path.join(self.base_dir, "JSON", "admin_settings.json")
-        try:
-            if os.path.isfile(path):
-                with open(path, "r", encoding="utf-8") as f:
-                    return json.load(f) or {}
-        except Exception:
-            pass
-        return {}
+        data = await store.read(path, {}, copy=False)
+        return data if isinstance(data, dict) else {}
 
-    def _selected_guild_id(self) -> str:
-        settings = self._load_settings()
+    async def _selected_guild_id(self) -> str:
+        settings = await self._load_settings()
         return str(settings.get("SELECTED_GUILD_ID") or "").strip()
 
-    def _config_guild_id(self) -> str:
+    async def _config_guild_id(self) -> str:
         try:
             cfg_path = os.path.join(self.base_dir, "config.json")
-            if os.path.isfile(cfg_path):
-                with open(cfg_path, "r", encoding="utf-8") as f:
-                    cfg = json.load(f) or {}
+            cfg = await store.read(cfg_path, {}, copy=False)
+            if isinstance(cfg, dict):
                 for key in ("DISCORD_GUILD_ID", "GUILD_ID", "PRIMARY_GUILD_ID", "ADMIN_GUILD_ID", "GUILD", "GUILDID"):
                     gid = str(cfg.get(key) or "").strip()
                     if gid:
@@ -96,23 +97,21 @@ class FanZoneAnnouncer(commands.Cog):
         # flagcdn supports both iso-2 and gb-eng style codes
         return f"https://flagcdn.com/w80/{code}.png"
 
-    def _load_state(self):
+    async def _load_state(self):
         try:
-            with open(self.state_path, "r", encoding="utf-8") as f:
-                d = json.load(f)
+            d = await store.read(self.state_path, {})
             self._offset = int(d.get("offset") or 0)
         except Exception:
             self._offset = 0
 
-    def _save_state(self):
+    async def _save_state(self):
         try:
-            with open(self.state_path, "w", encoding="utf-8") as f:
-                json.dump({"offset": int(self._offset)}, f)
+            await store.write(self.state_path, {"offset": int(self._offset)})
         except Exception:
             pass
 
-    def _get_guild(self) -> discord.Guild | None:
-        for gid in (self._selected_guild_id(), self._config_guild_id()):
+    async def _get_guild(self) -> discord.Guild | None:
+        for gid in (await self._selected_guild_id(), await self._config_guild_id()):
             if gid:
                 try:
                     return self.bot.get_guild(int(gid))
@@ -132,18 +131,19 @@ class FanZoneAnnouncer(commands.Cog):
                 return ch
         return None
 
-    async def _dm_user_embed(self, user_id: str, embed: discord.Embed):
-        try:
-            uid = int(str(user_id))
-        except Exception:
-            return
-        try:
-            user = self.bot.get_user(uid) or await self.bot.fetch_user(uid)
-            if not user:
-                return
-            await user.send(embed=embed)
-        except Exception:
-            return
+    def _dm_user_embed(self, user_id: str, embed: discord.Embed, key: str | None = None, batch: str | None = None):
+        # DMs go through the shared scheduler so hundreds of owner DMs never
+        # hold up the next announcement in this loop.
+        get_outbound_scheduler(self.bot).enqueue_dm(user_id, embed=embed, key=key, batch=batch)
+
+    def _dm_owners(self, batch: str, outcome: str, owner_ids, embed: discord.Embed):
+        # The outcome is part of the key: after a split one owner can hold
+        # both sides and must get both DMs.
+        for uid in owner_ids:
+            self._dm_user_embed(uid, embed, key=f"{batch}:{outcome}:{uid}", batch=batch)
+
+    def _post_channel_embed(self, channel, embed: discord.Embed, key: str | None = None, batch: str | None = None):
+        get_outbound_scheduler(self.bot).enqueue_channel(channel.id, embed=embed, key=key, batch=batch)
 
     def _public_embed(
         self,
@@ -180,6 +180,26 @@ class FanZoneAnnouncer(commands.Cog):
         e.timestamp = discord.utils.utcnow()
         return e
 
+    def _load_live_stats(self, data: dict) -> list:
+        """Events for a result embed: inline in older queue records, else the fixture's timeline."""
+        if isinstance(data.get("live_stats"), list):
+            return data["live_stats"]
+        fixture_id = str(data.get("fixture_id") or "").strip()
+        if not fixture_id:
+            return []
+
+        def legacy():
+            # Only reached for fixtures whose events predate timelines.
+            raw = store.read_blocking(self.matches_path, [], copy=False)
+            if isinstance(raw, dict):
+                raw = raw.get("fixtures") or raw.get("matches") or []
+            for fixture in raw if isinstance(raw, list) else []:
+                if isinstance(fixture, dict) and str(fixture.get("id") or fixture.get("fixture_id") or "").strip() == fixture_id:
+                    return fixture.get("live_stats")
+            return None
+
+        return match_timeline.load(self.timelines_dir, fixture_id, legacy).view()
+
     def _add_match_stats_field(self, embed: discord.Embed, live_stats: list | None):
         """Add the same sorted full-time match events to any result-style embed."""
         stats_lines = []
@@ -355,26 +375,12 @@ class FanZoneAnnouncer(commands.Cog):
         return e
 
     @tasks.loop(seconds=2.5)
+    @timed_loop("FanZoneAnnouncer._loop")
     async def _loop(self):
-        if not os.path.isfile(self.queue_path):
-            return
-
-        try:
-            size = os.path.getsize(self.queue_path)
-            if self._offset > size:
-                self._offset = 0
-        except Exception:
-            return
-
-        try:
-            with open(self.queue_path, "r", encoding="utf-8", errors="ignore") as f:
-                f.seek(self._offset)
-                chunk = f.read()
-                self._offset = f.tell()
-        except Exception:
+        chunk, self._offset = await store.run(read_queue_chunk, self.queue_path, self._offset)
+        if chunk is None:
             return
-        finally:
-            self._save_state()
+        await self._save_state()
 
         if not chunk:
             return
@@ -383,7 +389,7 @@ class FanZoneAnnouncer(commands.Cog):
         if not lines:
             return
 
-        guild = self._get_guild()
+        guild = await self._get_guild()
         if not guild:
             return
 
@@ -401,6 +407,9 @@ class FanZoneAnnouncer(commands.Cog):
             home = str(data.get("home") or "")
             away = str(data.get("away") or "")
             channel_name = str(data.get("channel") or "fanzone")
+            # Replaying the same queue line (e.g. after a crash before the
+            # offset was saved) yields the same keys, so nothing is sent twice.
+            batch = f"{kind}:{data.get('fixture_id') or f'{home}-{away}'}:{cmd.get('ts') or ''}"
 
             if kind == "quick_match_announcement":
                 ch = await self._find_text_channel(guild, channel_name)
@@ -409,10 +418,7 @@ class FanZoneAnnouncer(commands.Cog):
                 if not ch and guild.text_channels:
                     ch = guild.text_channels[0]
                 if ch:
-                    try:
-                        await ch.send(embed=self._quick_announcement_embed(data))
-                    except Exception:
-                        pass
+                    self._post_channel_embed(ch, self._quick_announcement_embed(data))
                 continue
 
             # Result commands are generated by the Add result action and post
@@ -424,19 +430,21 @@ class FanZoneAnnouncer(commands.Cog):
                 if not ch and guild.text_channels:
                     ch = guild.text_channels[0]
                 if ch:
+                    live_stats = await store.run(self._load_live_stats, data)
                     try:
-                        await ch.send(embed=self._result_embed(
+                        emb = self._result_embed(
                             home,
                             away,
                             int(data.get("home_score") or 0),
                             int(data.get("away_score") or 0),
                             str(data.get("winner_side") or ""),
-                            data.get("live_stats") if isinstance(data.get("live_stats"), list) else [],
+                            live_stats,
                             data.get("home_penalties"),
                             data.get("away_penalties"),
-                        ))
+                        )
                     except Exception:
-                        pass
+                        continue
+                    self._post_channel_embed(ch, emb, key=f"{batch}:public", batch=batch)
                 continue
 
             winner_team = str(data.get("winner_team") or "")
@@ -463,7 +471,7 @@ class FanZoneAnnouncer(commands.Cog):
                         data.get("home_score"),
                         data.get("away_score"),
                     )
-                    await ch.send(embed=emb)
+                    self._post_channel_embed(ch, emb, key=f"{batch}:public", batch=batch)
                 except Exception:
                     pass
 
@@ -473,21 +481,23 @@ class FanZoneAnnouncer(commands.Cog):
             draw_owner_ids = data.get("draw_owner_ids") or []
 
             if str(data.get("winner_side") or "").strip().lower() != "draw":
-                live_stats = data.get("live_stats") if isinstance(data.get("live_stats"), list) else []
+                if not (win_owner_ids or lose_owner_ids):
+                    continue
+                live_stats = await store.run(self._load_live_stats, data)
                 win_emb = self._dm_embed(True, winner_team, loser_team, winner_iso, live_stats)
                 lose_emb = self._dm_embed(False, loser_team, winner_team, loser_iso, live_stats)
 
-                for uid in win_owner_ids:
-                    await self._dm_user_embed(uid, win_emb)
-                for uid in lose_owner_ids:
-                    await self._dm_user_embed(uid, lose_emb)
+                self._dm_owners(batch, "win", win_owner_ids, win_emb)
+                self._dm_owners(batch, "lose", lose_owner_ids, lose_emb)
             else:
-                live_stats = data.get("live_stats") if isinstance(data.get("live_stats"), list) else []
+                if not draw_owner_ids:
+                    continue
+                live_stats = await store.run(self._load_live_stats, data)
                 draw_emb = self._dm_draw_embed(home, away, winner_iso or loser_iso, live_stats)
-                for uid in draw_owner_ids:
-                    await self._dm_user_embed(uid, draw_emb)
+                self._dm_owners(batch, "draw", draw_owner_ids, draw_emb)
 
-        compact_command_queue(
+        await store.run(
+            compact_command_queue,
             self.queue_path,
             [self.state_path, self.commands_state_path, self.stage_state_path],
         )
@@ -7,12 +7,18 @@ from typing import Any
 import discord
 from discord.ext import commands, tasks
 
+from bot_telemetry import get_telemetry, timed_loop
+from json_store import store
+from queue_utils import read_queue_chunk
 from stage_constants import STAGE_CHANNEL_MAP, normalize_stage
 
 
 class MatchStartAnnouncer(commands.Cog):
     """Announce fixtures that are within one hour of kickoff in stage/group channels."""
 
+    # Documents prefetched off-loop for the current tick; None outside a tick.
+    _docs: dict[str, Any] | None = None
+
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.base_dir = getattr(bot, "BASE_DIR", None) or os.getcwd()
@@ -31,7 +37,10 @@ class MatchStartAnnouncer(commands.Cog):
         self._sent_hour_keys: set[str] = set()
         self._sent_kickoff_keys: set[str] = set()
         self._commands_offset = 0
-        self._load_state()
+        get_telemetry(bot).register_consumer("MatchStartAnnouncer", self.commands_path, lambda: self._commands_offset)
+
+    async def cog_load(self):
+        await store.run(self._load_state)
         self._loop.start()
 
     def cog_unload(self):
@@ -42,8 +51,7 @@ class MatchStartAnnouncer(commands.Cog):
 
     def _load_state(self):
         try:
-            with open(self.state_path, "r", encoding="utf-8") as f:
-                data = json.load(f) or {}
+            data = store.read_blocking(self.state_path, {}) or {}
             # Backward compatibility: previous state versions used "sent_keys"
             # for one-hour reminders only.
             old_hour_keys = data.get("sent_keys") or []
@@ -60,22 +68,33 @@ class MatchStartAnnouncer(commands.Cog):
 
     def _save_state(self):
         try:
-            with open(self.state_path, "w", encoding="utf-8") as f:
-                json.dump({
-                    "sent_hour_keys": sorted(self._sent_hour_keys)[-5000:],
-                    "sent_kickoff_keys": sorted(self._sent_kickoff_keys)[-5000:],
-                    "commands_offset": int(self._commands_offset),
-                }, f)
+            store.write_blocking(self.state_path, {
+                "sent_hour_keys": sorted(self._sent_hour_keys)[-5000:],
+                "sent_kickoff_keys": sorted(self._sent_kickoff_keys)[-5000:],
+                "commands_offset": int(self._commands_offset),
+            })
         except Exception:
             pass
 
     def _load_json(self, path: str, default: Any):
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            return data if data is not None else default
-        except Exception:
-            return default
+        # Inside a tick the helpers read the prefetched snapshot, so nothing
+        # below _loop touches the disk from the event loop.
+        if self._docs is not None and path in self._docs:
+            data = self._docs[path]
+        else:
+            data = store.read_blocking(path, None, copy=False)
+        return data if data is not None else default
+
+    def _prefetch_docs(self) -> dict[str, Any]:
+        paths = (
+            self.matches_path,
+            self.legacy_matches_path,
+            self.country_roles_path,
+            self.team_meta_path,
+            os.path.join(self.json_dir, "admin_settings.json"),
+            os.path.join(self.base_dir, "config.json"),
+        )
+        return {path: store.read_blocking(path, None, copy=False) for path in paths}
 
     def _load_matches(self) -> list[dict[str, Any]]:
         # Prefer JSON/matches.json because admin/public routes persist there.
@@ -227,17 +246,10 @@ class MatchStartAnnouncer(commands.Cog):
         so this cog keeps its own byte offset and ignores unrelated command kinds.
         """
         try:
-            if not os.path.isfile(self.commands_path):
+            chunk, self._commands_offset = read_queue_chunk(self.commands_path, self._commands_offset)
+            if chunk is None:
                 return []
-            size = os.path.getsize(self.commands_path)
-            if self._commands_offset > size:
-                self._commands_offset = 0
-            with open(self.commands_path, "r", encoding="utf-8", errors="ignore") as f:
-                f.seek(self._commands_offset)
-                lines = f.read().splitlines()
-                self._commands_offset = f.tell()
-        except Exception:
-            return []
+            lines = chunk.splitlines()
         finally:
             self._save_state()
 
@@ -321,12 +333,20 @@ class MatchStartAnnouncer(commands.Cog):
         return embed
 
     @tasks.loop(seconds=60)
+    @timed_loop("MatchStartAnnouncer._loop")
     async def _loop(self):
+        self._docs = await store.run(self._prefetch_docs)
+        try:
+            await self._tick()
+        finally:
+            self._docs = None
+
+    async def _tick(self):
         guild = self._get_guild()
         if not guild:
             return
 
-        for data in self._read_new_delay_commands():
+        for data in await store.run(self._read_new_delay_commands):
             try:
                 await self._send_kickoff_adjustment(guild, data)
             except Exception:
@@ -374,7 +394,7 @@ class MatchStartAnnouncer(commands.Cog):
                     allowed_mentions=discord.AllowedMentions(roles=True),
                 )
                 sent_keys.add(state_key)
-                self._save_state()
+                await store.run(self._save_state)
             except Exception:
                 continue
 
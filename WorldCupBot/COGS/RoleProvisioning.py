@@ -1,10 +1,11 @@
-import json
 import logging
 from pathlib import Path
 
 from discord.ext import commands
 
 from COGS.role_utils import has_root
+from guild_ops import BulkExecutor, GuildOp, plan_missing_roles
+from json_store import store
 
 BASE_DIR = Path(__file__).resolve().parents[1]
 JSON_DIR = BASE_DIR / "JSON"
@@ -16,18 +17,14 @@ COUNTRY_GROUP_LINKS_FILE = JSON_DIR / "country_group_links.json"
 log = logging.getLogger(__name__)
 
 
-def load_json(path: Path, default):
-    """Load JSON content from disk and gracefully return a default value."""
-    if not path.exists():
-        return default
-    with path.open("r", encoding="utf-8") as f:
-        return json.load(f)
+async def load_json(path: Path, default):
+    """Load JSON content through the shared store and gracefully return a default value."""
+    return await store.read(path, default)
 
 
-def save_json(path: Path, data) -> None:
-    """Persist JSON data with indentation for easy manual inspection."""
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4)
+async def save_json(path: Path, data) -> None:
+    """Persist JSON data through the shared store."""
+    await store.write(path, data)
 
 
 
@@ -67,7 +64,7 @@ class RoleProvisioning(commands.Cog):
             await ctx.send("This command must be used in a server.")
             return
 
-        team_meta = load_json(TEAM_META_FILE, {"groups": {}})
+        team_meta = await load_json(TEAM_META_FILE, {"groups": {}})
         groups = team_meta.get("groups", {}) if isinstance(team_meta, dict) else {}
 
         if not groups:
@@ -75,60 +72,68 @@ class RoleProvisioning(commands.Cog):
             return
 
         existing_roles = {r.name: r for r in ctx.guild.roles}
-        country_roles = load_json(COUNTRYROLES_FILE, {})
-        group_roles = load_json(GROUPROLES_FILE, {})
-        country_group_links = load_json(COUNTRY_GROUP_LINKS_FILE, {})
-
-        created_groups = 0
-        created_countries = 0
-
+        country_roles = await load_json(COUNTRYROLES_FILE, {})
+        group_roles = await load_json(GROUPROLES_FILE, {})
+        country_group_links = await load_json(COUNTRY_GROUP_LINKS_FILE, {})
+
+        # Work out every missing role from the cached role list up front, then
+        # create only those. Re-running on a provisioned guild makes no calls.
+        wanted_groups = []
+        wanted_countries = {}
         for group_key, countries in groups.items():
             g_label = group_label(group_key)
             if not g_label:
                 continue
-
-            role = existing_roles.get(g_label)
-            if not role:
-                role = await ctx.guild.create_role(
-                    name=g_label,
-                    mentionable=True,
-                    reason="World Cup group role provisioning"
-                )
-                existing_roles[g_label] = role
-                created_groups += 1
-
-            group_roles[g_label] = role.id
-
-            # Keep countryroles.json scalar (country -> role_id) for compatibility with
-            # announcers that cast mapping values directly with int(...). Group linkage
-            # metadata is persisted separately in country_group_links.json.
+            wanted_groups.append(g_label)
             for country in countries:
-                if not country or country == "TBA":
-                    continue
-
-                country_role = existing_roles.get(country)
-                if not country_role:
-                    country_role = await ctx.guild.create_role(
-                        name=country,
-                        mentionable=True,
-                        reason=f"World Cup country role provisioning ({g_label})"
-                    )
-                    existing_roles[country] = country_role
-                    created_countries += 1
-
-                country_roles[country] = country_role.id
-                country_group_links[country] = {
-                    "group": g_label,
-                    "group_role_id": role.id,
-                }
+                if country and country != "TBA":
+                    wanted_countries[country] = g_label
+
+        missing_groups = plan_missing_roles(existing_roles, wanted_groups)
+        missing_countries = plan_missing_roles(existing_roles, wanted_countries)
+        guild = ctx.guild
+
+        def _create_op(name: str, reason: str) -> GuildOp:
+            async def _apply():
+                existing_roles[name] = await guild.create_role(name=name, mentionable=True, reason=reason)
+            # Role creation shares one per-guild bucket, so these ops share a route.
+            return GuildOp(f"create_role:{name}", f"guild_roles:{guild.id}", _apply)
+
+        ops = [_create_op(name, "World Cup group role provisioning") for name in missing_groups]
+        ops += [
+            _create_op(name, f"World Cup country role provisioning ({wanted_countries[name]})")
+            for name in missing_countries
+        ]
+        await BulkExecutor(f"setupgrouproles:{guild.id}").run(ops)
+        created_groups = sum(1 for name in missing_groups if name in existing_roles)
+        created_countries = sum(1 for name in missing_countries if name in existing_roles)
+
+        for g_label in wanted_groups:
+            role = existing_roles.get(g_label)
+            if role:
+                group_roles[g_label] = role.id
+
+        # Keep countryroles.json scalar (country -> role_id) for compatibility with
+        # announcers that cast mapping values directly with int(...). Group linkage
+        # metadata is persisted separately in country_group_links.json.
+        for country, g_label in wanted_countries.items():
+            country_role = existing_roles.get(country)
+            group_role = existing_roles.get(g_label)
+            if not country_role or not group_role:
+                continue
+            country_roles[country] = country_role.id
+            country_group_links[country] = {
+                "group": g_label,
+                "group_role_id": group_role.id,
+            }
 
         # If older runs stored dict entries in countryroles.json, coerce them back
         # to scalar IDs to restore ID lookups in announcer cogs.
         country_roles = coerce_country_role_ids(country_roles)
 
-        save_json(COUNTRYROLES_FILE, country_roles)
-        save_json(GROUPROLES_FILE, group_roles)
-        save_json(COUNTRY_GROUP_LINKS_FILE, country_group_links)
+        await save_json(COUNTRYROLES_FILE, country_roles)
+        await save_json(GROUPROLES_FILE, group_roles)
+        await save_json(COUNTRY_GROUP_LINKS_FILE, country_group_links)
 
         summary = (
             f"Group roles synced: {len(group_roles)} total ({created_groups} created).\n"
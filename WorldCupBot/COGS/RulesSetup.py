@@ -1,11 +1,12 @@
 import asyncio
-import json
 from pathlib import Path
 from typing import List, Tuple
 
 import discord
 from discord.ext import commands
 
+from json_store import store
+
 
 ROLE_NAME = "Unverified"
 GREEN_TICK = "✅"
@@ -160,10 +161,9 @@ RULES_SECTIONS: List[Tuple[str, str]] = [
     ),
 ]
 
-def is_verified(user_id):
+async def is_verified(user_id):
     try:
-        with open(VERIFIED_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = await store.read(VERIFIED_FILE, {}, copy=False)
         return str(user_id) in {str(u["discord_id"]) for u in data.get("verified_users", [])}
     except Exception:
         return False
@@ -239,7 +239,7 @@ class RulesCog(commands.Cog):
         role = discord.utils.get(guild.roles, name=ROLE_NAME)
 
         # Verified check
-        if is_verified(payload.user_id):
+        if await is_verified(payload.user_id):
             if role and role in member.roles:
                 try:
                     await member.remove_roles(role, reason="Already verified; remove Unverified role")
@@ -1,13 +1,17 @@
 import discord
 from discord.ext import commands, tasks
 from discord import app_commands
-import json
 from pathlib import Path
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 import logging
 
+from bot_telemetry import timed_loop
 from COGS.role_utils import has_referee
+import ownership_index
+from embed_refresher import EDITED, MISSING, UNCHANGED, get_embed_refresher
+from json_store import store
+from outbound_scheduler import get_outbound_scheduler
 
 BASE_DIR = Path(__file__).resolve().parents[1]
 JSON_DIR = BASE_DIR / "JSON"
@@ -21,31 +25,24 @@ SPLIT_REQUEST_COOLDOWN_SECONDS = 300
 
 log = logging.getLogger(__name__)
 
-def load_json(path):
-    if not path.exists():
-        return {} if str(path).endswith('.json') else []
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+async def load_json(path):
+    return await store.read(path, {} if str(path).endswith('.json') else [])
 
-def save_json(path, data):
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4)
+async def save_json(path, data):
+    return await store.write(path, data)
 
-def append_log(log_item):
+def read_players_blocking(path):
+    return store.read_blocking(path, {})
+
+async def append_log(log_item):
     try:
-        if not SPLIT_REQUESTS_LOG_FILE.exists():
-            with open(SPLIT_REQUESTS_LOG_FILE, "w", encoding="utf-8") as f:
-                json.dump([], f)
-        with open(SPLIT_REQUESTS_LOG_FILE, "r", encoding="utf-8") as f:
-            logs = json.load(f)
-        logs.append(log_item)
-        with open(SPLIT_REQUESTS_LOG_FILE, "w", encoding="utf-8") as f:
-            json.dump(logs, f, indent=4)
+        # The launcher appends to this log too, so it is written through, never deferred.
+        await store.update(SPLIT_REQUESTS_LOG_FILE, lambda logs: logs.append(log_item), [])
     except Exception as e:
         print(f"Failed to log split request: {e}")
 
-def get_flag_url(team_name):
-    iso_map = load_json(ISO_FILE)
+async def get_flag_url(team_name):
+    iso_map = await store.read(ISO_FILE, {}, copy=False)
     iso = iso_map.get(team_name, None)
     if not iso:
         return None
@@ -293,15 +290,15 @@ def find_public_players_channel(guild):
                     return channel
     return None
 
-def build_public_team_embed(bot, team, main_owner_id, main_owner_user, main_team_obj):
+async def build_public_team_embed(bot, team, main_owner_id, main_owner_user, main_team_obj):
     """Build the Discord embed from the same ownership fields used by the website."""
     ownership = main_team_obj.get("ownership", {})
     split_owners = ownership.get("split_with", [])
     total_owners = 1 + len(split_owners)
     split_mentions = format_owner_mentions(split_owners, total_owners, ownership) if split_owners else "N/A"
-    flag = get_flag_url(team)
+    flag = await get_flag_url(team)
     embed = discord.Embed(title=team, colour=discord.Colour.blue())
-    main_value = main_owner_user.mention if main_owner_user else str(main_owner_id)
+    main_value = main_owner_user.mention if main_owner_user else f"<@{main_owner_id}>"
     main_share = format_owner_share_label(main_owner_id, total_owners, ownership)
     if main_share:
         main_value = f"{main_value} ({main_share})"
@@ -313,18 +310,23 @@ def build_public_team_embed(bot, team, main_owner_id, main_owner_user, main_team
         embed.set_image(url=flag)
     return embed
 
-def embed_matches_expected(existing_embed, expected_embed):
-    """Compare stable user-visible embed fields before deciding whether to edit."""
-    if not existing_embed:
-        return False
-    if existing_embed.title != expected_embed.title:
-        return False
-    existing_fields = [(field.name, field.value) for field in existing_embed.fields]
-    expected_fields = [(field.name, field.value) for field in expected_embed.fields]
-    return existing_fields == expected_fields
+def cached_owner(bot, guild, owner_id):
+    """The main owner from the client's caches; never makes a Discord request."""
+    try:
+        owner_id = int(owner_id)
+    except (TypeError, ValueError):
+        return None
+    return bot.get_user(owner_id) or (guild.get_member(owner_id) if guild else None)
 
-async def check_and_correct_public_embed(bot, guild, team, players):
-    """Check one team's public Discord embed against players.json and correct it."""
+async def check_and_correct_public_embed(bot, guild, team, players, *, wait=True, force=True):
+    """Re-render one team's public Discord embed from players.json.
+
+    The edit goes through the shared embed refresher, so several requests for
+    the same team in a short window become one edit and the message is never
+    fetched. ``force`` edits even if the last rendered embed was identical
+    (the repair command uses it, since someone may have changed the message
+    by hand). With ``wait=False`` the refresh is only queued.
+    """
     main_owner_id, main_team_obj = find_team_main_owner(players, team)
     if not main_team_obj or "public_message_id" not in main_team_obj:
         return "missing_record", f"No public embed message is recorded for {team}."
@@ -333,24 +335,31 @@ async def check_and_correct_public_embed(bot, guild, team, players):
     if not public_channel:
         return "missing_channel", "Could not find #players-and-teams in the World Cup category."
 
-    msg_id = main_team_obj["public_message_id"]
-    msg = await public_channel.fetch_message(msg_id)
-    main_owner_user = bot.get_user(main_owner_id) or await bot.fetch_user(main_owner_id)
-    expected_embed = build_public_team_embed(bot, team, main_owner_id, main_owner_user, main_team_obj)
-    current_embed = msg.embeds[0] if msg.embeds else None
-    if embed_matches_expected(current_embed, expected_embed):
-        return "already_correct", f"{team} embed already matches the website ownership data."
+    async def render():
+        owner = cached_owner(bot, guild, main_owner_id)
+        return await build_public_team_embed(bot, team, main_owner_id, owner, main_team_obj)
 
-    await msg.edit(embed=expected_embed)
-    return "corrected", f"Corrected the {team} embed to match the website ownership data."
+    future = get_embed_refresher(bot).request(
+        public_channel.id, main_team_obj["public_message_id"], render, force=force,
+    )
+    if not wait:
+        return "queued", f"Queued a refresh of the {team} embed."
+    outcome = await future
+    if outcome == EDITED:
+        return "corrected", f"Corrected the {team} embed to match the website ownership data."
+    if outcome == UNCHANGED:
+        return "already_correct", f"{team} embed already matches the website ownership data."
+    if outcome == MISSING:
+        return "missing_message", f"The public embed message for {team} no longer exists."
+    return "failed", f"Discord rejected the edit of the {team} embed."
 
 async def update_public_embed(bot, guild, team, players):
     try:
-        status, message = await check_and_correct_public_embed(bot, guild, team, players)
-        if status == "corrected":
+        status, message = await check_and_correct_public_embed(bot, guild, team, players, wait=False, force=False)
+        if status == "queued":
             main_owner_id, main_team_obj = find_team_main_owner(players, team)
-            log.info("Split public embed updated (team=%s message_id=%s)", team, main_team_obj.get("public_message_id"))
-        elif status not in {"already_correct", "missing_record", "missing_channel"}:
+            log.info("Split public embed refresh queued (team=%s message_id=%s)", team, main_team_obj.get("public_message_id"))
+        elif status not in {"missing_record", "missing_channel"}:
             log.info("Split public embed check finished (team=%s status=%s message=%s)", team, status, message)
     except Exception as e:
         print(f"Failed to update public embed for {team}: {e}")
@@ -380,20 +389,16 @@ class ConfirmChoiceView(discord.ui.View):
             return
     
         await self.callback(self.accepted, self.team, self.requester, self.request_id, declined=not self.accepted)
-        flag_url = get_flag_url(self.team)
+        flag_url = await get_flag_url(self.team)
         
         if self.accepted:
-            players = load_json(PLAYERS_FILE)
-            main_owner_id, _ = find_team_main_owner(players, self.team)
-            split_owner_ids = []
-            for uid, pdata in players.items():
-                for t in pdata.get("teams", []):
-                    if t["team"] == self.team:
-                        split_owner_ids += [oid for oid in t["ownership"].get("split_with", []) if oid != main_owner_id]
-            split_owner_ids = list(set(split_owner_ids))
+            players = await load_json(PLAYERS_FILE)
+            main_owner_id, main_team_obj = find_team_main_owner(players, self.team)
+            index = await store.run(ownership_index.get, PLAYERS_FILE)
+            record = index.team(self.team)
+            split_owner_ids = [oid for oid in (record.split_with if record else []) if oid != str(main_owner_id)]
             main_team_ownership = {}
             if main_owner_id is not None:
-                _, main_team_obj = find_team_main_owner(players, self.team)
                 main_team_ownership = (main_team_obj or {}).get("ownership", {})
             total_owners = 1 + len(split_owner_ids)
             main_share = format_owner_share_label(main_owner_id, total_owners, main_team_ownership)
@@ -424,7 +429,7 @@ class ConfirmChoiceView(discord.ui.View):
     
         # Update public embeds if split was accepted
         if self.accepted:
-            players = load_json(PLAYERS_FILE)
+            players = await load_json(PLAYERS_FILE)
             for guild in self.bot.guilds:
                 await update_public_embed(self.bot, guild, self.team, players)
                 break
@@ -448,12 +453,12 @@ class ConfirmChoiceView(discord.ui.View):
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
 
-        flag_url = get_flag_url(self.team)
-        players = load_json(PLAYERS_FILE)
+        flag_url = await get_flag_url(self.team)
+        players = await load_json(PLAYERS_FILE)
         _, main_team_obj = find_team_main_owner(players, self.team)
         split_with = main_team_obj["ownership"].get("split_with", []) if main_team_obj else []
         remaining = calculate_remaining_percentage(len(split_with))
-        requests = load_json(REQUESTS_FILE)
+        requests = await load_json(REQUESTS_FILE)
         request = requests.get(self.request_id)
         requested_share = requested_share_for_team(self.team, players, request)
         existing_owner_count = 1 + len(split_with)
@@ -501,11 +506,11 @@ class SplitRequestView(discord.ui.View):
             embed.set_thumbnail(url=self.bot.user.display_avatar.url)
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
-        players = load_json(PLAYERS_FILE)
+        players = await load_json(PLAYERS_FILE)
         _, main_team_obj = find_team_main_owner(players, self.team)
         split_with = main_team_obj["ownership"].get("split_with", []) if main_team_obj else []
         remaining = calculate_remaining_percentage(len(split_with))
-        requests = load_json(REQUESTS_FILE)
+        requests = await load_json(REQUESTS_FILE)
         request = requests.get(self.request_id)
         requested_share = requested_share_for_team(self.team, players, request)
         existing_owner_count = 1 + len(split_with)
@@ -540,11 +545,11 @@ class SplitRequestView(discord.ui.View):
             embed.set_thumbnail(url=self.bot.user.display_avatar.url)
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
-        players = load_json(PLAYERS_FILE)
+        players = await load_json(PLAYERS_FILE)
         _, main_team_obj = find_team_main_owner(players, self.team)
         split_with = main_team_obj["ownership"].get("split_with", []) if main_team_obj else []
         remaining = calculate_remaining_percentage(len(split_with))
-        requests = load_json(REQUESTS_FILE)
+        requests = await load_json(REQUESTS_FILE)
         request = requests.get(self.request_id)
         requested_share = requested_share_for_team(self.team, players, request)
         existing_owner_count = 1 + len(split_with)
@@ -588,7 +593,7 @@ class SplitOwnership(commands.Cog):
             await ctx.reply("This command must be used in a server.")
             return
 
-        players = load_json(PLAYERS_FILE)
+        players = await load_json(PLAYERS_FILE)
         team_case_map = build_team_case_map_from_players(players)
         canonical_team = team_case_map.get(team.strip().lower())
         if not canonical_team:
@@ -606,15 +611,16 @@ class SplitOwnership(commands.Cog):
         await ctx.reply(f"{prefix} {message}")
 
     @tasks.loop(minutes=15)
+    @timed_loop("SplitOwnership.cleanup_requests")
     async def cleanup_requests(self):
-        requests = load_json(REQUESTS_FILE)
+        requests = await load_json(REQUESTS_FILE)
         now = datetime.now(timezone.utc).timestamp()
         updated = False
         for req_id in list(requests.keys()):
             req = requests[req_id]
             if req["expires_at"] < now:
                 # Log expiration
-                append_log({
+                await append_log({
                     "timestamp": datetime.now(timezone.utc).isoformat(),
                     "status": "expired",
                     "request_id": req_id,
@@ -631,40 +637,36 @@ class SplitOwnership(commands.Cog):
                     req.get("requester_id"),
                     req.get("main_owner_id"),
                 )
-                main_owner = self.bot.get_user(req["main_owner_id"])
-                requester = self.bot.get_user(int(req["requester_id"]))
                 embed = discord.Embed(
                     title=f"Split Request Expired - {req['team']}",
                     description=f"Your split request for **{req['team']}** expired after 48 hours without a response from the main owner.",
                     colour=discord.Colour.orange()
                 )
                 embed.set_footer(text="World Cup 2026 · Split request expired")
-                flag_url = get_flag_url(req["team"])
+                flag_url = await get_flag_url(req["team"])
                 if flag_url:
                     embed.set_image(url=flag_url)
                 embed.set_thumbnail(url=self.bot.user.display_avatar.url)
-                if main_owner:
-                    try:
-                        await main_owner.send(embed=embed)
-                    except Exception:
-                        pass
-                if requester:
-                    try:
-                        await requester.send(embed=embed)
-                    except Exception:
-                        pass
+                outbound = get_outbound_scheduler(self.bot)
+                for uid in (req["main_owner_id"], req["requester_id"]):
+                    outbound.enqueue_dm(
+                        uid,
+                        embed=embed,
+                        key=f"split_expired:{req_id}:{uid}",
+                        batch=f"split_expired:{req_id}",
+                    )
                 del requests[req_id]
                 updated = True
         if updated:
-            save_json(REQUESTS_FILE, requests)
+            await save_json(REQUESTS_FILE, requests)
 
     async def split_callback(self, accepted, team, requester, request_id, declined=False, timeout=False):
-        requests = load_json(REQUESTS_FILE)
+        requests = await load_json(REQUESTS_FILE)
         req = requests.get(request_id, None)
         if not req:
             return
 
-        players = load_json(PLAYERS_FILE)
+        players, loaded = await store.run(ownership_index.read, PLAYERS_FILE, read_players_blocking)
         main_owner_id, main_team_obj = find_team_main_owner(players, team)
         uid = str(requester.id)
 
@@ -702,7 +704,7 @@ class SplitOwnership(commands.Cog):
             "resolved_by": str(main_owner_id) if not timeout else None,
             "expires_at": req.get("expires_at")
         }
-        append_log(log_item)
+        await append_log(log_item)
         log.info(
             "Split request resolved (request_id=%s team=%s status=%s requester_id=%s main_owner_id=%s)",
             request_id,
@@ -713,7 +715,7 @@ class SplitOwnership(commands.Cog):
         )
 
         del requests[request_id]
-        save_json(REQUESTS_FILE, requests)
+        await save_json(REQUESTS_FILE, requests)
 
         if timeout:
             return
@@ -728,7 +730,7 @@ class SplitOwnership(commands.Cog):
                 colour=discord.Colour.red()
             )
             embed.set_footer(text="World Cup 2026 · Split request declined")
-            flag_url = get_flag_url(team)
+            flag_url = await get_flag_url(team)
             if flag_url:
                 embed.set_image(url=flag_url)
             embed.set_thumbnail(url=self.bot.user.display_avatar.url)
@@ -739,6 +741,7 @@ class SplitOwnership(commands.Cog):
             return
 
         if accepted and main_team_obj:
+            index = await store.run(ownership_index.current, PLAYERS_FILE, players, loaded)
             split_with = main_team_obj["ownership"].setdefault("split_with", [])
             if requester.id not in split_with:
                 split_with.append(requester.id)
@@ -763,7 +766,8 @@ class SplitOwnership(commands.Cog):
                     if entry.get("team") == team:
                         entry.setdefault("ownership", {})
                         entry["ownership"]["percentages"] = percentages
-            save_json(PLAYERS_FILE, players)
+            written = await save_json(PLAYERS_FILE, players)
+            ownership_index.update(PLAYERS_FILE, players, [team], [uid], base=index, loaded=loaded, written=written)
 
             for guild in self.bot.guilds:
                 await update_public_embed(self.bot, guild, team, players)
@@ -780,7 +784,7 @@ class SplitOwnership(commands.Cog):
                 colour=discord.Colour.green()
             )
             embed.set_footer(text="World Cup 2026 · Team ownership updated")
-            flag_url = get_flag_url(team)
+            flag_url = await get_flag_url(team)
             if flag_url:
                 embed.set_image(url=flag_url)
             embed.set_thumbnail(url=self.bot.user.display_avatar.url)
@@ -804,12 +808,12 @@ class SplitOwnership(commands.Cog):
         
         await interaction.response.defer(ephemeral=True)
         
-        players = load_json(PLAYERS_FILE)
+        players = await load_json(PLAYERS_FILE)
         team_case_map = build_team_case_map_from_players(players)
         team_input = team.strip().lower()
         requester_id = str(interaction.user.id)
 
-        verified = load_json(VERIFIED_FILE)
+        verified = await load_json(VERIFIED_FILE)
         if not can_request_split(players, verified, requester_id):
             embed = discord.Embed(
                 title="You are not eligible to split yet!",
@@ -860,7 +864,7 @@ class SplitOwnership(commands.Cog):
             await interaction.followup.send(embed=embed, ephemeral=True)
             return
 
-        requests = load_json(REQUESTS_FILE)
+        requests = await load_json(REQUESTS_FILE)
         for req in requests.values():
             if (req["requester_id"] == requester_id and req["team"] == team):
                 embed = discord.Embed(
@@ -919,7 +923,7 @@ class SplitOwnership(commands.Cog):
             "expires_at": expires_at,
             "requested_percentage": requested_percentage
         }
-        save_json(REQUESTS_FILE, requests)
+        await save_json(REQUESTS_FILE, requests)
         log.info(
             "Split request created (request_id=%s team=%s requester_id=%s main_owner_id=%s requested_percentage=%s)",
             request_id,
@@ -929,7 +933,7 @@ class SplitOwnership(commands.Cog):
             requested_percentage,
         )
 
-        flag_url = get_flag_url(team)
+        flag_url = await get_flag_url(team)
         embed = discord.Embed(
             title=f"Split Request - {team}",
             description=(
@@ -960,7 +964,7 @@ class SplitOwnership(commands.Cog):
             embed.set_footer(text="World Cup 2026 · DM failure")
             embed.set_thumbnail(url=self.bot.user.display_avatar.url)
             del requests[request_id]
-            save_json(REQUESTS_FILE, requests)
+            await save_json(REQUESTS_FILE, requests)
             await interaction.followup.send(embed=embed, ephemeral=True)
             return
 
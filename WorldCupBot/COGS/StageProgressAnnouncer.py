@@ -2,7 +2,10 @@ import os, json, logging
 import discord
 from discord.ext import commands, tasks
 
-from queue_utils import compact_command_queue
+from bot_telemetry import get_telemetry, timed_loop
+from json_store import store
+from outbound_scheduler import get_outbound_scheduler
+from queue_utils import compact_command_queue, read_queue_chunk
 from stage_constants import STAGE_CHANNEL_MAP, normalize_stage
 
 log = logging.getLogger(__name__)
@@ -23,10 +26,14 @@ class StageProgressAnnouncer(commands.Cog):
         self.country_roles_path = os.path.join(self.base_dir, "JSON", "countryroles.json")
         self.country_group_links_path = os.path.join(self.base_dir, "JSON", "country_group_links.json")
         self.team_meta_path = os.path.join(self.base_dir, "JSON", "team_meta.json")
-        self.team_iso = self._load_team_iso()
+        self.team_iso = {}
 
         self._offset = 0
-        self._load_state()
+        get_telemetry(bot).register_consumer("StageProgressAnnouncer", self.queue_path, lambda: self._offset)
+
+    async def cog_load(self):
+        self.team_iso = await self._load_team_iso()
+        await self._load_state()
         self._loop.start()
 
     def cog_unload(self):
@@ -35,53 +42,38 @@ class StageProgressAnnouncer(commands.Cog):
         except Exception:
             pass
 
-    def _load_team_iso(self):
+    async def _load_team_iso(self):
         try:
-            if os.path.isfile(self.team_iso_path):
-                with open(self.team_iso_path, "r", encoding="utf-8") as f:
-                    m = json.load(f)
-                if isinstance(m, dict):
-                    out = {}
-                    for k, v in m.items():
-                        if not k or not v:
-                            continue
-                        out[str(k).strip().lower()] = str(v).strip().lower()
-                    return out
+            m = await store.read(self.team_iso_path, None, copy=False)
+            if isinstance(m, dict):
+                out = {}
+                for k, v in m.items():
+                    if not k or not v:
+                        continue
+                    out[str(k).strip().lower()] = str(v).strip().lower()
+                return out
         except Exception:
             pass
         return {}
 
-    def _load_country_roles(self) -> dict:
-        try:
-            if os.path.isfile(self.country_roles_path):
-                with open(self.country_roles_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                if isinstance(data, dict):
-                    return data
-        except Exception:
-            pass
-        return {}
+    async def _load_country_roles(self) -> dict:
+        data = await store.read(self.country_roles_path, {}, copy=False)
+        return data if isinstance(data, dict) else {}
 
-    def _load_settings(self) -> dict:
+    async def _load_settings(self) -> dict:
         path = os.path.join(self.base_dir, "JSON", "admin_settings.json")
-        try:
-            if os.path.isfile(path):
-                with open(path, "r", encoding="utf-8") as f:
-                    return json.load(f) or {}
-        except Exception:
-            pass
-        return {}
+        data = await store.read(path, {}, copy=False)
+        return data if isinstance(data, dict) else {}
 
-    def _selected_guild_id(self) -> str:
-        settings = self._load_settings()
+    async def _selected_guild_id(self) -> str:
+        settings = await self._load_settings()
         return str(settings.get("SELECTED_GUILD_ID") or "").strip()
 
-    def _config_guild_id(self) -> str:
+    async def _config_guild_id(self) -> str:
         try:
             cfg_path = os.path.join(self.base_dir, "config.json")
-            if os.path.isfile(cfg_path):
-                with open(cfg_path, "r", encoding="utf-8") as f:
-                    cfg = json.load(f) or {}
+            cfg = await store.read(cfg_path, {}, copy=False)
+            if isinstance(cfg, dict):
                 for key in ("DISCORD_GUILD_ID", "GUILD_ID", "PRIMARY_GUILD_ID", "ADMIN_GUILD_ID", "GUILD", "GUILDID"):
                     gid = str(cfg.get(key) or "").strip()
                     if gid:
@@ -102,23 +94,21 @@ class StageProgressAnnouncer(commands.Cog):
             return None
         return f"https://flagcdn.com/w80/{code}.png"
 
-    def _load_state(self):
+    async def _load_state(self):
         try:
-            with open(self.state_path, "r", encoding="utf-8") as f:
-                d = json.load(f)
+            d = await store.read(self.state_path, {})
             self._offset = int(d.get("offset") or 0)
         except Exception:
             self._offset = 0
 
-    def _save_state(self):
+    async def _save_state(self):
         try:
-            with open(self.state_path, "w", encoding="utf-8") as f:
-                json.dump({"offset": int(self._offset)}, f)
+            await store.write(self.state_path, {"offset": int(self._offset)})
         except Exception:
             pass
 
-    def _get_guild(self) -> discord.Guild | None:
-        for gid in (self._selected_guild_id(), self._config_guild_id()):
+    async def _get_guild(self) -> discord.Guild | None:
+        for gid in (await self._selected_guild_id(), await self._config_guild_id()):
             if gid:
                 try:
                     return self.bot.get_guild(int(gid))
@@ -138,10 +128,9 @@ class StageProgressAnnouncer(commands.Cog):
                 return ch
         return None
 
-    def _get_team_role(self, guild: discord.Guild | None, team: str) -> discord.Role | None:
+    def _get_team_role(self, guild: discord.Guild | None, team: str, roles: dict) -> discord.Role | None:
         if not guild:
             return None
-        roles = self._load_country_roles()
         role_id = roles.get(team)
         if role_id:
             try:
@@ -169,36 +158,35 @@ class StageProgressAnnouncer(commands.Cog):
         return str(fallback or "announcements")
 
     def _group_channel_for_team(self, team: str) -> str:
-        """Resolve a team's group-stage channel from persisted team metadata."""
+        """Resolve a team's group-stage channel from persisted team metadata.
+
+        Blocking (reads through the store's cache); the loop calls it via ``store.run``.
+        """
         team_key = str(team or "").strip().lower()
         if not team_key:
             return ""
 
         try:
-            if os.path.isfile(self.country_group_links_path):
-                with open(self.country_group_links_path, "r", encoding="utf-8") as f:
-                    links = json.load(f) or {}
-                link = links.get(team) or links.get(team_key) or {}
-                group_label = str((link or {}).get("group") or "").strip()
-                if group_label:
-                    group_key = group_label.split()[-1].strip().lower()
-                    if group_key:
-                        return f"group-{group_key}"
+            links = store.read_blocking(self.country_group_links_path, {}, copy=False) or {}
+            link = links.get(team) or links.get(team_key) or {}
+            group_label = str((link or {}).get("group") or "").strip()
+            if group_label:
+                group_key = group_label.split()[-1].strip().lower()
+                if group_key:
+                    return f"group-{group_key}"
         except Exception:
             pass
 
         try:
-            if os.path.isfile(self.team_meta_path):
-                with open(self.team_meta_path, "r", encoding="utf-8") as f:
-                    meta = json.load(f) or {}
-                groups = meta.get("groups") if isinstance(meta, dict) else {}
-                if isinstance(groups, dict):
-                    for group_key, countries in groups.items():
-                        if not group_key or not isinstance(countries, list):
-                            continue
-                        for country in countries:
-                            if str(country or "").strip().lower() == team_key:
-                                return f"group-{str(group_key).strip().lower()}"
+            meta = store.read_blocking(self.team_meta_path, {}, copy=False) or {}
+            groups = meta.get("groups") if isinstance(meta, dict) else {}
+            if isinstance(groups, dict):
+                for group_key, countries in groups.items():
+                    if not group_key or not isinstance(countries, list):
+                        continue
+                    for country in countries:
+                        if str(country or "").strip().lower() == team_key:
+                            return f"group-{str(group_key).strip().lower()}"
         except Exception:
             pass
 
@@ -239,18 +227,8 @@ class StageProgressAnnouncer(commands.Cog):
 
         return self._announcement_channel(stage_key, fallback)
 
-    async def _dm_user_embed(self, user_id: str, embed: discord.Embed):
-        try:
-            uid = int(str(user_id))
-        except Exception:
-            return
-        try:
-            user = self.bot.get_user(uid) or await self.bot.fetch_user(uid)
-            if not user:
-                return
-            await user.send(embed=embed)
-        except Exception:
-            return
+    def _dm_user_embed(self, user_id: str, embed: discord.Embed, key: str | None = None, batch: str | None = None):
+        get_outbound_scheduler(self.bot).enqueue_dm(user_id, embed=embed, key=key, batch=batch)
 
     def _placement_copy(self, team: str, stage: str) -> tuple[str, str, discord.Color]:
         stage = normalize_stage(stage)
@@ -308,26 +286,12 @@ class StageProgressAnnouncer(commands.Cog):
         return e
 
     @tasks.loop(seconds=2.5)
+    @timed_loop("StageProgressAnnouncer._loop")
     async def _loop(self):
-        if not os.path.isfile(self.queue_path):
-            return
-
-        try:
-            size = os.path.getsize(self.queue_path)
-            if self._offset > size:
-                self._offset = 0
-        except Exception:
-            return
-
-        try:
-            with open(self.queue_path, "r", encoding="utf-8", errors="ignore") as f:
-                f.seek(self._offset)
-                chunk = f.read()
-                self._offset = f.tell()
-        except Exception:
+        chunk, self._offset = await store.run(read_queue_chunk, self.queue_path, self._offset)
+        if chunk is None:
             return
-        finally:
-            self._save_state()
+        await self._save_state()
 
         if not chunk:
             return
@@ -336,9 +300,10 @@ class StageProgressAnnouncer(commands.Cog):
         if not lines:
             return
 
-        guild = self._get_guild()
+        guild = await self._get_guild()
         if not guild:
             return
+        country_roles = await self._load_country_roles()
 
         for ln in lines:
             try:
@@ -354,7 +319,7 @@ class StageProgressAnnouncer(commands.Cog):
             stage = str(data.get("stage") or "")
             previous_stage = str(data.get("previous_stage") or "")
             requested_channel = str(data.get("channel") or "announcements")
-            channel_name = self._stage_update_channel(team, stage, requested_channel, previous_stage)
+            channel_name = await store.run(self._stage_update_channel, team, stage, requested_channel, previous_stage)
             owner_ids = data.get("owner_ids") or []
             log.info(
                 "Country stage announcement queued (team=%s stage=%s channel=%s owners=%s)",
@@ -365,6 +330,7 @@ class StageProgressAnnouncer(commands.Cog):
             )
 
             thumb_iso = self._iso_for_team(team, data.get("team_iso"))
+            batch = f"team_stage_progress:{team}:{stage}:{cmd.get('ts') or ''}"
 
             ch = await self._find_text_channel(guild, channel_name)
             if not ch:
@@ -375,12 +341,15 @@ class StageProgressAnnouncer(commands.Cog):
             if ch:
                 try:
                     emb = self._public_embed(team, stage, thumb_iso)
-                    role = self._get_team_role(guild, team)
+                    role = self._get_team_role(guild, team, country_roles)
                     content = role.mention if role else None
-                    await ch.send(
+                    get_outbound_scheduler(self.bot).enqueue_channel(
+                        ch.id,
                         content=content,
                         embed=emb,
-                        allowed_mentions=discord.AllowedMentions(roles=True)
+                        key=f"{batch}:public",
+                        batch=batch,
+                        mention_roles=True,
                     )
                 except Exception:
                     pass
@@ -388,9 +357,10 @@ class StageProgressAnnouncer(commands.Cog):
             if owner_ids:
                 dm_emb = self._dm_embed(team, stage, thumb_iso)
                 for uid in owner_ids:
-                    await self._dm_user_embed(uid, dm_emb)
+                    self._dm_user_embed(uid, dm_emb, key=f"{batch}:{uid}", batch=batch)
 
-        compact_command_queue(
+        await store.run(
+            compact_command_queue,
             self.queue_path,
             [self.state_path, self.commands_state_path, self.fanzone_state_path],
         )
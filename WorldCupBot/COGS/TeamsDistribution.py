@@ -1,4 +1,3 @@
-import json
 import random
 from pathlib import Path
 import discord
@@ -8,6 +7,9 @@ import logging
 from COGS.role_utils import (
     check_root_interaction, check_referee_interaction, has_referee
 )
+import ownership_index
+from guild_ops import PROGRESS_EVERY, BulkExecutor, plan_role_grants, role_grant_ops
+from json_store import store
 
 BASE_DIR = Path(__file__).resolve().parents[1]
 JSON_DIR = BASE_DIR / "JSON"
@@ -19,15 +21,14 @@ COUNTRY_GROUP_LINKS_FILE = JSON_DIR / "country_group_links.json"
 
 log = logging.getLogger(__name__)
 
-def load_json(path):
-    if not path.exists():
-        return {} if path.name.endswith(".json") else []
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+async def load_json(path):
+    return await store.read(path, {} if path.name.endswith(".json") else [])
 
-def save_json(path, data):
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4)
+async def save_json(path, data):
+    return await store.write(path, data)
+
+def read_players_blocking(path):
+    return store.read_blocking(path, {})
 
 def flag_url(team, iso_mapping):
     iso = iso_mapping.get(team)
@@ -98,7 +99,10 @@ def calculate_teams_left(players, teams):
 class TeamsDistribution(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.iso_mapping = load_json(ISO_FILE)
+        self.iso_mapping = {}
+
+    async def cog_load(self):
+        self.iso_mapping = await load_json(ISO_FILE)
 
     async def sync_member_pool_roles(
         self,
@@ -173,7 +177,7 @@ class TeamsDistribution(commands.Cog):
                     countryroles[country]["role_id"] = role.id
                 else:
                     countryroles[country] = role.id
-                save_json(COUNTRYROLES_FILE, countryroles)
+                await save_json(COUNTRYROLES_FILE, countryroles)
             except Exception:
                 role = None
         elif role:
@@ -181,7 +185,7 @@ class TeamsDistribution(commands.Cog):
                 countryroles[country]["role_id"] = role.id
             else:
                 countryroles[country] = role.id
-            save_json(COUNTRYROLES_FILE, countryroles)
+            await save_json(COUNTRYROLES_FILE, countryroles)
         return role
 
     async def get_existing_country_role(self, guild, country, existing_roles, countryroles):
@@ -213,13 +217,60 @@ class TeamsDistribution(commands.Cog):
         if not guild or not country:
             return None
 
-        country_group_links = load_json(COUNTRY_GROUP_LINKS_FILE)
+        country_group_links = await load_json(COUNTRY_GROUP_LINKS_FILE)
         link = country_group_links.get(country, {}) if isinstance(country_group_links, dict) else {}
         group_role_id = link.get("group_role_id") if isinstance(link, dict) else None
         if group_role_id:
             return guild.get_role(int(group_role_id))
         return None
 
+    async def desired_owner_roles(self, guild, players) -> dict[int, set[int]]:
+        """Map each owner id to the country/group role ids they should hold.
+
+        Country and group links are loaded once per call rather than per
+        entry, and only already-provisioned roles are considered.
+        """
+        countryroles = await load_json(COUNTRYROLES_FILE)
+        country_group_links = await load_json(COUNTRY_GROUP_LINKS_FILE)
+        if not isinstance(country_group_links, dict):
+            country_group_links = {}
+        existing_roles = {role.name: role for role in guild.roles}
+
+        desired: dict[int, set[int]] = {}
+        for pdata in players.values():
+            for entry in pdata.get("teams", []):
+                if not isinstance(entry, dict):
+                    continue
+                country = entry.get("team")
+                ownership = entry.get("ownership") or {}
+                owner_ids = set()
+                main_owner = ownership.get("main_owner")
+                if main_owner:
+                    owner_ids.add(int(main_owner))
+                for split_uid in ownership.get("split_with", []):
+                    owner_ids.add(int(split_uid))
+                if not country or not owner_ids:
+                    continue
+
+                role_ids = set()
+                country_role = existing_roles.get(country)
+                stored = countryroles.get(country)
+                stored_role_id = stored.get("role_id") if isinstance(stored, dict) else stored
+                if not country_role and stored_role_id:
+                    country_role = guild.get_role(int(stored_role_id))
+                if country_role:
+                    role_ids.add(country_role.id)
+                link = country_group_links.get(country)
+                group_role_id = link.get("group_role_id") if isinstance(link, dict) else None
+                if group_role_id and guild.get_role(int(group_role_id)):
+                    role_ids.add(int(group_role_id))
+                if not role_ids:
+                    continue
+
+                for owner_id in owner_ids:
+                    desired.setdefault(owner_id, set()).update(role_ids)
+        return desired
+
     async def notify_admin_general(
         self,
         guild: discord.Guild | None,
@@ -255,14 +306,14 @@ class TeamsDistribution(commands.Cog):
 
         await interaction.response.defer(ephemeral=True)
 
-        players = load_json(PLAYERS_FILE)
-        teams = load_json(TEAMS_FILE)
+        players = await load_json(PLAYERS_FILE)
+        teams = await load_json(TEAMS_FILE)
         if str(user.id) not in players:
             players[str(user.id)] = {"username": user.name, "teams": []}
 
         players[str(user.id)]["teams"].append({"pending": True})
 
-        save_json(PLAYERS_FILE, players)
+        await save_json(PLAYERS_FILE, players)
 
         guild = interaction.guild
         await self.sync_member_pool_roles(guild, user, interaction.user)
@@ -349,19 +400,11 @@ class TeamsDistribution(commands.Cog):
 
         await interaction.response.defer(ephemeral=True)
 
-        players = load_json(PLAYERS_FILE)
-        teams = load_json(TEAMS_FILE)
-
-        assigned_teams = set()
-        for pdata in players.values():
-            for entry in pdata.get("teams", []):
-                if isinstance(entry, dict):
-                    team = entry.get("team")
-                    if team:
-                        assigned_teams.add(team)
-                elif entry:
-                    assigned_teams.add(entry)
+        players, loaded = await store.run(ownership_index.read, PLAYERS_FILE, read_players_blocking)
+        index = await store.run(ownership_index.current, PLAYERS_FILE, players, loaded)
+        teams = await load_json(TEAMS_FILE)
 
+        assigned_teams = index.assigned_teams()
         unassigned_teams = [team for team in teams if team not in assigned_teams]
         pending_entries = []
         for pid, pdata in players.items():
@@ -383,7 +426,8 @@ class TeamsDistribution(commands.Cog):
             return
 
         random.shuffle(unassigned_teams)
-        for (pid, _pdata, entry), team in zip(pending_entries, unassigned_teams):
+        assignments = list(zip(pending_entries, unassigned_teams))
+        for (pid, _pdata, entry), team in assignments:
             entry.clear()
             entry.update({
                 "team": team,
@@ -393,7 +437,15 @@ class TeamsDistribution(commands.Cog):
                 }
             })
 
-        save_json(PLAYERS_FILE, players)
+        written = await save_json(PLAYERS_FILE, players)
+        ownership_index.update(
+            PLAYERS_FILE, players,
+            [team for _, team in assignments],
+            [pid for (pid, _pdata, _entry), _team in assignments],
+            base=index,
+            loaded=loaded,
+            written=written,
+        )
 
         await interaction.followup.send(
             f"Assigned teams to {len(pending_entries)} pending entry(ies).", ephemeral=True
@@ -440,7 +492,7 @@ class TeamsDistribution(commands.Cog):
 
         await interaction.response.defer(ephemeral=True)
 
-        players = load_json(PLAYERS_FILE)
+        players = await load_json(PLAYERS_FILE)
         guild = interaction.guild
         should_send_channel = target.value == "channel"
         should_send_dm = target.value == "dms"
@@ -463,7 +515,7 @@ class TeamsDistribution(commands.Cog):
 
         bot_avatar = self.bot.user.display_avatar.url if self.bot.user else None
         existing_roles = {role.name: role for role in guild.roles} if guild else {}
-        countryroles = load_json(COUNTRYROLES_FILE)
+        countryroles = await load_json(COUNTRYROLES_FILE)
 
         # Collect main ownership per team (alphabetical)
         alphabetical_assignments = []
@@ -559,7 +611,7 @@ class TeamsDistribution(commands.Cog):
                 except Exception:
                     pass
 
-        save_json(PLAYERS_FILE, players)
+        await save_json(PLAYERS_FILE, players)
 
         if target.value == "channel":
             result_message = "All assignments have been announced in #players-and-teams (alphabetical order)."
@@ -587,43 +639,35 @@ class TeamsDistribution(commands.Cog):
 
         await interaction.response.defer(ephemeral=True)
         guild = interaction.guild
-        players = load_json(PLAYERS_FILE)
-        countryroles = load_json(COUNTRYROLES_FILE)
-        existing_roles = {role.name: role for role in guild.roles}
-        applied = 0
-
-        for pid, pdata in players.items():
-            for entry in pdata.get("teams", []):
-                if not isinstance(entry, dict):
-                    continue
-                country = entry.get("team")
-                ownership = entry.get("ownership") or {}
-                owner_ids = set()
-                main_owner = ownership.get("main_owner")
-                if main_owner:
-                    owner_ids.add(int(main_owner))
-                for split_uid in ownership.get("split_with", []):
-                    owner_ids.add(int(split_uid))
-
-                if not country or not owner_ids:
-                    continue
-
-                country_role = await self.get_existing_country_role(guild, country, existing_roles, countryroles)
-                group_role = await self.get_group_role_for_country(guild, country)
-                if not country_role and not group_role:
-                    continue
+        players = await load_json(PLAYERS_FILE)
+        desired = await self.desired_owner_roles(guild, players)
+
+        # Diff against the gateway cache first so an already-correct guild
+        # makes no role API calls at all.
+        missing = plan_role_grants(guild, desired)
+        ops = role_grant_ops(guild, missing, "World Cup role assignment retry")
+        on_progress = None
+        if len(ops) > PROGRESS_EVERY:
+            # Large runs take a while under rate limits; keep one ephemeral
+            # status message up to date instead of leaving the referee waiting.
+            status = await interaction.followup.send(
+                f"Assigning roles: 0/{len(ops)} member(s) done...", ephemeral=True, wait=True
+            )
 
-                for owner_id in owner_ids:
-                    member = guild.get_member(owner_id)
-                    if not member:
-                        continue
-                    try:
-                        roles_to_add = [r for r in (country_role, group_role) if r and r not in member.roles]
-                        if roles_to_add:
-                            await member.add_roles(*roles_to_add, reason="World Cup role assignment retry")
-                            applied += len(roles_to_add)
-                    except Exception:
-                        continue
+            async def on_progress(done, total):
+                if done < total:
+                    await status.edit(content=f"Assigning roles: {done}/{total} member(s) done...")
+
+        executor = BulkExecutor(f"assignroles:{guild.id}")
+        result = await executor.run(ops, on_progress=on_progress)
+        applied = result["applied"]
+        log.info(
+            "Role assignment finished (actor_id=%s owners=%s granted=%s failed=%s)",
+            interaction.user.id,
+            len(desired),
+            result["applied"],
+            result["failed"],
+        )
 
         await interaction.followup.send(
             f"Role assignment complete. Added {applied} role grant(s).",
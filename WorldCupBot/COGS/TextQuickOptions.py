@@ -5,7 +5,8 @@ from typing import Any
 
 from discord.ext import commands
 
-from match_events import sort_match_events
+from json_store import store
+import match_timeline
 from stage_constants import STAGE_ALLOWED, normalize_stage, stage_rank
 
 
@@ -43,22 +44,17 @@ class TextQuickOptions(commands.Cog):
         os.makedirs(self.json_dir, exist_ok=True)
         self.commands_path = os.path.join(self.json_dir, "bot_commands.jsonl")
         self.matches_path = os.path.join(self.json_dir, "matches.json")
+        self.timelines_dir = os.path.join(self.json_dir, "match_timelines")
         self.team_stage_path = os.path.join(self.json_dir, "team_stage.json")
         self.settings_path = os.path.join(self.json_dir, "admin_settings.json")
 
+    # The helpers below block; commands call them through ``store.run`` so the
+    # file I/O happens on the storage pool, never on the event loop.
     def _read_json(self, path: str, default: Any):
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception:
-            return default
+        return store.read_blocking(path, default)
 
     def _write_json_atomic(self, path: str, data: Any) -> None:
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        tmp_path = f"{path}.tmp"
-        with open(tmp_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        os.replace(tmp_path, path)
+        store.write_blocking(path, data)
 
     def _enqueue_command(self, kind: str, data: dict) -> None:
         os.makedirs(os.path.dirname(self.commands_path), exist_ok=True)
@@ -181,12 +177,6 @@ class TextQuickOptions(commands.Cog):
         group = str(fixture.get("group") or "").strip().lower()
         return f"group-{group}" if group else "fanzone"
 
-    def _score_from_live_stats(self, fixture: dict, home: str, away: str) -> tuple[int, int]:
-        stats = fixture.get("live_stats") if isinstance(fixture.get("live_stats"), list) else []
-        home_score = sum(1 for stat in stats if stat.get("event_type") == "goal" and stat.get("country") == home)
-        away_score = sum(1 for stat in stats if stat.get("event_type") == "goal" and stat.get("country") == away)
-        return home_score, away_score
-
     def _fixture_score(self, fixture: dict) -> tuple[int | None, int | None]:
         """Read a completed fixture score without guessing from live events.
 
@@ -224,6 +214,48 @@ class TextQuickOptions(commands.Cog):
     async def _ack(self, ctx: commands.Context, message: str) -> None:
         await ctx.send(message, delete_after=12)
 
+    def _record_event(
+        self,
+        fixture: dict,
+        fixtures: list,
+        container: Any,
+        key: str,
+        event_key: str,
+        country: str,
+        match_time: str,
+    ) -> tuple[str, int, int] | None:
+        """Append one event to the fixture's timeline; None when there is no goal to disallow."""
+        home = str(fixture.get("home") or fixture.get("home_team") or "").strip()
+        away = str(fixture.get("away") or fixture.get("away_team") or "").strip()
+        fixture_id = self._fixture_id(fixture)
+        timeline = match_timeline.seed(self.timelines_dir, fixture_id, fixture.get("live_stats"))
+        event = {
+            "event_type": event_key,
+            "label": EVENT_LABELS[event_key],
+            "country": country,
+            "match_time": match_time,
+            "ts": int(time.time()),
+        }
+        if event_key == "disallowed_goal":
+            # Disallowing a goal reverses the latest matching goal event while
+            # retaining a separate audit-style timeline entry for Discord.
+            goal = timeline.latest("goal", country)
+            if goal is None:
+                return None
+            event["voids"] = goal.get("id")
+
+        preview = timeline.extended([event])
+        home_score, away_score = preview.goals(home), preview.goals(away)
+        event["message"] = f"{home} {home_score} - {away_score} {away}"
+        timeline = match_timeline.append(self.timelines_dir, fixture_id, event)
+        live_score = timeline.score(home, away)
+        # matches.json only carries the running score; rewrite it when that changes.
+        if "live_stats" in fixture or fixture.get("live_score") != live_score:
+            fixture.pop("live_stats", None)
+            fixture["live_score"] = live_score
+            self._save_fixtures(fixtures, container, key)
+        return event["message"], home_score, away_score
+
     async def _queue_event_for_fixture(
         self,
         ctx: commands.Context,
@@ -246,41 +278,14 @@ class TextQuickOptions(commands.Cog):
             country = ""
             match_time = ""
 
-        live_stats = fixture.get("live_stats") if isinstance(fixture.get("live_stats"), list) else []
-        if event_key == "disallowed_goal":
-            # Disallowing a goal reverses the latest matching goal event while
-            # retaining a separate audit-style timeline entry for Discord.
-            removed_goal = False
-            for idx in range(len(live_stats) - 1, -1, -1):
-                stat = live_stats[idx]
-                if (
-                    isinstance(stat, dict)
-                    and stat.get("event_type") == "goal"
-                    and stat.get("country") == country
-                ):
-                    del live_stats[idx]
-                    removed_goal = True
-                    break
-            if not removed_goal:
-                await self._ack(ctx, f"No goal found to disallow for `{country}`.")
-                return
-
-        home_score, away_score = self._score_from_live_stats(fixture, home, away)
-        if event_key == "goal":
-            home_score += 1 if country == home else 0
-            away_score += 1 if country == away else 0
-        message = f"{home} {home_score} - {away_score} {away}"
-        live_stats.append({
-            "event_type": event_key,
-            "label": EVENT_LABELS[event_key],
-            "message": message,
-            "country": country,
-            "match_time": match_time,
-            "ts": int(time.time()),
-        })
-        fixture["live_stats"] = sort_match_events(live_stats)[-100:]
-        self._save_fixtures(fixtures, container, key)
-        self._enqueue_command("quick_match_announcement", {
+        recorded = await store.run(
+            self._record_event, fixture, fixtures, container, key, event_key, country, match_time
+        )
+        if recorded is None:
+            await self._ack(ctx, f"No goal found to disallow for `{country}`.")
+            return
+        message, home_score, away_score = recorded
+        await store.run(self._enqueue_command, "quick_match_announcement", {
             "fixture_id": self._fixture_id(fixture),
             "home": home,
             "away": away,
@@ -292,7 +297,6 @@ class TextQuickOptions(commands.Cog):
             "away_score": away_score,
             "country": country if event_key not in MATCH_STATE_EVENTS else "",
             "channel": self._fixture_channel(fixture),
-            "live_stats": fixture["live_stats"],
         })
         await self._ack(ctx, f"Queued {EVENT_LABELS[event_key]} for {home} vs {away}.")
 
@@ -318,7 +322,6 @@ class TextQuickOptions(commands.Cog):
             "away_score": away_score,
             "winner_side": side,
             "channel": self._fixture_channel(fixture),
-            "live_stats": fixture.get("live_stats") if isinstance(fixture.get("live_stats"), list) else [],
         }
         if corrected:
             data["corrected"] = True
@@ -335,7 +338,7 @@ class TextQuickOptions(commands.Cog):
             await self._ack(ctx, "Invalid event. Use goal, disallowed_goal, penalty, var_decision, yellow_card, red_card, half_time, extra_time, extra_time_half_time, extra_time_full_time, or extra_time_penalties.")
             return
 
-        fixture, fixtures, container, key = self._find_fixture(match_id)
+        fixture, fixtures, container, key = await store.run(self._find_fixture, match_id)
         if not fixture:
             await self._ack(ctx, f"No fixture found for `{match_id}`.")
             return
@@ -343,7 +346,7 @@ class TextQuickOptions(commands.Cog):
 
     async def _simple_channel_event(self, ctx: commands.Context, event_key: str, details: str = "") -> None:
         await self._delete_command_message(ctx)
-        fixture, fixtures, container, key, error = self._resolve_channel_fixture(ctx)
+        fixture, fixtures, container, key, error = await store.run(self._resolve_channel_fixture, ctx)
         if error:
             await self._ack(ctx, error)
             return
@@ -424,17 +427,22 @@ class TextQuickOptions(commands.Cog):
         if next_stage not in STAGE_ALLOWED:
             await self._ack(ctx, "Invalid stage name.")
             return
-        data = self._read_json(self.team_stage_path, {})
-        if not isinstance(data, dict):
-            data = {}
-        prev_stage = normalize_stage(data.get(team)) or "Group Stage"
-        data[team] = next_stage
-        self._write_json_atomic(self.team_stage_path, data)
+        stages = {}
+
+        def set_stage(data):
+            if not isinstance(data, dict):
+                data = {}
+            stages["previous"] = data.get(team)
+            data[team] = next_stage
+            return data
+
+        await store.update(self.team_stage_path, set_stage, {})
+        prev_stage = normalize_stage(stages.get("previous")) or "Group Stage"
         progressed = stage_rank(next_stage) > stage_rank(prev_stage) >= 0
         eliminated = next_stage == "Eliminated" and prev_stage != "Eliminated"
         if progressed or eliminated:
-            settings = self._read_json(self.settings_path, {})
-            self._enqueue_command("team_stage_progress", {"team": team, "stage": next_stage, "previous_stage": prev_stage, "owner_ids": [], "channel": str(settings.get("STAGE_ANNOUNCE_CHANNEL") or "announcements")})
+            settings = await store.read(self.settings_path, {}, copy=False)
+            await store.run(self._enqueue_command, "team_stage_progress", {"team": team, "stage": next_stage, "previous_stage": prev_stage, "owner_ids": [], "channel": str(settings.get("STAGE_ANNOUNCE_CHANNEL") or "announcements")})
         await self._ack(ctx, f"Updated {team} to {next_stage}.")
 
     @commands.command(name="fulltime", aliases=["resultquick", "matchresult"])
@@ -442,7 +450,7 @@ class TextQuickOptions(commands.Cog):
     async def full_time(self, ctx: commands.Context, match_id: str, home_score: int, away_score: int, winner_side: str = ""):
         """Post the full-time result: wc fulltime <match_id> <home_score> <away_score> [home|away|draw]."""
         await self._delete_command_message(ctx)
-        fixture, fixtures, container, key = self._find_fixture(match_id)
+        fixture, fixtures, container, key = await store.run(self._find_fixture, match_id)
         if not fixture:
             await self._ack(ctx, f"No fixture found for `{match_id}`.")
             return
@@ -462,8 +470,8 @@ class TextQuickOptions(commands.Cog):
         fixture["away_score"] = away_score
         fixture["winner_side"] = side
         fixture["status"] = "completed"
-        self._save_fixtures(fixtures, container, key)
-        queued, message = self._queue_fixture_result_embed(fixture)
+        await store.run(self._save_fixtures, fixtures, container, key)
+        queued, message = await store.run(self._queue_fixture_result_embed, fixture)
         await self._ack(ctx, message if queued else f"Saved result, but {message}")
 
     @commands.command(name="remakeembed", aliases=["remake", "remakeresult", "repostresult", "lastresult"])
@@ -477,12 +485,12 @@ class TextQuickOptions(commands.Cog):
         not recalculate scores, resettle picks, or DM owners.
         """
         await self._delete_command_message(ctx)
-        fixture, fixtures, container, key, error = self._resolve_last_completed_channel_fixture(ctx)
+        fixture, fixtures, container, key, error = await store.run(self._resolve_last_completed_channel_fixture, ctx)
         if error:
             await self._ack(ctx, error)
             return
 
-        queued, message = self._queue_fixture_result_embed(fixture)
+        queued, message = await store.run(self._queue_fixture_result_embed, fixture)
         await self._ack(ctx, message if queued else message)
 
 
@@ -2,14 +2,14 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import aiohttp
-import json
-import os
 import time
 import random
 import string
-import re
 from pathlib import Path
 
+from json_store import store
+from member_index import get_member_index
+
 SPECTATORS_ROLE_ID = 1388690743782146178
 UNVERIFIED_ROLE_ID = 1394431170707456111
 
@@ -18,23 +18,11 @@ VERIFIED_PATH = str(BASE_DIR / "JSON" / "verified.json")
 VERIFICATION_CODES_PATH = str(BASE_DIR / "JSON" / "verification_codes.json")
 VERIFICATION_LOG_CHANNEL_ID = 1394481766739218554
 
-def ensure_json_file(path, default):
-    if not os.path.exists(path):
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(path, "w") as f:
-            json.dump(default, f, indent=4)
-    try:
-        with open(path, "r") as f:
-            return json.load(f)
-    except Exception:
-        with open(path, "w") as f:
-            json.dump(default, f, indent=4)
-        return default
-
-def save_json_file(path, data):
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w") as f:
-        json.dump(data, f, indent=4)
+async def ensure_json_file(path, default):
+    return await store.ensure(path, default)
+
+async def save_json_file(path, data):
+    await store.write(path, data)
 
 def generate_code(length=5):
     return ''.join(random.choices(string.ascii_letters + string.digits, k=length))
@@ -42,12 +30,16 @@ def generate_code(length=5):
 class SpectatorVerify(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.verification_data = ensure_json_file(VERIFICATION_CODES_PATH, {"verification_data": {}})
-        self.verified_data = ensure_json_file(VERIFIED_PATH, {"verified_users": []})
+        self.verification_data = {"verification_data": {}}
+        self.verified_data = {"verified_users": []}
 
-    def save_all(self):
-        save_json_file(VERIFICATION_CODES_PATH, self.verification_data)
-        save_json_file(VERIFIED_PATH, self.verified_data)
+    async def cog_load(self):
+        self.verification_data = await ensure_json_file(VERIFICATION_CODES_PATH, {"verification_data": {}})
+        self.verified_data = await ensure_json_file(VERIFIED_PATH, {"verified_users": []})
+
+    async def save_all(self):
+        await save_json_file(VERIFICATION_CODES_PATH, self.verification_data)
+        await save_json_file(VERIFIED_PATH, self.verified_data)
 
     def _build_avatar_url(self, user: discord.abc.User) -> str:
         """Build a stable avatar URL for the verified record."""
@@ -56,6 +48,15 @@ class SpectatorVerify(commands.Cog):
             return f"https://cdn.discordapp.com/avatars/{user.id}/{avatar_hash}.png?size=256"
         return f"https://cdn.discordapp.com/embed/avatars/{user.id % 5}.png"
 
+    def _member_candidates(self, guild: discord.Guild, username: str, limit: int = 5):
+        """Return ranked (match_kind, member) pairs for a free-form username.
+
+        Lookups go through the shared member index, so display names, global
+        names, account names and legacy name#discriminator tags resolve without
+        scanning every guild member.
+        """
+        return get_member_index(self.bot).find(guild, username, limit=limit)
+
     def _find_member_by_username(self, guild: discord.Guild, username: str):
         """
         Resolve a guild member from a free-form username.
@@ -64,47 +65,8 @@ class SpectatorVerify(commands.Cog):
         account name, and legacy name#discriminator) so staff can verify people
         quickly even when they do not have a mention or user ID handy.
         """
-        needle = (username or "").strip()
-        if not needle:
-            return None
-
-        # Staff often copy a Discord mention into the command. Prefix commands
-        # receive mentions as raw text, so resolve <@123>, <@!123>, and bare IDs
-        # before falling back to username matching.
-        mention_match = re.fullmatch(r"<@!?(\d+)>", needle)
-        member_id = int(mention_match.group(1)) if mention_match else (int(needle) if needle.isdigit() else None)
-        if member_id is not None:
-            member = guild.get_member(member_id) if hasattr(guild, "get_member") else None
-            if member is not None:
-                return member
-            for member in guild.members:
-                if member.id == member_id:
-                    return member
-
-        needle = needle.lower()
-
-        # Exact match first to avoid ambiguity when there are similar names.
-        for member in guild.members:
-            candidates = {
-                (member.display_name or "").strip().lower(),
-                (member.name or "").strip().lower(),
-                (member.global_name or "").strip().lower(),
-                (str(member) or "").strip().lower(),
-            }
-            if needle in candidates:
-                return member
-
-        # Fallback to partial match for moderator convenience.
-        for member in guild.members:
-            candidates = [
-                (member.display_name or "").strip().lower(),
-                (member.name or "").strip().lower(),
-                (member.global_name or "").strip().lower(),
-                (str(member) or "").strip().lower(),
-            ]
-            if any(needle in c for c in candidates if c):
-                return member
-        return None
+        candidates = self._member_candidates(guild, username, limit=1)
+        return candidates[0][1] if candidates else None
 
     async def _enrich_verified_habbo_name(self, discord_id: str, habbo: str):
         """
@@ -126,7 +88,7 @@ class SpectatorVerify(commands.Cog):
             for entry in self.verified_data.get("verified_users", []):
                 if str(entry.get("discord_id")) == str(discord_id):
                     entry["habbo_name"] = canonical_name
-                    self.save_all()
+                    await self.save_all()
                     return
         except Exception:
             # Network/API issues are non-fatal for force verification.
@@ -209,7 +171,7 @@ class SpectatorVerify(commands.Cog):
                             })
                             if user_id in self.verification_data["verification_data"]:
                                 del self.verification_data["verification_data"][user_id]
-                            self.save_all()
+                            await self.save_all()
                             embed = discord.Embed(
                                 title="Verification Successful",
                                 description=f"Welcome! \n# `{habbo_name}`! \nYou are now a Spectator.",
@@ -251,7 +213,7 @@ class SpectatorVerify(commands.Cog):
             "habbo": habbo,
             "timestamp": time.time()
         }
-        self.save_all()
+        await self.save_all()
         embed = discord.Embed(
             title="Verification Started",
             description=(
@@ -278,13 +240,25 @@ class SpectatorVerify(commands.Cog):
             await ctx.send("❌ This command can only be used inside a server.")
             return
 
-        # Ensure member cache is present before searching by username.
-        await ctx.guild.chunk()
+        # Ensure member cache is present before searching by username. Chunking
+        # adds members without join events, so the name index is rebuilt.
+        if not ctx.guild.chunked:
+            await ctx.guild.chunk()
+            get_member_index(self.bot).invalidate(ctx.guild)
 
-        member = self._find_member_by_username(ctx.guild, username)
-        if member is None:
+        candidates = self._member_candidates(ctx.guild, username)
+        if not candidates:
             await ctx.send(f"❌ I couldn't find a member matching `{username}`.")
             return
+        # Two equally good matches mean the name is ambiguous; list them rather
+        # than force-verifying whoever happened to come first.
+        if len(candidates) > 1 and candidates[0][0] == candidates[1][0]:
+            listed = "\n".join(f"• `{m.display_name}` ({m.name}, `{m.id}`)" for _, m in candidates)
+            await ctx.send(
+                f"⚠️ Several members match `{username}`. Re-run with a mention or ID:\n{listed}"
+            )
+            return
+        member = candidates[0][1]
 
         user_id = str(member.id)
         existing = next(
@@ -309,7 +283,7 @@ class SpectatorVerify(commands.Cog):
             "discord_avatar": self._build_avatar_url(member),
         })
         self.verification_data.get("verification_data", {}).pop(user_id, None)
-        self.save_all()
+        await self.save_all()
 
         if spectators_role and spectators_role not in member.roles:
             try:
@@ -336,7 +310,7 @@ class SpectatorVerify(commands.Cog):
 
     @commands.Cog.listener()
     async def on_member_join(self, member):
-        verified_data = ensure_json_file(VERIFIED_PATH, {"verified_users": []})
+        verified_data = await ensure_json_file(VERIFIED_PATH, {"verified_users": []})
         for entry in verified_data.get("verified_users", []):
             if entry["discord_id"] == str(member.id):
                 # Assign spectator role if not already present
@@ -361,7 +335,7 @@ class SpectatorVerify(commands.Cog):
             return
 
         # Reload the latest file on each change
-        data = ensure_json_file(VERIFIED_PATH, {"verified_users": []})
+        data = await ensure_json_file(VERIFIED_PATH, {"verified_users": []})
 
         user_id = str(after.id)
         updated = False
@@ -386,7 +360,7 @@ class SpectatorVerify(commands.Cog):
                 updated = True
                 break
         if updated:
-            save_json_file(VERIFIED_PATH, data)
+            await save_json_file(VERIFIED_PATH, data)
 
 
 async def setup(bot):
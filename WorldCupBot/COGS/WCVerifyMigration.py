@@ -3,34 +3,21 @@
 
 import discord
 from discord.ext import commands
-import json
-import os
 from pathlib import Path
 
+from json_store import store
+
 BASE_DIR = Path(__file__).resolve().parents[1]
 VERIFIED_PATH = str(BASE_DIR / "JSON" / "verified.json")
 
 
 # ---------- JSON HELPERS ----------
-def ensure_json_file(path, default):
-    if not os.path.exists(path):
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(default, f, indent=4)
-        return default
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(default, f, indent=4)
-        return default
-
-
-def save_json_file(path, data):
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4)
+async def ensure_json_file(path, default):
+    return await store.ensure(path, default)
+
+
+async def save_json_file(path, data):
+    await store.write(path, data)
 
 
 # ---------- DISCORD HELPERS ----------
@@ -71,7 +58,7 @@ class VerifyMigration(commands.Cog):
         # ensure member cache is populated
         await guild.chunk()
 
-        data = ensure_json_file(VERIFIED_PATH, {"verified_users": []})
+        data = await ensure_json_file(VERIFIED_PATH, {"verified_users": []})
         users = data.get("verified_users", [])
         if not isinstance(users, list):
             await ctx.send("❌ verified.json format error.")
@@ -125,7 +112,7 @@ class VerifyMigration(commands.Cog):
 
             updated += 1
 
-        save_json_file(VERIFIED_PATH, data)
+        await save_json_file(VERIFIED_PATH, data)
 
         await ctx.send(
             f"✅ Migration complete!\n"
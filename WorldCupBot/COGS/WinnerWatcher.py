@@ -1,50 +1,60 @@
 import os
-import json
 import time
 from typing import List, Dict, Any, Optional
 import logging
 import discord
 from discord.ext import commands, tasks
 
+from bot_telemetry import timed_loop
+from json_store import store
+import notification_prefs
+from outbound_scheduler import get_outbound_scheduler
+
 log = logging.getLogger(__name__)
 
 # ---------- File helpers ----------
-def _read_json(path: str) -> Any:
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        return {}
-
-def _read_bets() -> List[Dict[str, Any]]:
+def _json_path(*parts: str) -> str:
     base = os.path.dirname(os.path.abspath(__file__))
-    bets_path = os.path.join(base, "..", "JSON", "bets.json")
-    try:
-        with open(os.path.normpath(bets_path), "r", encoding="utf-8") as f:
-            data = json.load(f)
-            return data if isinstance(data, list) else []
-    except Exception:
-        return []
+    return os.path.normpath(os.path.join(base, "..", *parts))
+
+async def _read_json(path: str) -> Any:
+    return await store.read(path, {})
+
+async def _read_bets() -> List[Dict[str, Any]]:
+    data = await store.read(_bets_path(), [])
+    return data if isinstance(data, list) else []
 
 def _bets_path() -> str:
-    base = os.path.dirname(os.path.abspath(__file__))
-    return os.path.normpath(os.path.join(base, "..", "JSON", "bets.json"))
+    return _json_path("JSON", "bets.json")
+
+async def _mark_bets_notified(notified: Dict[str, str]) -> None:
+    """Persist admin_notified flags onto the current bets.json.
+
+    Merged under the store's writer lock rather than writing back the list
+    read at the start of the poll, so a bet claimed meanwhile is kept.
+    """
+    def apply(bets):
+        if not isinstance(bets, list):
+            return bets
+        for bet in bets:
+            bet_id = str(bet.get("bet_id") or "").strip()
+            if bet_id in notified:
+                bet["admin_notified"] = notified[bet_id]
+        return bets
 
-def _write_bets(bets: List[Dict[str, Any]]) -> None:
     try:
-        with open(_bets_path(), "w", encoding="utf-8") as f:
-            json.dump(bets, f, indent=2, ensure_ascii=False)
+        await store.update(_bets_path(), apply, [])
     except Exception:
         return
 
 def _bet_results_path() -> str:
-    base = os.path.dirname(os.path.abspath(__file__))
-    return os.path.normpath(os.path.join(base, "..", "JSON", "bet_results.json"))
+    return _json_path("JSON", "bet_results.json")
 
-def _read_config() -> Dict[str, Any]:
-    base = os.path.dirname(os.path.abspath(__file__))
-    config_path = os.path.join(base, "..", "config.json")
-    cfg = _read_json(os.path.normpath(config_path))
+async def _notification_prefs() -> notification_prefs.PrefsSnapshot:
+    return await store.run(notification_prefs.get, _json_path("JSON", "notification_settings.json"))
+
+async def _read_config() -> Dict[str, Any]:
+    cfg = await _read_json(_json_path("config.json"))
     return cfg if isinstance(cfg, dict) else {}
 
 # ---------- Discord helpers ----------
@@ -209,7 +219,7 @@ def _build_bet_result_embed(bet: Dict[str, Any], msg_url: Optional[str]) -> disc
     embed.timestamp = discord.utils.utcnow()
     return embed
 
-def _append_bet_results(bet: Dict[str, Any]):
+async def _append_bet_results(bet: Dict[str, Any], prefs: notification_prefs.PrefsSnapshot):
     winner = str((bet or {}).get("winner") or "").strip().lower()
     if winner not in ("option1", "option2"):
         return
@@ -222,7 +232,7 @@ def _append_bet_results(bet: Dict[str, Any]):
         return
 
     path = _bet_results_path()
-    data = _read_json(path) or {}
+    data = await _read_json(path) or {}
     if not isinstance(data, dict):
         data = {}
     events = data.get("events")
@@ -236,7 +246,7 @@ def _append_bet_results(bet: Dict[str, Any]):
     wager = str((bet or {}).get("wager") or "-")
 
     def add_event(uid: str, result: str):
-        if not uid:
+        if not uid or not prefs.allows(uid, "bell", "bets"):
             return
         eid = f"bet:{bet_id}:{uid}"
         if eid in existing:
@@ -283,23 +293,23 @@ def _append_bet_results(bet: Dict[str, Any]):
     events.sort(key=lambda x: int((x or {}).get("ts") or 0), reverse=True)
     data["events"] = events[:500]
     try:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        await store.write(path, data)
     except Exception:
         return
 
-async def _dm_bet_result(bot: commands.Bot, user_id: str, bet: Dict[str, Any], msg_url: Optional[str]):
-    try:
-        uid = int(str(user_id))
-    except Exception:
-        return
-    try:
-        user = bot.get_user(uid) or await bot.fetch_user(uid)
-        if not user:
-            return
-        await user.send(embed=_build_bet_result_embed(bet, msg_url))
-    except Exception:
+def _dm_bet_result(bot: commands.Bot, user_id: str, bet: Dict[str, Any], msg_url: Optional[str]):
+    if not str(user_id or "").strip():
         return
+    bet_id = str(bet.get("bet_id") or "").strip()
+    winner = str(bet.get("winner") or "").strip().lower()
+    # Keyed on the settled outcome so a corrected winner DMs again but a
+    # replayed poll after a restart does not.
+    get_outbound_scheduler(bot).enqueue_dm(
+        user_id,
+        embed=_build_bet_result_embed(bet, msg_url),
+        key=f"bet:{bet_id}:{winner}:{user_id}",
+        batch=f"bet:{bet_id}:{winner}",
+    )
 
 # ---------- Channel resolver ----------
 async def _resolve_admin_channel(bot: commands.Bot, pref: Any, admin_category: str) -> Optional[discord.TextChannel]:
@@ -331,7 +341,12 @@ class WinnerWatcher(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self._last_winner: Dict[str, Optional[str]] = {}
-        self._config = _read_config()
+        self._config: Dict[str, Any] = {}
+        self._admin_category = "World Cup Admin"
+        self._admin_bet_channel = "bet-settled"
+
+    async def cog_load(self):
+        self._config = await _read_config()
         self._admin_category = self._config.get("ADMIN_CATEGORY_NAME", "World Cup Admin")
         self._admin_bet_channel = self._config.get("ADMIN_BET_CHANNEL") or "bet-settled"
         self.poll.start()
@@ -340,13 +355,14 @@ class WinnerWatcher(commands.Cog):
         self.poll.cancel()
 
     @tasks.loop(seconds=30)
+    @timed_loop("WinnerWatcher.poll")
     async def poll(self):
-        bets = _read_bets()
+        bets = await _read_bets()
         if not isinstance(bets, list):
             log.warning("bets.json malformed or empty")
             return
 
-        bets_changed = False
+        notified: Dict[str, str] = {}
 
         for bet in bets:
             bet_id = str(bet.get("bet_id") or "").strip()
@@ -415,21 +431,23 @@ class WinnerWatcher(commands.Cog):
                 else:
                     log.warning("Admin bet channel not found (bet_id=%s)", bet_id)
 
-            opt1_id = str(bet.get("option1_user_id") or "").strip()
-            opt2_id = str(bet.get("option2_user_id") or "").strip()
-            await _dm_bet_result(self.bot, opt1_id, bet, msg_url)
-            await _dm_bet_result(self.bot, opt2_id, bet, msg_url)
+            prefs = await _notification_prefs()
+            dm_ids = prefs.filter(
+                [bet.get("option1_user_id"), bet.get("option2_user_id")], "dms", "bets"
+            )
+            for uid in dm_ids:
+                _dm_bet_result(self.bot, uid, bet, msg_url)
 
-            _append_bet_results(bet)
+            await _append_bet_results(bet, prefs)
 
             # Mark the exact winning option as processed so later polls and bot
             # restarts do not fetch, edit, notify, or DM for it again.
             bet["admin_notified"] = winner
-            bets_changed = True
+            notified[bet_id] = winner
             self._last_winner[bet_id] = winner
 
-        if bets_changed:
-            _write_bets(bets)
+        if notified:
+            await _mark_bets_notified(notified)
 
     @poll.before_loop
     async def before_poll(self):
@@ -0,0 +1,314 @@
+"""Incremental, content-addressed backups of the JSON/ directory.
+
+Layout under BACKUPS/:
+
+    blobs/<aa>/<sha256>.gz    gzip-compressed file contents, stored once
+    manifests/<name>.json     {"name", "created", "files": {rel: {sha256, size}}}
+    hash_cache.json           rel -> [mtime_ns, size, sha256] for change detection
+
+A snapshot only hashes files whose mtime/size changed since the previous one
+and only writes blobs that are not already stored, so an hourly snapshot of a
+mostly idle JSON/ directory costs a few stat() calls and one small manifest.
+Legacy ``*.zip`` backups in the same folder stay listable, downloadable and
+restorable. Blobs hold the files exactly as stored (compact); zip exports
+pretty-print the JSON documents for people reading them.
+"""
+import datetime
+import gzip
+import hashlib
+import io
+import logging
+import os
+import shutil
+import threading
+import time
+import zipfile
+
+import change_log
+import json_codec
+
+log = logging.getLogger("launcher")
+
+BLOBS_DIR = "blobs"
+MANIFESTS_DIR = "manifests"
+HASH_CACHE_FILE = "hash_cache.json"
+# Reads of a file that keeps changing underneath a snapshot before it is skipped.
+READ_ATTEMPTS = 3
+
+# Snapshots, restores and pruning share one lock so they never interleave.
+_lock = threading.RLock()
+
+
+def exclusive() -> threading.RLock:
+    """The snapshot lock, for callers taking a snapshot in a worker process.
+
+    A process pool worker has its own copy of this module, so the launcher
+    holds the lock around the call to keep scheduled snapshots and pruning out.
+    """
+    return _lock
+
+
+def _ensure_dir(path: str) -> str:
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _blob_path(backup_dir: str, digest: str) -> str:
+    return os.path.join(backup_dir, BLOBS_DIR, digest[:2], f"{digest}.gz")
+
+
+def _manifest_path(backup_dir: str, name: str) -> str:
+    return os.path.join(backup_dir, MANIFESTS_DIR, f"{name}.json")
+
+
+def _read_json(path: str, default):
+    try:
+        return json_codec.read_file(path)[0]
+    except Exception:
+        return default
+
+
+def _write_json_atomic(path: str, data) -> None:
+    json_codec.write_file(path, data)
+
+
+def _pretty(rel: str, raw: bytes) -> bytes:
+    if not rel.lower().endswith(".json"):
+        return raw
+    try:
+        return json_codec.dumps(json_codec.loads(raw), pretty=True)
+    except ValueError:
+        return raw
+
+
+def _stat_key(st: os.stat_result) -> tuple[int, int, int]:
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+def _read_stable(path: str) -> tuple[bytes, os.stat_result] | None:
+    """Read ``path`` once, retrying if it is replaced or rewritten mid-read.
+
+    The bot and the launcher keep writing JSON/ while a snapshot runs; the
+    bytes returned are the ones hashed and stored, so they must be a single
+    version of the file. Returns None if the file vanished or never settled.
+    """
+    for _ in range(READ_ATTEMPTS):
+        try:
+            before = os.stat(path)
+            with open(path, "rb") as f:
+                data = f.read()
+            after = os.stat(path)
+        except OSError:
+            return None
+        if _stat_key(before) == _stat_key(after) and len(data) == after.st_size:
+            return data, after
+    return None
+
+
+def _safe_name(name: str) -> bool:
+    return bool(name) and os.path.basename(name) == name and not name.startswith(".")
+
+
+def _unique_name(backup_dir: str, timestamp: str) -> str:
+    name = timestamp
+    suffix = 1
+    while os.path.exists(_manifest_path(backup_dir, name)) or os.path.exists(os.path.join(backup_dir, f"{name}.zip")):
+        name = f"{timestamp}_{suffix:02d}"
+        suffix += 1
+    return name
+
+
+def create_snapshot(json_dir: str, backup_dir: str) -> str:
+    """Snapshot JSON/ into content-addressed blobs and return the manifest name."""
+    with _lock:
+        _ensure_dir(os.path.join(backup_dir, MANIFESTS_DIR))
+        cache_path = os.path.join(backup_dir, HASH_CACHE_FILE)
+        cache = _read_json(cache_path, {})
+        if not isinstance(cache, dict):
+            cache = {}
+
+        files = {}
+        new_cache = {}
+        written = 0
+        if os.path.isdir(json_dir):
+            for root, _, names in os.walk(json_dir):
+                for fn in names:
+                    if fn.endswith(".tmp") or fn in change_log.FILES:
+                        continue
+                    fp = os.path.join(root, fn)
+                    rel = os.path.relpath(fp, json_dir).replace(os.sep, "/")
+                    try:
+                        st = os.stat(fp)
+                    except OSError:
+                        continue
+                    cached = cache.get(rel)
+                    digest = None
+                    if isinstance(cached, list) and len(cached) == 3 and cached[:2] == [st.st_mtime_ns, st.st_size]:
+                        digest = cached[2]
+                    if digest is None or not os.path.isfile(_blob_path(backup_dir, digest)):
+                        # Hash and store the same bytes, so a blob always matches its name.
+                        read = _read_stable(fp)
+                        if read is None:
+                            log.warning("Backup skipped a file that kept changing: %s", rel)
+                            continue
+                        data, st = read
+                        digest = hashlib.sha256(data).hexdigest()
+                        blob = _blob_path(backup_dir, digest)
+                        if not os.path.isfile(blob):
+                            _ensure_dir(os.path.dirname(blob))
+                            tmp = f"{blob}.tmp"
+                            with open(tmp, "wb") as dst:
+                                dst.write(gzip.compress(data, compresslevel=6))
+                            os.replace(tmp, blob)
+                            written += 1
+                    files[rel] = {"sha256": digest, "size": st.st_size}
+                    new_cache[rel] = [st.st_mtime_ns, st.st_size, digest]
+
+        name = _unique_name(backup_dir, datetime.datetime.now().strftime("%d-%m_%H-%M-%S"))
+        manifest = {"name": name, "created": time.time(), "files": files}
+        _write_json_atomic(_manifest_path(backup_dir, name), manifest)
+        _write_json_atomic(cache_path, new_cache)
+        log.info("Backup snapshot created (name=%s files=%s new_blobs=%s)", name, len(files), written)
+        return name
+
+
+def list_snapshots(backup_dir: str) -> list[dict]:
+    """Return manifests and legacy zips, newest first, in the API's listing shape."""
+    out = []
+    mdir = os.path.join(backup_dir, MANIFESTS_DIR)
+    if os.path.isdir(mdir):
+        for fn in os.listdir(mdir):
+            if not fn.endswith(".json"):
+                continue
+            manifest = _read_json(os.path.join(mdir, fn), None)
+            if not isinstance(manifest, dict):
+                continue
+            name = fn[:-5]
+            files = manifest.get("files") or {}
+            created = float(manifest.get("created") or os.path.getmtime(os.path.join(mdir, fn)))
+            out.append({
+                "name": name,
+                "title": name,
+                "size": sum(int((f or {}).get("size") or 0) for f in files.values()),
+                "ts": int(created),
+                "rel": name,
+                "kind": "snapshot",
+                "_created": created,
+            })
+    if os.path.isdir(backup_dir):
+        for fn in os.listdir(backup_dir):
+            fp = os.path.join(backup_dir, fn)
+            if fn.lower().endswith(".zip") and os.path.isfile(fp):
+                mtime = os.path.getmtime(fp)
+                out.append({
+                    "name": fn,
+                    "title": fn,
+                    "size": os.path.getsize(fp),
+                    "ts": int(mtime),
+                    "rel": fn,
+                    "kind": "zip",
+                    "_created": mtime,
+                })
+    # Sort on the sub-second creation time so snapshots taken within the same
+    # second still prune oldest-first.
+    out.sort(key=lambda x: x.pop("_created"), reverse=True)
+    return out
+
+
+def _load_manifest(backup_dir: str, name: str) -> dict | None:
+    if not _safe_name(name):
+        return None
+    manifest = _read_json(_manifest_path(backup_dir, name), None)
+    return manifest if isinstance(manifest, dict) else None
+
+
+def _read_blob(backup_dir: str, digest: str) -> bytes:
+    with gzip.open(_blob_path(backup_dir, digest), "rb") as f:
+        return f.read()
+
+
+def export_zip(backup_dir: str, name: str) -> tuple[io.BytesIO, str] | None:
+    """Return (zip buffer, download name) for a snapshot or legacy zip, or None."""
+    if not _safe_name(name):
+        return None
+    legacy = os.path.join(backup_dir, name)
+    if name.lower().endswith(".zip") and os.path.isfile(legacy):
+        with open(legacy, "rb") as f:
+            return io.BytesIO(f.read()), name
+    manifest = _load_manifest(backup_dir, name)
+    if manifest is None:
+        return None
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", compression=zipfile.ZIP_DEFLATED) as z:
+        for rel, meta in sorted((manifest.get("files") or {}).items()):
+            z.writestr(rel, _pretty(rel, _read_blob(backup_dir, meta["sha256"])))
+    buf.seek(0)
+    return buf, f"{name}.zip"
+
+
+def restore(json_dir: str, backup_dir: str, name: str) -> bool:
+    """Restore a snapshot (or legacy zip) over JSON/, keeping a copy of the current files.
+
+    Runs under the snapshot lock so pruning cannot collect a blob mid-restore,
+    and reads every blob before the first file is replaced: a missing blob
+    fails the restore without leaving JSON/ half restored.
+    """
+    legacy = os.path.join(backup_dir, name) if _safe_name(name) else ""
+    with _lock:
+        manifest = None if name.lower().endswith(".zip") else _load_manifest(backup_dir, name)
+        if manifest is None and not (legacy.lower().endswith(".zip") and os.path.isfile(legacy)):
+            raise FileNotFoundError("Backup not found")
+        contents = {}
+        for rel, meta in ((manifest or {}).get("files") or {}).items():
+            dest = os.path.normpath(os.path.join(json_dir, rel))
+            if dest.startswith(os.path.normpath(json_dir) + os.sep):
+                contents[dest] = _read_blob(backup_dir, meta["sha256"])
+        if os.path.isdir(json_dir):
+            shutil.copytree(json_dir, json_dir + ".bak.restore", dirs_exist_ok=True)
+        _ensure_dir(json_dir)
+        if manifest is None:
+            with zipfile.ZipFile(legacy, "r") as z:
+                z.extractall(json_dir)
+            return True
+        for dest, raw in contents.items():
+            _ensure_dir(os.path.dirname(dest))
+            tmp = f"{dest}.restore.tmp"
+            with open(tmp, "wb") as f:
+                f.write(raw)
+            os.replace(tmp, dest)
+    return True
+
+
+def prune(backup_dir: str, keep: int) -> int:
+    """Keep the newest ``keep`` backups, then delete blobs no manifest references."""
+    with _lock:
+        entries = list_snapshots(backup_dir)
+        removed = 0
+        for entry in entries[keep:]:
+            if entry["kind"] == "zip":
+                path = os.path.join(backup_dir, entry["name"])
+            else:
+                path = _manifest_path(backup_dir, entry["name"])
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                log.warning("Failed to remove old backup: %s", path)
+
+        referenced = set()
+        mdir = os.path.join(backup_dir, MANIFESTS_DIR)
+        if os.path.isdir(mdir):
+            for fn in os.listdir(mdir):
+                manifest = _read_json(os.path.join(mdir, fn), {}) if fn.endswith(".json") else {}
+                for meta in (manifest.get("files") or {}).values():
+                    referenced.add((meta or {}).get("sha256"))
+        bdir = os.path.join(backup_dir, BLOBS_DIR)
+        if os.path.isdir(bdir):
+            for root, _, names in os.walk(bdir):
+                for fn in names:
+                    if fn.endswith(".gz") and fn[:-3] not in referenced:
+                        try:
+                            os.remove(os.path.join(root, fn))
+                        except OSError:
+                            pass
+        return removed
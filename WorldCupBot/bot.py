@@ -1,12 +1,18 @@
 import os
 import json
 import logging
-import asyncio
 from typing import List, Tuple
 
 import discord
 from discord.ext import commands, tasks
 
+from bot_telemetry import Telemetry, timed_loop
+from embed_refresher import EmbedRefresher
+from json_store import store
+from log_queue import AsyncLogging, JsonFormatter, DEFAULT_QUEUE_SIZE, POLICY_DROP_NEW
+from loop_monitor import StallDetector
+from member_index import MemberIndex
+from outbound_scheduler import OutboundScheduler
 from queue_utils import compact_command_queue
 
 # -------------------- Paths & Config --------------------
@@ -35,6 +41,9 @@ def _resolve_log_level(value: str) -> int:
 
 LOG_LEVEL = _resolve_log_level(os.getenv("LOG_LEVEL", ""))
 
+_log_format = "%(asctime)s | %(levelname)s | %(name)s | %(module)s.%(funcName)s:%(lineno)d | %(message)s"
+_formatter = JsonFormatter() if os.getenv("LOG_JSON") else logging.Formatter(_log_format)
+
 _handlers = []
 _stdout_only = bool(os.getenv("BOT_LOG_STDOUT_ONLY"))
 _stream_handler = logging.StreamHandler()
@@ -44,12 +53,23 @@ if not _stdout_only:
     _file_handler = logging.FileHandler(LOG_PATH, encoding="utf-8")
     _file_handler.setLevel(LOG_LEVEL)
     _handlers.append(_file_handler)
-
-logging.basicConfig(
-    level=LOG_LEVEL,
-    format="%(asctime)s | %(levelname)s | %(name)s | %(module)s.%(funcName)s:%(lineno)d | %(message)s",
-    handlers=_handlers
+for _h in _handlers:
+    _h.setFormatter(_formatter)
+
+# Cogs log from the event loop; hand records to a listener thread so a slow
+# pipe or disk never blocks the loop.
+_log_sampling = os.getenv("LOG_SAMPLING", "")
+try:
+    _log_sampling = json.loads(_log_sampling) if _log_sampling.startswith("{") else _log_sampling
+except ValueError:
+    pass
+ASYNC_LOG = AsyncLogging(
+    maxsize=int(os.getenv("LOG_QUEUE_SIZE") or DEFAULT_QUEUE_SIZE),
+    policy=os.getenv("LOG_OVERFLOW_POLICY") or POLICY_DROP_NEW,
+    sample_rates=_log_sampling,
 )
+logging.basicConfig(level=LOG_LEVEL, handlers=[ASYNC_LOG.handler(*_handlers)])
+ASYNC_LOG.start()
 log = logging.getLogger("WorldCupBot")
 
 # -------------------- Load config --------------------
@@ -89,13 +109,47 @@ class WorldCupBot(commands.Bot):
         super().__init__(command_prefix="wc ", intents=intents, help_command=None)
         self.loaded_exts: List[str] = []
         self._commands_offset = 0
+        self.outbound = OutboundScheduler(self, JSON_DIR)
+        # Loop timings, queue lag and Discord latency, published for the launcher.
+        self.telemetry = Telemetry(JSON_DIR)
+        self.telemetry.attach(self)
+        self.telemetry.register_consumer("bot_commands", COMMANDS_PATH, lambda: self._commands_offset)
+        self.telemetry.register_source("outbound", self.outbound.stats)
+        # Debounced edits of tracker, team and bet embeds, shared by the cogs.
+        self.embeds = EmbedRefresher(self, window=float(CONFIG.get("embed_refresh_window_seconds", 2.0)))
+        self.telemetry.register_source("embeds", self.embeds.stats)
+        # Captures the stack of whatever blocks the event loop past the threshold.
+        self.stall_detector = StallDetector(threshold=float(CONFIG.get("loop_stall_threshold_ms", 250)) / 1000)
+        self.telemetry.register_source("event_loop", self.stall_detector.snapshot)
+        # Shared member name lookup for cogs; kept current by gateway events.
+        self.member_index = MemberIndex()
+        self.member_index.attach(self)
+        # Cogs do their JSON reads/writes through this store, off the event loop.
+        self.store = store
+        self.store.flush_interval = float(CONFIG.get("json_flush_interval_seconds", self.store.flush_interval))
+        self.telemetry.register_source("storage", self.store.snapshot)
 
     async def setup_hook(self):
+        # Start the outbound scheduler before cogs load so announcers can queue
+        # DMs and channel posts from their first loop iteration.
+        self.outbound.start()
+        self.telemetry.start()
+        self.stall_detector.start()
+        self.store.start()
         await self.load_all_cogs()
-        self._load_commands_state()
+        await self._load_commands_state()
         self._command_watcher.start()
         log.info("setup_hook completed.")
 
+    async def close(self):
+        await self.stall_detector.stop()
+        await self.telemetry.stop()
+        await self.embeds.flush()
+        await self.outbound.stop()
+        await super().close()
+        await self.store.stop()
+        ASYNC_LOG.stop()
+
     async def on_ready(self):
         log.info("Logged in as %s (%s)", self.user, self.user.id if self.user else "?")
         await self._post_config_report()
@@ -169,7 +223,7 @@ class WorldCupBot(commands.Bot):
             except Exception as e:
                 log.exception("Error loading cog %s: %s", ext, e)
         self.loaded_exts = loaded
-        self._write_cogs_status(loaded)
+        await self._write_cogs_status(loaded)
 
     async def reload_cog(self, short_name: str):
         ext = f"COGS.{short_name}"
@@ -178,38 +232,35 @@ class WorldCupBot(commands.Bot):
         except Exception:
             pass
         await self.load_extension(ext)
-        self._mark_cog_loaded(short_name, True)
+        await self._mark_cog_loaded(short_name, True)
         log.info("Reloaded cog: %s", ext)
         return f"Reloaded {short_name}"
 
     async def load_cog(self, short_name: str):
         ext = f"COGS.{short_name}"
         await self.load_extension(ext)
-        self._mark_cog_loaded(short_name, True)
+        await self._mark_cog_loaded(short_name, True)
         log.info("Loaded cog: %s", ext)
         return f"Loaded {short_name}"
 
     async def unload_cog(self, short_name: str):
         ext = f"COGS.{short_name}"
         await self.unload_extension(ext)
-        self._mark_cog_loaded(short_name, False)
+        await self._mark_cog_loaded(short_name, False)
         log.info("Unloaded cog: %s", ext)
         return f"Unloaded {short_name}"
 
     # --------------- Runtime Command Queue ---------------
-    def _load_commands_state(self):
+    async def _load_commands_state(self):
         try:
-            if os.path.isfile(COMMANDS_STATE_PATH):
-                with open(COMMANDS_STATE_PATH, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                self._commands_offset = int(data.get("offset") or 0)
+            data = await self.store.read(COMMANDS_STATE_PATH, {})
+            self._commands_offset = int(data.get("offset") or 0)
         except Exception:
             self._commands_offset = 0
 
-    def _save_commands_state(self):
+    async def _save_commands_state(self):
         try:
-            with open(COMMANDS_STATE_PATH, "w", encoding="utf-8") as f:
-                json.dump({"offset": int(self._commands_offset)}, f)
+            await self.store.write(COMMANDS_STATE_PATH, {"offset": int(self._commands_offset)})
         except Exception:
             pass
 
@@ -221,7 +272,7 @@ class WorldCupBot(commands.Bot):
                 f.seek(self._commands_offset)
                 lines = f.read().splitlines()
                 return lines, f.tell()
-        return await asyncio.to_thread(_read)
+        return await self.store.run(_read)
 
     async def _handle_cog_action(self, action: str, name: str):
         if not name:
@@ -360,6 +411,7 @@ class WorldCupBot(commands.Bot):
                 )
 
     @tasks.loop(seconds=1.0)
+    @timed_loop("bot._command_watcher")
     async def _command_watcher(self):
         lines, new_offset = await self._read_new_commands()
         if not lines:
@@ -382,8 +434,9 @@ class WorldCupBot(commands.Bot):
                 # queued payload provides the user-facing message.
                 await self._handle_maintenance_announcement(data)
         self._commands_offset = new_offset
-        self._save_commands_state()
-        compact_command_queue(
+        await self._save_commands_state()
+        await self.store.run(
+            compact_command_queue,
             COMMANDS_PATH,
             [COMMANDS_STATE_PATH, FANZONE_STATE_PATH, STAGE_STATE_PATH],
         )
@@ -393,34 +446,30 @@ class WorldCupBot(commands.Bot):
         await self.wait_until_ready()
 
     # --- JSON status tracking (shared with Flask) ---
-    def _write_cogs_status(self, loaded_exts):
+    async def _write_cogs_status(self, loaded_exts):
         data = {"loaded": list(loaded_exts)}
         try:
-            with open(COGS_STATUS_PATH, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
+            await self.store.write(COGS_STATUS_PATH, data)
             log.info("Updated %s with %d loaded cogs.", COGS_STATUS_PATH, len(loaded_exts))
         except Exception as e:
             log.warning("Failed to write cogs_status.json: %s", e)
 
-    def _mark_cog_loaded(self, short_name: str, is_loaded: bool):
-        data = {"loaded": []}
-        try:
-            if os.path.exists(COGS_STATUS_PATH):
-                with open(COGS_STATUS_PATH, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-        except Exception:
-            pass
+    async def _mark_cog_loaded(self, short_name: str, is_loaded: bool):
         ext = f"COGS.{short_name}"
-        cur = set(data.get("loaded", []))
-        if is_loaded:
-            cur.add(ext)
-        else:
-            cur.discard(ext)
-        data["loaded"] = sorted(cur)
+
+        def mark(data):
+            if not isinstance(data, dict):
+                data = {}
+            cur = set(data.get("loaded", []))
+            if is_loaded:
+                cur.add(ext)
+            else:
+                cur.discard(ext)
+            data["loaded"] = sorted(cur)
+            return data
+
         try:
-            os.makedirs(JSON_DIR, exist_ok=True)
-            with open(COGS_STATUS_PATH, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
+            await self.store.update(COGS_STATUS_PATH, mark, {"loaded": []})
         except Exception as e:
             log.warning("Failed to update cogs_status.json: %s", e)
 
@@ -0,0 +1,306 @@
+"""Runtime telemetry for the bot process.
+
+Records per-loop tick durations, how far each ``bot_commands.jsonl`` consumer
+is behind the writer, gateway latency, and Discord HTTP latency / 429 counts.
+A snapshot is written to JSON/bot_telemetry.json on an interval so the
+launcher can show it without talking to the bot.
+
+Kept free of a module-level discord import so the launcher can use
+``read_snapshot`` and ``snapshot_gauges``.
+"""
+import asyncio
+import collections
+import functools
+import json
+import logging
+import os
+import time
+
+import json_codec
+
+log = logging.getLogger("WorldCupBot.telemetry")
+
+SNAPSHOT_FILE = "bot_telemetry.json"
+PUBLISH_INTERVAL_SECONDS = 15.0
+SAMPLE_WINDOW = 256
+
+
+class _Timings:
+    """Count, total and max plus a bounded window of recent samples for percentiles."""
+
+    __slots__ = ("count", "errors", "total", "max", "last", "recent")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+        self.recent: collections.deque[float] = collections.deque(maxlen=SAMPLE_WINDOW)
+
+    def observe(self, seconds: float, ok: bool = True) -> None:
+        self.count += 1
+        self.errors += 0 if ok else 1
+        self.total += seconds
+        self.last = seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.recent.append(seconds)
+
+    def summary(self) -> dict:
+        recent = sorted(self.recent)
+
+        def pct(q):
+            return round(recent[min(len(recent) - 1, int(q * len(recent)))] * 1000, 2) if recent else None
+
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "avg_ms": round(self.total / self.count * 1000, 2) if self.count else None,
+            "last_ms": round(self.last * 1000, 2),
+            "max_ms": round(self.max * 1000, 2),
+            "p50_ms": pct(0.50),
+            "p95_ms": pct(0.95),
+        }
+
+
+def _first_line_ts(path: str, offset: int) -> float | None:
+    """``ts`` of the first unconsumed command at ``offset``, or None."""
+    try:
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            f.seek(offset)
+            line = f.readline()
+        return float((json.loads(line) or {}).get("ts")) if line.strip() else None
+    except (OSError, ValueError, TypeError, AttributeError):
+        return None
+
+
+class Telemetry:
+    def __init__(self, json_dir: str, publish_interval: float = PUBLISH_INTERVAL_SECONDS):
+        self.json_dir = json_dir
+        self.publish_interval = publish_interval
+        self.started = time.time()
+        self.loops: dict[str, _Timings] = {}
+        self.http: dict[str, _Timings] = {}
+        self.http_status: dict[int, int] = {}
+        self.rate_limited = 0
+        self.consumers: dict[str, tuple[str, object]] = {}
+        self.sources: dict[str, object] = {}
+        self._bot = None
+        self._task: asyncio.Task | None = None
+
+    # ---------- Recording ----------
+    def record_tick(self, name: str, seconds: float, ok: bool = True) -> None:
+        timings = self.loops.get(name)
+        if timings is None:
+            timings = self.loops[name] = _Timings()
+        timings.observe(seconds, ok)
+
+    def record_http(self, method: str, path: str, seconds: float, status: int | None = None) -> None:
+        key = f"{method} {path}"
+        timings = self.http.get(key)
+        if timings is None:
+            timings = self.http[key] = _Timings()
+        timings.observe(seconds, ok=status is None or status < 400)
+        if status is not None:
+            self.http_status[status] = self.http_status.get(status, 0) + 1
+
+    def register_consumer(self, name: str, queue_path: str, offset_fn) -> None:
+        """Track a queue reader; ``offset_fn()`` returns its current byte offset."""
+        self.consumers[name] = (queue_path, offset_fn)
+
+    def register_source(self, name: str, stats_fn) -> None:
+        """Include ``stats_fn()`` (a dict) in every snapshot, e.g. the outbound scheduler."""
+        self.sources[name] = stats_fn
+
+    # ---------- Snapshot ----------
+    def consumer_offsets(self) -> dict[str, tuple[str, int]]:
+        """Current byte offset of every consumer; reads cog state, so call on the loop."""
+        out = {}
+        for name, (path, offset_fn) in self.consumers.items():
+            try:
+                out[name] = (path, int(offset_fn() or 0))
+            except Exception:
+                continue
+        return out
+
+    def consumer_lag(self, now: float | None = None, offsets: dict | None = None) -> dict:
+        """How far each consumer is behind; stats and reads the queue files, so run it off the loop."""
+        now = now or time.time()
+        out = {}
+        for name, (path, offset) in (self.consumer_offsets() if offsets is None else offsets).items():
+            try:
+                size = os.path.getsize(path) if os.path.isfile(path) else 0
+            except OSError:
+                continue
+            behind = max(0, size - offset)
+            oldest = _first_line_ts(path, offset) if behind else None
+            out[name] = {
+                "offset": offset,
+                "bytes_behind": behind,
+                "seconds_behind": round(max(0.0, now - oldest), 1) if oldest else 0.0,
+            }
+        return out
+
+    def snapshot(self, consumers: dict | None = None, now: float | None = None) -> dict:
+        """Everything but the file-backed consumer lag, which ``publish`` measures off the loop."""
+        now = now or time.time()
+        latency = getattr(self._bot, "latency", None)
+        sources = {}
+        for name, fn in list(self.sources.items()):
+            try:
+                sources[name] = fn()
+            except Exception:
+                sources[name] = {}
+        return {
+            "ts": now,
+            "uptime_seconds": int(now - self.started),
+            "gateway_latency_ms": round(latency * 1000, 1) if isinstance(latency, float) and latency == latency else None,
+            "loops": {name: t.summary() for name, t in self.loops.items()},
+            "consumers": consumers or {},
+            "http": {
+                "routes": {key: t.summary() for key, t in self.http.items()},
+                "status": {str(k): v for k, v in sorted(self.http_status.items())},
+                "rate_limited": self.rate_limited,
+            },
+            **sources,
+        }
+
+    def _write(self, snap: dict) -> None:
+        json_codec.write_file(os.path.join(self.json_dir, SNAPSHOT_FILE), snap)
+
+    async def publish(self) -> None:
+        # Build the snapshot on the loop (no cross-thread dict reads); the queue
+        # files are measured and the snapshot written off-loop.
+        now = time.time()
+        consumers = await asyncio.to_thread(self.consumer_lag, now, self.consumer_offsets())
+        await asyncio.to_thread(self._write, self.snapshot(consumers, now))
+
+    async def _publish_loop(self) -> None:
+        while True:
+            try:
+                await self.publish()
+            except Exception:
+                log.exception("Failed to publish bot telemetry")
+            await asyncio.sleep(self.publish_interval)
+
+    # ---------- Wiring ----------
+    def attach(self, bot) -> None:
+        """Instrument the bot's HTTP client and count rate-limit warnings."""
+        self._bot = bot
+        http = getattr(bot, "http", None)
+        if http is not None and not getattr(http.request, "_telemetry", False):
+            http.request = self._wrap_http(http.request)
+        logging.getLogger("discord.http").addFilter(self._count_rate_limits)
+
+    def _wrap_http(self, request):
+        @functools.wraps(request)
+        async def timed(route, *args, **kwargs):
+            started = time.perf_counter()
+            status = None
+            try:
+                return await request(route, *args, **kwargs)
+            except Exception as exc:
+                status = getattr(exc, "status", None)
+                raise
+            finally:
+                # Route.path is the template (/channels/{channel_id}/messages),
+                # which keeps the key count bounded.
+                self.record_http(getattr(route, "method", "?"), getattr(route, "path", "?"),
+                                 time.perf_counter() - started, status)
+
+        timed._telemetry = True
+        return timed
+
+    def _count_rate_limits(self, record) -> bool:
+        # discord.py retries 429s internally and only logs them.
+        if "rate limited" in record.getMessage():
+            self.rate_limited += 1
+        return True
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._publish_loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+        try:
+            await self.publish()
+        except Exception:
+            pass
+
+
+def get_telemetry(bot) -> Telemetry:
+    """Return the bot-wide telemetry, creating a detached one if the bot has none."""
+    telemetry = getattr(bot, "telemetry", None)
+    if telemetry is None:
+        base_dir = getattr(bot, "BASE_DIR", None) or os.getcwd()
+        telemetry = Telemetry(os.path.join(base_dir, "JSON"))
+        try:
+            bot.telemetry = telemetry
+        except Exception:
+            pass
+    return telemetry
+
+
+def timed_loop(name: str):
+    """Decorate a ``tasks.loop`` body (below the ``@tasks.loop`` line) to record tick time."""
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(self, *args, **kwargs):
+            started = time.perf_counter()
+            ok = False
+            try:
+                result = await fn(self, *args, **kwargs)
+                ok = True
+                return result
+            finally:
+                get_telemetry(getattr(self, "bot", self)).record_tick(name, time.perf_counter() - started, ok)
+
+        return wrapper
+
+    return decorator
+
+
+# ---------- Launcher side ----------
+def read_snapshot(json_dir: str) -> dict | None:
+    """Load the last published snapshot plus its age in seconds, or None."""
+    path = os.path.join(json_dir, SNAPSHOT_FILE)
+    try:
+        snap = json_codec.read_file(path)[0]
+    except (OSError, ValueError):
+        return None
+    if not isinstance(snap, dict):
+        return None
+    snap["age_seconds"] = round(max(0.0, time.time() - float(snap.get("ts") or 0)), 1)
+    return snap
+
+
+def snapshot_gauges(snap: dict | None) -> dict:
+    """Flatten the headline numbers of a snapshot for the launcher's metrics endpoint."""
+    if not snap:
+        return {}
+    consumers = snap.get("consumers") or {}
+    loops = snap.get("loops") or {}
+    http = snap.get("http") or {}
+    out = {
+        "snapshot_age_seconds": snap.get("age_seconds", 0),
+        "http_rate_limited_total": http.get("rate_limited", 0),
+        "queue_max_bytes_behind": max((c.get("bytes_behind", 0) for c in consumers.values()), default=0),
+        "queue_max_seconds_behind": max((c.get("seconds_behind", 0) for c in consumers.values()), default=0),
+        "loop_max_tick_ms": max((l.get("max_ms") or 0 for l in loops.values()), default=0),
+    }
+    if snap.get("gateway_latency_ms") is not None:
+        out["gateway_latency_ms"] = snap["gateway_latency_ms"]
+    event_loop = snap.get("event_loop") or {}
+    for field in ("stalls", "stall_seconds", "max_stall_ms", "lag_max_ms", "lag_avg_ms"):
+        if isinstance(event_loop.get(field), (int, float)):
+            out[f"loop_{field}"] = event_loop[field]
+    return out
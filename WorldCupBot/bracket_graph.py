@@ -0,0 +1,464 @@
+"""Knockout bracket as a dependency graph.
+
+Each knockout match is a node, and each edge runs from a feeder match to the
+match its winner (or, for the third-place play-off, its loser) plays next.
+The graph is data, not code: ``JSON/bracket_map.json`` lists every match with
+its stage, bracket position (side and slot) and where its two teams come
+from. ``W74`` is the winner of match 74 and ``L101`` the loser of match 101.
+First-round matches name group places instead: ``1E`` is the winner of
+group E, and ``3ABCDF`` is a third-placed team from one of those groups.
+
+``Bracket`` joins the graph with matches.json, fan_winners.json and
+bracket_slots.json. When a result is saved, ``propagate`` follows edges out
+of that match only. A downstream match is revisited only when one of its
+teams changed and it already has a result of its own, so a result updates
+the path it feeds instead of the whole bracket. ``propagate`` returns the
+fixture and slot changes it made, and callers write the files only when
+there are some.
+
+``view`` is the resolved bracket /api/bracket serves. It is rebuilt only
+when one of its files changes (mtime, size and inode), like the other
+indexes.
+"""
+import collections
+import hashlib
+import os
+import re
+import threading
+
+import json_codec
+from stage_constants import normalize_stage
+
+DEFAULT_MAP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "JSON", "bracket_map.json")
+
+POSITIONS = ("home", "away")
+FINAL_STATUSES = {"final", "full_time", "full time", "completed", "finished"}
+
+_FEED_RE = re.compile(r"([WL])(\d{1,3})", re.IGNORECASE)
+_SEED_RE = re.compile(r"([123])([A-L]+)")
+# Team names imports and older saves use while a match is still undecided.
+_GENERATED_RE = re.compile(r"TBD|[MWL]\d{1,3}", re.IGNORECASE)
+
+
+def match_no(raw) -> int | None:
+    text = str(raw or "").strip()
+    if not text:
+        return None
+    if re.fullmatch(r"\d{1,3}", text):
+        return int(text)
+    # FIFA/imported feeds commonly prefix match numbers with a short label
+    # (for example M73 or W74).
+    m = re.fullmatch(r"(?:match\s*#?\s*|[mw])(\d{1,3})", text, flags=re.IGNORECASE)
+    return int(m.group(1)) if m else None
+
+
+def fixture_match_no(fixture: dict) -> int | None:
+    return match_no(fixture.get("id")) or match_no(fixture.get("fixture_id")) or match_no(fixture.get("label"))
+
+
+def is_generated(team) -> bool:
+    text = str(team or "").strip()
+    return not text or bool(_GENERATED_RE.fullmatch(text))
+
+
+def _fixture_id(fixture) -> str:
+    return str((fixture or {}).get("id") or (fixture or {}).get("fixture_id") or "").strip()
+
+
+def _entry_id(entry: dict) -> str:
+    return str(entry.get("match_id") or entry.get("matchId") or "").strip()
+
+
+def _score(raw) -> int | None:
+    try:
+        return int(raw)
+    except (TypeError, ValueError):
+        return None
+
+
+class Node:
+    __slots__ = ("match", "stage", "side", "slot", "feeds", "seeds")
+
+    def __init__(self, match: int, stage: str, side: str, slot: int, feeds: dict, seeds: dict | None = None):
+        self.match = match
+        self.stage = stage
+        self.side = side
+        self.slot = slot
+        # position -> ("W" | "L", feeder match); empty for the first knockout round
+        self.feeds = feeds
+        # position -> (group place, eligible groups); first knockout round only
+        self.seeds = seeds or {}
+
+    def placeholder(self, position: str) -> str:
+        feed = self.feeds.get(position)
+        if feed:
+            return f"{feed[0]}{feed[1]}"
+        seed = self.seeds.get(position)
+        return f"{seed[0]}{seed[1]}" if seed else ""
+
+
+class BracketGraph:
+    def __init__(self, nodes):
+        self.nodes: dict[int, Node] = {}
+        for node in nodes:
+            if node.match in self.nodes:
+                raise ValueError(f"bracket map lists match {node.match} twice")
+            self.nodes[node.match] = node
+        # feeder -> [(target, position, "W" | "L")]
+        self.downstream: dict[int, list[tuple[int, str, str]]] = {}
+        for node in self.nodes.values():
+            for position, (outcome, feeder) in node.feeds.items():
+                if feeder not in self.nodes:
+                    raise ValueError(f"match {node.match} is fed by unknown match {feeder}")
+                self.downstream.setdefault(feeder, []).append((node.match, position, outcome))
+        self.order = self._topological_order()
+
+    @classmethod
+    def from_doc(cls, doc) -> "BracketGraph":
+        items = doc.get("matches") if isinstance(doc, dict) else None
+        if not isinstance(items, list):
+            raise ValueError("bracket map has no matches")
+        nodes = []
+        for item in items:
+            try:
+                number = int(item["match"])
+                stage = normalize_stage(str(item["stage"]))
+            except (KeyError, TypeError, ValueError):
+                raise ValueError(f"bad bracket map entry: {item!r}") from None
+            feeds, seeds = {}, {}
+            for position in POSITIONS:
+                spec = str(item.get(position) or "").strip()
+                if not spec:
+                    continue
+                m = _FEED_RE.fullmatch(spec)
+                if m:
+                    feeds[position] = (m.group(1).upper(), int(m.group(2)))
+                    continue
+                m = _SEED_RE.fullmatch(spec.upper())
+                if not m:
+                    raise ValueError(f"match {number}: bad {position} feed {spec!r}")
+                seeds[position] = (int(m.group(1)), m.group(2))
+            nodes.append(Node(number, stage, str(item.get("side") or "center"), int(item.get("slot") or 1), feeds, seeds))
+        return cls(nodes)
+
+    def _topological_order(self) -> list[int]:
+        waiting = {number: len(node.feeds) for number, node in self.nodes.items()}
+        queue = collections.deque(sorted(number for number, count in waiting.items() if not count))
+        order = []
+        while queue:
+            number = queue.popleft()
+            order.append(number)
+            for target, _, _ in self.downstream.get(number, ()):
+                waiting[target] -= 1
+                if not waiting[target]:
+                    queue.append(target)
+        if len(order) != len(self.nodes):
+            raise ValueError("bracket map has a cycle")
+        return order
+
+
+class Bracket:
+    """The graph joined with one state of the fixtures, result records and saved slots.
+
+    ``propagate`` updates ``fixtures`` and ``slots`` in place.
+    """
+
+    def __init__(self, graph: BracketGraph, fixtures: list, winners: dict, slots: dict):
+        self.graph = graph
+        self.fixtures = fixtures
+        self.winners = winners if isinstance(winners, dict) else {}
+        self.slots = slots if isinstance(slots, dict) else {}
+        self.fixtures_changed = False
+        self.slots_changed = False
+        self._by_match: dict[int, dict] = {}
+        self._by_id: dict[str, dict] = {}
+        for fixture in fixtures:
+            if isinstance(fixture, dict):
+                self._index(fixture)
+
+    def _index(self, fixture: dict) -> None:
+        fid = _fixture_id(fixture)
+        if fid:
+            self._by_id[fid] = fixture
+        number = fixture_match_no(fixture)
+        if number is not None:
+            self._by_match[number] = fixture
+
+    def match_for(self, fixture_id) -> int | None:
+        """Match number of the fixture saved as ``fixture_id``."""
+        fixture = self._by_id.get(str(fixture_id or "").strip())
+        number = fixture_match_no(fixture) if fixture else match_no(fixture_id)
+        return number if number in self.graph.nodes else None
+
+    # ---- results ----
+    def _winner_side(self, fixture: dict, number: int) -> str:
+        for key in (_fixture_id(fixture), str(number), f"Match {number}"):
+            rec = self.winners.get(key) if key else None
+            if isinstance(rec, dict):
+                side = str(rec.get("winner_side") or rec.get("winner") or "").strip().lower()
+                if side in ("home", "away", "draw"):
+                    return side
+        if str(fixture.get("status") or "").strip().lower() not in FINAL_STATUSES:
+            return ""
+        home, away = _score(fixture.get("home_score")), _score(fixture.get("away_score"))
+        if home is None or away is None:
+            return ""
+        if home != away:
+            return "home" if home > away else "away"
+        # Level after extra time: the saved shootout winner advances.
+        return str(fixture.get("winner_side") or "").strip().lower()
+
+    def outcome(self, number: int) -> tuple[str, str]:
+        """(winner, loser) of match ``number``; empty while it is undecided."""
+        fixture = self._fixture(number)
+        if fixture is None:
+            return "", ""
+        side = self._winner_side(fixture, number)
+        home = str(fixture.get("home") or "").strip()
+        away = str(fixture.get("away") or "").strip()
+        if side == "home":
+            return home, away
+        if side == "away":
+            return away, home
+        return "", ""
+
+    def _team(self, feed) -> str:
+        outcome, feeder = feed
+        winner, loser = self.outcome(feeder)
+        return winner if outcome == "W" else loser
+
+    # ---- fixtures and slot entries ----
+    def _fixture(self, number: int, entry: dict | None = None) -> dict | None:
+        fixture = self._by_match.get(number)
+        if fixture is None:
+            node = self.graph.nodes.get(number)
+            located = self._locate(node) if node and entry is None else None
+            entry = entry if entry is not None else (located[2] if located else {})
+            fixture = self._by_id.get(_entry_id(entry)) if entry else None
+        return fixture
+
+    def _entry_no(self, entry: dict) -> int | None:
+        for field in ("match_id", "matchId", "id", "label"):
+            number = match_no(entry.get(field))
+            if number is not None:
+                return number
+        fixture = self._by_id.get(_entry_id(entry))
+        return fixture_match_no(fixture) if fixture else None
+
+    def _fits(self, node: Node, entry: dict) -> bool:
+        # Entries saved before the map was official may sit in another match's
+        # position; their W/L placeholders tell them apart.
+        for position in POSITIONS:
+            m = _FEED_RE.fullmatch(str(entry.get(position) or "").strip())
+            if m and node.feeds.get(position) != (m.group(1).upper(), int(m.group(2))):
+                return False
+        return True
+
+    def _locate(self, node: Node):
+        """(side, slot key, entry) of the saved slot entry for ``node``, or None."""
+        stage_slots = self.slots.get(node.stage)
+        if not isinstance(stage_slots, dict):
+            return None
+        for side, side_slots in stage_slots.items():
+            if not isinstance(side_slots, dict):
+                continue
+            for key, entry in side_slots.items():
+                if isinstance(entry, dict) and self._entry_no(entry) == node.match:
+                    return side, key, entry
+        side_slots = stage_slots.get(node.side)
+        entry = side_slots.get(str(node.slot)) if isinstance(side_slots, dict) else None
+        if isinstance(entry, dict) and self._entry_no(entry) is None and self._fits(node, entry):
+            return node.side, str(node.slot), entry
+        return None
+
+    def _place(self, node: Node, located, entry: dict) -> None:
+        """Store ``entry`` at ``node``'s position, swapping out whatever sat there."""
+        stage_slots = self.slots.get(node.stage)
+        if not isinstance(stage_slots, dict):
+            stage_slots = self.slots[node.stage] = {}
+        side_slots = stage_slots.get(node.side)
+        if not isinstance(side_slots, dict):
+            side_slots = stage_slots[node.side] = {}
+        key = str(node.slot)
+        if located and located[:2] != (node.side, key):
+            old_slots = stage_slots[located[0]]
+            displaced = side_slots.get(key)
+            if isinstance(displaced, dict):
+                old_slots[located[1]] = displaced
+            else:
+                old_slots.pop(located[1], None)
+        side_slots[key] = entry
+
+    def _refresh(self, node: Node) -> dict | None:
+        """Bring ``node``'s slot entry and fixture up to date with its feeders."""
+        teams = {position: self._team(feed) for position, feed in node.feeds.items()}
+        # A single decided feeder advances its side and keeps the other
+        # side's placeholder (W77, TBD, ...).
+        if not any(teams.values()):
+            return None
+        located = self._locate(node)
+        entry = located[2] if located else {}
+        fixture = self._fixture(node.match, entry)
+        next_entry = {**entry, "match_id": _entry_id(entry) or _fixture_id(fixture) or str(node.match)}
+        for position in POSITIONS:
+            next_entry[position] = teams.get(position) or str(entry.get(position) or "").strip() or node.placeholder(position)
+
+        change = {}
+        if next_entry != entry or (located and located[:2] != (node.side, str(node.slot))):
+            self._place(node, located, next_entry)
+            self.slots_changed = True
+            change["slot"] = {"stage": node.stage, "side": node.side, "slot": node.slot, **next_entry}
+
+        if fixture is not None:
+            updates = {
+                position: next_entry[position]
+                for position in POSITIONS
+                if teams.get(position) and str(fixture.get(position) or "").strip() != next_entry[position]
+            }
+            if normalize_stage(str(fixture.get("stage") or "")) != node.stage:
+                updates["stage"] = node.stage
+            if str(fixture.get("bracket_slot") or "").strip() != str(node.slot):
+                updates["bracket_slot"] = node.slot
+            if updates:
+                fixture.update(updates)
+                change["fixture"] = {"id": _fixture_id(fixture), **updates}
+        else:
+            fixture = {
+                "id": next_entry["match_id"],
+                "home": next_entry["home"],
+                "away": next_entry["away"],
+                "utc": "",
+                "time": "",
+                "stadium": "",
+                "group": "",
+                "stage": node.stage,
+                "bracket_slot": node.slot,
+            }
+            self.fixtures.append(fixture)
+            self._index(fixture)
+            self._by_match[node.match] = fixture
+            change["fixture"] = dict(fixture)
+            change["created"] = True
+        if "fixture" in change:
+            self.fixtures_changed = True
+        return {"match": node.match, **change} if change else None
+
+    def propagate(self, sources) -> list[dict]:
+        """Advance the outcome of matches ``sources`` down the bracket; returns the changes made."""
+        queue = collections.deque(number for number in sources if number in self.graph.nodes)
+        changes = []
+        while queue:
+            number = queue.popleft()
+            for target, _, _ in self.graph.downstream.get(number, ()):
+                change = self._refresh(self.graph.nodes[target])
+                if change is None:
+                    continue
+                changes.append(change)
+                # Its teams changed, so a result it already has now names someone else.
+                if target in self.graph.downstream and any(self.outcome(target)):
+                    queue.append(target)
+        return changes
+
+    # ---- read model ----
+    def view(self) -> dict:
+        """Every knockout match at its position with the teams as currently known."""
+        slots: dict[str, dict] = {}
+        matches = []
+        for number in self.graph.order:
+            node = self.graph.nodes[number]
+            located = self._locate(node)
+            entry = dict(located[2]) if located else {}
+            fixture = self._fixture(number, entry) or {}
+            teams = {}
+            for position in POSITIONS:
+                saved = str(entry.get(position) or "").strip()
+                scheduled = str(fixture.get(position) or "").strip()
+                known = next((team for team in (saved, scheduled) if not is_generated(team)), "")
+                feed = node.feeds.get(position)
+                teams[position] = known or (self._team(feed) if feed else "") or node.placeholder(position) or saved or scheduled
+            entry.update(teams)
+            entry["match_id"] = _entry_id(entry) or _fixture_id(fixture) or str(number)
+            entry["utc"] = str(entry.get("utc") or fixture.get("utc") or fixture.get("time") or "").strip()
+            slots.setdefault(node.stage, {}).setdefault(node.side, {})[str(node.slot)] = entry
+            winner, loser = self.outcome(number)
+            matches.append({
+                "match": number,
+                "stage": node.stage,
+                "side": node.side,
+                "slot": node.slot,
+                "fixture_id": _fixture_id(fixture),
+                "home": teams["home"],
+                "away": teams["away"],
+                "utc": entry["utc"],
+                "winner": winner,
+                "loser": loser,
+                "feeds": {position: node.placeholder(position) for position in node.feeds},
+            })
+        return {"slots": slots, "matches": matches}
+
+
+def _signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+def _read(path, default):
+    try:
+        return json_codec.read_file(path)[0]
+    except (OSError, ValueError):
+        return default
+
+
+def map_path(json_dir) -> str:
+    """The deployment's bracket map, or the one shipped with the launcher."""
+    path = os.path.join(os.fspath(json_dir), "bracket_map.json")
+    return path if os.path.exists(path) else DEFAULT_MAP
+
+
+_graphs: dict[str, tuple] = {}
+_views: dict[str, tuple] = {}
+_lock = threading.Lock()
+
+
+def load_graph(path=DEFAULT_MAP) -> BracketGraph:
+    """Graph for the map at ``path``; raises ValueError for a map that is not a DAG."""
+    path = os.fspath(path)
+    sig = _signature(path)
+    with _lock:
+        cached = _graphs.get(path)
+    if cached is not None and cached[0] == sig:
+        return cached[1]
+    graph = BracketGraph.from_doc(_read(path, {}))
+    with _lock:
+        _graphs[path] = (sig, graph)
+    return graph
+
+
+def view(json_dir, load=None) -> dict:
+    """``Bracket.view()`` for the files in ``json_dir`` plus a ``version``; ``load(path, default)`` reads them."""
+    json_dir = os.fspath(json_dir)
+    paths = (
+        map_path(json_dir),
+        os.path.join(json_dir, "matches.json"),
+        os.path.join(json_dir, "fan_winners.json"),
+        os.path.join(json_dir, "bracket_slots.json"),
+    )
+    sigs = tuple((path, _signature(path)) for path in paths)
+    with _lock:
+        cached = _views.get(json_dir)
+    if cached is not None and cached[0] == sigs:
+        return cached[1]
+    read = load or _read
+    doc = read(paths[1], [])
+    if isinstance(doc, dict):
+        doc = next((doc[key] for key in ("fixtures", "matches") if isinstance(doc.get(key), list)), [])
+    fixtures = doc if isinstance(doc, list) else []
+    bracket = Bracket(load_graph(paths[0]), fixtures, read(paths[2], {}), read(paths[3], {}))
+    out = bracket.view()
+    out["version"] = hashlib.blake2b(repr(sigs).encode("utf-8"), digest_size=8).hexdigest()
+    with _lock:
+        _views[json_dir] = (sigs, out)
+    return out
@@ -0,0 +1,310 @@
+"""Versioned change log for the JSON documents the web app polls.
+
+Every write of a tracked document (matches.json, bets.json, players.json) is
+compared per entity with what was last logged for it, and the fixture ids, bet
+ids and team ownership rows that differ are appended to JSON/changes.jsonl
+under a monotonically increasing version. The launcher and the bot both write
+these documents, so the version and the per-entity digests live in
+JSON/changes.state.json and are only touched under an exclusive file lock.
+
+``read_since`` backs /api/changes: it returns the entities changed after a
+client's version, or ``resync`` when the client is too far behind (the log was
+compacted past its version, too many entities changed, or a backup restore
+replaced the documents wholesale).
+"""
+import bisect
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+import json_codec
+
+try:
+    import fcntl
+except ImportError:  # Windows dev boxes: the in-process lock still applies.
+    fcntl = None
+
+log = logging.getLogger("WorldCupBot.change_log")
+
+LOG_FILE = "changes.jsonl"
+STATE_FILE = "changes.state.json"
+LOCK_FILE = "changes.lock"
+# Not part of the data: backups skip them and a restore does not roll them back.
+FILES = (LOG_FILE, STATE_FILE, LOCK_FILE)
+
+MAX_LOG_BYTES = 512 * 1024
+KEEP_AFTER_COMPACT = 2000
+MAX_CHANGES = 500
+
+RESET = "reset"
+
+
+def _digest(obj) -> str:
+    raw = json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=8).hexdigest()
+
+
+# ---------- Entity extractors: document -> {entity id: digest} ----------
+def _fixture_entities(doc) -> dict:
+    seq = doc
+    if isinstance(doc, dict):
+        seq = next((doc[key] for key in ("fixtures", "matches") if isinstance(doc.get(key), list)), [])
+    out = {}
+    for m in seq if isinstance(seq, list) else []:
+        if isinstance(m, dict):
+            mid = str(m.get("id") or "").strip()
+            if mid:
+                out[mid] = _digest(m)
+    return out
+
+
+def _bet_entities(doc) -> dict:
+    seq = doc.get("bets", []) if isinstance(doc, dict) else doc
+    out = {}
+    for b in seq if isinstance(seq, list) else []:
+        if isinstance(b, dict):
+            bid = str(b.get("bet_id") or "").strip()
+            if bid:
+                out[bid] = _digest(b)
+    return out
+
+
+def _ownership_entities(doc) -> dict:
+    teams: dict[str, list] = {}
+    if isinstance(doc, dict):
+        for uid, pdata in doc.items():
+            if not isinstance(pdata, dict):
+                continue
+            for entry in pdata.get("teams") or []:
+                if isinstance(entry, dict):
+                    team, own = str(entry.get("team") or "").strip(), entry.get("ownership") or {}
+                else:
+                    team, own = str(entry or "").strip(), {}
+                if team:
+                    teams.setdefault(team, []).append([str(uid), own])
+    return {team: _digest(sorted(rows, key=lambda row: row[0])) for team, rows in teams.items()}
+
+
+# file name -> (entity kind, extractor)
+TRACKED = {
+    "matches.json": ("fixture", _fixture_entities),
+    "bets.json": ("bet", _bet_entities),
+    "players.json": ("ownership", _ownership_entities),
+}
+KINDS = tuple(kind for kind, _ in TRACKED.values())
+
+
+def _signature(path: str):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+class ChangeLog:
+    """One JSON directory's log; get it through ``for_dir``."""
+
+    def __init__(self, json_dir: str):
+        self.json_dir = json_dir
+        self.log_path = os.path.join(json_dir, LOG_FILE)
+        self.state_path = os.path.join(json_dir, STATE_FILE)
+        self.lock_path = os.path.join(json_dir, LOCK_FILE)
+        self._lock = threading.Lock()
+        # Reader side: parsed log entries plus where parsing stopped.
+        self._versions: list[int] = []
+        self._entries: list[dict] = []
+        self._read_sig = None
+        self._read_ino = None
+        self._read_offset = 0
+
+    # ---------- Writer side ----------
+    @contextlib.contextmanager
+    def _locked(self):
+        with self._lock:
+            os.makedirs(self.json_dir, exist_ok=True)
+            with open(self.lock_path, "a+") as fh:
+                if fcntl is not None:
+                    fcntl.flock(fh, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(fh, fcntl.LOCK_UN)
+
+    def _load_state(self) -> dict:
+        try:
+            state, _ = json_codec.read_file(self.state_path)
+        except (OSError, ValueError):
+            state = None
+        if not isinstance(state, dict):
+            state = {}
+        state.setdefault("version", 0)
+        state.setdefault("floor", 0)
+        state.setdefault("docs", {})
+        return state
+
+    def _save_state(self, state: dict) -> None:
+        json_codec.write_file(self.state_path, state)
+
+    def _append(self, state: dict, changes: list[tuple[str, str, str]]) -> None:
+        now = int(time.time())
+        lines = []
+        for kind, entity_id, op in changes:
+            state["version"] += 1
+            lines.append(json.dumps({"v": state["version"], "ts": now, "kind": kind, "id": entity_id, "op": op},
+                                    separators=(",", ":"), ensure_ascii=False))
+        # State first: a crash before the append leaves a gap, which readers
+        # treat as a resync, rather than versions that get handed out twice.
+        self._save_state(state)
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        if os.path.getsize(self.log_path) > MAX_LOG_BYTES:
+            self._compact(state)
+            self._save_state(state)
+
+    def _compact(self, state: dict) -> None:
+        with open(self.log_path, "r", encoding="utf-8", errors="ignore") as f:
+            kept = f.read().splitlines()[-KEEP_AFTER_COMPACT:]
+        try:
+            state["floor"] = int(json.loads(kept[0])["v"]) - 1
+        except (IndexError, ValueError, KeyError, TypeError):
+            state["floor"] = state["version"]
+        tmp = f"{self.log_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write("\n".join(kept) + "\n")
+        os.replace(tmp, self.log_path)
+
+    def record(self, name: str, doc) -> int:
+        """Log what changed in tracked document ``name``; returns the current version."""
+        kind, extract = TRACKED[name]
+        current = extract(doc)
+        with self._locked():
+            state = self._load_state()
+            previous = state["docs"].get(name)
+            if previous is None:
+                # Nothing to diff against yet: clients holding this kind must reload it.
+                changes = [(kind, "*", RESET)]
+            else:
+                changes = [(kind, eid, "upsert") for eid, d in current.items() if previous.get(eid) != d]
+                changes += [(kind, eid, "delete") for eid in previous if eid not in current]
+            if not changes:
+                return state["version"]
+            state["docs"][name] = current
+            self._append(state, changes)
+            return state["version"]
+
+    def record_reset(self) -> int:
+        """Everything may have changed (e.g. a backup restore); forces clients to resync."""
+        with self._locked():
+            state = self._load_state()
+            # Forget the baselines so the next write of each document re-seeds them.
+            state["docs"] = {}
+            self._append(state, [("*", "*", RESET)])
+            return state["version"]
+
+    # ---------- Reader side ----------
+    def _refresh(self) -> None:
+        sig = _signature(self.log_path)
+        if sig == self._read_sig:
+            return
+        grew = sig is not None and sig[2] == self._read_ino and sig[1] >= self._read_offset
+        if not grew:
+            # Compacted, replaced or removed: parse from scratch.
+            self._versions, self._entries, self._read_offset = [], [], 0
+        try:
+            with open(self.log_path, "r", encoding="utf-8", errors="ignore") as f:
+                f.seek(self._read_offset)
+                chunk = f.read()
+        except OSError:
+            chunk = ""
+        # Only consume complete lines; a writer may be mid-append.
+        end = chunk.rfind("\n") + 1
+        for line in chunk[:end].splitlines():
+            try:
+                entry = json.loads(line)
+                v = int(entry["v"])
+            except (ValueError, KeyError, TypeError):
+                continue
+            if self._versions and v <= self._versions[-1]:
+                continue
+            self._versions.append(v)
+            self._entries.append(entry)
+        self._read_offset += len(chunk[:end].encode("utf-8"))
+        self._read_ino = sig[2] if sig is not None else None
+        # Leave the signature unset after a partial line so the next call reads on.
+        self._read_sig = sig if end == len(chunk) else None
+
+    def read_since(self, since: int | None, kinds=None, limit: int = MAX_CHANGES) -> dict:
+        """Changes after ``since``, newest op per entity, oldest first."""
+        state = self._load_state()
+        version = int(state["version"])
+        resync = {"version": version, "resync": True, "changes": []}
+        if since is None or since > version or since < int(state["floor"]):
+            return resync
+        if since == version:
+            return {"version": version, "resync": False, "changes": []}
+        with self._lock:
+            self._refresh()
+            start = bisect.bisect_right(self._versions, since)
+            entries = self._entries[start:]
+        if not entries or entries[0]["v"] != since + 1:
+            # A gap means the log lost lines the client never saw.
+            return resync
+        wanted = set(kinds) if kinds else None
+        latest: dict[tuple[str, str], dict] = {}
+        for entry in entries:
+            if entry.get("op") == RESET and (entry.get("kind") == "*" or wanted is None or entry.get("kind") in wanted):
+                return resync
+            if wanted is not None and entry.get("kind") not in wanted:
+                continue
+            key = (entry.get("kind"), entry.get("id"))
+            latest.pop(key, None)
+            latest[key] = entry
+        if len(latest) > limit:
+            return resync
+        changes = [{"kind": e["kind"], "id": e["id"], "op": e["op"], "v": e["v"]} for e in latest.values()]
+        return {"version": version, "resync": False, "changes": changes}
+
+
+_logs: dict[str, ChangeLog] = {}
+_logs_lock = threading.Lock()
+
+
+def for_dir(json_dir: str) -> ChangeLog:
+    key = os.path.abspath(json_dir)
+    with _logs_lock:
+        change_log = _logs.get(key)
+        if change_log is None:
+            change_log = _logs[key] = ChangeLog(key)
+        return change_log
+
+
+def record_write(path, doc) -> None:
+    """Hook for JSON writers: call after ``doc`` has been written to ``path``.
+
+    Untracked files are ignored; failures are logged and never fail the write.
+    """
+    path = os.fspath(path)
+    name = os.path.basename(path)
+    if name not in TRACKED:
+        return
+    try:
+        for_dir(os.path.dirname(os.path.abspath(path))).record(name, doc)
+    except Exception:
+        log.exception("Failed to record changes for %s", path)
+
+
+def record_reset(json_dir: str) -> None:
+    try:
+        for_dir(json_dir).record_reset()
+    except Exception:
+        log.exception("Failed to record a change-log reset for %s", json_dir)
+
+
+def read_since(json_dir: str, since: int | None, kinds=None, limit: int = MAX_CHANGES) -> dict:
+    return for_dir(json_dir).read_since(since, kinds, limit)
@@ -0,0 +1,248 @@
+import asyncio
+import hashlib
+import inspect
+import logging
+import time
+from collections import OrderedDict
+
+import discord
+
+import json_codec
+from outbound_scheduler import is_retryable, retry_delay
+
+log = logging.getLogger(__name__)
+
+# Requests for one message within this window become a single edit.
+DEBOUNCE_SECONDS = 2.0
+MAX_ATTEMPTS = 3
+# Messages whose last rendered content is remembered for change detection.
+HASH_LIMIT = 2000
+
+# Discord's embed limits.
+FIELD_VALUE_LIMIT = 1024
+FIELDS_PER_EMBED = 25
+EMBED_TOTAL_LIMIT = 6000
+
+# Outcomes a request's future resolves to.
+EDITED = "edited"
+UNCHANGED = "unchanged"
+MISSING = "missing"
+FAILED = "failed"
+
+
+def content_hash(embeds) -> str:
+    """Digest of what a message would show; equal digests need no edit."""
+    return hashlib.blake2b(json_codec.dumps([embed.to_dict() for embed in embeds]), digest_size=16).hexdigest()
+
+
+def _as_list(rendered) -> list:
+    if rendered is None:
+        return []
+    if isinstance(rendered, discord.Embed):
+        return [rendered]
+    return list(rendered)
+
+
+def leaderboard_pages(
+    title: str,
+    lines,
+    *,
+    description: str | None = None,
+    colour=None,
+    field_name: str = "Leaderboard",
+    footer: str | None = None,
+) -> list:
+    """Spread ``lines`` over as many embeds as Discord's limits need, one per message.
+
+    Discord caps a message's embeds at 6000 characters in total, so a longer
+    leaderboard needs more messages, not more embeds. Lines are never split.
+    The description goes on the first page, the footer on the last, and the
+    title on every page (numbered once there is more than one).
+    """
+    fields = []
+    current, size = [], 0
+    for line in lines:
+        line = line[:FIELD_VALUE_LIMIT]
+        if current and size + 1 + len(line) > FIELD_VALUE_LIMIT:
+            fields.append(current)
+            current, size = [], 0
+        size += len(line) + (1 if current else 0)
+        current.append(line)
+    if current:
+        fields.append(current)
+
+    # Room for the page number added to titles afterwards.
+    reserve = len(title) + len(" (99/99)") + len(footer or "")
+    pages = []
+    shown = 0
+    for chunk in fields:
+        name = field_name if not shown else f"{field_name} ({shown + 1}-{shown + len(chunk)})"
+        value = "\n".join(chunk)
+        page = pages[-1] if pages else None
+        if (
+            page is None
+            or len(page.fields) >= FIELDS_PER_EMBED
+            or len(page) + reserve + len(name) + len(value) > EMBED_TOTAL_LIMIT
+        ):
+            page = discord.Embed(description=description if not pages else None, colour=colour)
+            pages.append(page)
+        page.add_field(name=name, value=value, inline=False)
+        shown += len(chunk)
+    if not pages:
+        pages.append(discord.Embed(description=description, colour=colour))
+    for number, page in enumerate(pages, start=1):
+        page.title = title if len(pages) == 1 else f"{title} ({number}/{len(pages)})"
+    if footer:
+        pages[-1].set_footer(text=footer)
+    return pages
+
+
+class EmbedRefresher:
+    """Coalesce edits to long-lived embed messages (trackers, team cards, bets).
+
+    ``request`` does not edit straight away. The first request for a message
+    starts a ``window``-second timer. Later requests in that window replace
+    the renderer, so the message is rendered once, with the latest data.
+    Edits go through a partial message, so nothing is fetched first. An edit
+    whose rendered content hashes the same as the last one is skipped.
+    """
+
+    def __init__(self, bot, *, window: float = DEBOUNCE_SECONDS):
+        self.bot = bot
+        self.window = max(0.0, float(window))
+        self._pending: dict[tuple[int, int], dict] = {}
+        self._hashes: OrderedDict[int, str] = OrderedDict()
+        self.counters = {"requested": 0, "coalesced": 0, "edited": 0, "unchanged": 0, "missing": 0, "failed": 0}
+
+    def request(
+        self, channel_id, message_id, render, *, on_missing=None, force: bool = False, delay: float | None = None, **edit_kwargs
+    ) -> asyncio.Future:
+        """Schedule an edit of one message; the future resolves to the outcome.
+
+        ``render`` returns an embed or a list of embeds (or an awaitable of
+        either). ``on_missing`` is awaited if the message no longer exists.
+        ``force`` edits even when the content is unchanged. ``delay``
+        replaces the window for callers that already debounced. Extra keyword
+        arguments (such as ``view=None``) are passed to ``edit``.
+        """
+        key = (int(channel_id), int(message_id))
+        self.counters["requested"] += 1
+        entry = self._pending.get(key)
+        if entry is not None:
+            self.counters["coalesced"] += 1
+            entry["render"] = render
+            entry["on_missing"] = on_missing or entry["on_missing"]
+            entry["force"] = entry["force"] or force
+            entry["kwargs"].update(edit_kwargs)
+            return entry["future"]
+        loop = asyncio.get_running_loop()
+        entry = {
+            "render": render,
+            "on_missing": on_missing,
+            "force": force,
+            "kwargs": dict(edit_kwargs),
+            "future": loop.create_future(),
+            "attempts": 0,
+            "queued": time.monotonic(),
+        }
+        self._pending[key] = entry
+        entry["handle"] = loop.call_later(self.window if delay is None else max(0.0, delay), self._start, key)
+        return entry["future"]
+
+    def discard(self, channel_id, message_id):
+        """Drop a pending refresh, e.g. because the caller is deleting the message."""
+        entry = self._pending.pop((int(channel_id), int(message_id)), None)
+        self._hashes.pop(int(message_id), None)
+        if entry is not None:
+            entry["handle"].cancel()
+            if not entry["future"].done():
+                entry["future"].set_result(MISSING)
+
+    def remember(self, message_id, embeds):
+        """Record what a freshly sent message shows, so an identical refresh is skipped."""
+        self._remember(int(message_id), content_hash(_as_list(embeds)))
+
+    def _remember(self, message_id: int, digest: str):
+        self._hashes[message_id] = digest
+        self._hashes.move_to_end(message_id)
+        while len(self._hashes) > HASH_LIMIT:
+            self._hashes.popitem(last=False)
+
+    def _start(self, key):
+        entry = self._pending.pop(key, None)
+        if entry is not None:
+            entry["task"] = asyncio.ensure_future(self._run(key, entry))
+
+    async def flush(self):
+        """Apply every pending edit now (used on shutdown)."""
+        entries = list(self._pending.items())
+        self._pending.clear()
+        for key, entry in entries:
+            entry["handle"].cancel()
+            await self._run(key, entry)
+
+    async def _run(self, key, entry):
+        try:
+            outcome = await self._apply(key, entry)
+        except Exception as exc:
+            log.warning("Embed refresh failed (channel_id=%s message_id=%s error=%s)", key[0], key[1], exc)
+            outcome = FAILED
+        if outcome is None:
+            return
+        self.counters[outcome] += 1
+        if not entry["future"].done():
+            entry["future"].set_result(outcome)
+
+    async def _apply(self, key, entry):
+        channel_id, message_id = key
+        rendered = entry["render"]()
+        if inspect.isawaitable(rendered):
+            rendered = await rendered
+        embeds = _as_list(rendered)
+        digest = content_hash(embeds)
+        if not entry["force"] and self._hashes.get(message_id) == digest:
+            return UNCHANGED
+
+        channel = self.bot.get_channel(channel_id) or await self.bot.fetch_channel(channel_id)
+        try:
+            await channel.get_partial_message(message_id).edit(embeds=embeds, **entry["kwargs"])
+        except discord.NotFound:
+            self._hashes.pop(message_id, None)
+            log.info("Embed message is gone (channel_id=%s message_id=%s)", channel_id, message_id)
+            if entry["on_missing"] is not None:
+                await entry["on_missing"]()
+            return MISSING
+        except Exception as exc:
+            entry["attempts"] += 1
+            if not is_retryable(exc) or entry["attempts"] >= MAX_ATTEMPTS:
+                raise
+            delay = retry_delay(entry["attempts"], getattr(exc, "retry_after", None))
+            log.info("Embed refresh retry scheduled (message_id=%s delay=%.1fs error=%s)", message_id, delay, exc)
+            # A request made meanwhile already has a newer renderer; let it carry this one's future.
+            newer = self._pending.get(key)
+            if newer is not None:
+                newer["future"].add_done_callback(
+                    lambda done, fut=entry["future"]: fut.done() or fut.set_result(done.result())
+                )
+                return None
+            self._pending[key] = entry
+            entry["handle"] = asyncio.get_running_loop().call_later(delay, self._start, key)
+            return None
+        self._remember(message_id, digest)
+        log.info(
+            "Embed refreshed (channel_id=%s message_id=%s embeds=%s waited=%.1fs)",
+            channel_id, message_id, len(embeds), time.monotonic() - entry["queued"],
+        )
+        return EDITED
+
+    def stats(self) -> dict:
+        return {"pending": len(self._pending), "counters": dict(self.counters)}
+
+
+def get_embed_refresher(bot) -> EmbedRefresher:
+    """Return the bot-wide refresher, creating it on first use."""
+    refresher = getattr(bot, "embeds", None)
+    if refresher is None:
+        refresher = EmbedRefresher(bot)
+        bot.embeds = refresher
+    return refresher
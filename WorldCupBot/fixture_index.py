@@ -0,0 +1,109 @@
+"""Per-team fixture index over matches.json.
+
+Kickoffs are parsed once per change of the file (mtime, size and inode) and
+each team gets its fixture ids sorted by kickoff, so a user's schedule is a
+k-way merge of their teams' lists instead of a scan and sort of every
+fixture. Fixtures are kept in a slim projection (no ``live_stats`` or other
+match-centre data) for list views.
+"""
+import datetime
+import hashlib
+import heapq
+import os
+import threading
+
+import json_codec
+
+# Keys list views need; everything else stays in matches.json.
+SLIM_FIELDS = ("id", "home", "away", "utc", "stadium", "group", "stage")
+
+
+def _signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+def _kickoff_ts(fixture) -> float:
+    when = fixture.get("utc") or fixture.get("time") or ""
+    try:
+        dt = datetime.datetime.fromisoformat(str(when).replace("Z", "+00:00"))
+    except ValueError:
+        return 0
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=datetime.timezone.utc)
+    return dt.timestamp()
+
+
+def _fixtures(doc) -> list:
+    if isinstance(doc, dict):
+        doc = next((doc[key] for key in ("fixtures", "matches") if isinstance(doc.get(key), list)), [])
+    return doc if isinstance(doc, list) else []
+
+
+class FixtureIndex:
+    def __init__(self, version: str = ""):
+        self.version = version
+        # fixture id -> slim fixture
+        self.fixtures: dict[str, dict] = {}
+        # team -> [(kickoff ts, fixture id)], kickoff order
+        self.by_team: dict[str, list[tuple[float, str]]] = {}
+
+    @classmethod
+    def build(cls, doc, version: str = "") -> "FixtureIndex":
+        idx = cls(version)
+        for pos, m in enumerate(_fixtures(doc)):
+            if not isinstance(m, dict):
+                continue
+            ts = _kickoff_ts(m)
+            if not ts:
+                continue
+            fid = str(m.get("id") or f"#{pos}")
+            slim = {key: m[key] for key in SLIM_FIELDS if key in m}
+            if "utc" not in slim and m.get("time"):
+                slim["utc"] = m.get("time")
+            idx.fixtures[fid] = slim
+            for team in {m.get("home"), m.get("away")}:
+                if team:
+                    idx.by_team.setdefault(team, []).append((ts, fid))
+        for entries in idx.by_team.values():
+            entries.sort()
+        return idx
+
+    def schedule(self, teams) -> list[dict]:
+        """Slim fixtures involving any of ``teams``, in kickoff order."""
+        out, last = [], None
+        for _, fid in heapq.merge(*(self.by_team.get(team, ()) for team in teams)):
+            # A fixture between two of the teams comes out of the merge twice, back to back.
+            if fid != last:
+                out.append(self.fixtures[fid])
+                last = fid
+        return out
+
+
+_cache: dict[str, tuple] = {}
+_lock = threading.Lock()
+
+
+def _load(path):
+    try:
+        return json_codec.read_file(path)[0]
+    except (OSError, ValueError):
+        return []
+
+
+def get(path, load=None) -> FixtureIndex:
+    """Index for the matches file at ``path``; ``load(path)`` reads it when stale."""
+    path = os.fspath(path)
+    sig = _signature(path)
+    with _lock:
+        cached = _cache.get(path)
+    if cached is not None and cached[0] == sig:
+        return cached[1]
+    version = hashlib.blake2b(repr(sig).encode("utf-8"), digest_size=8).hexdigest()
+    idx = FixtureIndex.build((load or _load)(path), version)
+    with _lock:
+        _cache[path] = (sig, idx)
+    return idx
@@ -0,0 +1,192 @@
+"""What each team needs from the group fixtures still to play.
+
+``scenarios`` takes one group table and its remaining fixtures and plays
+every combination of results. Each fixture takes every scoreline up to a
+goal bound. The bound is as high as the scoreline budget allows: five
+goals a side with two fixtures left, one with six. The scorelines are
+enumerated as arrays, so all of them are ranked at once. The order
+matches ``_build_standings``: points, goal difference, goals scored, then
+the table's fixed tiebreak.
+
+The scorelines are grouped by their win/draw/loss pattern, and each
+pattern reports the best and worst finish of every team. A team's
+``guarantees`` list the patterns that secure first place, a top-two
+finish or a top-three finish:
+
+- ``{"by": "points"}``: the place is secured on points alone, whatever
+  the score.
+- ``{"by": "goals", "goals": bound}``: the place held in every scoreline
+  up to ``bound`` goals a side. A bigger scoreline can still change it.
+
+These are finishing places within the group. The top two qualify, but
+``top_three`` is not qualification: a third-placed team goes through
+only as one of the eight best thirds, which depends on the other groups.
+Each team's ``qualification`` says where things stand on points:
+``"qualified"`` (top two in every pattern), ``"third"`` (third at best
+and at worst, so it rests on the other groups), ``"eliminated"`` (cannot
+finish in the top three), or None while it is open.
+
+Results are memoised by the group's state, so repeated requests between
+two saved results cost a dictionary lookup.
+"""
+import collections
+import threading
+
+import numpy as np
+
+# Most scorelines enumerated for one group.
+MAX_SCORELINES = 200_000
+# Highest goal bound tried per team and fixture.
+MAX_GOALS = 5
+# Group states whose scenarios are kept.
+KEEP = 64
+
+RESULTS = ("home", "draw", "away")
+PLACES = (("first", 1), ("top_two", 2), ("top_three", 3))
+
+_PTS, _GD, _GF = 1 << 24, 1 << 16, 1 << 8
+
+
+def goal_bound(fixtures: int, budget: int = MAX_SCORELINES) -> int:
+    """Highest per-team goal count whose scorelines for ``fixtures`` fit in ``budget``."""
+    for goals in range(MAX_GOALS, 0, -1):
+        if (goals + 1) ** (2 * fixtures) <= budget:
+            return goals
+    raise ValueError(f"{fixtures} fixtures have too many outcomes to enumerate")
+
+
+def _grid(base: int, k: int) -> np.ndarray:
+    """Every combination of ``k`` values in ``range(base)``, one per row."""
+    if not k:
+        return np.zeros((1, 0), dtype=np.int64)
+    return np.indices((base,) * k).reshape(k, -1).T
+
+
+def _positions(key) -> np.ndarray:
+    """1-based table position of every team, per row of ``key`` (higher key ranks higher)."""
+    return (key[:, None, :] > key[:, :, None]).sum(axis=2) + 1
+
+
+def _compute(rows, fixtures, budget) -> dict:
+    teams = [row["team"] for row in rows]
+    index = {team: i for i, team in enumerate(teams)}
+    n, k = len(teams), len(fixtures)
+    # Lower tiebreak ranks higher; only the order within the group matters.
+    tiebreak = np.argsort(np.argsort([row["tiebreak"] for row in rows], kind="stable"), kind="stable")
+    base_key = np.array([row["pts"] * _PTS + row["gd"] * _GD + row["gf"] * _GF for row in rows], dtype=np.int64)
+    base_key += n - tiebreak
+    home_idx = [index[home] for home, _ in fixtures]
+    away_idx = [index[away] for _, away in fixtures]
+
+    goals = goal_bound(k, budget)
+    side = goals + 1
+    scored, conceded = np.divmod(np.arange(side * side), side)
+    points = np.where(scored > conceded, 3, np.where(scored == conceded, 1, 0))
+    # Indexed by home goals * side + away goals.
+    home_delta = points * _PTS + (scored - conceded) * _GD + scored * _GF
+    away_points = np.where(conceded > scored, 3, np.where(scored == conceded, 1, 0))
+    away_delta = away_points * _PTS + (conceded - scored) * _GD + conceded * _GF
+    result_of = np.where(scored > conceded, 0, np.where(scored == conceded, 1, 2))
+
+    score = _grid(side * side, k)
+    key = np.broadcast_to(base_key, (len(score), n)).copy()
+    pattern = np.zeros(len(score), dtype=np.int64)
+    for f in range(k):
+        key[:, home_idx[f]] += home_delta[score[:, f]]
+        key[:, away_idx[f]] += away_delta[score[:, f]]
+        pattern = pattern * 3 + result_of[score[:, f]]
+    positions = _positions(key)
+
+    order = np.argsort(pattern, kind="stable")
+    starts = np.flatnonzero(np.r_[True, np.diff(pattern[order]) != 0])
+    best = np.minimum.reduceat(positions[order], starts, axis=0)
+    worst = np.maximum.reduceat(positions[order], starts, axis=0)
+
+    # Points per pattern are exact: only the scoreline inside a result varies.
+    results = _grid(3, k)
+    pts = np.broadcast_to(np.array([row["pts"] for row in rows]), (len(results), n)).copy()
+    for f in range(k):
+        pts[:, home_idx[f]] += np.array([3, 1, 0])[results[:, f]]
+        pts[:, away_idx[f]] += np.array([0, 1, 3])[results[:, f]]
+    points_worst = (pts[:, None, :] >= pts[:, :, None]).sum(axis=2)
+    points_best = (pts[:, None, :] > pts[:, :, None]).sum(axis=2) + 1
+
+    outcomes = []
+    summary = [
+        {"team": row["team"], "pts": row["pts"], "gd": row["gd"], "gf": row["gf"],
+         "best": int(best[:, i].min()), "worst": int(worst[:, i].max()),
+         "guarantees": {name: [] for name, _ in PLACES}}
+        for i, row in enumerate(rows)
+    ]
+    for p, combo in enumerate(results):
+        labels = [RESULTS[r] for r in combo]
+        outcomes.append({
+            "results": labels,
+            "positions": {team: [int(best[p, i]), int(worst[p, i])] for i, team in enumerate(teams)},
+        })
+        for i, item in enumerate(summary):
+            for name, place in PLACES:
+                if points_worst[p, i] <= place:
+                    item["guarantees"][name].append({"results": labels, "by": "points"})
+                elif worst[p, i] <= place:
+                    item["guarantees"][name].append({"results": labels, "by": "goals", "goals": goals})
+    for i, item in enumerate(summary):
+        # Clinched when every pattern secures the place on points.
+        item["clinched"] = next((name for name, place in PLACES if (points_worst[:, i] <= place).all()), None)
+        item["qualification"] = _qualification(points_best[:, i], points_worst[:, i])
+    return {
+        "fixtures": [{"home": home, "away": away} for home, away in fixtures],
+        "goals": goals,
+        "scorelines": int(len(score)),
+        "outcomes": outcomes,
+        "teams": summary,
+    }
+
+
+def _qualification(best, worst) -> str | None:
+    """Qualification state from a team's best and worst place on points in each pattern."""
+    if (worst <= 2).all():
+        return "qualified"
+    if (best > 3).all():
+        return "eliminated"
+    if (best == 3).all() and (worst == 3).all():
+        return "third"
+    return None
+
+
+_cache: collections.OrderedDict = collections.OrderedDict()
+_lock = threading.Lock()
+stats = {"hits": 0, "misses": 0}
+
+
+def cache_stats() -> dict:
+    return {**stats, "size": len(_cache)}
+
+
+def scenarios(rows, fixtures, budget: int = MAX_SCORELINES) -> dict:
+    """Scenarios for one group, memoised by its table and remaining fixtures.
+
+    ``rows`` are ``{"team", "pts", "gd", "gf", "tiebreak"}`` as in
+    ``tournament_odds.Tournament``. ``fixtures`` are ``(home, away)`` pairs;
+    pairs that are not both in the group are ignored.
+    """
+    members = {row["team"] for row in rows}
+    fixtures = tuple((home, away) for home, away in fixtures if home in members and away in members)
+    state = (
+        tuple((row["team"], row["pts"], row["gd"], row["gf"], row["tiebreak"]) for row in rows),
+        fixtures,
+        budget,
+    )
+    with _lock:
+        hit = _cache.get(state)
+        if hit is not None:
+            _cache.move_to_end(state)
+            stats["hits"] += 1
+            return hit
+        stats["misses"] += 1
+    result = _compute(rows, fixtures, budget)
+    with _lock:
+        _cache[state] = result
+        while len(_cache) > KEEP:
+            _cache.popitem(last=False)
+    return result
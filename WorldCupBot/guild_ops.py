@@ -0,0 +1,166 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Iterable
+
+import discord
+
+from outbound_scheduler import is_retryable, retry_delay
+
+log = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 3
+MAX_ATTEMPTS = 4
+PROGRESS_EVERY = 25
+
+
+class GuildOp:
+    """One Discord API call in a bulk plan.
+
+    ``op_id`` is deterministic (e.g. ``grant:<member>:<role>``) and names the
+    op in logs. ``route`` groups ops that share a Discord rate-limit bucket;
+    ops on one route run one at a time.
+    ``weight`` is what the op counts as in summaries (e.g. roles granted).
+    """
+
+    __slots__ = ("op_id", "route", "run", "weight")
+
+    def __init__(self, op_id: str, route: str, run: Callable[[], Awaitable], weight: int = 1):
+        self.op_id = op_id
+        self.route = route
+        self.run = run
+        self.weight = weight
+
+
+# --------------- Diffing (gateway cache only, no API calls) ---------------
+def plan_role_grants(guild, desired: dict[int, set[int]]) -> dict[int, list[int]]:
+    """Return member_id -> role ids the member should have but does not yet."""
+    missing: dict[int, list[int]] = {}
+    for member_id, role_ids in desired.items():
+        member = guild.get_member(int(member_id))
+        if not member:
+            continue
+        current = {r.id for r in getattr(member, "roles", [])}
+        todo = sorted(rid for rid in role_ids if rid and rid not in current)
+        if todo:
+            missing[int(member_id)] = todo
+    return missing
+
+
+def plan_missing_roles(existing_names: Iterable[str], wanted: Iterable[str]) -> list[str]:
+    """Return wanted role names (deduped, in order) that do not exist yet."""
+    have = set(existing_names)
+    out = []
+    for name in wanted:
+        if name and name not in have:
+            have.add(name)
+            out.append(name)
+    return out
+
+
+def _overwrite_key(overwrites: dict) -> dict:
+    return {
+        getattr(target, "id", target): tuple(int(v.value) for v in ow.pair())
+        for target, ow in (overwrites or {}).items()
+    }
+
+
+def overwrites_match(current: dict, desired: dict) -> bool:
+    """True when a channel's cached overwrites already equal the desired map."""
+    return _overwrite_key(current) == _overwrite_key(desired)
+
+
+# --------------- Execution ---------------
+class BulkExecutor:
+    """Apply a list of GuildOps with bounded concurrency and retry on 429/5xx.
+
+    Nothing is checkpointed between runs: callers diff against the gateway
+    cache each time, so a re-run after a failure only contains the ops that
+    still need applying.
+    """
+
+    def __init__(self, job: str, *, concurrency: int = DEFAULT_CONCURRENCY):
+        self.job = job
+        self.concurrency = max(1, int(concurrency))
+        self.applied = 0
+        self.failed = 0
+
+    async def _run_op(self, op: GuildOp):
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                await op.run()
+                return True
+            except Exception as e:
+                if attempt >= MAX_ATTEMPTS or not is_retryable(e):
+                    log.warning("Guild op failed (job=%s op=%s error=%s)", self.job, op.op_id, e)
+                    return False
+                await asyncio.sleep(retry_delay(attempt, getattr(e, "retry_after", None)))
+
+    async def run(self, ops: list[GuildOp], on_progress: Callable[[int, int], Awaitable] | None = None) -> dict:
+        total = len(ops)
+        if not total:
+            return self.summary()
+
+        log.info("Guild ops starting (job=%s ops=%s)", self.job, total)
+        sem = asyncio.Semaphore(self.concurrency)
+        route_locks: dict[str, asyncio.Lock] = {}
+        finished = 0
+
+        async def _worker(op: GuildOp):
+            nonlocal finished
+            lock = route_locks.setdefault(op.route, asyncio.Lock())
+            async with sem, lock:
+                ok = await self._run_op(op)
+            finished += 1
+            if ok:
+                self.applied += op.weight
+            else:
+                self.failed += 1
+            if finished % PROGRESS_EVERY == 0 or finished == total:
+                log.info("Guild ops progress (job=%s %s/%s)", self.job, finished, total)
+                if on_progress:
+                    try:
+                        await on_progress(finished, total)
+                    except Exception:
+                        pass
+
+        await asyncio.gather(*(_worker(op) for op in ops))
+        return self.summary()
+
+    def summary(self) -> dict:
+        return {"applied": self.applied, "failed": self.failed}
+
+
+def role_grant_ops(guild, missing: dict[int, list[int]], reason: str) -> list[GuildOp]:
+    """Build one op per member; a member missing several roles gets one PATCH."""
+    ops = []
+    for member_id, role_ids in missing.items():
+        member = guild.get_member(member_id)
+        roles = [r for r in (guild.get_role(rid) for rid in role_ids) if r]
+        if not member or not roles:
+            continue
+
+        async def _apply(member=member, roles=roles):
+            # atomic=False sends a single member edit instead of one request
+            # per role, which matters when grants are country + group.
+            await member.add_roles(*roles, reason=reason, atomic=len(roles) == 1)
+
+        op_id = f"grant:{member_id}:{','.join(str(r.id) for r in roles)}"
+        ops.append(GuildOp(op_id, f"member:{member_id}", _apply, weight=len(roles)))
+    return ops
+
+
+def channel_overwrite_ops(plans: Iterable[tuple[discord.abc.GuildChannel, dict]]) -> list[GuildOp]:
+    """Build edit ops only for channels whose overwrites differ from the plan."""
+    ops = []
+    for channel, overwrites in plans:
+        if overwrites_match(getattr(channel, "overwrites", {}), overwrites):
+            continue
+
+        async def _apply(channel=channel, overwrites=overwrites):
+            await channel.edit(overwrites=overwrites)
+
+        digest = hash(tuple(sorted(_overwrite_key(overwrites).items())))
+        ops.append(GuildOp(f"overwrites:{channel.id}:{digest & 0xFFFFFFFF:x}", f"channel:{channel.id}", _apply))
+    return ops
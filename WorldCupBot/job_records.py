@@ -0,0 +1,69 @@
+"""JSON record file shared by the launcher's persisted job queues.
+
+Both queues keep their records as ``{"jobs": [...]}`` in one file, loaded
+once and rewritten after every change, with only the newest ``keep`` finished
+records retained. What happens to a record that was active when the launcher
+stopped is the one thing they differ on, and it is decided here per queue:
+
+- ``job_runner.JobRunner`` (admin jobs: backups, restores, embed posts,
+  Discord syncs): an interrupted job is marked ``failed``. Its work is not
+  known to be safe to repeat, so the admin resubmits it.
+- ``settlement_jobs.SettlementQueue`` (fixture settlement): an interrupted job
+  goes back to ``queued`` and resumes at its first unfinished step. Every
+  settlement step is written to be safe to run again.
+"""
+import os
+import time
+
+import json_codec
+
+FAIL = "fail"
+RESUME = "resume"
+
+
+class JobRecords:
+    """Records in ``path``, with their state under ``state_key``.
+
+    ``on_restart`` is ``FAIL`` or ``RESUME`` (see the module docstring).
+    Callers serialise access with their own lock.
+    """
+
+    def __init__(self, path, *, state_key: str, active, keep: int, on_restart: str):
+        if on_restart not in (FAIL, RESUME):
+            raise ValueError(on_restart)
+        self.path = os.fspath(path)
+        self.state_key = state_key
+        self.active = tuple(active)
+        self.keep = keep
+        self.on_restart = on_restart
+        self._records: list[dict] | None = None
+
+    def load(self) -> list[dict]:
+        if self._records is None:
+            try:
+                doc = json_codec.read_file(self.path)[0]
+            except (OSError, ValueError):
+                doc = {}
+            records = doc.get("jobs") if isinstance(doc, dict) else None
+            self._records = [r for r in records or [] if isinstance(r, dict) and r.get("id")]
+            now = int(time.time())
+            for record in self._records:
+                state = record.get(self.state_key)
+                if self.on_restart == FAIL and state in self.active:
+                    record.update({self.state_key: "failed", "error": "interrupted by a launcher restart", "finished_at": now})
+                elif self.on_restart == RESUME and state == "running":
+                    record[self.state_key] = "queued"
+        return self._records
+
+    def save(self) -> None:
+        """Trim old finished records and rewrite the file; OSError propagates."""
+        records = self.load()
+        finished = [r for r in records if r.get(self.state_key) not in self.active]
+        if len(finished) > self.keep:
+            drop = {r["id"] for r in finished[:-self.keep]}
+            records[:] = [r for r in records if r["id"] not in drop]
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        json_codec.write_file(self.path, {"jobs": records})
+
+    def find(self, job_id) -> dict | None:
+        return next((r for r in self.load() if r["id"] == job_id), None)
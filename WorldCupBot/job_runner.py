@@ -0,0 +1,243 @@
+"""Background jobs for slow admin actions.
+
+Routes submit a registered job kind with its parameters and get a job record
+back straight away; a bounded thread pool runs the job and the admin panel
+polls the record (``/admin/jobs/<id>``) for its state, progress and result.
+
+- Records live in one JSON file (``job_records``) so finished jobs stay
+  visible across launcher restarts. A job that was queued or running when the
+  launcher stopped is marked failed rather than run again; ``job_records``
+  documents why, and how settlement jobs differ.
+- A submit with a ``key`` that matches a queued or running job returns that
+  job instead of starting another, so double clicks and browser retries do
+  not create a second backup or post a second embed.
+- Queued jobs can be cancelled outright; a running job only sees the request
+  through ``Job.cancelled`` / ``Job.check_cancelled()``.
+- CPU-heavy parts of a job can call ``Job.offload(fn, *args)``, which runs
+  them in a process pool when one is configured (``process_workers``) and
+  inline otherwise. Offloaded functions must be importable module-level
+  functions.
+"""
+import concurrent.futures
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+
+import job_records
+
+log = logging.getLogger("launcher")
+
+DEFAULT_WORKERS = 4
+# Jobs allowed to wait for a worker before submits are refused.
+MAX_QUEUED = 50
+# Finished jobs kept in the records file.
+KEEP_FINISHED = 200
+
+ACTIVE = ("queued", "running")
+
+
+class JobError(Exception):
+    """Fail a job with ``error`` and keep ``details`` as its result."""
+
+    def __init__(self, error: str, **details):
+        super().__init__(error)
+        self.details = details
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class QueueFull(Exception):
+    pass
+
+
+class Job:
+    """Handle a job function receives."""
+
+    def __init__(self, runner: "JobRunner", record: dict):
+        self._runner = runner
+        self.id = record["id"]
+        self.kind = record["kind"]
+        self.params = record.get("params") or {}
+
+    @property
+    def cancelled(self) -> bool:
+        return self._runner._cancel_requested(self.id)
+
+    def check_cancelled(self) -> None:
+        if self.cancelled:
+            raise JobCancelled()
+
+    def progress(self, done, total=None, message: str = "") -> None:
+        self._runner._update(self.id, progress={"done": done, "total": total, "message": message})
+
+    def offload(self, fn, *args):
+        pool = self._runner._processes
+        if pool is None:
+            return fn(*args)
+        return pool.submit(fn, *args).result()
+
+
+class JobRunner:
+    def __init__(self, path, workers: int = DEFAULT_WORKERS, process_workers: int = 0):
+        self.path = os.fspath(path)
+        self._kinds: dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._records = job_records.JobRecords(
+            self.path, state_key="state", active=ACTIVE, keep=KEEP_FINISHED, on_restart=job_records.FAIL
+        )
+        self._futures: dict[str, concurrent.futures.Future] = {}
+        self._done: dict[str, threading.Event] = {}
+        self._threads = concurrent.futures.ThreadPoolExecutor(max_workers=max(1, int(workers)), thread_name_prefix="job")
+        # Spawned, not forked: a fork would copy whatever locks the launcher's
+        # threads hold at that moment.
+        self._processes = (
+            concurrent.futures.ProcessPoolExecutor(int(process_workers), mp_context=multiprocessing.get_context("spawn"))
+            if int(process_workers or 0) > 0 else None
+        )
+
+    def register(self, kind: str, fn, *, public: bool = False) -> None:
+        """``fn(job)`` runs jobs of ``kind``; ``public`` kinds may be submitted through /admin/jobs."""
+        self._kinds[kind] = (fn, public)
+
+    def is_public(self, kind: str) -> bool:
+        return bool(self._kinds.get(kind, (None, False))[1])
+
+    # ---- records (callers hold _lock) ----
+    def _load(self) -> list[dict]:
+        return self._records.load()
+
+    def _save(self) -> None:
+        try:
+            self._records.save()
+        except OSError:
+            log.exception("Failed to save job records (%s)", self.path)
+
+    def _find(self, job_id) -> dict | None:
+        return self._records.find(job_id)
+
+    def _update(self, job_id, **fields) -> None:
+        with self._lock:
+            record = self._find(job_id)
+            if record is not None:
+                record.update(fields)
+                self._save()
+
+    def _cancel_requested(self, job_id) -> bool:
+        with self._lock:
+            record = self._find(job_id)
+            return bool(record and record.get("cancel_requested"))
+
+    # ---- public API ----
+    def submit(self, kind: str, params: dict | None = None, *, key: str = "", user: str = "") -> dict:
+        if kind not in self._kinds:
+            raise KeyError(kind)
+        with self._lock:
+            records = self._load()
+            if key:
+                for record in records:
+                    if record.get("key") == key and record.get("state") in ACTIVE:
+                        return dict(record)
+            if sum(1 for r in records if r.get("state") == "queued") >= MAX_QUEUED:
+                raise QueueFull()
+            record = {
+                "id": uuid.uuid4().hex[:12],
+                "kind": kind,
+                "key": key,
+                "state": "queued",
+                "params": params or {},
+                "progress": None,
+                "result": None,
+                "error": "",
+                "user": user,
+                "cancel_requested": False,
+                "created_at": int(time.time()),
+                "started_at": None,
+                "finished_at": None,
+            }
+            records.append(record)
+            self._save()
+            self._done[record["id"]] = threading.Event()
+            self._futures[record["id"]] = self._threads.submit(self._execute, record["id"])
+            return dict(record)
+
+    def get(self, job_id) -> dict | None:
+        with self._lock:
+            record = self._find(job_id)
+            return dict(record) if record else None
+
+    def list(self, limit: int = 50, kind: str = "") -> list[dict]:
+        """Newest first."""
+        with self._lock:
+            records = [r for r in self._load() if not kind or r["kind"] == kind]
+            return [dict(r) for r in reversed(records[-limit:] if limit else records)]
+
+    def cancel(self, job_id) -> dict | None:
+        """Cancel a queued job, or ask a running one to stop. None if the job is unknown."""
+        with self._lock:
+            record = self._find(job_id)
+            if record is None:
+                return None
+            if record["state"] in ACTIVE:
+                future = self._futures.get(job_id)
+                if record["state"] == "queued" and future is not None and future.cancel():
+                    record.update(state="cancelled", finished_at=int(time.time()))
+                    self._finish(job_id)
+                else:
+                    record["cancel_requested"] = True
+                self._save()
+            return dict(record)
+
+    def wait(self, job_id, timeout: float | None = None) -> dict | None:
+        """The job's record once it finishes, or as it stands after ``timeout`` seconds."""
+        event = self._done.get(job_id)
+        if event is not None:
+            event.wait(timeout)
+        return self.get(job_id)
+
+    def shutdown(self) -> None:
+        self._threads.shutdown(wait=False, cancel_futures=True)
+        if self._processes is not None:
+            self._processes.shutdown(wait=False, cancel_futures=True)
+
+    # ---- worker ----
+    def _finish(self, job_id) -> None:
+        self._futures.pop(job_id, None)
+        event = self._done.pop(job_id, None)
+        if event is not None:
+            event.set()
+
+    def _execute(self, job_id) -> None:
+        with self._lock:
+            record = self._find(job_id)
+            if record is None or record["state"] != "queued":
+                return
+            if record.get("cancel_requested"):
+                record.update(state="cancelled", finished_at=int(time.time()))
+                self._save()
+                self._finish(job_id)
+                return
+            record.update(state="running", started_at=int(time.time()))
+            self._save()
+            job = Job(self, record)
+        fn = self._kinds[job.kind][0]
+        fields = {}
+        try:
+            fields = {"state": "done", "result": fn(job)}
+        except JobCancelled:
+            fields = {"state": "cancelled"}
+        except JobError as exc:
+            fields = {"state": "failed", "error": str(exc), "result": exc.details or None}
+        except Exception as exc:
+            log.exception("Job %s failed (id=%s)", job.kind, job_id)
+            fields = {"state": "failed", "error": str(exc) or type(exc).__name__, "error_type": type(exc).__name__}
+        with self._lock:
+            record = self._find(job_id)
+            if record is not None:
+                record.update(fields, finished_at=int(time.time()))
+                self._save()
+            self._finish(job_id)
@@ -0,0 +1,90 @@
+"""JSON encoding shared by every store the launcher and the bot write.
+
+``orjson`` is used when it is installed and the stdlib ``json`` module
+otherwise; both backends read each other's files, so either process can run
+without the accelerated library. Stores are written compact. Pretty-printing
+(``pretty=True``) is reserved for files people open by hand: backups and
+exports.
+
+Set ``WC_JSON_CODEC=json`` to force the stdlib backend.
+"""
+import json
+import os
+
+try:
+    import orjson
+except ImportError:  # Optional speed-up; the stdlib covers everything.
+    orjson = None
+
+_fast = None
+
+
+def set_backend(name: str) -> str:
+    """Select ``"orjson"`` or ``"json"``; falls back to json when orjson is missing."""
+    global _fast
+    _fast = orjson if name == "orjson" and orjson is not None else None
+    return backend()
+
+
+def backend() -> str:
+    return "orjson" if _fast is not None else "json"
+
+
+set_backend("json" if os.environ.get("WC_JSON_CODEC", "").strip().lower() == "json" else "orjson")
+
+
+def dumps(obj, *, pretty: bool = False) -> bytes:
+    """UTF-8 encoded JSON; compact unless ``pretty``."""
+    if _fast is not None:
+        option = _fast.OPT_NON_STR_KEYS | (_fast.OPT_INDENT_2 if pretty else 0)
+        try:
+            return _fast.dumps(obj, option=option)
+        except TypeError:
+            pass  # e.g. integers wider than 64 bits; the stdlib encoder handles them.
+    if pretty:
+        text = json.dumps(obj, indent=2, ensure_ascii=False)
+    else:
+        text = json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+    return text.encode("utf-8")
+
+
+def loads(data):
+    """Parse ``bytes`` or ``str``; raises ValueError on malformed input."""
+    if _fast is not None:
+        try:
+            return _fast.loads(data)
+        except ValueError:
+            pass  # NaN/Infinity from old stdlib writes; json decides whether it is really broken.
+    return json.loads(data)
+
+
+def read_file(path) -> tuple:
+    """(document, size in bytes) of a JSON file; raises OSError or ValueError."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    return loads(raw), len(raw)
+
+
+def write_file_stat(path, obj, *, pretty: bool = False) -> os.stat_result:
+    """Atomically replace ``path`` with ``obj``; returns the stat of the version written.
+
+    The stat is taken before the rename, so it describes this write even if
+    another process replaces the file straight after.
+    """
+    path = os.fspath(path)
+    raw = dumps(obj, pretty=pretty)
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(raw)
+        f.flush()
+        st = os.fstat(f.fileno())
+    os.replace(tmp, path)
+    return st
+
+
+def write_file(path, obj, *, pretty: bool = False) -> int:
+    """Atomically replace ``path`` with ``obj``; returns the bytes written."""
+    return write_file_stat(path, obj, pretty=pretty).st_size
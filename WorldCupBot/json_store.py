@@ -0,0 +1,291 @@
+"""Async JSON storage for the bot's cogs.
+
+Every read and write runs on a small dedicated thread pool, so no coroutine
+touches the disk. Parsed documents are cached by path and reused while the
+file's (mtime, size, inode) is unchanged; callers get their own copy unless they ask
+for the shared, read-only one. Writers to the same file are serialized, writes
+are atomic (temp file + rename) and compact unless ``pretty=True``, and ``defer=True`` turns a write into a
+write-behind that the flush loop coalesces and persists every
+``flush_interval`` seconds.
+
+The module-level ``store`` is what cogs use; bot.py starts and stops it.
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import change_log
+import json_codec
+
+log = logging.getLogger("WorldCupBot.json_store")
+
+DEFAULT_WORKERS = 2
+FLUSH_INTERVAL_SECONDS = 2.0
+
+
+def clone(obj):
+    """Copy a JSON document; much cheaper than ``copy.deepcopy`` for plain dicts/lists."""
+    if isinstance(obj, dict):
+        return {k: clone(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [clone(v) for v in obj]
+    return obj
+
+
+def _signature(st: os.stat_result) -> tuple[int, int, int]:
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+class JsonStore:
+    def __init__(self, max_workers: int = DEFAULT_WORKERS, flush_interval: float = FLUSH_INTERVAL_SECONDS):
+        self.max_workers = max(1, int(max_workers))
+        self.flush_interval = flush_interval
+        self.stats = {
+            "reads": 0,
+            "cache_hits": 0,
+            "loads": 0,
+            "load_errors": 0,
+            "writes": 0,
+            "write_errors": 0,
+            "deferred": 0,
+            "coalesced": 0,
+            "flushes": 0,
+            "io_seconds": 0.0,
+        }
+        # path -> ((mtime_ns, size, inode), document). The inode catches atomic
+        # replaces that land within the filesystem's mtime granularity.
+        self._cache: dict[str, tuple[tuple[int, int, int], object]] = {}
+        # path -> (document, pretty) waiting for the flush loop.
+        self._dirty: dict[str, tuple[object, int | None]] = {}
+        self._lock = threading.Lock()
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._pool: ThreadPoolExecutor | None = None
+        self._task: asyncio.Task | None = None
+
+    # ---------- Plumbing ----------
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="json-store")
+        return self._pool
+
+    async def run(self, fn, *args):
+        """Run a blocking callable on the storage pool (for non-JSON file work)."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor(), fn, *args)
+
+    def lock(self, path) -> asyncio.Lock:
+        """The writer lock for ``path``; hold it around a read-modify-write."""
+        key = os.fspath(path)
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
+
+    @property
+    def write_behind(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    # ---------- Blocking I/O (runs on the pool) ----------
+    def read_blocking(self, path, default=None, copy: bool = True):
+        """Synchronous ``read`` for helpers that are themselves called through ``run``."""
+        path = os.fspath(path)
+        started = time.perf_counter()
+        with self._lock:
+            self.stats["reads"] += 1
+            pending = self._dirty.get(path)
+            if pending is not None:
+                self.stats["cache_hits"] += 1
+                return clone(pending[0]) if copy else pending[0]
+        try:
+            st = os.stat(path)
+        except OSError:
+            return clone(default)
+        with self._lock:
+            cached = self._cache.get(path)
+        if cached is not None and cached[0] == _signature(st):
+            with self._lock:
+                self.stats["cache_hits"] += 1
+            return clone(cached[1]) if copy else cached[1]
+        try:
+            doc, _ = json_codec.read_file(path)
+        except (OSError, ValueError) as e:
+            with self._lock:
+                self.stats["load_errors"] += 1
+            log.warning("Failed to read %s: %s", path, e)
+            return clone(default)
+        with self._lock:
+            self._cache[path] = (_signature(st), doc)
+            self.stats["loads"] += 1
+            self.stats["io_seconds"] += time.perf_counter() - started
+        return clone(doc) if copy else doc
+
+    def write_blocking(self, path, doc, pretty: bool = False) -> tuple[int, int, int]:
+        """Synchronous ``write`` for helpers that are themselves called through ``run``."""
+        path = os.fspath(path)
+        with self._lock:
+            # Anything deferred for this path is older than this write.
+            self._dirty.pop(path, None)
+        return self._write_file(path, clone(doc), pretty)
+
+    def _write_file(self, path: str, doc, pretty: bool) -> tuple[int, int, int]:
+        started = time.perf_counter()
+        sig = _signature(json_codec.write_file_stat(path, doc, pretty=pretty))
+        change_log.record_write(path, doc)
+        with self._lock:
+            self._cache[path] = (sig, doc)
+            self.stats["writes"] += 1
+            self.stats["io_seconds"] += time.perf_counter() - started
+        return sig
+
+    def _defer(self, path: str, doc, pretty: bool) -> None:
+        with self._lock:
+            if path in self._dirty:
+                self.stats["coalesced"] += 1
+            self._dirty[path] = (doc, pretty)
+            self.stats["deferred"] += 1
+
+    def _discard_pending(self, path: str) -> None:
+        with self._lock:
+            self._dirty.pop(path, None)
+
+    # ---------- Public API ----------
+    async def read(self, path, default=None, *, copy: bool = True):
+        """Return the document at ``path``, or a copy of ``default`` if missing or invalid.
+
+        With ``copy=False`` the cached object itself is returned; callers must
+        treat it as read-only.
+        """
+        return await self.run(self.read_blocking, path, default, copy)
+
+    async def write(self, path, data, *, pretty: bool = False, defer: bool = False) -> tuple[int, int, int] | None:
+        """Atomically replace ``path`` with ``data``.
+
+        Returns the (mtime_ns, size, inode) signature of the version written,
+        or None when the write was deferred.
+
+        ``defer=True`` queues the document for the flush loop instead; later
+        reads see it immediately. Without a running flush loop the write goes
+        straight to disk. Only defer files that nothing outside the bot writes:
+        while a document is pending, reads ignore the file and the flush
+        overwrites it.
+        """
+        key = os.fspath(path)
+        async with self.lock(key):
+            doc = await self.run(clone, data)
+            if defer and self.write_behind:
+                self._defer(key, doc, pretty)
+                return None
+            self._discard_pending(key)
+            return await self._write_now(key, doc, pretty)
+
+    async def update(self, path, mutate, default=None, *, pretty: bool = False, defer: bool = False):
+        """Read-modify-write under the path's writer lock.
+
+        ``mutate(doc)`` may change ``doc`` in place or return a replacement.
+        Returns the stored document.
+        """
+        key = os.fspath(path)
+        async with self.lock(key):
+            doc = await self.read(key, default)
+            result = mutate(doc)
+            doc = doc if result is None else result
+            if defer and self.write_behind:
+                self._defer(key, await self.run(clone, doc), pretty)
+            else:
+                self._discard_pending(key)
+                await self._write_now(key, await self.run(clone, doc), pretty)
+        return doc
+
+    async def ensure(self, path, default, *, pretty: bool = False):
+        """Read ``path``, creating it with ``default`` if it is missing or unreadable."""
+        key = os.fspath(path)
+        sentinel = object()
+        doc = await self.read(key, sentinel)
+        if doc is sentinel:
+            await self.write(key, default, pretty=pretty)
+            return clone(default)
+        return doc
+
+    async def exists(self, path) -> bool:
+        key = os.fspath(path)
+        if key in self._dirty:
+            return True
+        return await self.run(os.path.exists, key)
+
+    async def _write_now(self, key: str, doc, pretty: bool) -> tuple[int, int, int]:
+        try:
+            return await self.run(self._write_file, key, doc, pretty)
+        except Exception:
+            with self._lock:
+                self.stats["write_errors"] += 1
+            raise
+
+    async def flush(self) -> None:
+        """Persist every deferred document."""
+        with self._lock:
+            paths = list(self._dirty)
+        for key in paths:
+            async with self.lock(key):
+                with self._lock:
+                    pending = self._dirty.pop(key, None)
+                if pending is None:
+                    continue
+                try:
+                    await self._write_now(key, pending[0], pending[1])
+                except Exception:
+                    log.exception("Failed to flush %s", key)
+                    with self._lock:
+                        # Keep it for the next pass unless something newer arrived.
+                        self._dirty.setdefault(key, pending)
+        if paths:
+            with self._lock:
+                self.stats["flushes"] += 1
+
+    def invalidate(self, path=None) -> None:
+        """Drop cached documents (all of them when ``path`` is None)."""
+        with self._lock:
+            if path is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(os.fspath(path), None)
+
+    # ---------- Lifecycle ----------
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception:
+                log.exception("JSON store flush failed")
+
+    def start(self) -> None:
+        """Enable write-behind on the running loop; call from a coroutine (e.g. setup_hook)."""
+        if not self.write_behind:
+            self._task = asyncio.get_running_loop().create_task(self._flush_loop(), name="json-store-flush")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+        await self.flush()
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            out = dict(self.stats)
+            out["cached"] = len(self._cache)
+            out["pending"] = len(self._dirty)
+        out["io_seconds"] = round(out["io_seconds"], 3)
+        out["write_behind"] = self.write_behind
+        return out
+
+
+store = JsonStore()
@@ -1,12 +1,15 @@
 #!/usr/bin/env python3
-import os, sys, time, json, signal, subprocess, logging, threading, collections
+import os, sys, time, json, signal, subprocess, logging, threading, collections, atexit
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
-from typing import Optional, Deque, TextIO
+from typing import Optional, Deque
 import psutil
 import requests
 from flask import Flask, jsonify, make_response, request, send_from_directory, session
 
+from log_capture import BotLogCapture, DEFAULT_BACKUP_COUNT, DEFAULT_MAX_BYTES, DEFAULT_RING_LINES
+from log_queue import AsyncLogging, JsonFormatter, DEFAULT_QUEUE_SIZE, POLICY_DROP_NEW
+
 # ---------- Paths & Config ----------
 HERE = Path(__file__).resolve().parent
 BASE_DIR = HERE
@@ -37,27 +40,60 @@ def _resolve_log_level(value: str) -> int:
 
 LOG_LEVEL = _resolve_log_level(os.getenv("LOG_LEVEL") or str(CONFIG.get("LOG_LEVEL", "")))
 
-def _mk_logger(name, fname):
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s %(module)s.%(funcName)s:%(lineno)d: %(message)s"
+LOG_JSON = bool(os.getenv("LOG_JSON") or CONFIG.get("log_json", False))
+# Keep 1 in N sub-WARNING records for chatty loggers, e.g. {"werkzeug": 20}.
+LOG_SAMPLING = CONFIG.get("log_sampling") or os.getenv("LOG_SAMPLING") or {}
+
+def _log_formatter() -> logging.Formatter:
+    return JsonFormatter() if LOG_JSON else logging.Formatter(LOG_FORMAT)
+
+# Request threads only enqueue records; a single listener thread does the
+# file and console writes.
+ASYNC_LOG = AsyncLogging(
+    maxsize=int(CONFIG.get("log_queue_size", DEFAULT_QUEUE_SIZE)),
+    policy=str(CONFIG.get("log_overflow_policy", POLICY_DROP_NEW)),
+    sample_rates=LOG_SAMPLING,
+)
+ASYNC_LOG.start()
+atexit.register(ASYNC_LOG.stop)
+
+def _mk_logger(name, fname=None, handlers=None):
     logger = logging.getLogger(name)
     logger.setLevel(LOG_LEVEL)
-    fh = RotatingFileHandler(LOG_DIR / fname, maxBytes=1_000_000, backupCount=3)
-    fmt = logging.Formatter(
-        "%(asctime)s %(levelname)s %(name)s %(module)s.%(funcName)s:%(lineno)d: %(message)s"
-    )
-    fh.setFormatter(fmt)
-    logger.addHandler(fh)
+    fmt = _log_formatter()
+    targets = []
+    if fname:
+        fh = RotatingFileHandler(LOG_DIR / fname, maxBytes=1_000_000, backupCount=3)
+        fh.setFormatter(fmt)
+        targets.append(fh)
+    targets.extend(handlers or [])
     sh = logging.StreamHandler(sys.stdout)
     sh.setFormatter(fmt)
-    logger.addHandler(sh)
+    targets.append(sh)
+    logger.addHandler(ASYNC_LOG.handler(*targets))
     return logger
 
+# bot.log has a single writer: the capture's rotating handler, fed both by the
+# bot child's piped stdout/stderr and by the launcher's own "bot" logger.
+bot_log_capture = BotLogCapture(
+    LOG_DIR / "bot.log",
+    _log_formatter(),
+    ring_lines=int(CONFIG.get("bot_log_ring_lines", DEFAULT_RING_LINES)),
+    max_bytes=int(CONFIG.get("bot_log_max_bytes", DEFAULT_MAX_BYTES)),
+    backup_count=int(CONFIG.get("bot_log_backups", DEFAULT_BACKUP_COUNT)),
+    compress=bool(CONFIG.get("bot_log_compress", False)),
+)
+
 log = _mk_logger("launcher", "launcher.log")
-log_bot = _mk_logger("bot", "bot.log")
+log_bot = _mk_logger("bot", handlers=bot_log_capture.handlers)
 log_health = _mk_logger("health", "health.log")
+# Werkzeug's request log otherwise gets its own stderr handler and bypasses the
+# queue (and with it the log_sampling rates).
+log_access = _mk_logger("werkzeug")
 
 # ---------- Bot process management ----------
 bot_process: Optional[subprocess.Popen] = None
-bot_log_fp: Optional[TextIO] = None
 bot_last_start_ref = {"value": None}
 bot_last_stop_ref = {"value": None}
 _manual_stop_flag = False  # True when stop_bot() intentionally stops the process
@@ -136,6 +172,12 @@ def _spawn_env():
     env = os.environ.copy()
     env["BOT_LOG_STDOUT_ONLY"] = "1"
     env["PYTHONUNBUFFERED"] = "1"
+    if LOG_JSON:
+        env["LOG_JSON"] = "1"
+    env.setdefault("LOG_QUEUE_SIZE", str(CONFIG.get("log_queue_size", DEFAULT_QUEUE_SIZE)))
+    env.setdefault("LOG_OVERFLOW_POLICY", str(CONFIG.get("log_overflow_policy", POLICY_DROP_NEW)))
+    if LOG_SAMPLING and "LOG_SAMPLING" not in env:
+        env["LOG_SAMPLING"] = json.dumps(LOG_SAMPLING) if isinstance(LOG_SAMPLING, dict) else str(LOG_SAMPLING)
     return env
 
 def is_bot_running() -> bool:
@@ -154,7 +196,7 @@ def is_bot_running() -> bool:
     return False
 
 def start_bot() -> bool:
-    global bot_process, bot_log_fp, _manual_stop_flag
+    global bot_process, _manual_stop_flag
     if is_bot_running():
         log_bot.info("start_bot requested but bot already running")
         return True
@@ -164,28 +206,25 @@ def start_bot() -> bool:
     py = sys.executable or "python3"
     bot_py = str(BASE_DIR / "bot.py")
     try:
-        bot_log_fp = open(LOG_DIR / "bot.log", "a", encoding="utf-8")
         bot_process = subprocess.Popen(
             [py, bot_py],
             cwd=str(BASE_DIR),
-            stdout=bot_log_fp,
-            stderr=bot_log_fp,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
             env=_spawn_env()
         )
+        bot_log_capture.attach(bot_process.stdout)
         _manual_stop_flag = False
         bot_last_start_ref["value"] = time.time()
         CTX["bot_process"] = bot_process
         log_bot.info(f"Started bot.py with PID {bot_process.pid}")
         return True
     except Exception as e:
-        if bot_log_fp:
-            bot_log_fp.close()
-            bot_log_fp = None
         log_bot.error(f"Failed to start bot: {e}")
         return False
 
 def stop_bot() -> bool:
-    global bot_process, bot_log_fp, _manual_stop_flag
+    global bot_process, _manual_stop_flag
     _manual_stop_flag = True
     try:
         if bot_process and bot_process.poll() is None:
@@ -209,9 +248,6 @@ def stop_bot() -> bool:
                     pass
         bot_last_stop_ref["value"] = time.time()
         bot_process = None
-        if bot_log_fp:
-            bot_log_fp.close()
-            bot_log_fp = None
         CTX["bot_process"] = None
         log_bot.info("Stopped bot.py")
         return True
@@ -256,9 +292,19 @@ def get_crash_status():
 
 # ---------- Flask app ----------
 from routes_public import create_public_routes
-from routes_admin import create_admin_routes
+from routes_admin import create_admin_routes, start_auto_backup_scheduler
+import bot_telemetry
+import job_runner
+import request_metrics
 
 app = Flask(__name__, static_folder=str(STATIC_DIR), static_url_path="")
+# Installed first so its before_request hook runs ahead of guards that may
+# short-circuit the request.
+request_metrics.install(app)
+request_metrics.metrics.register_gauges("log_queue", ASYNC_LOG.snapshot)
+request_metrics.metrics.register_gauges(
+    "bot", lambda: bot_telemetry.snapshot_gauges(bot_telemetry.read_snapshot(str(BASE_DIR / "JSON")))
+)
 # Session secret
 try:
     if FLASK_SECRET:
@@ -275,6 +321,17 @@ try:
 except Exception as e:
     print(f"[launcher] Failed to set Flask secret key: {e}", file=sys.stderr)
 
+# Slow admin actions (backups, embed posts, bracket edits) run here instead of
+# on request threads. The process pool is off unless job_process_workers is
+# set; with it, backup snapshots are hashed and compressed outside the
+# launcher process.
+JOBS = job_runner.JobRunner(
+    BASE_DIR / "JSON" / "jobs.json",
+    workers=int(CONFIG.get("job_workers", job_runner.DEFAULT_WORKERS)),
+    process_workers=int(CONFIG.get("job_process_workers", 0)),
+)
+atexit.register(JOBS.shutdown)
+
 # Shared context for blueprints
 CTX = {
     "BASE_DIR": str(BASE_DIR),
@@ -285,15 +342,21 @@ CTX = {
     "restart_bot": restart_bot,
     "get_bot_resource_usage": get_bot_resource_usage,
     "get_crash_status": get_crash_status,
+    "get_log_stats": ASYNC_LOG.snapshot,
     "bot_last_start_ref": bot_last_start_ref,
     "bot_last_stop_ref": bot_last_stop_ref,
     "bot_process": None,
+    "JOBS": JOBS,
 
     "LOG_PATHS": {
         "bot": str(LOG_DIR / "bot.log"),
         "health": str(LOG_DIR / "health.log"),
         "launcher": str(LOG_DIR / "launcher.log"),
-    }
+    },
+    # In-memory tails served by the admin log viewer instead of reading disk.
+    "LOG_CAPTURES": {
+        "bot": bot_log_capture,
+    },
 }
 
 # Register routes
@@ -410,6 +473,8 @@ def _handle_sigterm(sig, frame):
     try:
         stop_bot()
     finally:
+        # os._exit skips atexit, so drain queued log records explicitly.
+        ASYNC_LOG.stop()
         os._exit(0)
 
 signal.signal(signal.SIGTERM, _handle_sigterm)
@@ -419,6 +484,9 @@ signal.signal(signal.SIGINT, _handle_sigterm)
 _watchdog = threading.Thread(target=_watchdog_loop, name="bot-watchdog", daemon=True)
 _watchdog.start()
 
+# ---------- Start auto-backup thread ----------
+start_auto_backup_scheduler(CTX)
+
 # ---------- Main ----------
 if __name__ == "__main__":
     host = CONFIG.get("flask_host", "0.0.0.0")
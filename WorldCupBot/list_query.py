@@ -0,0 +1,211 @@
+"""Shared list-query layer for the launcher's list endpoints.
+
+Each endpoint describes its items once with a ``ListSpec`` (stable id, named
+sort keys, allowed filters) and runs ``ListQuery.parse(request.args, spec)``
+over them. The query understands:
+
+* ``fields=a,b``      project each returned item to those keys
+* ``limit=N``         page size (capped at ``MAX_LIMIT``)
+* ``cursor=...``      opaque token from the previous page's ``next_cursor``
+* ``sort=name``       a named sort key, ``-name`` for descending
+* ``<filter>=v1,v2``  endpoint-specific filters; values are OR-ed
+
+Items are filtered and keyed in one streaming pass and only the ``limit + 1``
+smallest keys past the cursor are kept (a bounded heap), so a page never sorts
+or copies the full list. The sort key always ends with the item's id (or its
+position), which makes ordering total and cursors stable across requests.
+"""
+import base64
+import heapq
+import json
+
+from flask import jsonify
+
+MAX_LIMIT = 500
+POSITION = "position"
+
+
+class ListQueryError(ValueError):
+    """Bad query parameters; endpoints answer 400 with the message."""
+
+
+def _norm(value):
+    # Mixed types must still compare: None sorts last, numbers before strings.
+    if value is None:
+        return (1, 0, 0)
+    if isinstance(value, bool):
+        return (0, 0, int(value))
+    if isinstance(value, (int, float)):
+        return (0, 0, value)
+    return (0, 1, str(value))
+
+
+def _tuples(value):
+    return tuple(_tuples(v) for v in value) if isinstance(value, list) else value
+
+
+class ListSpec:
+    """How an endpoint's items are identified, sorted and filtered.
+
+    ``sorts`` maps a name to ``fn(item) -> value``; ``filters`` maps a query
+    parameter to ``fn(item, values) -> bool`` where ``values`` is the set of
+    comma-separated values from the request. Without a ``sort`` parameter the
+    ``default_sort`` applies; ``"position"`` (the source order) always exists.
+    """
+
+    def __init__(self, id_of=None, sorts=None, filters=None, default_sort=POSITION):
+        self.id_of = id_of
+        self.sorts = dict(sorts or {})
+        self.filters = dict(filters or {})
+        self.default_sort = default_sort
+
+    def key(self, sort, item, pos):
+        tiebreak = str(self.id_of(item) or "") if self.id_of else pos
+        if sort == POSITION:
+            return ((0, 0, pos), tiebreak)
+        return (_norm(self.sorts[sort](item)), tiebreak)
+
+
+class Page:
+    __slots__ = ("items", "next_cursor", "total", "paged")
+
+    def __init__(self, items, next_cursor, total, paged=False):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.total = total
+        self.paged = paged
+
+
+class ListQuery:
+    def __init__(self, spec, *, fields=None, limit=None, cursor=None, sort=None, desc=False, filters=None):
+        self.spec = spec
+        self.fields = fields
+        self.limit = limit
+        self.sort = sort or spec.default_sort
+        self.desc = desc
+        self.filters = filters or {}
+        self.cursor = self._decode_cursor(cursor) if cursor else None
+
+    @classmethod
+    def parse(cls, args, spec, max_limit=MAX_LIMIT):
+        """Build a query from ``request.args``; raises ListQueryError on bad input."""
+        fields = [f.strip() for f in (args.get("fields") or "").split(",") if f.strip()] or None
+
+        limit = None
+        if args.get("limit") not in (None, ""):
+            try:
+                limit = int(args.get("limit"))
+            except (TypeError, ValueError):
+                raise ListQueryError("limit must be an integer")
+            if limit < 1:
+                raise ListQueryError("limit must be positive")
+            limit = min(limit, max_limit)
+
+        raw_sort = str(args.get("sort") or "").strip()
+        desc = raw_sort.startswith("-")
+        sort = raw_sort.lstrip("-") or None
+        if sort and sort != POSITION and sort not in spec.sorts:
+            raise ListQueryError(f"unknown sort '{sort}'; use one of: {', '.join([POSITION, *spec.sorts])}")
+
+        filters = {}
+        for name in spec.filters:
+            values = {v.strip().casefold() for v in str(args.get(name) or "").split(",") if v.strip()}
+            if values:
+                filters[name] = values
+
+        return cls(spec, fields=fields, limit=limit, cursor=args.get("cursor"), sort=sort, desc=desc, filters=filters)
+
+    @property
+    def active(self) -> bool:
+        """True when the request asked for anything beyond the endpoint's plain list."""
+        return bool(self.fields or self.limit or self.cursor is not None or self.filters
+                    or self.sort != self.spec.default_sort or self.desc)
+
+    # ---------- Cursors ----------
+    def _encode_cursor(self, key) -> str:
+        raw = json.dumps([self.sort, self.desc, key], separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+    def _decode_cursor(self, token):
+        try:
+            raw = base64.urlsafe_b64decode(str(token) + "=" * (-len(str(token)) % 4))
+            sort, desc, key = json.loads(raw)
+        except Exception:
+            raise ListQueryError("invalid cursor")
+        if sort != self.sort or bool(desc) != self.desc:
+            raise ListQueryError("cursor belongs to a different sort order")
+        return _tuples(key)
+
+    # ---------- Evaluation ----------
+    def _project(self, item):
+        if not self.fields or not isinstance(item, dict):
+            return item
+        return {f: item[f] for f in self.fields if f in item}
+
+    def apply(self, items, transform=None) -> Page:
+        """Filter, order and cut ``items`` (any iterable) into one page.
+
+        ``transform(page_items) -> items`` runs on the selected page before
+        projection, for enrichment that is too costly to do for every item.
+        """
+        spec, sort, cursor, desc = self.spec, self.sort, self.cursor, self.desc
+        predicates = [(spec.filters[name], values) for name, values in self.filters.items()]
+        counted = [0]
+
+        def keyed():
+            for pos, item in enumerate(items):
+                if predicates and not all(pred(item, values) for pred, values in predicates):
+                    continue
+                counted[0] += 1
+                key = spec.key(sort, item, pos)
+                if cursor is not None and not (key < cursor if desc else key > cursor):
+                    continue
+                yield key, item
+
+        by_key = lambda pair: pair[0]
+        if not self.limit and cursor is None and sort == POSITION and not desc:
+            # Plain request: the source order is already the answer.
+            chosen = list(keyed())
+        elif self.limit:
+            pick = heapq.nlargest if desc else heapq.nsmallest
+            chosen = pick(self.limit + 1, keyed(), key=by_key)
+        else:
+            chosen = sorted(keyed(), key=by_key, reverse=desc)
+        more = bool(self.limit) and len(chosen) > self.limit
+        if more:
+            chosen = chosen[:self.limit]
+        next_cursor = self._encode_cursor(chosen[-1][0]) if more else None
+        page = [item for _, item in chosen]
+        if transform is not None:
+            page = transform(page)
+        paged = bool(self.limit) or cursor is not None
+        return Page([self._project(item) for item in page], next_cursor, counted[0], paged)
+
+
+def casefold_in(*getters):
+    """Filter matching when any getter's value (case-insensitively) is one of the values."""
+    def match(item, values):
+        return any(str(get(item) or "").strip().casefold() in values for get in getters)
+    return match
+
+
+def respond(page: Page, envelope: dict | None = None, key: str | None = None):
+    """jsonify a page, as a bare list or inside ``envelope[key]``.
+
+    Paging metadata always goes in headers, and into the envelope as well for
+    paged requests; unpaged responses keep the endpoint's original shape.
+    """
+    if envelope is None:
+        resp = jsonify(page.items)
+    elif page.paged:
+        resp = jsonify({**envelope, key: page.items, "next_cursor": page.next_cursor, "total": page.total})
+    else:
+        resp = jsonify({**envelope, key: page.items})
+    resp.headers["X-Total-Count"] = str(page.total)
+    if page.next_cursor:
+        resp.headers["X-Next-Cursor"] = page.next_cursor
+    return resp
+
+
+def error_response(exc: ListQueryError):
+    return jsonify({"ok": False, "error": str(exc)}), 400
@@ -0,0 +1,167 @@
+"""Launcher-side capture of the bot's stdout/stderr.
+
+The bot child writes to a pipe; a reader thread feeds each line into a single
+rotating file handler and a bounded in-memory ring. The launcher's own
+``bot`` logger shares the same two handlers, so bot.log has exactly one
+writer and the admin viewer can serve recent lines without touching disk.
+"""
+import collections
+import gzip
+import itertools
+import logging
+import os
+import shutil
+import threading
+from logging.handlers import RotatingFileHandler
+
+DEFAULT_RING_LINES = 5000
+DEFAULT_MAX_BYTES = 5_000_000
+DEFAULT_BACKUP_COUNT = 5
+
+
+def _gzip_rotator(source: str, dest: str) -> None:
+    with open(source, "rb") as src, gzip.open(dest, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(source)
+
+
+def rotating_handler(path, max_bytes: int = DEFAULT_MAX_BYTES, backup_count: int = DEFAULT_BACKUP_COUNT,
+                     compress: bool = False) -> RotatingFileHandler:
+    """RotatingFileHandler that optionally gzips rotated files (bot.log.1.gz, ...)."""
+    handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+    if compress:
+        handler.namer = lambda name: f"{name}.gz"
+        handler.rotator = _gzip_rotator
+    return handler
+
+
+class LogRing:
+    """Bounded buffer of recent log lines addressed by a monotonically increasing sequence.
+
+    The cursor handed to clients is the sequence number of the next line, so
+    polls cost O(new lines) and a cursor that fell off the end is detectable.
+    """
+
+    def __init__(self, maxlen: int = DEFAULT_RING_LINES):
+        self._lines: collections.deque[str] = collections.deque(maxlen=maxlen)
+        self._next_seq = 0
+        self._lock = threading.Lock()
+
+    def append(self, line: str) -> None:
+        with self._lock:
+            self._lines.append(line)
+            self._next_seq += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._lines.clear()
+
+    def _last(self, count: int) -> list[str]:
+        return list(itertools.islice(reversed(self._lines), count))[::-1]
+
+    def tail(self, max_lines: int, flt=None) -> tuple[list[str], int]:
+        """Return (last lines, cursor); mirrors ``log_tail.tail``."""
+        with self._lock:
+            cursor = self._next_seq
+            if flt is not None and flt.active:
+                lines = list(self._lines)
+            else:
+                return self._last(max_lines), cursor
+        return flt.apply(lines)[-max_lines:], cursor
+
+    def read_since(self, cursor: int) -> tuple[list[str], int, bool]:
+        """Return (lines after cursor, new cursor, reset); mirrors ``log_tail.read_since``."""
+        with self._lock:
+            first_seq = self._next_seq - len(self._lines)
+            if cursor < first_seq or cursor > self._next_seq:
+                return [], self._next_seq, True
+            return self._last(self._next_seq - cursor), self._next_seq, False
+
+    def verdict(self, flt, cursor: int) -> bool:
+        """``flt.verdict`` for the lines before ``cursor``; mirrors ``LogFilter.verdict_at``."""
+        with self._lock:
+            skip = max(0, self._next_seq - cursor)
+            return flt.verdict(itertools.islice(reversed(self._lines), skip, None))
+
+
+class RingHandler(logging.Handler):
+    def __init__(self, ring: LogRing):
+        super().__init__()
+        self.ring = ring
+
+    def emit(self, record):
+        try:
+            self.ring.append(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+
+class PassthroughFormatter(logging.Formatter):
+    """Formats launcher records with ``inner`` but leaves captured child lines untouched."""
+
+    def __init__(self, inner: logging.Formatter):
+        super().__init__()
+        self.inner = inner
+
+    def format(self, record):
+        if getattr(record, "raw_line", False):
+            return record.getMessage()
+        return self.inner.format(record)
+
+
+class BotLogCapture:
+    """Owns bot.log's only writer and the ring buffer behind /admin/log/bot."""
+
+    def __init__(self, path, fmt: str | logging.Formatter, ring_lines: int = DEFAULT_RING_LINES,
+                 max_bytes: int = DEFAULT_MAX_BYTES, backup_count: int = DEFAULT_BACKUP_COUNT,
+                 compress: bool = False):
+        self.ring = LogRing(ring_lines)
+        inner = fmt if isinstance(fmt, logging.Formatter) else logging.Formatter(fmt)
+        formatter = PassthroughFormatter(inner)
+        self.file_handler = rotating_handler(path, max_bytes, backup_count, compress)
+        self.file_handler.setFormatter(formatter)
+        self.ring_handler = RingHandler(self.ring)
+        self.ring_handler.setFormatter(formatter)
+        self._readers: list[threading.Thread] = []
+
+    @property
+    def handlers(self) -> list[logging.Handler]:
+        return [self.file_handler, self.ring_handler]
+
+    def write_line(self, line: str) -> None:
+        # Child lines are already formatted by the bot, and must not be
+        # dropped by the launcher's own log level, so bypass the logger.
+        record = logging.makeLogRecord({
+            "name": "bot", "msg": line, "levelno": logging.INFO, "levelname": "INFO", "raw_line": True,
+        })
+        for handler in self.handlers:
+            handler.handle(record)
+
+    def _pump(self, stream) -> None:
+        try:
+            for raw in iter(stream.readline, b""):
+                line = raw.decode("utf-8", "replace").rstrip("\r\n")
+                if line:
+                    self.write_line(line)
+        except (OSError, ValueError):
+            pass
+        finally:
+            try:
+                stream.close()
+            except Exception:
+                pass
+
+    def attach(self, stream) -> threading.Thread:
+        """Start a daemon thread that drains ``stream`` (a binary pipe) until EOF."""
+        self._readers = [t for t in self._readers if t.is_alive()]
+        reader = threading.Thread(target=self._pump, args=(stream,), name="bot-log-reader", daemon=True)
+        reader.start()
+        self._readers.append(reader)
+        return reader
+
+    def clear(self) -> None:
+        self.ring.clear()
+        with self.file_handler.lock:
+            if self.file_handler.stream is not None:
+                self.file_handler.stream.seek(0)
+                self.file_handler.stream.truncate()
@@ -0,0 +1,195 @@
+"""Non-blocking logging shared by the launcher and the bot.
+
+Loggers get a ``QueueHandler`` that only enqueues the record; one
+``QueueListener`` thread does the file and console I/O. The queue is bounded
+so a burst (or a stuck disk) can never grow memory or stall a request thread
+or the event loop: overflowing records are dropped and counted instead.
+"""
+import datetime
+import json
+import logging
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+DEFAULT_QUEUE_SIZE = 10_000
+
+# What to do with a record when the queue is full.
+POLICY_DROP_NEW = "drop_new"
+POLICY_DROP_OLDEST = "drop_oldest"
+POLICIES = (POLICY_DROP_NEW, POLICY_DROP_OLDEST)
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line.
+
+    ``ts``, ``level`` and ``logger`` always come first so the admin log
+    viewer's filters can read them without parsing the whole line.
+    """
+
+    def format(self, record):
+        payload = {
+            "ts": datetime.datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "where": f"{record.module}.{record.funcName}:{record.lineno}",
+            "msg": record.getMessage(),
+        }
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+def parse_sample_rates(value) -> dict[str, int]:
+    """Accept {"werkzeug": 10} or "werkzeug=10,discord.gateway=20" and return logger -> N."""
+    if not value:
+        return {}
+    if isinstance(value, str):
+        pairs = (item.split("=", 1) for item in value.split(",") if "=" in item)
+        value = {k.strip(): v.strip() for k, v in pairs}
+    out = {}
+    if isinstance(value, dict):
+        for name, rate in value.items():
+            try:
+                rate = int(rate)
+            except (TypeError, ValueError):
+                continue
+            if name and rate > 1:
+                out[str(name)] = rate
+    return out
+
+
+class SamplingFilter(logging.Filter):
+    """Keep one in N records below WARNING for loggers matching a configured prefix."""
+
+    def __init__(self, rates: dict[str, int], stats: dict):
+        super().__init__()
+        # Longest prefix first so "discord.gateway" wins over "discord".
+        self.rates = sorted(rates.items(), key=lambda kv: len(kv[0]), reverse=True)
+        self.stats = stats
+        self._seen: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _rate_for(self, name: str) -> int:
+        for prefix, rate in self.rates:
+            if name == prefix or name.startswith(prefix + "."):
+                return rate
+        return 1
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        rate = self._rate_for(record.name)
+        if rate <= 1:
+            return True
+        with self._lock:
+            seen = self._seen.get(record.name, 0)
+            self._seen[record.name] = seen + 1
+            if seen % rate == 0:
+                return True
+            self.stats["sampled_out"] += 1
+        return False
+
+
+class _RoutedQueueHandler(QueueHandler):
+    def __init__(self, owner: "AsyncLogging", route: int):
+        super().__init__(owner.queue)
+        self.owner = owner
+        self.route = route
+
+    def prepare(self, record):
+        record = super().prepare(record)
+        record.log_route = self.route
+        return record
+
+    def enqueue(self, record):
+        self.owner._put(record)
+
+
+class _Dispatcher(logging.Handler):
+    """Listener-side handler that forwards each record to its route's real handlers."""
+
+    def __init__(self, owner: "AsyncLogging"):
+        super().__init__()
+        self.owner = owner
+
+    def handle(self, record):
+        for handler in self.owner._routes.get(getattr(record, "log_route", None), ()):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+        return True
+
+    def emit(self, record):  # pragma: no cover - handle() does the work
+        pass
+
+
+class _Listener(QueueListener):
+    def enqueue_sentinel(self):
+        # The queue may be full at shutdown; wait for room rather than raising.
+        self.queue.put(self._sentinel)
+
+
+class AsyncLogging:
+    """A bounded log queue, its listener thread and the drop/sampling counters."""
+
+    def __init__(self, maxsize: int = DEFAULT_QUEUE_SIZE, policy: str = POLICY_DROP_NEW, sample_rates=None):
+        self.queue: queue.Queue = queue.Queue(maxsize=max(1, int(maxsize)))
+        self.policy = policy if policy in POLICIES else POLICY_DROP_NEW
+        self.stats = {"enqueued": 0, "dropped": 0, "sampled_out": 0, "high_water": 0}
+        self._stats_lock = threading.Lock()
+        self.sampler = SamplingFilter(parse_sample_rates(sample_rates), self.stats)
+        self._routes: dict[int, list[logging.Handler]] = {}
+        self._listener = _Listener(self.queue, _Dispatcher(self))
+        self._started = False
+
+    def handler(self, *targets: logging.Handler) -> logging.Handler:
+        """Return a queue handler whose records are written by ``targets`` on the listener thread."""
+        route = len(self._routes)
+        self._routes[route] = list(targets)
+        handler = _RoutedQueueHandler(self, route)
+        handler.addFilter(self.sampler)
+        return handler
+
+    def _put(self, record) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._stats_lock:
+                self.stats["dropped"] += 1
+            if self.policy != POLICY_DROP_OLDEST:
+                return
+            try:
+                self.queue.get_nowait()
+                self.queue.put_nowait(record)
+            except (queue.Empty, queue.Full):
+                return
+        with self._stats_lock:
+            self.stats["enqueued"] += 1
+            depth = self.queue.qsize()
+            if depth > self.stats["high_water"]:
+                self.stats["high_water"] = depth
+
+    def start(self) -> None:
+        if not self._started:
+            self._listener.start()
+            self._started = True
+
+    def stop(self) -> None:
+        """Drain the queue and stop the listener thread."""
+        if self._started:
+            self._listener.stop()
+            self._started = False
+        for handlers in self._routes.values():
+            for handler in handlers:
+                try:
+                    handler.flush()
+                except Exception:
+                    pass
+
+    def snapshot(self) -> dict:
+        with self._stats_lock:
+            out = dict(self.stats)
+        out["depth"] = self.queue.qsize()
+        out["capacity"] = self.queue.maxsize
+        out["policy"] = self.policy
+        return out
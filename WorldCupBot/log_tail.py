@@ -0,0 +1,213 @@
+"""Cheap log reads for the admin log viewer.
+
+Both entry points touch only the bytes they return: ``tail`` walks the file
+backwards in fixed-size blocks and ``read_since`` seeks straight to a byte
+cursor, so a multi-hundred-megabyte bot.log costs the same as a small one.
+"""
+import logging
+import os
+import re
+
+BLOCK_SIZE = 64 * 1024
+# Upper bound on bytes scanned backwards when filters reject most lines.
+MAX_SCAN_BYTES = 16 * 1024 * 1024
+MAX_READ_BYTES = 1024 * 1024
+MAX_PATTERN_LENGTH = 200
+
+# Matches every format in use:
+#   launcher: "2026-06-11 18:00:00,123 INFO launcher module.func:12: msg"
+#   bot:      "2026-06-11 18:00:00,123 | INFO | WorldCupBot | module.func:12 | msg"
+#   json:     '{"ts": "2026-06-11T18:00:00.123", "level": "INFO", "logger": "launcher", ...}'
+_HEADER_RE = re.compile(
+    r"^\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:[,.]\d+)?\s*\|?\s*"
+    r"(?P<level>DEBUG|INFO|WARNING|ERROR|CRITICAL)\s*\|?\s*(?P<logger>[^\s|]+)"
+    r'|^\{"ts": "[^"]*", "level": "(?P<jlevel>[A-Z]+)", "logger": "(?P<jlogger>[^"]+)"'
+)
+
+
+def _header_fields(header) -> tuple[str, str]:
+    return (header.group("level") or header.group("jlevel"), header.group("logger") or header.group("jlogger"))
+
+
+def iter_lines_reverse(path: str, end: int | None = None, max_bytes: int = MAX_SCAN_BYTES):
+    """Yield decoded lines from ``end`` (default EOF) backwards, newest first."""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell() if end is None else min(end, f.tell())
+        if pos > 0:
+            # Drop the final newline so it does not read as an empty last line.
+            f.seek(pos - 1)
+            if f.read(1) == b"\n":
+                pos -= 1
+        stop = max(0, pos - max_bytes)
+        tail = b""
+        while pos > stop:
+            step = min(BLOCK_SIZE, pos - stop)
+            pos -= step
+            f.seek(pos)
+            chunk = f.read(step) + tail
+            lines = chunk.split(b"\n")
+            # The first piece may be a partial line; carry it into the next block.
+            tail = lines.pop(0)
+            for line in reversed(lines):
+                yield line.rstrip(b"\r").decode("utf-8", "ignore")
+        if tail and stop == 0:
+            yield tail.rstrip(b"\r").decode("utf-8", "ignore")
+
+
+class LogFilter:
+    """Server-side line filter on level threshold, logger prefix and regex.
+
+    Traceback and other continuation lines have no header of their own, so
+    they are judged by the record header that precedes them.
+    """
+
+    def __init__(self, level: str = "", logger: str = "", pattern: str = ""):
+        level = (level or "").strip().upper()
+        self.min_level = logging.getLevelName(level) if level else 0
+        if not isinstance(self.min_level, int):
+            raise ValueError("invalid_level")
+        self.logger = (logger or "").strip()
+        pattern = (pattern or "").strip()
+        if len(pattern) > MAX_PATTERN_LENGTH:
+            raise ValueError("pattern_too_long")
+        try:
+            self.regex = re.compile(pattern, re.IGNORECASE) if pattern else None
+        except re.error:
+            raise ValueError("invalid_regex")
+
+    @property
+    def active(self) -> bool:
+        return bool(self.min_level or self.logger or self.regex)
+
+    def _header_ok(self, header) -> bool:
+        if header is None:
+            return not (self.min_level or self.logger)
+        level, logger = _header_fields(header)
+        levelno = logging.getLevelName(level)
+        if self.min_level and (not isinstance(levelno, int) or levelno < self.min_level):
+            return False
+        if self.logger and not logger.startswith(self.logger):
+            return False
+        return True
+
+    def verdict(self, lines_before) -> bool:
+        """Whether the record open at a cursor passes, given the lines before it newest first.
+
+        Polls start at a cursor that can sit inside a record (a traceback
+        split across two reads), so its continuation lines need the verdict
+        of the header that came before the cursor.
+        """
+        if not (self.min_level or self.logger):
+            return True
+        for line in lines_before:
+            header = _HEADER_RE.match(line)
+            if header is not None:
+                return self._header_ok(header)
+        return False
+
+    def verdict_at(self, path: str, cursor: int) -> bool:
+        """``verdict`` for a byte cursor into ``path``."""
+        if not (self.min_level or self.logger) or cursor <= 0:
+            return not (self.min_level or self.logger)
+        return self.verdict(iter_lines_reverse(path, cursor, MAX_READ_BYTES))
+
+    def apply(self, lines: list[str], header_ok: bool | None = None) -> list[str]:
+        """Filter lines in file order; ``header_ok`` is the verdict carried in from before them."""
+        if not self.active:
+            return lines
+        out = []
+        if header_ok is None:
+            header_ok = not (self.min_level or self.logger)
+        for line in lines:
+            header = _HEADER_RE.match(line)
+            if header is not None:
+                header_ok = self._header_ok(header)
+            if header_ok and (self.regex is None or self.regex.search(line)):
+                out.append(line)
+        return out
+
+    def tail(self, path: str, max_lines: int, end: int | None = None) -> list[str]:
+        """Return the last ``max_lines`` matching lines before ``end`` in file order."""
+        out: list[str] = []
+        pending: list[str] = []  # continuation lines waiting for their header
+        for line in iter_lines_reverse(path, end):
+            header = _HEADER_RE.match(line)
+            if header is None and (self.min_level or self.logger):
+                pending.append(line)
+                continue
+            group = [line] + pending[::-1]
+            pending = []
+            if not self._header_ok(header):
+                continue
+            for item in reversed(group):
+                if self.regex is None or self.regex.search(item):
+                    out.append(item)
+            if len(out) >= max_lines:
+                break
+        return out[:max_lines][::-1]
+
+
+def aligned_size(path: str) -> int:
+    """File size rounded down to the end of the last complete line."""
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return 0
+    if size == 0:
+        return 0
+    with open(path, "rb") as f:
+        pos = size
+        while pos > 0:
+            step = min(BLOCK_SIZE, pos)
+            f.seek(pos - step)
+            chunk = f.read(step)
+            idx = chunk.rfind(b"\n")
+            if idx != -1:
+                return pos - step + idx + 1
+            pos -= step
+    return 0
+
+
+def tail(path: str, max_lines: int, flt: LogFilter | None = None) -> tuple[list[str], int]:
+    """Return (last lines, cursor) where cursor points just past the last full line."""
+    if not os.path.isfile(path):
+        return [], 0
+    end = aligned_size(path)
+    if flt is not None and flt.active:
+        return flt.tail(path, max_lines, end), end
+    lines = []
+    for line in iter_lines_reverse(path, end):
+        lines.append(line)
+        if len(lines) >= max_lines:
+            break
+    return lines[::-1], end
+
+
+def read_since(path: str, cursor: int, max_bytes: int = MAX_READ_BYTES) -> tuple[list[str], int, bool]:
+    """Return (complete lines after cursor, new cursor, reset).
+
+    ``reset`` is True when the file shrank below the cursor (cleared or
+    rotated); callers should then fall back to a fresh ``tail``.
+    """
+    if not os.path.isfile(path):
+        return [], 0, cursor > 0
+    size = os.path.getsize(path)
+    if cursor > size:
+        return [], 0, True
+    if cursor == size:
+        return [], cursor, False
+    with open(path, "rb") as f:
+        f.seek(cursor)
+        data = f.read(min(max_bytes, size - cursor))
+    idx = data.rfind(b"\n")
+    if idx == -1:
+        if len(data) < max_bytes:
+            # A single partial line; wait for the writer to finish it.
+            return [], cursor, False
+        # One line longer than a whole read: hand it out in pieces, or the
+        # cursor would never get past it.
+        return [data.rstrip(b"\r").decode("utf-8", "ignore")], cursor + len(data), False
+    data = data[: idx + 1]
+    lines = [ln.rstrip(b"\r").decode("utf-8", "ignore") for ln in data.split(b"\n")[:-1]]
+    return lines, cursor + len(data), False
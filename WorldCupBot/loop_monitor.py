@@ -0,0 +1,163 @@
+"""Event-loop stall detector for the bot.
+
+A heartbeat coroutine wakes every ``interval`` seconds and records how late
+it was scheduled (loop lag). A watchdog thread notices when the heartbeat has
+not run for longer than ``threshold`` and captures the loop thread's current
+stack, so a blocking ``json.load`` inside a cog shows up with its file, line
+and the task that was running. Captured stalls go to a bounded ring buffer and
+the log; counters are included in the bot telemetry snapshot.
+"""
+import asyncio
+import collections
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+
+log = logging.getLogger("WorldCupBot.loop_monitor")
+
+DEFAULT_THRESHOLD_SECONDS = 0.25
+DEFAULT_INTERVAL_SECONDS = 0.1
+DEFAULT_RING_SIZE = 50
+STACK_DEPTH = 12
+_COGS_MARKER = f"{os.sep}COGS{os.sep}"
+
+
+def cog_from_stack(frames) -> str | None:
+    """Name of the innermost cog module in a list of FrameSummary objects."""
+    for fs in reversed(frames):
+        if _COGS_MARKER in fs.filename:
+            return os.path.splitext(os.path.basename(fs.filename))[0]
+    return None
+
+
+class StallDetector:
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD_SECONDS, interval: float = DEFAULT_INTERVAL_SECONDS,
+                 ring_size: int = DEFAULT_RING_SIZE):
+        self.threshold = threshold
+        self.interval = interval
+        self.events: collections.deque[dict] = collections.deque(maxlen=ring_size)
+        self.stats = {
+            "stalls": 0,
+            "stall_seconds": 0.0,
+            "max_stall_ms": 0.0,
+            "lag_max_ms": 0.0,
+            "lag_avg_ms": 0.0,
+            "beats": 0,
+        }
+        self.by_cog: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread: int | None = None
+        self._beat = time.monotonic()
+        self._current: dict | None = None
+        self._task: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    # ---------- Loop side ----------
+    async def _heartbeat(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._beat = now
+            self._record_lag(max(0.0, now - expected))
+
+    def _record_lag(self, lag: float) -> None:
+        lag_ms = lag * 1000
+        with self._lock:
+            s = self.stats
+            s["beats"] += 1
+            # Exponential moving average keeps this O(1) per beat.
+            s["lag_avg_ms"] = round(s["lag_avg_ms"] * 0.98 + lag_ms * 0.02, 3)
+            if lag_ms > s["lag_max_ms"]:
+                s["lag_max_ms"] = round(lag_ms, 2)
+            if lag < self.threshold:
+                return
+            s["stalls"] += 1
+            s["stall_seconds"] = round(s["stall_seconds"] + lag, 3)
+            if lag_ms > s["max_stall_ms"]:
+                s["max_stall_ms"] = round(lag_ms, 2)
+            event, self._current = self._current, None
+            if event is not None:
+                event["duration_ms"] = round(lag_ms, 1)
+                cog = event.get("cog") or "?"
+                self.by_cog[cog] = self.by_cog.get(cog, 0) + 1
+        if event is not None:
+            log.warning(
+                "Event loop stalled for %.0f ms (cog=%s task=%s at %s)",
+                lag_ms, event.get("cog") or "-", event.get("task") or "-", event.get("where") or "?",
+            )
+        else:
+            log.warning("Event loop stalled for %.0f ms (no stack captured)", lag_ms)
+
+    # ---------- Watchdog thread ----------
+    def _running_task(self):
+        try:
+            return asyncio.current_task(self._loop)
+        except Exception:
+            return None
+
+    def _capture(self, blocked: float) -> dict:
+        frame = sys._current_frames().get(self._loop_thread)
+        frames = traceback.extract_stack(frame)[-STACK_DEPTH:] if frame is not None else []
+        task = self._running_task()
+        coro = task.get_coro() if task is not None else None
+        top = frames[-1] if frames else None
+        return {
+            "ts": time.time(),
+            "blocked_ms": round(blocked * 1000, 1),
+            "duration_ms": None,  # filled in by the heartbeat once the loop recovers
+            "task": task.get_name() if task is not None else None,
+            "coro": getattr(coro, "__qualname__", None),
+            "cog": cog_from_stack(frames),
+            "where": f"{os.path.basename(top.filename)}:{top.lineno} in {top.name}" if top else None,
+            "stack": traceback.format_list(frames),
+        }
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.interval / 2):
+            blocked = time.monotonic() - self._beat - self.interval
+            if blocked < self.threshold or self._current is not None:
+                continue
+            try:
+                event = self._capture(blocked)
+            except Exception:
+                continue
+            with self._lock:
+                self._current = event
+                self.events.append(event)
+
+    # ---------- Lifecycle ----------
+    def start(self) -> None:
+        """Start on the running loop; call from a coroutine (e.g. setup_hook)."""
+        if self._task is not None and not self._task.done():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._task = self._loop.create_task(self._heartbeat(), name="loop-stall-heartbeat")
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="loop-stall-watchdog", daemon=True)
+        self._thread.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+
+    def snapshot(self, recent: int = 10) -> dict:
+        with self._lock:
+            out = dict(self.stats)
+            out["by_cog"] = dict(self.by_cog)
+            out["recent"] = list(self.events)[-recent:]
+        out["threshold_ms"] = round(self.threshold * 1000)
+        return out
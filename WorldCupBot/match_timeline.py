@@ -0,0 +1,162 @@
+"""Append-only live event timelines, one log per fixture.
+
+Quick options record goals, cards and match-state updates while a match is
+played. Each fixture's events live in ``<folder>/<fixture id>.jsonl``, one
+JSON object per line, rather than in matches.json: recording an event appends
+one line instead of rewriting every fixture, and readers of matches.json no
+longer parse every timeline. matches.json keeps only the running score
+(``live_score``).
+
+``load`` keeps the parsed timeline of each log and, because logs only grow,
+reads just the lines appended since its last call, inserting each event at
+its match-clock position (``match_event_sort_key``). A disallowed goal is an
+event that names the goal it cancels (``voids``); the goal leaves the timeline
+but stays in the log.
+
+Fixtures recorded before timelines existed carry ``live_stats`` in
+matches.json. ``load`` falls back to those events while the fixture has no
+log, and ``seed`` copies them into the log before its first append.
+"""
+import bisect
+import os
+import re
+import threading
+import uuid
+
+import json_codec
+from match_events import match_event_sort_key, sort_match_events
+
+# Events readers show: the latest ones by match clock.
+LIMIT = 100
+
+
+def path_for(folder, fixture_id) -> str:
+    name = re.sub(r"[^A-Za-z0-9_.-]", "_", str(fixture_id or "").strip()) or "_"
+    return os.path.join(folder, f"{name}.jsonl")
+
+
+def _new_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+def _legacy_events(legacy) -> list:
+    events = legacy() if callable(legacy) else legacy
+    return sort_match_events(events) if isinstance(events, list) else []
+
+
+class Timeline:
+    """A fixture's events in match-clock order. Published timelines are never mutated."""
+
+    def __init__(self, events=(), logged: bool = False):
+        self.events: list[dict] = list(events)
+        # False while the events still come from matches.json.
+        self.logged = logged
+
+    def extended(self, records) -> "Timeline":
+        """Copy with ``records`` applied in order, as if appended to the log."""
+        events = list(self.events)
+        for record in records:
+            if not isinstance(record, dict):
+                continue
+            voids = record.get("voids")
+            if voids:
+                events = [ev for ev in events if ev.get("id") != voids]
+            bisect.insort_right(events, record, key=match_event_sort_key)
+        return Timeline(events, logged=self.logged)
+
+    def view(self, limit: int = LIMIT) -> list[dict]:
+        return self.events[-limit:] if limit else list(self.events)
+
+    def latest(self, event_type: str, country: str) -> dict | None:
+        """Last event of ``event_type`` for ``country`` by match clock."""
+        for event in reversed(self.events):
+            if event.get("event_type") == event_type and event.get("country") == country:
+                return event
+        return None
+
+    def goals(self, team: str, *, first_half: bool = False) -> int:
+        count = 0
+        for event in self.events:
+            if event.get("event_type") != "goal" or event.get("country") != team:
+                continue
+            if first_half:
+                minute = str(event.get("match_time") or "").split("+", 1)[0]
+                if not minute.isdigit() or int(minute) > 45:
+                    continue
+            count += 1
+        return count
+
+    def score(self, home: str, away: str) -> dict:
+        """The ``live_score`` summary stored on the fixture."""
+        return {"home": self.goals(home), "away": self.goals(away)}
+
+
+# path -> (inode, size seen, bytes consumed, Timeline)
+_cache: dict[str, tuple] = {}
+_lock = threading.Lock()
+
+
+def _parse(chunk: bytes) -> list:
+    records = []
+    for line in chunk.splitlines():
+        if not line.strip():
+            continue
+        try:
+            records.append(json_codec.loads(line))
+        except ValueError:
+            continue
+    return records
+
+
+def load(folder, fixture_id, legacy=None) -> Timeline:
+    """Timeline of ``fixture_id``.
+
+    ``legacy`` (the fixture's ``live_stats``, or a callable returning them) is
+    only used, and only called, when the fixture has no log yet.
+    """
+    path = path_for(folder, fixture_id)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return Timeline(_legacy_events(legacy))
+    with _lock:
+        cached = _cache.get(path)
+        if cached is not None and cached[:2] == (st.st_ino, st.st_size):
+            return cached[3]
+        if cached is not None and cached[0] == st.st_ino and cached[2] <= st.st_size:
+            base, offset = cached[3], cached[2]
+        else:
+            base, offset = Timeline(logged=True), 0
+        try:
+            with open(path, "rb") as f:
+                f.seek(offset)
+                chunk = f.read()
+        except OSError:
+            return base
+        # A line still being written by the other process is picked up next time.
+        end = chunk.rfind(b"\n") + 1
+        timeline = base.extended(_parse(chunk[:end])) if end else base
+        _cache[path] = (st.st_ino, offset + len(chunk), offset + end, timeline)
+    return timeline
+
+
+def _write(path, records) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "ab") as f:
+        f.write(b"".join(json_codec.dumps(record) + b"\n" for record in records))
+
+
+def seed(folder, fixture_id, legacy=None) -> Timeline:
+    """Make sure the fixture has a log, copying ``legacy`` events into a new one."""
+    path = path_for(folder, fixture_id)
+    if not os.path.exists(path):
+        _write(path, [dict(event, id=event.get("id") or _new_id()) for event in _legacy_events(legacy)])
+    return load(folder, fixture_id)
+
+
+def append(folder, fixture_id, event: dict) -> Timeline:
+    """Append ``event`` (given an ``id`` if it has none) and return the updated timeline."""
+    record = dict(event)
+    record.setdefault("id", _new_id())
+    _write(path_for(folder, fixture_id), [record])
+    return load(folder, fixture_id)
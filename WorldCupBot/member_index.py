@@ -0,0 +1,233 @@
+import bisect
+import re
+
+# Name fields in the order they rank when two members match equally well.
+# Staff usually type what they see, so display names win over account names.
+NAME_FIELDS = ("display_name", "name", "global_name", "tag")
+
+MATCH_EXACT = 0
+MATCH_PREFIX = 1
+MATCH_SUBSTRING = 2
+
+_MENTION_RE = re.compile(r"<@!?(\d+)>")
+
+
+def member_keys(member) -> dict[str, str]:
+    """Return field -> lowercase name for every non-empty name a member has."""
+    raw = {
+        "display_name": getattr(member, "display_name", None),
+        "name": getattr(member, "name", None),
+        "global_name": getattr(member, "global_name", None),
+        "tag": str(member or ""),
+    }
+    return {field: str(v).strip().lower() for field, v in raw.items() if v and str(v).strip()}
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class GuildMemberIndex:
+    """Name lookup structures for one guild.
+
+    ``exact`` maps a lowercase name to member ids, ``sorted_keys`` supports
+    prefix search by bisect, and a trigram map narrows substring searches to
+    a handful of candidates instead of a scan over every member.
+    """
+
+    def __init__(self):
+        self.members: dict[int, object] = {}
+        self.keys: dict[int, dict[str, str]] = {}
+        self.exact: dict[str, set[int]] = {}
+        self.trigrams: dict[str, set[int]] = {}
+        self.sorted_keys: list[tuple[str, int]] = []
+
+    @classmethod
+    def build(cls, members) -> "GuildMemberIndex":
+        index = cls()
+        for member in members:
+            index.add(member, _sorted=False)
+        # One sort instead of an insort per key keeps large guilds O(n log n).
+        index.sorted_keys.sort()
+        return index
+
+    def add(self, member, _sorted: bool = True):
+        mid = int(member.id)
+        if mid in self.keys:
+            self.remove(mid)
+        keys = member_keys(member)
+        self.members[mid] = member
+        self.keys[mid] = keys
+        for key in set(keys.values()):
+            self.exact.setdefault(key, set()).add(mid)
+            if _sorted:
+                bisect.insort(self.sorted_keys, (key, mid))
+            else:
+                self.sorted_keys.append((key, mid))
+            for gram in _trigrams(key):
+                self.trigrams.setdefault(gram, set()).add(mid)
+
+    def remove(self, member_id: int):
+        mid = int(member_id)
+        keys = self.keys.pop(mid, None)
+        self.members.pop(mid, None)
+        if not keys:
+            return
+        for key in set(keys.values()):
+            ids = self.exact.get(key)
+            if ids is not None:
+                ids.discard(mid)
+                if not ids:
+                    del self.exact[key]
+            pos = bisect.bisect_left(self.sorted_keys, (key, mid))
+            if pos < len(self.sorted_keys) and self.sorted_keys[pos] == (key, mid):
+                del self.sorted_keys[pos]
+            for gram in _trigrams(key):
+                ids = self.trigrams.get(gram)
+                if ids is not None:
+                    ids.discard(mid)
+                    if not ids:
+                        del self.trigrams[gram]
+
+    def _prefix_ids(self, needle: str) -> set[int]:
+        out = set()
+        pos = bisect.bisect_left(self.sorted_keys, (needle, -1))
+        while pos < len(self.sorted_keys) and self.sorted_keys[pos][0].startswith(needle):
+            out.add(self.sorted_keys[pos][1])
+            pos += 1
+        return out
+
+    def _substring_ids(self, needle: str) -> set[int]:
+        if len(needle) < 3:
+            # Too short for trigrams; fall back to the (rare) full key scan.
+            return {mid for key, mid in self.sorted_keys if needle in key}
+        grams = sorted(_trigrams(needle), key=lambda g: len(self.trigrams.get(g, ())))
+        ids = set(self.trigrams.get(grams[0], ()))
+        for gram in grams[1:]:
+            if not ids:
+                break
+            ids &= self.trigrams.get(gram, set())
+        return {mid for mid in ids if any(needle in k for k in self.keys[mid].values())}
+
+    def search(self, needle: str, limit: int = 5) -> list[tuple[int, object]]:
+        """Return up to ``limit`` (match_kind, member) pairs, best match first."""
+        needle = (needle or "").strip().lower()
+        if not needle:
+            return []
+        ids = set(self.exact.get(needle, ()))
+        if len(ids) < limit:
+            ids |= self._prefix_ids(needle)
+        if len(ids) < limit:
+            ids |= self._substring_ids(needle)
+
+        ranked = []
+        for mid in ids:
+            keys = self.keys.get(mid) or {}
+            best = None
+            for field_rank, field in enumerate(NAME_FIELDS):
+                key = keys.get(field)
+                if not key or needle not in key:
+                    continue
+                kind = MATCH_EXACT if key == needle else MATCH_PREFIX if key.startswith(needle) else MATCH_SUBSTRING
+                score = (kind, field_rank, len(key))
+                if best is None or score < best:
+                    best = score
+            if best is not None:
+                ranked.append((best, mid))
+        ranked.sort()
+        return [(score[0], self.members[mid]) for score, mid in ranked[:limit]]
+
+
+class MemberIndex:
+    """Per-guild member name indexes shared by every cog.
+
+    Indexes are built lazily from the gateway cache on first lookup and then
+    kept current by the member join/remove/update listeners registered in
+    ``attach``.
+    """
+
+    def __init__(self):
+        self._guilds: dict[int, GuildMemberIndex] = {}
+
+    def attach(self, bot):
+        bot.add_listener(self._on_member_join, "on_member_join")
+        bot.add_listener(self._on_member_remove, "on_member_remove")
+        bot.add_listener(self._on_member_update, "on_member_update")
+        bot.add_listener(self._on_user_update, "on_user_update")
+
+    @staticmethod
+    def _guild_key(guild) -> int:
+        gid = getattr(guild, "id", None)
+        return int(gid) if gid is not None else id(guild)
+
+    def for_guild(self, guild) -> GuildMemberIndex:
+        key = self._guild_key(guild)
+        index = self._guilds.get(key)
+        if index is None:
+            index = GuildMemberIndex.build(getattr(guild, "members", []))
+            self._guilds[key] = index
+        return index
+
+    def invalidate(self, guild):
+        """Drop a guild index so the next lookup rebuilds it (e.g. after chunking)."""
+        self._guilds.pop(self._guild_key(guild), None)
+
+    def find(self, guild, query: str, limit: int = 5) -> list[tuple[int, object]]:
+        """Resolve a mention, ID or free-form name to ranked (match_kind, member) pairs."""
+        needle = (query or "").strip()
+        if not needle:
+            return []
+
+        # Staff often paste a mention or a bare ID; resolve those directly.
+        mention = _MENTION_RE.fullmatch(needle)
+        member_id = int(mention.group(1)) if mention else (int(needle) if needle.isdigit() else None)
+        if member_id is not None:
+            member = guild.get_member(member_id) if hasattr(guild, "get_member") else None
+            if member is None:
+                member = self.for_guild(guild).members.get(member_id)
+            if member is not None:
+                return [(MATCH_EXACT, member)]
+
+        return self.for_guild(guild).search(needle, limit=limit)
+
+    # --------------- Gateway listeners ---------------
+    async def _on_member_join(self, member):
+        index = self._guilds.get(self._guild_key(member.guild))
+        if index is not None:
+            index.add(member)
+
+    async def _on_member_remove(self, member):
+        index = self._guilds.get(self._guild_key(member.guild))
+        if index is not None:
+            index.remove(member.id)
+
+    async def _on_member_update(self, before, after):
+        if member_keys(before) == member_keys(after):
+            return
+        index = self._guilds.get(self._guild_key(after.guild))
+        if index is not None:
+            index.add(after)
+
+    async def _on_user_update(self, before, after):
+        # Username/global name changes arrive as user updates, so refresh the
+        # member object in every guild index that contains this user.
+        for index in self._guilds.values():
+            if after.id in index.members:
+                member = index.members[after.id]
+                guild = getattr(member, "guild", None)
+                fresh = guild.get_member(after.id) if guild is not None else None
+                index.add(fresh or member)
+
+
+def get_member_index(bot) -> MemberIndex:
+    """Return the bot-wide member index, creating it on first use."""
+    index = getattr(bot, "member_index", None)
+    if index is None:
+        index = MemberIndex()
+        if hasattr(bot, "add_listener"):
+            index.attach(bot)
+        try:
+            bot.member_index = index
+        except Exception:
+            pass
+    return index
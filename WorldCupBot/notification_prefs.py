@@ -0,0 +1,143 @@
+"""Compiled notification preferences from notification_settings.json.
+
+A user's record (``{"channel": ..., "categories": {...}}`` or, in older files,
+a bare channel string) compiles to one bitmask: channel bits say where their
+notifications may go (the website bell, Discord DMs) and category bits which
+kinds they want. Users without a record get everything. ``get(path)``
+compiles the file once per change (mtime, size and inode) and shares the
+snapshot, so fan-out over a recipient list costs one AND per recipient and no
+file reads.
+"""
+import os
+import threading
+
+import json_codec
+
+CATEGORIES = ("splits", "matches", "bets", "stages")
+CHANNELS = ("bell", "dms")
+
+BELL = 1 << 0
+DMS = 1 << 1
+_CATEGORY_BITS = {name: 1 << (2 + i) for i, name in enumerate(CATEGORIES)}
+ALL_CATEGORIES = sum(_CATEGORY_BITS.values())
+
+# Stored channel preference -> channel bits. Unknown values get neither.
+_CHANNEL_BITS = {"": BELL | DMS, "bell": BELL, "dms": DMS, "none": 0}
+_BITS_FOR = {"bell": BELL, "dms": DMS}
+
+DEFAULT_MASK = BELL | DMS | ALL_CATEGORIES
+
+
+def _signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+def compile_record(raw) -> tuple[str, int]:
+    """(channel, mask) for one stored record."""
+    if isinstance(raw, str):
+        raw = {"channel": raw}
+    if not isinstance(raw, dict):
+        raw = {}
+    channel = str(raw.get("channel") or "").strip().lower()
+    mask = _CHANNEL_BITS.get(channel, 0) | ALL_CATEGORIES
+    categories = raw.get("categories")
+    if isinstance(categories, dict):
+        for key, bit in _CATEGORY_BITS.items():
+            if key in categories and not categories.get(key):
+                mask &= ~bit
+    return channel, mask
+
+
+def required(channel: str, category: str) -> int | None:
+    """Mask a user needs for ``category`` notifications over ``channel``.
+
+    None for a channel nobody can receive on.
+    """
+    bit = _BITS_FOR.get(channel)
+    return None if bit is None else bit | _CATEGORY_BITS.get(category, 0)
+
+
+class PrefsSnapshot:
+    def __init__(self, settings=None):
+        self.masks: dict[str, int] = {}
+        # Only users with a non-empty stored channel.
+        self.channels: dict[str, str] = {}
+        for uid, raw in (settings.items() if isinstance(settings, dict) else ()):
+            uid = str(uid).strip()
+            if not uid:
+                continue
+            channel, mask = compile_record(raw)
+            self.masks[uid] = mask
+            if channel:
+                self.channels[uid] = channel
+
+    def mask(self, uid) -> int:
+        return self.masks.get(str(uid or "").strip(), DEFAULT_MASK)
+
+    def channel(self, uid) -> str:
+        return self.channels.get(str(uid or "").strip(), "")
+
+    def category_enabled(self, uid, category: str) -> bool:
+        bit = _CATEGORY_BITS.get(category)
+        return bit is None or bool(self.mask(uid) & bit)
+
+    def record(self, uid) -> dict:
+        """The normalized record the settings endpoints return."""
+        mask = self.mask(uid)
+        return {
+            "channel": self.channel(uid),
+            "categories": {key: bool(mask & bit) for key, bit in _CATEGORY_BITS.items()},
+        }
+
+    def allows(self, uid, channel: str, category: str) -> bool:
+        need = required(channel, category)
+        return need is not None and self.mask(uid) & need == need
+
+    def filter(self, ids, channel: str, category: str) -> list[str]:
+        """Ids (stripped, in order) that accept ``category`` notifications over ``channel``."""
+        need, masks = required(channel, category), self.masks
+        if need is None:
+            return []
+        stripped = (str(uid or "").strip() for uid in ids or ())
+        return [uid for uid in stripped if uid and masks.get(uid, DEFAULT_MASK) & need == need]
+
+    def filter_mapping(self, by_uid, channel: str, category: str) -> dict:
+        """``filter`` for a ``{uid: value}`` mapping, keeping the values."""
+        need, masks = required(channel, category), self.masks
+        if need is None or not isinstance(by_uid, dict):
+            return {}
+        out = {}
+        for uid, value in by_uid.items():
+            suid = str(uid or "").strip()
+            if suid and masks.get(suid, DEFAULT_MASK) & need == need:
+                out[suid] = value
+        return out
+
+
+_cache: dict[str, tuple] = {}
+_lock = threading.Lock()
+
+
+def _load(path):
+    try:
+        return json_codec.read_file(path)[0]
+    except (OSError, ValueError):
+        return {}
+
+
+def get(path, load=None) -> PrefsSnapshot:
+    """Snapshot for the settings file at ``path``; ``load(path)`` reads it when stale."""
+    path = os.fspath(path)
+    sig = _signature(path)
+    with _lock:
+        cached = _cache.get(path)
+    if cached is not None and cached[0] == sig:
+        return cached[1]
+    snapshot = PrefsSnapshot((load or _load)(path))
+    with _lock:
+        _cache[path] = (sig, snapshot)
+    return snapshot
@@ -0,0 +1,376 @@
+import asyncio
+import hashlib
+import itertools
+import json
+import logging
+import os
+import random
+import time
+from collections import OrderedDict
+
+import discord
+
+import json_codec
+
+log = logging.getLogger(__name__)
+
+# Lower lanes drain first, so public channel posts are never stuck behind a
+# few hundred owner/voter DMs from the same declaration.
+LANE_CHANNEL = 0
+LANE_DM = 1
+
+PENDING_FILE = "outbound_pending.json"
+
+# Discord allows ~50 requests/second per bot globally. Stay well below that so
+# the gateway, slash command responses and edits done elsewhere keep headroom.
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RATE_PER_SEC = 20.0
+MAX_ATTEMPTS = 5
+RETRY_BASE_SECONDS = 2.0
+RETRY_MAX_SECONDS = 120.0
+RECENT_KEYS_LIMIT = 5000
+BATCH_HISTORY_LIMIT = 50
+FLUSH_INTERVAL_SECONDS = 2.0
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Return True for failures worth retrying (rate limits, Discord 5xx, network)."""
+    if isinstance(exc, (discord.Forbidden, discord.NotFound)):
+        return False
+    if isinstance(exc, discord.HTTPException):
+        status = int(getattr(exc, "status", 0) or 0)
+        return status == 429 or status >= 500
+    return isinstance(exc, (asyncio.TimeoutError, OSError))
+
+
+def retry_delay(attempt: int, retry_after: float | None = None, rng=random.random) -> float:
+    """Exponential backoff with jitter, never shorter than Discord's retry_after."""
+    base = min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * (2 ** max(0, attempt - 1)))
+    delay = base * (0.5 + rng())
+    if retry_after:
+        delay = max(delay, float(retry_after))
+    return min(RETRY_MAX_SECONDS, delay)
+
+
+def _payload_id(payload: dict) -> str:
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+class OutboundScheduler:
+    """Queue DMs and channel posts and deliver them off the caller's loop.
+
+    Jobs and batch progress are persisted to JSON/outbound_pending.json so a
+    restart resumes undelivered messages with their batch totals intact. A job key doubles as a dedupe key: a key that is
+    pending or was delivered recently is ignored when enqueued again.
+    """
+
+    def __init__(
+        self,
+        bot,
+        json_dir: str,
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        rate_per_sec: float = DEFAULT_RATE_PER_SEC,
+    ):
+        self.bot = bot
+        self.path = os.path.join(json_dir, PENDING_FILE)
+        self.concurrency = max(1, int(concurrency))
+        self.min_interval = 1.0 / rate_per_sec if rate_per_sec > 0 else 0.0
+
+        self._jobs: dict[str, dict] = {}
+        self._payloads: dict[str, dict] = {}
+        self._recent: OrderedDict[str, float] = OrderedDict()
+        self._batches: OrderedDict[str, dict] = OrderedDict()
+        self._seq = itertools.count()
+        self._queue: asyncio.PriorityQueue | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._rate_lock: asyncio.Lock | None = None
+        self._next_slot = 0.0
+        self._dirty = False
+        self._in_flight = 0
+        self.counters = {"sent": 0, "failed": 0, "retried": 0, "deduped": 0, "rate_limited": 0}
+
+        self._load_pending()
+
+    # --------------- Persistence ---------------
+    def _load_pending(self):
+        try:
+            data = json_codec.read_file(self.path)[0] or {}
+        except Exception:
+            return
+        payloads = data.get("payloads") if isinstance(data.get("payloads"), dict) else {}
+        self._payloads = {str(k): v for k, v in payloads.items() if isinstance(v, dict)}
+        for job in data.get("jobs") or []:
+            if isinstance(job, dict) and job.get("key") and job.get("payload") in self._payloads:
+                self._jobs[str(job["key"])] = job
+        for key in data.get("recent") or []:
+            self._recent[str(key)] = 0.0
+        batches = data.get("batches") if isinstance(data.get("batches"), dict) else {}
+        for name, info in batches.items():
+            if isinstance(info, dict):
+                self._batch(str(name)).update(
+                    {k: info[k] for k in ("total", "sent", "failed", "started", "finished") if k in info}
+                )
+        # Files written before batches were persisted: count what is still pending.
+        for job in self._jobs.values():
+            name = job.get("batch")
+            if name and name not in batches:
+                self._batch(name)["total"] += 1
+        if self._jobs:
+            log.info("Outbound scheduler restored %s pending job(s)", len(self._jobs))
+
+    def _snapshot(self) -> dict | None:
+        if not self._dirty:
+            return None
+        used = {job.get("payload") for job in self._jobs.values()}
+        self._payloads = {pid: p for pid, p in self._payloads.items() if pid in used}
+        self._dirty = False
+        return {
+            "jobs": [dict(job) for job in self._jobs.values()],
+            "payloads": dict(self._payloads),
+            "recent": list(self._recent.keys()),
+            "batches": {name: dict(info) for name, info in self._batches.items()},
+        }
+
+    def flush(self):
+        """Write pending jobs to disk if anything changed since the last flush."""
+        self._write(self._snapshot())
+
+    def _write(self, data: dict | None):
+        if data is None:
+            return
+        try:
+            json_codec.write_file(self.path, data)
+        except Exception as e:
+            self._dirty = True
+            log.warning("Failed to persist outbound queue: %s", e)
+
+    # --------------- Enqueue ---------------
+    def enqueue_dm(
+        self,
+        user_id,
+        *,
+        embed: discord.Embed | None = None,
+        content: str | None = None,
+        key: str | None = None,
+        batch: str | None = None,
+    ) -> bool:
+        try:
+            uid = int(str(user_id))
+        except Exception:
+            return False
+        return self._enqueue(LANE_DM, "user", uid, embed, content, key, batch, False)
+
+    def enqueue_channel(
+        self,
+        channel_id,
+        *,
+        embed: discord.Embed | None = None,
+        content: str | None = None,
+        key: str | None = None,
+        batch: str | None = None,
+        mention_roles: bool = False,
+    ) -> bool:
+        try:
+            cid = int(str(channel_id))
+        except Exception:
+            return False
+        return self._enqueue(LANE_CHANNEL, "channel", cid, embed, content, key, batch, mention_roles)
+
+    def _enqueue(self, lane, target_kind, target_id, embed, content, key, batch, mention_roles) -> bool:
+        payload = {"content": content, "embed": embed.to_dict() if embed else None}
+        if mention_roles:
+            payload["mention_roles"] = True
+        pid = _payload_id(payload)
+
+        if key is None:
+            key = f"{target_kind}:{target_id}:{pid}:{time.time_ns()}"
+        key = str(key)
+        if key in self._jobs or key in self._recent:
+            self.counters["deduped"] += 1
+            return False
+
+        self._payloads.setdefault(pid, payload)
+        job = {
+            "key": key,
+            "lane": lane,
+            "target": target_kind,
+            "target_id": target_id,
+            "payload": pid,
+            "batch": batch,
+            "attempts": 0,
+            "created": time.time(),
+        }
+        self._jobs[key] = job
+        self._dirty = True
+        if batch:
+            self._batch(batch)["total"] += 1
+        self._push(job)
+        return True
+
+    def _push(self, job: dict):
+        if self._queue is not None:
+            self._queue.put_nowait((int(job.get("lane") or 0), next(self._seq), job["key"]))
+
+    def _batch(self, name: str) -> dict:
+        info = self._batches.get(name)
+        if info is None:
+            info = {"total": 0, "sent": 0, "failed": 0, "started": time.time(), "finished": None}
+            self._batches[name] = info
+            while len(self._batches) > BATCH_HISTORY_LIMIT:
+                self._batches.popitem(last=False)
+        return info
+
+    # --------------- Lifecycle ---------------
+    def start(self):
+        if self._tasks:
+            return
+        self._queue = asyncio.PriorityQueue()
+        self._rate_lock = asyncio.Lock()
+        for job in sorted(self._jobs.values(), key=lambda j: (j.get("lane") or 0, j.get("created") or 0)):
+            self._push(job)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+        self._tasks.append(asyncio.create_task(self._flush_loop()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self.flush()
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL_SECONDS)
+            # Snapshot on the loop so the worker thread never iterates dicts
+            # that workers are mutating.
+            await asyncio.to_thread(self._write, self._snapshot())
+
+    async def _throttle(self):
+        async with self._rate_lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            if wait > 0:
+                await asyncio.sleep(wait)
+                now = time.monotonic()
+            self._next_slot = now + self.min_interval
+
+    # --------------- Delivery ---------------
+    async def _worker(self):
+        wait_until_ready = getattr(self.bot, "wait_until_ready", None)
+        if wait_until_ready:
+            await wait_until_ready()
+        while True:
+            _, _, key = await self._queue.get()
+            job = self._jobs.get(key)
+            if job is None:
+                continue
+            self._in_flight += 1
+            try:
+                await self._throttle()
+                await self._deliver(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._handle_failure(job, e)
+            else:
+                self._finish(job, ok=True)
+            finally:
+                self._in_flight -= 1
+
+    async def _resolve_target(self, job: dict):
+        target_id = int(job["target_id"])
+        if job.get("target") == "user":
+            return self.bot.get_user(target_id) or await self.bot.fetch_user(target_id)
+        return self.bot.get_channel(target_id) or await self.bot.fetch_channel(target_id)
+
+    async def _deliver(self, job: dict):
+        payload = self._payloads.get(job.get("payload")) or {}
+        target = await self._resolve_target(job)
+        if target is None:
+            raise LookupError(f"{job.get('target')} {job.get('target_id')} not found")
+        kwargs = {}
+        if payload.get("content"):
+            kwargs["content"] = payload["content"]
+        if payload.get("embed"):
+            kwargs["embed"] = discord.Embed.from_dict(payload["embed"])
+        if payload.get("mention_roles"):
+            kwargs["allowed_mentions"] = discord.AllowedMentions(roles=True)
+        await target.send(**kwargs)
+
+    def _handle_failure(self, job: dict, exc: Exception):
+        job["attempts"] = int(job.get("attempts") or 0) + 1
+        if getattr(exc, "status", None) == 429:
+            self.counters["rate_limited"] += 1
+        if is_retryable(exc) and job["attempts"] < MAX_ATTEMPTS:
+            delay = retry_delay(job["attempts"], getattr(exc, "retry_after", None))
+            self.counters["retried"] += 1
+            self._dirty = True
+            log.info(
+                "Outbound send retry scheduled (key=%s attempt=%s delay=%.1fs error=%s)",
+                job["key"],
+                job["attempts"],
+                delay,
+                exc,
+            )
+            asyncio.get_running_loop().call_later(delay, self._push, job)
+            return
+        log.warning(
+            "Outbound send dropped (key=%s target=%s:%s attempts=%s error=%s)",
+            job["key"],
+            job.get("target"),
+            job.get("target_id"),
+            job["attempts"],
+            exc,
+        )
+        self._finish(job, ok=False)
+
+    def _finish(self, job: dict, ok: bool):
+        key = job["key"]
+        self._jobs.pop(key, None)
+        self._recent[key] = time.time()
+        while len(self._recent) > RECENT_KEYS_LIMIT:
+            self._recent.popitem(last=False)
+        self._dirty = True
+        self.counters["sent" if ok else "failed"] += 1
+
+        name = job.get("batch")
+        if not name:
+            return
+        info = self._batch(name)
+        info["sent" if ok else "failed"] += 1
+        if info["sent"] + info["failed"] >= info["total"] and info["finished"] is None:
+            info["finished"] = time.time()
+            log.info(
+                "Outbound batch complete (batch=%s sent=%s failed=%s seconds=%.1f)",
+                name,
+                info["sent"],
+                info["failed"],
+                info["finished"] - info["started"],
+            )
+
+    def stats(self) -> dict:
+        lanes = {"channel": 0, "dm": 0}
+        for job in self._jobs.values():
+            lanes["dm" if job.get("lane") == LANE_DM else "channel"] += 1
+        return {
+            "pending": lanes,
+            "in_flight": self._in_flight,
+            "counters": dict(self.counters),
+            "batches": {name: dict(info) for name, info in self._batches.items()},
+        }
+
+
+def get_outbound_scheduler(bot) -> OutboundScheduler:
+    """Return the bot-wide scheduler, creating and starting it on first use."""
+    scheduler = getattr(bot, "outbound", None)
+    if scheduler is None:
+        base_dir = getattr(bot, "BASE_DIR", None) or os.getcwd()
+        json_dir = os.path.join(base_dir, "JSON")
+        os.makedirs(json_dir, exist_ok=True)
+        scheduler = OutboundScheduler(bot, json_dir)
+        bot.outbound = scheduler
+    scheduler.start()
+    return scheduler
@@ -0,0 +1,342 @@
+"""Team ownership index over players.json.
+
+players.json is keyed by player, but most readers ask by team (who owns
+Brazil?) or by owner (which teams does this user hold?). ``get(path)``
+returns an ``OwnershipIndex`` built once per change of the file (mtime, size
+and inode, like the JSON store) and shared by every caller in the process.
+Every index records the signature of the file version it was built from.
+Writers read players.json through ``read``, which returns the document
+with its signature, take the matching index from ``current`` and, after
+saving, pass both to ``update`` together with the signature their own write
+produced. ``update`` patches a copy of the index for the teams the writer
+touched only when the index was built from the very version the writer
+loaded; if the other process wrote in between, it rebuilds from the saved
+document instead. The result is recorded under the written signature, never
+a fresh stat, so a write by the other process right after it stays stale.
+
+Published indexes are never mutated, so readers need no locking.
+"""
+import os
+import threading
+
+import json_codec
+
+
+def _signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+def _fold(team) -> str:
+    return str(team or "").strip().casefold()
+
+
+def _player_name(uid, pdata) -> str:
+    if isinstance(pdata, dict):
+        return str(pdata.get("display_name") or pdata.get("username") or pdata.get("name") or uid)
+    return str(uid)
+
+
+def _percentages(raw) -> dict:
+    out = {}
+    for owner_id, value in (raw or {}).items():
+        try:
+            out[str(owner_id)] = float(value)
+        except (TypeError, ValueError):
+            continue
+    return out
+
+
+class TeamOwnership:
+    """One team's ownership merged over every player entry that lists it."""
+
+    __slots__ = ("team", "main_owner", "split_with", "percentages", "public_message_id", "holders")
+
+    def __init__(self, team: str):
+        self.team = team
+        self.main_owner: str | None = None
+        self.split_with: list[str] = []
+        # Raw values as stored; ``row`` converts them.
+        self.percentages: dict = {}
+        self.public_message_id = None
+        # uid -> None; players whose ``teams`` list carries this team, in file order.
+        self.holders: dict[str, None] = {}
+
+    def _add(self, uid: str, entry: dict) -> None:
+        self.holders[uid] = None
+        own = entry.get("ownership") or {}
+        main_owner = own.get("main_owner")
+        if main_owner is not None and (self.main_owner is None or str(main_owner) == uid):
+            self.main_owner = str(main_owner)
+        split_with = own.get("split_with") or []
+        for sid in split_with if isinstance(split_with, list) else [split_with]:
+            sid = str(sid).strip()
+            if sid and sid not in self.split_with:
+                self.split_with.append(sid)
+        percentages = own.get("percentages")
+        if isinstance(percentages, dict) and percentages:
+            self.percentages = {str(k): v for k, v in percentages.items() if v is not None}
+        if self.public_message_id is None and entry.get("public_message_id") is not None:
+            self.public_message_id = entry.get("public_message_id")
+
+    @property
+    def split_owners(self) -> list[str]:
+        """Split owners other than the main owner."""
+        return [sid for sid in self.split_with if sid != self.main_owner]
+
+    @property
+    def owner_ids(self) -> list[str]:
+        return ([self.main_owner] if self.main_owner else []) + self.split_owners
+
+    def row(self, names) -> dict:
+        """The public ownership row (/api/ownership_merged shape)."""
+        main_id, split_ids = self.main_owner, self.split_owners
+        return {
+            "country": self.team,
+            "main_owner": None if main_id is None else {"id": main_id, "username": names.get(main_id)},
+            "split_with": [{"id": sid, "username": names.get(sid)} for sid in split_ids],
+            "owners_count": (1 if main_id else 0) + len(split_ids),
+            "percentages": _percentages(self.percentages),
+        }
+
+
+def _unowned_row(team: str) -> dict:
+    return {"country": team, "main_owner": None, "split_with": [], "owners_count": 0, "percentages": {}}
+
+
+class OwnershipIndex:
+    def __init__(self):
+        self.teams: dict[str, TeamOwnership] = {}
+        # Legacy entries that are a bare team name without ownership data.
+        self.bare_teams: set[str] = set()
+        # casefolded team name -> spellings seen in the file
+        self.by_fold: dict[str, set[str]] = {}
+        self.owned: dict[str, frozenset] = {}
+        self.split: dict[str, frozenset] = {}
+        self.player_names: dict[str, str] = {}
+        # (mtime_ns, size, inode) of the file version this index describes.
+        self.signature = None
+
+    # ---------- Building ----------
+    @classmethod
+    def build(cls, players) -> "OwnershipIndex":
+        idx = cls()
+        if not isinstance(players, dict):
+            return idx
+        for uid, pdata in players.items():
+            uid = str(uid).strip()
+            if not uid:
+                continue
+            idx.player_names[uid] = _player_name(uid, pdata)
+            if not isinstance(pdata, dict):
+                continue
+            for entry in pdata.get("teams") or []:
+                idx._add_entry(uid, entry)
+        owned, split = {}, {}
+        for rec in idx.teams.values():
+            if rec.main_owner:
+                owned.setdefault(rec.main_owner, set()).add(rec.team)
+            for sid in rec.split_owners:
+                split.setdefault(sid, set()).add(rec.team)
+        idx.owned = {uid: frozenset(teams) for uid, teams in owned.items()}
+        idx.split = {uid: frozenset(teams) for uid, teams in split.items()}
+        return idx
+
+    def _add_entry(self, uid: str, entry, only=None) -> None:
+        if isinstance(entry, dict):
+            team = entry.get("team")
+            if not team or (only is not None and team not in only):
+                return
+            rec = self.teams.get(team)
+            if rec is None:
+                rec = self.teams[team] = TeamOwnership(team)
+            rec._add(uid, entry)
+        elif entry:
+            team = str(entry)
+            if only is not None and team not in only:
+                return
+            self.bare_teams.add(team)
+        else:
+            return
+        self.by_fold.setdefault(_fold(team), set()).add(team)
+
+    def patched(self, players, teams, uids=()) -> "OwnershipIndex":
+        """Copy of this index with ``teams`` recomputed from ``players``.
+
+        Only the current holders of those teams plus ``uids`` (players the
+        writer gave a copy of the team) are rescanned.
+        """
+        teams = {str(t) for t in teams if t}
+        players = players if isinstance(players, dict) else {}
+        idx = OwnershipIndex()
+        idx.teams = dict(self.teams)
+        idx.bare_teams = set(self.bare_teams)
+        idx.by_fold = {fold: set(names) for fold, names in self.by_fold.items()}
+        idx.player_names = dict(self.player_names)
+        owned = dict(self.owned)
+        split = dict(self.split)
+
+        scan = {str(uid): None for uid in uids}
+        for team in teams:
+            old = idx.teams.pop(team, None)
+            if old is None:
+                continue
+            scan.update(old.holders)
+            if old.main_owner in owned:
+                owned[old.main_owner] = owned[old.main_owner] - {team}
+            for sid in old.split_owners:
+                if sid in split:
+                    split[sid] = split[sid] - {team}
+        for team in teams - idx.bare_teams:
+            names = idx.by_fold.get(_fold(team))
+            if names is not None:
+                names.discard(team)
+                if not names:
+                    del idx.by_fold[_fold(team)]
+
+        for uid in scan:
+            pdata = players.get(uid)
+            if uid in players:
+                idx.player_names[uid] = _player_name(uid, pdata)
+            if isinstance(pdata, dict):
+                for entry in pdata.get("teams") or []:
+                    idx._add_entry(uid, entry, only=teams)
+
+        for team in teams:
+            rec = idx.teams.get(team)
+            if rec is None:
+                continue
+            if rec.main_owner:
+                owned[rec.main_owner] = owned.get(rec.main_owner, frozenset()) | {team}
+            for sid in rec.split_owners:
+                split[sid] = split.get(sid, frozenset()) | {team}
+        idx.owned = {uid: t for uid, t in owned.items() if t}
+        idx.split = {uid: t for uid, t in split.items() if t}
+        return idx
+
+    # ---------- Lookups ----------
+    def team(self, name: str) -> TeamOwnership | None:
+        return self.teams.get(name)
+
+    def spellings(self, name: str) -> set[str]:
+        """Every spelling of ``name`` in the file, compared case-insensitively."""
+        return self.by_fold.get(_fold(name), set())
+
+    def owner_ids(self, name: str) -> list[str]:
+        """Main and split owner ids of a team, case-insensitive, sorted."""
+        out = set()
+        for spelling in self.spellings(name):
+            rec = self.teams.get(spelling)
+            if rec is not None:
+                if rec.main_owner is not None:
+                    out.add(rec.main_owner)
+                out.update(rec.split_with)
+        return sorted(out)
+
+    def holders(self, name: str) -> list[str]:
+        """Players with an entry for the team (any spelling), in file order."""
+        out = {}
+        for spelling in sorted(self.spellings(name)):
+            rec = self.teams.get(spelling)
+            if rec is not None:
+                out.update(rec.holders)
+        return list(out)
+
+    def owned_by(self, uid) -> frozenset:
+        return self.owned.get(str(uid), frozenset())
+
+    def split_by(self, uid) -> frozenset:
+        return self.split.get(str(uid), frozenset())
+
+    def assigned_teams(self) -> set[str]:
+        return set(self.teams) | self.bare_teams
+
+    def rows(self, names, team_names=None) -> list[dict]:
+        """Ownership rows for ``team_names`` (default: every team in the file), sorted by name."""
+        if team_names is None:
+            team_names = self.assigned_teams()
+        out = []
+        for team in sorted(team_names, key=lambda s: s.lower()):
+            rec = self.teams.get(team)
+            out.append(rec.row(names) if rec is not None else _unowned_row(team))
+        return out
+
+
+_cache: dict[str, tuple] = {}
+_lock = threading.Lock()
+
+
+def _load(path):
+    try:
+        return json_codec.read_file(path)[0]
+    except (OSError, ValueError):
+        return {}
+
+
+def read(path, load=None):
+    """Return ``(players, signature)`` for the file at ``path``.
+
+    The signature is None when the file changed while it was being read, so
+    it never names a version other than the one returned.
+    """
+    path = os.fspath(path)
+    before = _signature(path)
+    players = (load or _load)(path)
+    return players, (before if before is not None and _signature(path) == before else None)
+
+
+def _remember(path: str, sig, idx: OwnershipIndex) -> OwnershipIndex:
+    idx.signature = sig
+    with _lock:
+        _cache[path] = (sig, idx)
+    return idx
+
+
+def get(path, load=None) -> OwnershipIndex:
+    """Index for the players file at ``path``; ``load(path)`` reads it when stale."""
+    path = os.fspath(path)
+    sig = _signature(path)
+    with _lock:
+        cached = _cache.get(path)
+    if cached is not None and cached[0] is not None and cached[0] == sig:
+        return cached[1]
+    players, sig = read(path, load)
+    return _remember(path, sig, OwnershipIndex.build(players))
+
+
+def current(path, players, loaded) -> OwnershipIndex:
+    """Index describing ``players``, the document a writer read with signature ``loaded``.
+
+    The cached index is reused when it was built from that version;
+    otherwise one is built from ``players``.
+    """
+    path = os.fspath(path)
+    with _lock:
+        cached = _cache.get(path)
+    if loaded is not None and cached is not None and cached[1].signature == loaded:
+        return cached[1]
+    idx = OwnershipIndex.build(players)
+    if loaded is None:
+        return idx
+    return _remember(path, loaded, idx)
+
+
+def update(path, players, teams, uids=(), *, base: OwnershipIndex | None = None, loaded=None,
+           written=None) -> OwnershipIndex:
+    """Refresh the index after ``players`` was written to ``path``.
+
+    ``loaded`` is the signature ``read`` returned for the document the writer
+    changed. Only when ``base`` was built from that same version are just
+    ``teams`` recomputed; otherwise the index is rebuilt from ``players``.
+    ``written`` is the signature of the writer's own save (what ``store.write``
+    returns); without it the index is kept but ``get`` rebuilds on next use.
+    """
+    path = os.fspath(path)
+    if base is not None and loaded is not None and base.signature == loaded:
+        idx = base.patched(players, teams, uids)
+    else:
+        idx = OwnershipIndex.build(players)
+    return _remember(path, written, idx)
@@ -3,6 +3,24 @@ import os
 from typing import Iterable
 
 
+def read_queue_chunk(queue_path: str, offset: int) -> tuple[str | None, int]:
+    """Read everything appended after ``offset``.
+
+    Returns ``(None, offset)`` when the queue is missing or unreadable. An
+    offset past the end (the queue was compacted or truncated) restarts at 0.
+    """
+    if not os.path.isfile(queue_path):
+        return None, offset
+    try:
+        if offset > os.path.getsize(queue_path):
+            offset = 0
+        with open(queue_path, "r", encoding="utf-8", errors="ignore") as f:
+            f.seek(offset)
+            return f.read(), f.tell()
+    except Exception:
+        return None, offset
+
+
 def compact_command_queue(queue_path: str, state_paths: Iterable[str], *, min_bytes: int = 4096) -> None:
     if not os.path.isfile(queue_path):
         return
@@ -0,0 +1,228 @@
+"""In-process request metrics for the launcher's Flask app.
+
+``install(app)`` records, per route template, a latency histogram, status
+code counts, response bytes and in-flight requests. JSON document loads and
+any registered caches are counted alongside. Everything lives in a few dicts
+guarded by one lock, so the per-request cost is two ``perf_counter`` calls and
+a handful of integer increments.
+"""
+import bisect
+import threading
+import time
+
+from flask import g, request
+
+# Upper bounds in seconds; the implicit last bucket is +Inf.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class _Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate a quantile by linear interpolation inside its bucket."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if seen + n >= rank and n:
+                lower = LATENCY_BUCKETS[i - 1] if i > 0 else 0.0
+                upper = LATENCY_BUCKETS[i] if i < len(LATENCY_BUCKETS) else LATENCY_BUCKETS[-1]
+                return lower + (upper - lower) * ((rank - seen) / n)
+            seen += n
+        return LATENCY_BUCKETS[-1]
+
+
+class RequestMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.latency: dict[tuple[str, str], _Histogram] = {}
+        self.statuses: dict[tuple[str, int], int] = {}
+        self.response_bytes: dict[str, int] = {}
+        self.in_flight: dict[str, int] = {}
+        self.json_docs: dict[str, list] = {}  # file -> [loads, errors, bytes, seconds]
+        self._caches: dict[str, object] = {}
+        self._gauges: dict[str, object] = {}
+
+    # ---------- Recording ----------
+    def begin(self, route: str) -> None:
+        with self._lock:
+            self.in_flight[route] = self.in_flight.get(route, 0) + 1
+
+    def end(self, method: str, route: str, status: int, seconds: float, nbytes: int) -> None:
+        with self._lock:
+            self.in_flight[route] = max(0, self.in_flight.get(route, 0) - 1)
+            hist = self.latency.get((method, route))
+            if hist is None:
+                hist = self.latency[(method, route)] = _Histogram()
+            hist.observe(seconds)
+            key = (route, int(status))
+            self.statuses[key] = self.statuses.get(key, 0) + 1
+            self.response_bytes[route] = self.response_bytes.get(route, 0) + max(0, int(nbytes or 0))
+
+    def observe_json_load(self, name: str, nbytes: int, seconds: float, ok: bool = True) -> None:
+        with self._lock:
+            rec = self.json_docs.get(name)
+            if rec is None:
+                rec = self.json_docs[name] = [0, 0, 0, 0.0]
+            rec[0] += 1
+            rec[1] += 0 if ok else 1
+            rec[2] += max(0, int(nbytes or 0))
+            rec[3] += seconds
+
+    def register_cache(self, name: str, stats_fn) -> None:
+        """Expose a cache; ``stats_fn()`` returns a dict with hits/misses/size."""
+        self._caches[name] = stats_fn
+
+    def register_gauges(self, prefix: str, stats_fn) -> None:
+        """Expose numeric fields of ``stats_fn()`` as ``wc_<prefix>_<field>`` gauges."""
+        self._gauges[prefix] = stats_fn
+
+    # ---------- Views ----------
+    def _collect(self, fns: dict) -> dict[str, dict]:
+        out = {}
+        for name, fn in list(fns.items()):
+            try:
+                out[name] = dict(fn() or {})
+            except Exception:
+                out[name] = {}
+        return out
+
+    def snapshot(self) -> dict:
+        """Compact JSON view: per route counts, error rate, size and latency quantiles."""
+        with self._lock:
+            routes = {}
+            for (method, route), hist in self.latency.items():
+                errors = sum(n for (r, status), n in self.statuses.items() if r == route and status >= 500)
+                routes[f"{method} {route}"] = {
+                    "count": hist.count,
+                    "errors": errors,
+                    "avg_ms": round(hist.total / hist.count * 1000, 2) if hist.count else None,
+                    "p50_ms": _ms(hist.quantile(0.50)),
+                    "p95_ms": _ms(hist.quantile(0.95)),
+                    "p99_ms": _ms(hist.quantile(0.99)),
+                    "bytes": self.response_bytes.get(route, 0),
+                }
+            in_flight = sum(self.in_flight.values())
+            docs = {
+                name: {"loads": r[0], "errors": r[1], "bytes": r[2], "ms": round(r[3] * 1000, 2)}
+                for name, r in self.json_docs.items()
+            }
+        return {
+            "uptime_seconds": int(time.time() - self.started),
+            "in_flight": in_flight,
+            "routes": routes,
+            "json_documents": docs,
+            "caches": self._collect(self._caches),
+            "gauges": self._collect(self._gauges),
+        }
+
+    def render_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            lines += [
+                "# HELP wc_http_request_duration_seconds Request latency by route.",
+                "# TYPE wc_http_request_duration_seconds histogram",
+            ]
+            for (method, route), hist in sorted(self.latency.items()):
+                labels = f'method="{method}",route="{_esc(route)}"'
+                cumulative = 0
+                for bound, n in zip(LATENCY_BUCKETS, hist.counts):
+                    cumulative += n
+                    lines.append(f'wc_http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'wc_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {hist.count}')
+                lines.append(f"wc_http_request_duration_seconds_sum{{{labels}}} {hist.total:.6f}")
+                lines.append(f"wc_http_request_duration_seconds_count{{{labels}}} {hist.count}")
+
+            lines += ["# HELP wc_http_responses_total Responses by route and status.", "# TYPE wc_http_responses_total counter"]
+            for (route, status), n in sorted(self.statuses.items()):
+                lines.append(f'wc_http_responses_total{{route="{_esc(route)}",status="{status}"}} {n}')
+
+            lines += ["# HELP wc_http_response_bytes_total Response body bytes by route.", "# TYPE wc_http_response_bytes_total counter"]
+            for route, n in sorted(self.response_bytes.items()):
+                lines.append(f'wc_http_response_bytes_total{{route="{_esc(route)}"}} {n}')
+
+            lines += ["# HELP wc_http_requests_in_flight Requests currently being served.", "# TYPE wc_http_requests_in_flight gauge"]
+            for route, n in sorted(self.in_flight.items()):
+                lines.append(f'wc_http_requests_in_flight{{route="{_esc(route)}"}} {n}')
+
+            lines += ["# TYPE wc_json_document_loads_total counter", "# TYPE wc_json_document_load_errors_total counter",
+                      "# TYPE wc_json_document_bytes_total counter", "# TYPE wc_json_document_load_seconds_total counter"]
+            for name, (loads, errors, nbytes, secs) in sorted(self.json_docs.items()):
+                label = f'file="{_esc(name)}"'
+                lines.append(f"wc_json_document_loads_total{{{label}}} {loads}")
+                lines.append(f"wc_json_document_load_errors_total{{{label}}} {errors}")
+                lines.append(f"wc_json_document_bytes_total{{{label}}} {nbytes}")
+                lines.append(f"wc_json_document_load_seconds_total{{{label}}} {secs:.6f}")
+
+        for name, stats in sorted(self._collect(self._caches).items()):
+            for field in ("hits", "misses", "size"):
+                if isinstance(stats.get(field), (int, float)):
+                    lines.append(f'wc_cache_{field}{{cache="{_esc(name)}"}} {stats[field]}')
+        for prefix, stats in sorted(self._collect(self._gauges).items()):
+            for field, value in sorted(stats.items()):
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    lines.append(f"wc_{prefix}_{field} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 2) if seconds is not None else None
+
+
+def _esc(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+metrics = RequestMetrics()
+
+
+def _route_label() -> str:
+    # Label by rule template (/api/fanzone/<fixture_id>) so cardinality stays bounded.
+    rule = request.url_rule
+    return rule.rule if rule is not None else UNMATCHED_ROUTE
+
+
+def install(app, registry: RequestMetrics = metrics) -> RequestMetrics:
+    """Attach before/after/teardown hooks that feed ``registry``."""
+
+    @app.before_request
+    def _metrics_begin():
+        g._metrics_route = _route_label()
+        g._metrics_started = time.perf_counter()
+        registry.begin(g._metrics_route)
+
+    @app.after_request
+    def _metrics_response(response):
+        g._metrics_status = response.status_code
+        # Streamed responses (SSE, send_file) have no length up front.
+        g._metrics_bytes = response.content_length or 0
+        return response
+
+    @app.teardown_request
+    def _metrics_end(exc):
+        started = g.pop("_metrics_started", None)
+        if started is None:
+            return
+        registry.end(
+            request.method,
+            g.pop("_metrics_route", UNMATCHED_ROUTE),
+            g.pop("_metrics_status", 500 if exc is not None else 200),
+            time.perf_counter() - started,
+            g.pop("_metrics_bytes", 0),
+        )
+
+    return registry
@@ -1,9 +1,23 @@
-import os, json, time, glob, sys, re, shutil, zipfile, datetime, math
+import os, json, time, glob, sys, re, datetime, math, hashlib
 import requests
-from flask import Blueprint, jsonify, request, session, send_file, make_response
+from flask import Blueprint, Response, jsonify, request, session, send_file, make_response
+import hmac
 import logging
-
-from match_events import sort_match_events
+import threading
+
+import backup_store
+import bot_telemetry
+import bracket_graph
+import change_log
+import job_runner
+import json_codec
+import list_query
+import log_tail
+import match_timeline
+import notification_prefs
+import ownership_index
+import request_metrics
+import settlement_jobs
 from routes_public import STANDINGS_GROUPS, _build_standings
 from stage_constants import (
     STAGE_ALLOWED,
@@ -18,6 +32,16 @@ HELPER_ROLE_NAME = "Helper"
 MAX_BACKUPS = 24
 AUTO_BACKUP_DEFAULT_HOURS = 1.0
 BACKUP_FOLDER_NAME = "BACKUPS"
+LOG_VIEW_DEFAULT_LINES = 2000
+LOG_VIEW_MAX_LINES = 10000
+LOG_STREAM_POLL_SECONDS = 1.0
+LOG_STREAM_HEARTBEAT_SECONDS = 15.0
+# EventSource reconnects on its own, so cap each stream rather than pinning a
+# server thread to an idle browser tab forever.
+LOG_STREAM_MAX_SECONDS = 300.0
+# Routes that hand work to the job runner answer inline when it finishes this
+# quickly, and with 202 and the job otherwise.
+JOB_INLINE_WAIT_SECONDS = 2.0
 
 # ---- PATH / IO HELPERS ----
 def _base_dir(ctx):
@@ -35,68 +59,16 @@ def _backup_dir(base_dir):
     return _ensure_dir(os.path.join(base_dir, BACKUP_FOLDER_NAME))
 
 def _list_backups(base_dir):
-    bdir = _backup_dir(base_dir)
-    out = []
-    for name in sorted(os.listdir(bdir)):
-        fp = os.path.join(bdir, name)
-        if os.path.isfile(fp):
-            title, ext = os.path.splitext(name)
-            if ext.lower() == ".zip":
-                title = name
-            out.append({
-                "name": name,
-                "title": title,
-                "size": os.path.getsize(fp),
-                "ts": int(os.path.getmtime(fp)),
-                "rel": name,
-            })
-    return sorted(out, key=lambda x: x["ts"], reverse=True)
-
-def _unique_backup_path(bdir: str, timestamp: str) -> tuple[str, str]:
-    base_name = f"{timestamp}.zip"
-    base_path = os.path.join(bdir, base_name)
-    if not os.path.exists(base_path):
-        return base_name, base_path
-    suffix = 1
-    while True:
-        candidate_name = f"{timestamp}_{suffix:02d}.zip"
-        candidate_path = os.path.join(bdir, candidate_name)
-        if not os.path.exists(candidate_path):
-            return candidate_name, candidate_path
-        suffix += 1
+    return backup_store.list_snapshots(_backup_dir(base_dir))
 
 def _cleanup_old_backups(base_dir: str):
-    bdir = _backup_dir(base_dir)
-    backups = sorted(
-        [
-            os.path.join(bdir, name)
-            for name in os.listdir(bdir)
-            if name.endswith(".zip") and os.path.isfile(os.path.join(bdir, name))
-        ],
-        key=os.path.getmtime,
-    )
-    if len(backups) <= MAX_BACKUPS:
-        return
-    for path in backups[:-MAX_BACKUPS]:
-        try:
-            os.remove(path)
-        except OSError:
-            log.warning("Failed to remove old backup: %s", path)
+    backup_store.prune(_backup_dir(base_dir), MAX_BACKUPS)
 
 def _create_backup(base_dir):
-    bdir = _backup_dir(base_dir)
-    jdir = os.path.join(base_dir, "JSON")
-    ts = datetime.datetime.now().strftime("%d-%m_%H-%M-%S")
-    outname, outpath = _unique_backup_path(bdir, ts)
-    with zipfile.ZipFile(outpath, "w", compression=zipfile.ZIP_DEFLATED) as z:
-        if os.path.isdir(jdir):
-            for root, _, files in os.walk(jdir):
-                for fn in files:
-                    fp = os.path.join(root, fn)
-                    arc = os.path.relpath(fp, jdir)
-                    z.write(fp, arcname=arc)
+    """Take an incremental snapshot; only files whose content changed add blobs."""
+    name = backup_store.create_snapshot(os.path.join(base_dir, "JSON"), _backup_dir(base_dir))
     _cleanup_old_backups(base_dir)
-    return outname
+    return name
 
 def _backup_request_context() -> dict:
     """Return safe request metadata to trace backup calls without exposing tokens."""
@@ -107,27 +79,16 @@ def _backup_request_context() -> dict:
     }
 
 def _restore_backup(base_dir, name):
-    bdir = _backup_dir(base_dir)
-    jdir = os.path.join(base_dir, "JSON")
-    src = os.path.join(bdir, name)
-    if not (os.path.isfile(src) and src.endswith(".zip")):
-        raise FileNotFoundError("Backup not found")
-    if os.path.isdir(jdir):
-        shutil.copytree(jdir, jdir + ".bak.restore", dirs_exist_ok=True)
-    with zipfile.ZipFile(src, "r") as z:
-        _ensure_dir(jdir)
-        z.extractall(jdir)
-    return True
+    json_dir = os.path.join(base_dir, "JSON")
+    restored = backup_store.restore(json_dir, _backup_dir(base_dir), name)
+    # The documents were swapped wholesale; clients must reload rather than diff.
+    change_log.record_reset(json_dir)
+    return restored
 
 def _notification_settings_path(ctx):
     return _path(ctx, "notification_settings.json")
 
-NOTIFICATION_CATEGORIES = (
-    "splits",
-    "matches",
-    "bets",
-    "stages",
-)
+NOTIFICATION_CATEGORIES = notification_prefs.CATEGORIES
 
 def _players_path(ctx):
     return _path(ctx, "players.json")
@@ -137,145 +98,63 @@ def _fanzone_votes_path(ctx):
 def _bracket_slots_path(ctx):
     return _path(ctx, "bracket_slots.json")
 
+def _ownership_index(ctx):
+    return ownership_index.get(_players_path(ctx), lambda path: _read_json(path, {}))
+
 def _owners_for_team(ctx, team_name: str):
-    team_name = (team_name or "").strip().lower()
+    team_name = (team_name or "").strip()
     if not team_name:
         return []
-
-    players = _read_json(_players_path(ctx), {})
-    out = set()
-
-    if isinstance(players, dict):
-        for uid, pdata in players.items():
-            if not isinstance(pdata, dict):
-                continue
-            for entry in (pdata.get("teams") or []):
-                if not isinstance(entry, dict):
-                    continue
-                entry_team = (entry.get("team") or "").strip().lower()
-                if entry_team != team_name:
-                    continue
-
-                own = entry.get("ownership") or {}
-                main = own.get("main_owner")
-                splits = own.get("split_with") or []
-
-                if main is not None:
-                    out.add(str(main))
-                if isinstance(splits, list):
-                    for s in splits:
-                        if s is not None:
-                            out.add(str(s))
-
-    return sorted(out)
+    return _ownership_index(ctx).owner_ids(team_name)
 
 def _path(ctx, name):
     return os.path.join(_json_dir(ctx), name)
 
 def _read_json(path, default):
+    started = time.perf_counter()
     try:
         if not os.path.isfile(path):
             return default
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        data, nbytes = json_codec.read_file(path)
     except Exception:
+        request_metrics.metrics.observe_json_load(os.path.basename(path), 0, time.perf_counter() - started, ok=False)
         return default
+    request_metrics.metrics.observe_json_load(os.path.basename(path), nbytes, time.perf_counter() - started)
+    return data
 
 def _write_json_atomic(path, data):
-    tmp = path + ".tmp"
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-    os.replace(tmp, path)
-
-def _load_notification_settings(ctx):
-    data = _read_json(_notification_settings_path(ctx), {})
-    return data if isinstance(data, dict) else {}
+    """Returns the (mtime_ns, size, inode) signature of the version written."""
+    st = json_codec.write_file_stat(path, data)
+    change_log.record_write(path, data)
+    return st.st_mtime_ns, st.st_size, st.st_ino
 
-def _default_notification_categories() -> dict:
-    return {key: True for key in NOTIFICATION_CATEGORIES}
+def _notification_prefs(ctx) -> notification_prefs.PrefsSnapshot:
+    return notification_prefs.get(_notification_settings_path(ctx), lambda p: _read_json(p, {}))
 
 def _notification_record(ctx, uid: str) -> dict:
-    settings = _load_notification_settings(ctx)
-    raw = settings.get(str(uid))
-    if isinstance(raw, str):
-        raw = {"channel": raw}
-    if not isinstance(raw, dict):
-        raw = {}
-    channel = str(raw.get("channel") or "").strip().lower()
-    raw_categories = raw.get("categories")
-    categories = _default_notification_categories()
-    if isinstance(raw_categories, dict):
-        for key in NOTIFICATION_CATEGORIES:
-            if key in raw_categories:
-                categories[key] = bool(raw_categories.get(key))
-    return {"channel": channel, "categories": categories}
+    return _notification_prefs(ctx).record(uid)
 
 def _notification_preference(ctx, uid: str) -> str:
-    return _notification_record(ctx, uid).get("channel") or ""
+    return _notification_prefs(ctx).channel(uid)
 
 def _prefers_bell(ctx, uid: str) -> bool:
-    return _notification_preference(ctx, uid) in ("", "bell")
+    return bool(_notification_prefs(ctx).mask(uid) & notification_prefs.BELL)
 
 def _prefers_dms(ctx, uid: str) -> bool:
-    return _notification_preference(ctx, uid) in ("", "dms")
+    return bool(_notification_prefs(ctx).mask(uid) & notification_prefs.DMS)
 
 def _category_enabled(ctx, uid: str, category: str) -> bool:
-    return bool(_notification_record(ctx, uid).get("categories", {}).get(category, True))
+    return _notification_prefs(ctx).category_enabled(uid, category)
 
 def _filter_notification_ids(ctx, ids: list[str], channel: str, category: str) -> list[str]:
     if not ids:
         return []
-    settings = _load_notification_settings(ctx)
-    out = []
-    for uid in ids:
-        suid = str(uid or "").strip()
-        if not suid:
-            continue
-        pref_record = settings.get(suid)
-        if isinstance(pref_record, str):
-            pref_record = {"channel": pref_record}
-        if not isinstance(pref_record, dict):
-            pref_record = {}
-        pref = str(pref_record.get("channel") or "").strip().lower()
-        categories = _default_notification_categories()
-        if isinstance(pref_record.get("categories"), dict):
-            for key in NOTIFICATION_CATEGORIES:
-                if key in pref_record["categories"]:
-                    categories[key] = bool(pref_record["categories"].get(key))
-        if not categories.get(category, True):
-            continue
-        if channel == "bell" and pref in ("", "bell"):
-            out.append(suid)
-        elif channel == "dms" and pref in ("", "dms"):
-            out.append(suid)
-    return out
+    return _notification_prefs(ctx).filter(ids, channel, category)
 
 def _filter_notification_voters(ctx, voters: dict, category: str) -> dict:
     if not isinstance(voters, dict) or not voters:
         return {}
-    settings = _load_notification_settings(ctx)
-    out = {}
-    for uid, choice in voters.items():
-        suid = str(uid or "").strip()
-        if not suid:
-            continue
-        pref_record = settings.get(suid)
-        if isinstance(pref_record, str):
-            pref_record = {"channel": pref_record}
-        if not isinstance(pref_record, dict):
-            pref_record = {}
-        pref = str(pref_record.get("channel") or "").strip().lower()
-        categories = _default_notification_categories()
-        if isinstance(pref_record.get("categories"), dict):
-            for key in NOTIFICATION_CATEGORIES:
-                if key in pref_record["categories"]:
-                    categories[key] = bool(pref_record["categories"].get(key))
-        if not categories.get(category, True):
-            continue
-        if pref in ("", "bell"):
-            out[suid] = choice
-    return out
+    return _notification_prefs(ctx).filter_mapping(voters, "bell", category)
 
 def _now_iso():
     import datetime as _dt
@@ -284,6 +163,9 @@ def _now_iso():
 def _matches_path(ctx):
     return _path(ctx, "matches.json")
 
+def _timelines_dir(ctx):
+    return _path(ctx, "match_timelines")
+
 def _commands_path(ctx):
     rd = _ensure_dir(_json_dir(ctx))
     return os.path.join(rd, "bot_commands.jsonl")
@@ -313,6 +195,48 @@ def _log_paths(ctx):
 def _log_path(ctx, kind):
     return _log_paths(ctx).get(str(kind))
 
+def _log_filter_from_request():
+    """Build a LogFilter from ?level=&logger=&q=; raises ValueError on bad input."""
+    return log_tail.LogFilter(
+        level=request.args.get("level", ""),
+        logger=request.args.get("logger", ""),
+        pattern=request.args.get("q", ""),
+    )
+
+def _log_cursor(raw):
+    try:
+        cursor = int(raw)
+    except (TypeError, ValueError):
+        return None
+    return cursor if cursor >= 0 else None
+
+def _log_capture(ctx, kind):
+    """In-memory capture for a log kind (the launcher pipes bot output into one), or None."""
+    return (ctx.get("LOG_CAPTURES") or {}).get(str(kind))
+
+def _read_log_window(path, cursor, max_lines, flt, ring=None):
+    """Return (lines, cursor, reset) for a first load (cursor None) or an incremental poll.
+
+    With a ring the cursor is a line sequence number; otherwise it is a byte offset.
+    """
+    if cursor is not None:
+        if ring is not None:
+            lines, new_cursor, reset = ring.read_since(cursor)
+        else:
+            lines, new_cursor, reset = log_tail.read_since(path, cursor)
+        if not reset:
+            if lines and flt.active:
+                header_ok = ring.verdict(flt, cursor) if ring is not None else flt.verdict_at(path, cursor)
+                lines = flt.apply(lines, header_ok)
+            return lines[-max_lines:], new_cursor, False
+    else:
+        reset = False
+    if ring is not None:
+        lines, new_cursor = ring.tail(max_lines, flt)
+    else:
+        lines, new_cursor = log_tail.tail(path, max_lines, flt)
+    return lines, new_cursor, reset
+
 # ---- VERIFIED MAP (discord id -> display name) ----
 def _verified_map(ctx):
     blob = _read_json(_path(ctx, "verified.json"), {})
@@ -347,8 +271,7 @@ def _load_settings(ctx):
     try:
         path = _settings_path(ctx)
         if os.path.isfile(path):
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f) or {}
+            return json_codec.read_file(path)[0] or {}
     except Exception:
         pass
     return {}
@@ -371,8 +294,6 @@ def _update_auto_backup_timestamp(ctx, ts: int) -> None:
 
 def _auto_backup_if_due(ctx) -> str | None:
     """Create an automatic backup when the configured interval elapses."""
-    if not _is_admin(ctx):
-        return None
     settings = _load_settings(ctx)
     if not bool(settings.get("AUTO_BACKUP_ENABLED")):
         return None
@@ -387,6 +308,22 @@ def _auto_backup_if_due(ctx) -> str | None:
     log.info("Auto backup created (name=%s interval_hours=%.2f)", name, interval_hours)
     return name
 
+AUTO_BACKUP_POLL_SECONDS = 60.0
+
+def start_auto_backup_scheduler(ctx, poll_seconds: float = AUTO_BACKUP_POLL_SECONDS) -> threading.Thread:
+    """Run due auto backups on a daemon thread instead of inside admin requests."""
+    def _loop():
+        while True:
+            try:
+                _auto_backup_if_due(ctx)
+            except Exception:
+                log.exception("Auto backup failed")
+            time.sleep(poll_seconds)
+
+    t = threading.Thread(target=_loop, name="auto-backup", daemon=True)
+    t.start()
+    return t
+
 def _guilds_path(ctx):
     return _path(ctx, "guilds.json")
 
@@ -420,11 +357,7 @@ def _is_divider_channel(name: str) -> bool:
 def _save_settings(ctx, data: dict) -> bool:
     path = _settings_path(ctx)
     try:
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        tmp = path + ".tmp"
-        with open(tmp, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        os.replace(tmp, path)
+        json_codec.write_file(path, data)
         return True
     except Exception:
         return False
@@ -490,24 +423,42 @@ def _is_helper(ctx):
     helper_name = str(cfg.get("HELPER_ROLE_NAME") or HELPER_ROLE_NAME).strip().casefold()
     return _user_has_role(u, helper_name)
 
+def _split_event_party_ids(ev):
+    """(requester id, owner id) across the field names history entries have used."""
+    req_id = str(ev.get("requester_id") or ev.get("from_id") or ev.get("from") or "")
+    own_id = str(
+        ev.get("main_owner_id")
+        or ev.get("to_id")
+        or ev.get("receiver_id")
+        or ev.get("resolved_by")
+        or ev.get("main_owner")
+        or ev.get("to")
+        or ""
+    )
+    return req_id, own_id
+
+SPLIT_HISTORY_LIST = list_query.ListSpec(
+    sorts={
+        "time": lambda ev: ev.get("timestamp") or ev.get("ts"),
+        "team": lambda ev: str(ev.get("team") or "").casefold(),
+    },
+    filters={
+        "status": list_query.casefold_in(lambda ev: ev.get("action") or ev.get("status")),
+        "team": list_query.casefold_in(lambda ev: ev.get("team")),
+        "user": lambda ev, values: any(pid.casefold() in values for pid in _split_event_party_ids(ev) if pid),
+    },
+)
+
 # ---- BLUEPRINT ----
 def create_admin_routes(ctx):
     bp = Blueprint("admin", __name__)
 
-    @bp.before_request
-    def _run_auto_backup_scheduler():
-        """Run due auto backups on admin traffic so schedule is not page-dependent."""
-        # This makes backup cadence consistent for active admins even when they
-        # never open the dedicated backups page.
-        _auto_backup_if_due(ctx)
-
     # ---------- Auth endpoints (Discord-session based) ----------
-    @bp.get("/admin/auth/status")
-    def auth_status():
+    def _auth_status_payload():
         u = _current_user()
         is_admin = bool(_is_admin(ctx))
         is_helper = bool(_is_helper(ctx))
-        return jsonify({
+        return {
             "unlocked": is_admin,
             "is_admin": is_admin,
             "is_helper": is_helper,
@@ -518,7 +469,14 @@ def create_admin_routes(ctx):
                 "global_name":(u or {}).get("global_name"),
                 "avatar":     (u or {}).get("avatar"),
             }
-        })
+        }
+
+    # Served to the web app's first paint by /api/bootstrap as well.
+    ctx.setdefault("BOOTSTRAP_SECTIONS", {})["auth"] = lambda _base: _auth_status_payload()
+
+    @bp.get("/admin/auth/status")
+    def auth_status():
+        return jsonify(_auth_status_payload())
 
     @bp.post("/admin/standings/audit")
     def standings_audit_refresh():
@@ -572,6 +530,91 @@ def create_admin_routes(ctx):
             return None
         return jsonify({"ok": False, "error": "Unauthorized"}), 401
 
+    # ---------- Background jobs ----------
+    # The launcher passes its runner; tools and tests that build the routes
+    # on their own get a private one.
+    jobs = ctx.get("JOBS")
+    if jobs is None:
+        jobs = ctx["JOBS"] = job_runner.JobRunner(_path(ctx, "jobs.json"))
+
+    def _run_job(kind, params=None, key=""):
+        """Submit a job and wait up to JOB_INLINE_WAIT_SECONDS for it."""
+        record = jobs.submit(kind, params, key=key, user=_user_label())
+        return jobs.wait(record["id"], JOB_INLINE_WAIT_SECONDS)
+
+    def _job_pending(record):
+        return jsonify({"ok": True, "pending": True, "job": record}), 202
+
+    @bp.errorhandler(job_runner.QueueFull)
+    def _job_queue_full(_exc):
+        return jsonify({"ok": False, "error": "job_queue_full"}), 503
+
+    @bp.get("/admin/jobs")
+    def admin_jobs_list():
+        resp = require_admin()
+        if resp is not None:
+            return resp
+        kind = str(request.args.get("kind") or "").strip()
+        try:
+            limit = max(1, min(int(request.args.get("limit") or 50), job_runner.KEEP_FINISHED))
+        except ValueError:
+            limit = 50
+        return jsonify({"ok": True, "jobs": jobs.list(limit, kind)})
+
+    @bp.post("/admin/jobs")
+    def admin_jobs_submit():
+        resp = require_admin()
+        if resp is not None:
+            return resp
+        body = request.get_json(silent=True) or {}
+        kind = str(body.get("kind") or "").strip()
+        params = body.get("params") or {}
+        if not jobs.is_public(kind):
+            return jsonify({"ok": False, "error": "unknown_job_kind"}), 400
+        if not isinstance(params, dict):
+            return jsonify({"ok": False, "error": "invalid_params"}), 400
+        record = jobs.submit(kind, params, key=str(body.get("key") or "").strip(), user=_user_label())
+        log.info("Job submitted by %s (kind=%s id=%s)", _user_label(), kind, record["id"])
+        return jsonify({"ok": True, "job": record}), 202
+
+    @bp.get("/admin/jobs/<job_id>")
+    def admin_job_get(job_id):
+        resp = require_admin()
+        if resp is not None:
+            return resp
+        record = jobs.get(job_id)
+        if record is None:
+            return jsonify({"ok": False, "error": "job_not_found"}), 404
+        return jsonify({"ok": True, "job": record})
+
+    @bp.post("/admin/jobs/<job_id>/cancel")
+    def admin_job_cancel(job_id):
+        resp = require_admin()
+        if resp is not None:
+            return resp
+        record = jobs.cancel(job_id)
+        if record is None:
+            return jsonify({"ok": False, "error": "job_not_found"}), 404
+        log.info("Job cancel requested by %s (kind=%s id=%s state=%s)", _user_label(), record["kind"], job_id, record["state"])
+        return jsonify({"ok": True, "job": record})
+
+    def _job_backups_create(job):
+        base = ctx.get("BASE_DIR", "")
+        # Hashing and gzip are the slow part; with a process pool they run there.
+        with backup_store.exclusive():
+            name = job.offload(backup_store.create_snapshot, os.path.join(base, "JSON"), _backup_dir(base))
+            _cleanup_old_backups(base)
+        _update_auto_backup_timestamp(ctx, int(time.time()))
+        return {"created": name}
+
+    def _job_backups_restore(job):
+        name = str(job.params.get("name") or "")
+        _restore_backup(ctx.get("BASE_DIR", ""), name)
+        return {"restored": name}
+
+    jobs.register("backups_create", _job_backups_create, public=True)
+    jobs.register("backups_restore", _job_backups_restore, public=True)
+
     @bp.get("/api/backups")
     def backups_list():
         base = ctx.get("BASE_DIR", "")
@@ -592,41 +635,47 @@ def create_admin_routes(ctx):
         rel = request.args.get("rel", "")
         if not rel:
             return jsonify({"ok": False, "error": "missing rel"}), 400
-        fp = os.path.join(_backup_dir(base), rel)
-        if not os.path.isfile(fp):
+        # Snapshots are exported as a classic zip on demand; legacy zips are
+        # streamed as stored.
+        exported = backup_store.export_zip(_backup_dir(base), rel)
+        if exported is None:
             return jsonify({"ok": False, "error": "not found"}), 404
-        return send_file(fp, as_attachment=True, download_name=os.path.basename(fp))
+        buf, download_name = exported
+        return send_file(buf, as_attachment=True, download_name=download_name, mimetype="application/zip")
 
     @bp.post("/api/backups/create")
     def backups_create():
-        base = ctx.get("BASE_DIR", "")
-        name = _create_backup(base)
-        _update_auto_backup_timestamp(ctx, int(time.time()))
         user = session.get(USER_SESSION_KEY) or {}
+        record = _run_job("backups_create", key="backups:create")
         # Trace backup creation to identify startup callers triggering this endpoint.
         trace_ctx = _backup_request_context()
         log.info(
-            "Backup created via API (name=%s discord_id=%s username=%s remote_addr=%s forwarded_for=%s user_agent=%s)",
-            name,
+            "Backup requested via API (job=%s state=%s discord_id=%s username=%s remote_addr=%s forwarded_for=%s user_agent=%s)",
+            record["id"],
+            record["state"],
             _effective_uid(ctx) or user.get("discord_id") or "anonymous",
             user.get("username") or "unknown",
             trace_ctx.get("remote_addr"),
             trace_ctx.get("forwarded_for"),
             trace_ctx.get("user_agent"),
         )
-        return jsonify({"ok": True, "created": name})
+        if record["state"] in job_runner.ACTIVE:
+            return _job_pending(record)
+        if record["state"] != "done":
+            return jsonify({"ok": False, "error": record["error"] or record["state"], "job": record}), 500
+        return jsonify({"ok": True, "created": record["result"]["created"], "job": record})
 
     @bp.post("/api/backups/restore")
     def backups_restore():
-        base = ctx.get("BASE_DIR", "")
         body = request.get_json(silent=True) or {}
         name = body.get("name", "")
-        try:
-            _restore_backup(base, name)
-        except FileNotFoundError:
-            return jsonify({"ok": False, "error": "backup not found"}), 404
-        except Exception as e:
-            return jsonify({"ok": False, "error": str(e)}), 500
+        record = _run_job("backups_restore", {"name": name}, key=f"backups:restore:{name}")
+        if record["state"] in job_runner.ACTIVE:
+            return _job_pending(record)
+        if record["state"] != "done":
+            if record.get("error_type") == "FileNotFoundError":
+                return jsonify({"ok": False, "error": "backup not found", "job": record}), 404
+            return jsonify({"ok": False, "error": record["error"] or record["state"], "job": record}), 500
         user = session.get(USER_SESSION_KEY) or {}
         log.info(
             "Backup restored via API (name=%s discord_id=%s username=%s)",
@@ -634,7 +683,7 @@ def create_admin_routes(ctx):
             _effective_uid(ctx) or user.get("discord_id") or "anonymous",
             user.get("username") or "unknown",
         )
-        return jsonify({"ok": True, "restored": name})
+        return jsonify({"ok": True, "restored": name, "job": record})
 
     # ---------- Bot controls ----------
     def _callable(fn):
@@ -711,9 +760,13 @@ def create_admin_routes(ctx):
             return jsonify({"ok": False, "error": "missing team or new_owner_id"}), 400
         log.info("Ownership reassignment requested by %s (team=%s new_owner_id=%s)", _user_label(), team, new_owner_id)
 
-        players = _read_json(_players_path(ctx), {})
+        players, loaded = ownership_index.read(_players_path(ctx), lambda path: _read_json(path, {}))
         if not isinstance(players, dict):
             players = {}
+        index = ownership_index.current(_players_path(ctx), players, loaded)
+        # Only players holding a copy of the team (any spelling) need touching.
+        holders = [uid for uid in index.holders(team) if isinstance(players.get(uid), dict)]
+        spellings = index.spellings(team) | {team}
 
         def ensure_player(uid):
             uid = str(uid)
@@ -731,10 +784,8 @@ def create_admin_routes(ctx):
         # First gather any split-owner metadata from existing copies of the team.
         # Reassigning should move main ownership, not leave stale main-owner rows
         # behind in players.json or accidentally keep the new main owner as a split.
-        for _uid, pdata in list(players.items()):
-            if not isinstance(pdata, dict):
-                continue
-            for entry in pdata.get("teams", []):
+        for uid in holders:
+            for entry in players[uid].get("teams", []):
                 if not isinstance(entry, dict) or str(entry.get("team") or "").casefold() != team_key:
                     continue
 
@@ -754,9 +805,8 @@ def create_admin_routes(ctx):
         # Remove every existing copy for this team before writing the canonical
         # records back. This makes the JSON reflect the actual reassignment
         # instead of merely nulling the old owner and leaving duplicate rows.
-        for uid, pdata in list(players.items()):
-            if not isinstance(pdata, dict):
-                continue
+        for uid in holders:
+            pdata = players[uid]
             teams = pdata.get("teams")
             if not isinstance(teams, list):
                 pdata["teams"] = []
@@ -801,7 +851,11 @@ def create_admin_routes(ctx):
                 split_entry["public_message_id"] = canonical_public_message_id
             split_player["teams"].append(split_entry)
 
-        _write_json_atomic(_players_path(ctx), players)
+        written = _write_json_atomic(_players_path(ctx), players)
+        ownership_index.update(
+            _players_path(ctx), players, spellings,
+            uids=[new_owner_id, *split_owner_ids], base=index, loaded=loaded, written=written,
+        )
 
         vmap = _verified_map(ctx)
         row = {
@@ -1073,54 +1127,51 @@ def create_admin_routes(ctx):
         events = raw.get("events") if isinstance(raw, dict) else raw
         if not isinstance(events, list):
             events = []
-
-        id_bucket = set()
-        for ev in events:
-            if not isinstance(ev, dict):
-                continue
-            for k in ("requester_id", "main_owner_id", "from_id", "to_id", "receiver_id", "resolved_by", "main_owner", "from", "to"):
-                v = ev.get(k)
-                if v:
-                    id_bucket.add(str(v))
-
-        names = _resolve_names(ctx, id_bucket)
-
-        norm = []
-        for ev in events:
-            if not isinstance(ev, dict):
-                continue
-            e = dict(ev)
-            req_id = str(ev.get("requester_id") or ev.get("from_id") or ev.get("from") or "")
-            own_id = str(
-                ev.get("main_owner_id")
-                or ev.get("to_id")
-                or ev.get("receiver_id")
-                or ev.get("resolved_by")
-                or ev.get("main_owner")
-                or ev.get("to")
-                or ""
-            )
-            # Discord-cog and website history entries have used slightly
-            # different owner fields over time. Keep the admin history response
-            # normalized so older accepted rows still show a TO value.
-            e["from_id"] = req_id
-            e["to_id"]   = own_id
-            e["main_owner_id"] = e.get("main_owner_id") or own_id
-            e["from_username"] = names.get(req_id, req_id)
-            e["to_username"]   = names.get(own_id, own_id)
-            e["from"] = e["from_username"]
-            e["to"]   = e["to_username"]
-            if not e.get("action") and e.get("status"):
-                e["action"] = e.get("status")
-            norm.append(e)
+        events = [ev for ev in events if isinstance(ev, dict)]
+
+        def normalize(page):
+            # Name lookups only for the events actually returned.
+            id_bucket = set()
+            for ev in page:
+                for k in ("requester_id", "main_owner_id", "from_id", "to_id", "receiver_id", "resolved_by", "main_owner", "from", "to"):
+                    v = ev.get(k)
+                    if v:
+                        id_bucket.add(str(v))
+
+            names = _resolve_names(ctx, id_bucket)
+
+            norm = []
+            for ev in page:
+                e = dict(ev)
+                req_id, own_id = _split_event_party_ids(ev)
+                # Discord-cog and website history entries have used slightly
+                # different owner fields over time. Keep the admin history response
+                # normalized so older accepted rows still show a TO value.
+                e["from_id"] = req_id
+                e["to_id"]   = own_id
+                e["main_owner_id"] = e.get("main_owner_id") or own_id
+                e["from_username"] = names.get(req_id, req_id)
+                e["to_username"]   = names.get(own_id, own_id)
+                e["from"] = e["from_username"]
+                e["to"]   = e["to_username"]
+                if not e.get("action") and e.get("status"):
+                    e["action"] = e.get("status")
+                norm.append(e)
+            return norm
+
+        if set(request.args) <= {"limit"}:
+            # Original contract: the newest ``limit`` events, oldest first.
+            try:
+                limit = int(request.args.get("limit", "200"))
+            except Exception:
+                limit = 200
+            return jsonify({"events": normalize(events[-abs(limit):])})
 
         try:
-            limit = int(request.args.get("limit", "200"))
-        except Exception:
-            limit = 200
-        norm = norm[-abs(limit):]
-
-        return jsonify({"events": norm})
+            query = list_query.ListQuery.parse(request.args, SPLIT_HISTORY_LIST)
+        except list_query.ListQueryError as e:
+            return list_query.error_response(e)
+        return list_query.respond(query.apply(events, transform=normalize), {}, "events")
 
     # ---------- BETS ----------
     def _bets_path(): return _path(ctx, "bets.json")
@@ -1163,10 +1214,12 @@ def create_admin_routes(ctx):
         bet_title = str((bet or {}).get("bet_title") or f"Bet {bet_id}")
         wager = str((bet or {}).get("wager") or "-")
 
+        prefs = _notification_prefs(ctx)
+
         def add_event(uid: str, result: str):
             if not uid:
                 return
-            if not _prefers_bell(ctx, uid) or not _category_enabled(ctx, uid, "bets"):
+            if not prefs.allows(uid, "bell", "bets"):
                 return
             eid = f"bet:{bet_id}:{uid}"
             if eid in existing:
@@ -1287,18 +1340,89 @@ def create_admin_routes(ctx):
     # ---------- LOGS ----------
     @bp.get("/admin/log/<kind>")
     def admin_log_get(kind):
+        """Return the log tail, or only lines appended since ?cursor= when given."""
         resp = require_admin()
         if resp is not None:
             return resp
         path = _log_path(ctx, kind)
-        lines = []
+        if not path:
+            return jsonify({"ok": False, "error": "unknown_log"}), 404
         try:
-            if path and os.path.isfile(path):
-                with open(path, "r", encoding="utf-8", errors="ignore") as f:
-                    lines = f.read().splitlines()[-2000:]
-        except Exception:
-            lines = []
-        return jsonify({"lines": lines})
+            flt = _log_filter_from_request()
+        except ValueError as e:
+            return jsonify({"ok": False, "error": str(e)}), 400
+        try:
+            max_lines = int(request.args.get("lines", LOG_VIEW_DEFAULT_LINES))
+        except (TypeError, ValueError):
+            max_lines = LOG_VIEW_DEFAULT_LINES
+        max_lines = max(1, min(max_lines, LOG_VIEW_MAX_LINES))
+        cursor = _log_cursor(request.args.get("cursor"))
+        capture = _log_capture(ctx, kind)
+        ring = capture.ring if capture is not None else None
+
+        try:
+            lines, cursor, reset = _read_log_window(path, cursor, max_lines, flt, ring=ring)
+            size = None if ring is not None else (os.path.getsize(path) if os.path.isfile(path) else 0)
+        except OSError:
+            log.exception("Failed to read log %s", kind)
+            lines, cursor, reset, size = [], 0, True, 0
+        resp = jsonify({
+            "ok": True,
+            "lines": lines,
+            "cursor": cursor,
+            "reset": reset,
+            "size": size,
+            "source": "memory" if ring is not None else "file",
+        })
+        resp.headers["Cache-Control"] = "no-store"
+        return resp
+
+    @bp.get("/admin/log/<kind>/stream")
+    def admin_log_stream(kind):
+        """Server-sent events live tail; each event id is the cursor after it."""
+        resp = require_admin()
+        if resp is not None:
+            return resp
+        path = _log_path(ctx, kind)
+        if not path:
+            return jsonify({"ok": False, "error": "unknown_log"}), 404
+        try:
+            flt = _log_filter_from_request()
+        except ValueError as e:
+            return jsonify({"ok": False, "error": str(e)}), 400
+        # Browsers resend the last event id on reconnect, which resumes the tail.
+        cursor = _log_cursor(request.headers.get("Last-Event-ID") or request.args.get("cursor"))
+        capture = _log_capture(ctx, kind)
+        ring = capture.ring if capture is not None else None
+
+        def _event(name, lines, cur, reset=False):
+            data = json.dumps({"lines": lines, "cursor": cur, "reset": reset}, ensure_ascii=False)
+            return f"id: {cur}\nevent: {name}\ndata: {data}\n\n"
+
+        def generate():
+            cur = cursor
+            if cur is None:
+                lines, cur, _ = _read_log_window(path, None, LOG_VIEW_DEFAULT_LINES, flt, ring=ring)
+                yield _event("lines", lines, cur, reset=True)
+            started = last_sent = time.monotonic()
+            while time.monotonic() - started < LOG_STREAM_MAX_SECONDS:
+                try:
+                    lines, new_cur, reset = _read_log_window(path, cur, LOG_VIEW_DEFAULT_LINES, flt, ring=ring)
+                except OSError:
+                    lines, new_cur, reset = [], cur, False
+                if reset or lines:
+                    yield _event("lines", lines, new_cur, reset=reset)
+                    last_sent = time.monotonic()
+                elif time.monotonic() - last_sent >= LOG_STREAM_HEARTBEAT_SECONDS:
+                    yield ": ping\n\n"
+                    last_sent = time.monotonic()
+                cur = new_cur
+                time.sleep(LOG_STREAM_POLL_SECONDS)
+
+        resp = Response(generate(), mimetype="text/event-stream")
+        resp.headers["Cache-Control"] = "no-store"
+        resp.headers["X-Accel-Buffering"] = "no"
+        return resp
 
     @bp.post("/admin/log/<kind>/clear")
     def admin_log_clear(kind):
@@ -1309,8 +1433,13 @@ def create_admin_routes(ctx):
         if not path:
             return jsonify({"ok": False, "error": "unknown_log"}), 404
         try:
-            os.makedirs(os.path.dirname(path), exist_ok=True)
-            open(path, "w", encoding="utf-8").close()
+            capture = _log_capture(ctx, kind)
+            if capture is not None:
+                # Truncate through the capture so its open handler keeps writing at offset 0.
+                capture.clear()
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                open(path, "w", encoding="utf-8").close()
             return jsonify({"ok": True})
         except Exception as e:
             return jsonify({"ok": False, "error": str(e)}), 500
@@ -1325,6 +1454,48 @@ def create_admin_routes(ctx):
             return jsonify({"ok": False, "error": "not_found"}), 404
         return send_file(path, as_attachment=True, download_name=f"{kind}.log", mimetype="text/plain")
 
+    # ---------- METRICS ----------
+    def require_metrics_access():
+        # Scrapers cannot hold a Discord session, so a configured
+        # metrics_token is accepted as a bearer token in addition to admin login.
+        token = str((ctx.get("CONFIG") or {}).get("metrics_token") or "")
+        auth = request.headers.get("Authorization", "")
+        if token and auth.startswith("Bearer ") and hmac.compare_digest(auth[7:].strip(), token):
+            return None
+        return require_admin()
+
+    @bp.get("/admin/metrics")
+    def admin_metrics():
+        resp = require_metrics_access()
+        if resp is not None:
+            return resp
+        resp = make_response(request_metrics.metrics.render_prometheus())
+        resp.headers["Content-Type"] = "text/plain; version=0.0.4; charset=utf-8"
+        resp.headers["Cache-Control"] = "no-store"
+        return resp
+
+    @bp.get("/admin/metrics.json")
+    def admin_metrics_json():
+        resp = require_metrics_access()
+        if resp is not None:
+            return resp
+        resp = jsonify({"ok": True, **request_metrics.metrics.snapshot()})
+        resp.headers["Cache-Control"] = "no-store"
+        return resp
+
+    @bp.get("/admin/bot/telemetry")
+    def admin_bot_telemetry():
+        """Last telemetry snapshot published by the bot (loop ticks, queue lag, API latency)."""
+        resp = require_admin()
+        if resp is not None:
+            return resp
+        snap = bot_telemetry.read_snapshot(_json_dir(ctx))
+        if snap is None:
+            return jsonify({"ok": False, "error": "no_snapshot"}), 404
+        resp = jsonify({"ok": True, "telemetry": snap})
+        resp.headers["Cache-Control"] = "no-store"
+        return resp
+
     # === view/update stages ===
     def _team_stage_path(ctx):
         return os.path.join(_json_dir(ctx), "team_stage.json")
@@ -1614,11 +1785,36 @@ def create_admin_routes(ctx):
                 "home_score": fixture.get("home_score"),
                 "away_score": fixture.get("away_score"),
                 "completed": fixture.get("home_score") is not None and fixture.get("away_score") is not None,
-                "live_stats": fixture.get("live_stats") if isinstance(fixture.get("live_stats"), list) else [],
+                # Timelines are fetched per fixture from /admin/fixtures/<id>/timeline.
+                "live_score": fixture.get("live_score") if isinstance(fixture.get("live_score"), dict) else None,
                 "winner_side": str(fixture.get("winner_side") or "").strip().lower(),
             })
         return jsonify({"ok": True, "fixtures": out})
 
+    @bp.get("/admin/fixtures/<match_id>/timeline")
+    def admin_fixture_timeline(match_id):
+        """Live events of one fixture, in match-clock order."""
+        resp = require_quick_options()
+        if resp is not None:
+            return resp
+
+        match_id = str(match_id or "").strip()
+
+        def legacy():
+            _, fixtures, _ = _load_matches_payload()
+            fixture = next(
+                (
+                    item for item in fixtures
+                    if isinstance(item, dict)
+                    and str(item.get("id") or item.get("fixture_id") or "").strip() == match_id
+                ),
+                {},
+            )
+            return fixture.get("live_stats")
+
+        timeline = match_timeline.load(_timelines_dir(ctx), match_id, legacy)
+        return jsonify({"ok": True, "fixture_id": match_id, "live_stats": timeline.view()})
+
     @bp.post("/admin/fixtures/quick-announce")
     def admin_fixture_quick_announce():
         """Queue a staff-written live-match update for the fixture's dedicated channel."""
@@ -1683,72 +1879,45 @@ def create_admin_routes(ctx):
             country = ""
             match_time = ""
         channel = _resolve_fanzone_channel(fixture, home, away)
-        live_stats = fixture.get("live_stats")
-        if not isinstance(live_stats, list):
-            live_stats = []
-        # Keep one score calculation as the source of truth for both the
-        # persisted event and its Discord card. Half time excludes second-half
-        # goals; other updates include every goal through the new event.
-        if event_type == "disallowed_goal":
-            # Remove the latest matching goal so the live score rolls back, then
-            # keep a separate timeline entry that explains why the score changed.
-            removed_goal = False
-            for idx in range(len(live_stats) - 1, -1, -1):
-                stat = live_stats[idx]
-                if (
-                    isinstance(stat, dict)
-                    and stat.get("event_type") == "goal"
-                    and stat.get("country") == country
-                ):
-                    del live_stats[idx]
-                    removed_goal = True
-                    break
-            if not removed_goal:
-                return jsonify({"ok": False, "error": "goal_not_found"}), 400
-
-        score_stats = live_stats + ([] if event_type == "disallowed_goal" else [{
-            "event_type": event_type,
-            "country": country,
-            "match_time": match_time,
-        }])
-
-        def goals_for(team):
-            goals = [
-                stat for stat in score_stats
-                if isinstance(stat, dict)
-                and stat.get("event_type") == "goal"
-                and stat.get("country") == team
-            ]
-            if event_type != "half_time":
-                return len(goals)
-            return sum(
-                1
-                for stat in goals
-                if str(stat.get("match_time") or "").split("+", 1)[0].isdigit()
-                and int(str(stat.get("match_time")).split("+", 1)[0]) <= 45
-            )
-
-        home_score = goals_for(home)
-        away_score = goals_for(away)
-        message = f"{home} {home_score} - {away_score} {away}"
-        live_stats.append({
+        # Fixtures recorded before per-fixture timelines keep their events in
+        # matches.json; the first new event moves them into the log.
+        timeline = match_timeline.seed(_timelines_dir(ctx), match_id, fixture.get("live_stats"))
+        event = {
             "event_type": event_type,
             "label": allowed_events[event_type],
-            "message": message,
             "country": country,
             "match_time": match_time,
             "ts": int(time.time()),
-        })
-        # Operators may learn about an incident after newer updates have
-        # already been entered. Persist match-clock order so every later
-        # consumer receives a chronological timeline.
-        fixture["live_stats"] = sort_match_events(live_stats)[-100:]
-        if container is None:
-            _write_json_atomic(_matches_path(ctx), fixtures)
-        else:
-            if key:
-                container[key] = fixtures
-            _write_json_atomic(_matches_path(ctx), container)
+        }
+        if event_type == "disallowed_goal":
+            # Cancel the latest matching goal so the live score rolls back; the
+            # disallowed entry stays in the timeline to explain the change.
+            goal = timeline.latest("goal", country)
+            if goal is None:
+                return jsonify({"ok": False, "error": "goal_not_found"}), 400
+            event["voids"] = goal.get("id")
+
+        # Keep one score calculation as the source of truth for both the
+        # persisted event and its Discord card. Half time excludes second-half
+        # goals; other updates include every goal through the new event.
+        preview = timeline.extended([event])
+        home_score = preview.goals(home, first_half=event_type == "half_time")
+        away_score = preview.goals(away, first_half=event_type == "half_time")
+        message = f"{home} {home_score} - {away_score} {away}"
+        event["message"] = message
+        # The log keeps entry order; readers get match-clock order, so an
+        # incident reported late still lands in its place.
+        timeline = match_timeline.append(_timelines_dir(ctx), match_id, event)
+        live_score = timeline.score(home, away)
+        if "live_stats" in fixture or fixture.get("live_score") != live_score:
+            fixture.pop("live_stats", None)
+            fixture["live_score"] = live_score
+            if container is None:
+                _write_json_atomic(_matches_path(ctx), fixtures)
+            else:
+                if key:
+                    container[key] = fixtures
+                _write_json_atomic(_matches_path(ctx), container)
         _enqueue_command(ctx, "quick_match_announcement", {
             "fixture_id": match_id,
             "home": home,
@@ -1763,7 +1932,6 @@ def create_admin_routes(ctx):
             # deliberately leaves it blank because neither team owns the event.
             "country": country,
             "channel": channel,
-            "live_stats": fixture["live_stats"],
         })
         log.info(
             "Quick match announcement queued by %s (fixture_id=%s event_type=%s channel=%s)",
@@ -1777,7 +1945,7 @@ def create_admin_routes(ctx):
             "fixture_id": match_id,
             "event_type": event_type,
             "channel": channel,
-            "live_stats": fixture["live_stats"],
+            "live_stats": timeline.view(),
         })
 
     @bp.post("/admin/fixtures/delay")
@@ -1999,175 +2167,174 @@ def create_admin_routes(ctx):
         elif away_score > home_score:
             winner_side = "away"
 
-        container, fixtures, key = _load_matches_payload()
-        winners = _read_json(_path(ctx, "fan_winners.json"), {})
-        if not isinstance(winners, dict):
-            winners = {}
-        updated = False
-        matched_fixture = None
-        unchanged = False
-        is_correction = False
-        has_existing_settlement = False
-        for fixture in fixtures:
-            if not isinstance(fixture, dict):
-                continue
-            fid = str(fixture.get("id") or fixture.get("fixture_id") or "").strip()
-            if fid != match_id:
-                continue
-            if requested_winner_side:
-                stage = normalize_stage(str(
-                    fixture.get("stage")
-                    or fixture.get("round")
-                    or fixture.get("phase")
+        with settlements.lock:
+            container, fixtures, key = _load_matches_payload()
+            winners = _read_json(_path(ctx, "fan_winners.json"), {})
+            if not isinstance(winners, dict):
+                winners = {}
+            updated = False
+            matched_fixture = None
+            unchanged = False
+            is_correction = False
+            has_existing_settlement = False
+            for fixture in fixtures:
+                if not isinstance(fixture, dict):
+                    continue
+                fid = str(fixture.get("id") or fixture.get("fixture_id") or "").strip()
+                if fid != match_id:
+                    continue
+                if requested_winner_side:
+                    stage = normalize_stage(str(
+                        fixture.get("stage")
+                        or fixture.get("round")
+                        or fixture.get("phase")
+                        or ""
+                    ))
+                    knockout_stages = {
+                        "Round of 32",
+                        "Round of 16",
+                        "Quarter-finals",
+                        "Semi-finals",
+                        "Third Place Play-off",
+                        "Final",
+                    }
+                    if stage not in knockout_stages:
+                        return jsonify({
+                            "ok": False,
+                            "error": "winner_side_requires_knockout_match",
+                        }), 400
+                try:
+                    previous_home_score = int(str(fixture.get("home_score")).strip())
+                    previous_away_score = int(str(fixture.get("away_score")).strip())
+                    had_previous_score = True
+                except Exception:
+                    previous_home_score = None
+                    previous_away_score = None
+                    had_previous_score = False
+                # Scores and winner records were historically written by separate
+                # endpoints. A save is only unchanged when both pieces already
+                # exist and agree; score-only production data still needs settling.
+                derived_id = _fanzone_fixture_id_from_fixture(fixture)
+                existing_settlement = winners.get(match_id)
+                if not isinstance(existing_settlement, dict) and derived_id:
+                    existing_settlement = winners.get(derived_id)
+                if not isinstance(existing_settlement, dict):
+                    existing_settlement = {}
+                settlement_side = str(
+                    existing_settlement.get("winner_side")
+                    or existing_settlement.get("winner")
                     or ""
-                ))
-                knockout_stages = {
-                    "Round of 32",
-                    "Round of 16",
-                    "Quarter-finals",
-                    "Semi-finals",
-                    "Third Place Play-off",
-                    "Final",
-                }
-                if stage not in knockout_stages:
-                    return jsonify({
-                        "ok": False,
-                        "error": "winner_side_requires_knockout_match",
-                    }), 400
-            try:
-                previous_home_score = int(str(fixture.get("home_score")).strip())
-                previous_away_score = int(str(fixture.get("away_score")).strip())
-                had_previous_score = True
-            except Exception:
-                previous_home_score = None
-                previous_away_score = None
-                had_previous_score = False
-            # Scores and winner records were historically written by separate
-            # endpoints. A save is only unchanged when both pieces already
-            # exist and agree; score-only production data still needs settling.
-            derived_id = _fanzone_fixture_id_from_fixture(fixture)
-            existing_settlement = winners.get(match_id)
-            if not isinstance(existing_settlement, dict) and derived_id:
-                existing_settlement = winners.get(derived_id)
-            if not isinstance(existing_settlement, dict):
-                existing_settlement = {}
-            settlement_side = str(
-                existing_settlement.get("winner_side")
-                or existing_settlement.get("winner")
-                or ""
-            ).strip().lower()
-            has_existing_settlement = settlement_side in ("home", "away", "draw")
-            unchanged = (
-                had_previous_score
-                and previous_home_score == home_score
-                and previous_away_score == away_score
-                and has_existing_settlement
-                and settlement_side == winner_side
-            )
-            is_correction = (
-                has_existing_settlement
-                and not unchanged
-                and (
-                    settlement_side != winner_side
-                    or (
-                        had_previous_score
-                        and (
-                            previous_home_score != home_score
-                            or previous_away_score != away_score
+                ).strip().lower()
+                has_existing_settlement = settlement_side in ("home", "away", "draw")
+                unchanged = (
+                    had_previous_score
+                    and previous_home_score == home_score
+                    and previous_away_score == away_score
+                    and has_existing_settlement
+                    and settlement_side == winner_side
+                )
+                is_correction = (
+                    has_existing_settlement
+                    and not unchanged
+                    and (
+                        settlement_side != winner_side
+                        or (
+                            had_previous_score
+                            and (
+                                previous_home_score != home_score
+                                or previous_away_score != away_score
+                            )
                         )
                     )
                 )
-            )
-            fixture["home_score"] = home_score
-            fixture["away_score"] = away_score
-            # Mark admin-entered scores as official. Some imported schedules keep
-            # status as scheduled with default 0-0 scores, so standings need an
-            # explicit staff-saved signal to distinguish real results.
-            fixture["status"] = "final"
-            fixture["result_source"] = "admin"
-            fixture["result_saved_at"] = int(time.time())
-            # Penalty shootouts select an advancing side without changing the
-            # official tied score displayed in fixture results.
-            if requested_winner_side:
-                fixture["winner_side"] = requested_winner_side
-                if home_penalties is not None:
-                    fixture["home_penalties"] = home_penalties
-                    fixture["away_penalties"] = away_penalties
-            else:
-                fixture.pop("winner_side", None)
-                fixture.pop("home_penalties", None)
-                fixture.pop("away_penalties", None)
-            updated = True
-            matched_fixture = fixture
-            break
+                fixture["home_score"] = home_score
+                fixture["away_score"] = away_score
+                # Mark admin-entered scores as official. Some imported schedules keep
+                # status as scheduled with default 0-0 scores, so standings need an
+                # explicit staff-saved signal to distinguish real results.
+                fixture["status"] = "final"
+                fixture["result_source"] = "admin"
+                fixture["result_saved_at"] = int(time.time())
+                # Penalty shootouts select an advancing side without changing the
+                # official tied score displayed in fixture results.
+                if requested_winner_side:
+                    fixture["winner_side"] = requested_winner_side
+                    if home_penalties is not None:
+                        fixture["home_penalties"] = home_penalties
+                        fixture["away_penalties"] = away_penalties
+                else:
+                    fixture.pop("winner_side", None)
+                    fixture.pop("home_penalties", None)
+                    fixture.pop("away_penalties", None)
+                updated = True
+                matched_fixture = fixture
+                break
 
-        if not updated:
-            return jsonify({"ok": False, "error": "match_not_found"}), 404
+            if not updated:
+                return jsonify({"ok": False, "error": "match_not_found"}), 404
 
-        if container is None:
-            _write_json_atomic(_matches_path(ctx), fixtures)
-        else:
-            if key:
-                container[key] = fixtures
-            _write_json_atomic(_matches_path(ctx), container)
+            if container is None:
+                _write_json_atomic(_matches_path(ctx), fixtures)
+            else:
+                if key:
+                    container[key] = fixtures
+                _write_json_atomic(_matches_path(ctx), container)
 
-        if unchanged:
-            home = str((matched_fixture or {}).get("home") or "").strip()
-            away = str((matched_fixture or {}).get("away") or "").strip()
-            winner_team = home if winner_side == "home" else away if winner_side == "away" else "Draw"
-            loser_team = away if winner_side == "home" else home if winner_side == "away" else ""
-            return jsonify({
-                "ok": True,
-                "unchanged": True,
-                "id": match_id,
-                "home_score": home_score,
-                "away_score": away_score,
-                "winner_side": winner_side,
-                "winner_team": winner_team,
-                "loser_team": loser_team,
-            })
+            if unchanged:
+                home = str((matched_fixture or {}).get("home") or "").strip()
+                away = str((matched_fixture or {}).get("away") or "").strip()
+                winner_team = home if winner_side == "home" else away if winner_side == "away" else "Draw"
+                loser_team = away if winner_side == "home" else home if winner_side == "away" else ""
+                return jsonify({
+                    "ok": True,
+                    "unchanged": True,
+                    "id": match_id,
+                    "home_score": home_score,
+                    "away_score": away_score,
+                    "winner_side": winner_side,
+                    "winner_team": winner_team,
+                    "loser_team": loser_team,
+                })
 
-        # Saving a new or corrected score runs the complete Match Picks flow,
-        # not just an embed. The helper locks voting, snapshots picks, updates
-        # leaderboards, and sends the appropriate owner/voter notifications.
-        settlement = _apply_fanzone_declaration(
-            matched_fixture or {},
-            match_id,
-            winner_side,
-            replace_existing=has_existing_settlement,
-            suppress_owner_dms=has_existing_settlement,
-            suppress_public=True,
-            corrected=is_correction,
-        )
-        # The dedicated Fixtures announcement is deliberately separate from
-        # Match Picks settlement so it uses the official full-time score embed.
-        _enqueue_command(ctx, "fixture_result", {
-            "fixture_id": match_id,
-            "home": str((matched_fixture or {}).get("home") or "").strip(),
-            "away": str((matched_fixture or {}).get("away") or "").strip(),
-            "home_score": home_score,
-            "away_score": away_score,
-            "winner_side": winner_side,
-            "home_penalties": home_penalties,
-            "away_penalties": away_penalties,
-            "channel": settlement["channel"],
-            "corrected": is_correction,
-            "live_stats": (
-                (matched_fixture or {}).get("live_stats")
-                if isinstance((matched_fixture or {}).get("live_stats"), list)
-                else []
-            ),
-        })
+            # Saving a new or corrected score runs the complete Match Picks flow,
+            # not just an embed. Recording the winner locks voting before the
+            # response; the settlement job then advances the bracket, snapshots
+            # picks, updates leaderboards, and sends the owner/voter
+            # notifications and announcements.
+            data = _record_fanzone_winner(matched_fixture or {}, match_id, winner_side)
+            data.update(
+                replace_existing=has_existing_settlement,
+                suppress_owner_dms=has_existing_settlement,
+                suppress_public=True,
+                corrected=is_correction,
+                announce={
+                    "fixture_id": match_id,
+                    "home": data["home"],
+                    "away": data["away"],
+                    "home_score": home_score,
+                    "away_score": away_score,
+                    "winner_side": winner_side,
+                    "home_penalties": home_penalties,
+                    "away_penalties": away_penalties,
+                    "corrected": is_correction,
+                },
+            )
+            job = settlements.submit(match_id, data)
 
+        log.info(
+            "Fixture result recorded by %s (fixture_id=%s score=%s-%s winner_side=%s settlement=%s)",
+            _user_label(), match_id, home_score, away_score, winner_side, job["id"],
+        )
         return jsonify({
             "ok": True,
             "id": match_id,
             "home_score": home_score,
             "away_score": away_score,
             "winner_side": winner_side,
-            "winner_team": settlement["winner_team"],
-            "loser_team": settlement["loser_team"],
+            "winner_team": data["winner_team"],
+            "loser_team": data["loser_team"],
             "corrected": is_correction,
+            "settlement": job,
         })
 
     @bp.post("/admin/bracket_slots")
@@ -2214,6 +2381,32 @@ def create_admin_routes(ctx):
         match_id = str(body.get("match_id") or body.get("matchId") or "").strip()
         utc = str(body.get("utc") or body.get("time") or "").strip()
 
+        params = {
+            "stage": stage,
+            "slot": slot_val,
+            "side": side,
+            "label": label,
+            "home": home,
+            "away": away,
+            "match_id": match_id,
+            "utc": utc,
+        }
+        digest = hashlib.blake2b(json_codec.dumps(params), digest_size=8).hexdigest()
+        record = _run_job("bracket_slot", params, key=f"bracket_slot:{digest}")
+        if record["state"] in job_runner.ACTIVE:
+            return _job_pending(record)
+        if record["state"] != "done":
+            return jsonify({"ok": False, "error": record["error"] or record["state"], "job": record}), 500
+        return jsonify({"ok": True, "stage": stage, "slot": slot_val, "job": record})
+
+    def _job_bracket_slot(job):
+        # matches.json is shared with result settlement.
+        with settlements.lock:
+            _save_bracket_slot(**job.params)
+        return {"stage": job.params["stage"], "slot": job.params["slot"]}
+
+    def _save_bracket_slot(stage, slot, side, label, home, away, match_id, utc):
+        slot_val = slot
         slots = _read_json(_bracket_slots_path(ctx), {})
         if not isinstance(slots, dict):
             slots = {}
@@ -2312,7 +2505,7 @@ def create_admin_routes(ctx):
                         container[key] = fixtures
                     _write_json_atomic(_matches_path(ctx), container)
 
-        return jsonify({"ok": True, "stage": stage, "slot": slot_val})
+    jobs.register("bracket_slot", _job_bracket_slot)
 
     @bp.get("/admin/discord/channels")
     def admin_discord_channels():
@@ -2493,28 +2686,46 @@ def create_admin_routes(ctx):
         if embed:
             payload["embeds"] = [embed]
 
-        url = f"https://discord.com/api/v10/channels/{channel_id}/messages"
+        digest = hashlib.blake2b(json_codec.dumps(payload), digest_size=8).hexdigest()
+        record = _run_job(
+            "admin_embed_post",
+            {"channel_id": channel_id, "payload": payload},
+            key=f"embed:{channel_id}:{digest}",
+        )
+        if record["state"] in job_runner.ACTIVE:
+            return _job_pending(record)
+        if record["state"] != "done":
+            status = 500 if record["error"] == "missing_bot_token" else 502
+            return jsonify({"ok": False, "error": record["error"] or record["state"], **(record["result"] or {})}), status
+        return jsonify({"ok": True, "message_id": record["result"]["message_id"], "job": record})
+
+    def _job_embed_post(job):
+        cfg = _load_config(ctx)
+        token = str(cfg.get("DISCORD_BOT_TOKEN") or cfg.get("BOT_TOKEN") or "").strip()
+        if not token:
+            raise job_runner.JobError("missing_bot_token")
+        url = f"https://discord.com/api/v10/channels/{job.params['channel_id']}/messages"
         try:
             resp = requests.post(
                 url,
                 headers={"Authorization": f"Bot {token}"},
-                json=payload,
+                json=job.params["payload"],
                 timeout=10,
             )
         except requests.RequestException as exc:
-            return jsonify({"ok": False, "error": "discord_request_failed", "detail": str(exc)}), 502
+            raise job_runner.JobError("discord_request_failed", detail=str(exc))
         if resp.status_code >= 300:
             detail = resp.text.strip() if resp.text else ""
-            return jsonify({
-                "ok": False,
-                "error": f"discord_error ({resp.status_code})",
-                "status": resp.status_code,
-                "detail": detail[:200],
-            }), 502
+            raise job_runner.JobError(
+                f"discord_error ({resp.status_code})",
+                status=resp.status_code,
+                detail=detail[:200],
+            )
 
         data = resp.json() if resp.content else {}
-        message_id = str((data or {}).get("id") or "").strip()
-        return jsonify({"ok": True, "message_id": message_id})
+        return {"message_id": str((data or {}).get("id") or "").strip()}
+
+    jobs.register("admin_embed_post", _job_embed_post)
 
 
     # ---------- FAN ZONE ----------
@@ -2711,228 +2922,37 @@ def create_admin_routes(ctx):
         ]
         _write_json_atomic(path, data)
 
-    def _match_no(raw) -> int | None:
-        text = str(raw or "").strip()
-        if not text:
-            return None
-        if re.fullmatch(r"\d{1,3}", text):
-            return int(text)
-        # FIFA/imported feeds commonly prefix match numbers with a short label
-        # (for example M73 or W74). Strip those prefixes so knockout winners
-        # can still be mapped into their downstream bracket slots.
-        m = re.fullmatch(r"(?:match\s*#?\s*|[mw])(\d{1,3})", text, flags=re.IGNORECASE)
-        if not m:
-            return None
-        return int(m.group(1))
-
-    def _winner_record_for_fixture(winners_map: dict, fixture: dict, match_no: int | None) -> dict:
-        if not isinstance(winners_map, dict):
-            return {}
-        fid = str((fixture or {}).get("id") or (fixture or {}).get("fixture_id") or "").strip()
-        keys = [fid]
-        if isinstance(match_no, int):
-            keys.extend([str(match_no), f"Match {match_no}"])
-        for key in keys:
-            if not key:
-                continue
-            rec = winners_map.get(key)
-            if isinstance(rec, dict):
-                return rec
-        return {}
-
-    def _auto_create_progression_matches():
-        """Create/update downstream knockout matches as soon as either feeder is known."""
-        progression = [
-            {"target": 89, "home_from": 74, "away_from": 77},
-            {"target": 90, "home_from": 73, "away_from": 75},
-            {"target": 91, "home_from": 76, "away_from": 78},
-            {"target": 92, "home_from": 79, "away_from": 80},
-            {"target": 93, "home_from": 83, "away_from": 84},
-            {"target": 94, "home_from": 81, "away_from": 82},
-            {"target": 95, "home_from": 86, "away_from": 88},
-            {"target": 96, "home_from": 85, "away_from": 87},
-            {"target": 97, "home_from": 89, "away_from": 90},
-            {"target": 98, "home_from": 93, "away_from": 94},
-            {"target": 99, "home_from": 91, "away_from": 92},
-            {"target": 100, "home_from": 95, "away_from": 96},
-            {"target": 101, "home_from": 97, "away_from": 98},
-            {"target": 102, "home_from": 99, "away_from": 100},
-            {"target": 103, "home_loser_from": 101, "away_loser_from": 102},
-            {"target": 104, "home_from": 101, "away_from": 102},
-        ]
-        target_meta = {
-            89: {"stage": "Round of 16", "side": "left", "slot": 1},
-            90: {"stage": "Round of 16", "side": "left", "slot": 2},
-            91: {"stage": "Round of 16", "side": "left", "slot": 3},
-            92: {"stage": "Round of 16", "side": "left", "slot": 4},
-            93: {"stage": "Round of 16", "side": "right", "slot": 1},
-            94: {"stage": "Round of 16", "side": "right", "slot": 2},
-            95: {"stage": "Round of 16", "side": "right", "slot": 3},
-            96: {"stage": "Round of 16", "side": "right", "slot": 4},
-            97: {"stage": "Quarter-finals", "side": "left", "slot": 1},
-            98: {"stage": "Quarter-finals", "side": "left", "slot": 2},
-            99: {"stage": "Quarter-finals", "side": "right", "slot": 1},
-            100: {"stage": "Quarter-finals", "side": "right", "slot": 2},
-            101: {"stage": "Semi-finals", "side": "left", "slot": 1},
-            102: {"stage": "Semi-finals", "side": "right", "slot": 1},
-            103: {"stage": "Third Place Play-off", "side": "center", "slot": 1},
-            104: {"stage": "Final", "side": "center", "slot": 1},
-        }
-
-        winners_map = _read_json(_path(ctx, "fan_winners.json"), {})
-        if not isinstance(winners_map, dict):
-            winners_map = {}
-
+    def _propagate_bracket(fixture_id) -> list[dict]:
+        """Advance the result of ``fixture_id`` through the knockout matches it feeds."""
+        graph = bracket_graph.load_graph(bracket_graph.map_path(_json_dir(ctx)))
         container, fixtures, key = _load_matches_payload()
         fixtures = fixtures if isinstance(fixtures, list) else []
-
-        by_match_no: dict[int, dict] = {}
-        by_fixture_id: dict[str, dict] = {}
-        for f in fixtures:
-            if not isinstance(f, dict):
-                continue
-            fid = str(f.get("id") or f.get("fixture_id") or "").strip()
-            if fid:
-                by_fixture_id[fid] = f
-            m_no = _match_no(f.get("id")) or _match_no(f.get("fixture_id")) or _match_no(f.get("label"))
-            if isinstance(m_no, int):
-                by_match_no[m_no] = f
-
-        def winner_loser(match_no: int) -> tuple[str, str]:
-            fx = by_match_no.get(match_no)
-            if not isinstance(fx, dict):
-                return "", ""
-            rec = _winner_record_for_fixture(winners_map, fx, match_no)
-            side = str(rec.get("winner_side") or rec.get("winner") or "").strip().lower()
-            home = str(fx.get("home") or "").strip()
-            away = str(fx.get("away") or "").strip()
-            if side == "home":
-                return home, away
-            if side == "away":
-                return away, home
-            return "", ""
-
-        slots = _read_json(_bracket_slots_path(ctx), {})
-        if not isinstance(slots, dict):
-            slots = {}
-
-        changed_slots = False
-        changed_fixtures = False
-
-        for rule in progression:
-            target = int(rule["target"])
-            meta = target_meta.get(target) or {}
-            stage = str(meta.get("stage") or "").strip()
-            side = str(meta.get("side") or "center").strip()
-            slot = int(meta.get("slot") or 1)
-            if not stage:
-                continue
-
-            home = ""
-            away = ""
-            if "home_from" in rule:
-                home, _ = winner_loser(int(rule["home_from"]))
-            elif "home_loser_from" in rule:
-                _, home = winner_loser(int(rule["home_loser_from"]))
-            if "away_from" in rule:
-                away, _ = winner_loser(int(rule["away_from"]))
-            elif "away_loser_from" in rule:
-                _, away = winner_loser(int(rule["away_loser_from"]))
-            # A single completed feeder should partially advance its side while
-            # preserving the other side's existing placeholder (W77/TBD/etc.).
-            if not home and not away:
-                continue
-
-            stage_slots = slots.get(stage)
-            if not isinstance(stage_slots, dict):
-                stage_slots = {}
-            side_slots = stage_slots.get(side)
-            if not isinstance(side_slots, dict):
-                side_slots = {}
-            slot_key = str(slot)
-            slot_entry = side_slots.get(slot_key)
-            if not isinstance(slot_entry, dict):
-                slot_entry = {}
-
-            existing_match_id = str(slot_entry.get("match_id") or slot_entry.get("matchId") or "").strip()
-            target_fx = by_match_no.get(target)
-            if not isinstance(target_fx, dict) and existing_match_id:
-                target_fx = by_fixture_id.get(existing_match_id)
-
-            current_home = str(slot_entry.get("home") or "").strip()
-            current_away = str(slot_entry.get("away") or "").strip()
-            next_home = home or current_home or f"W{rule.get('home_from') or rule.get('home_loser_from') or ''}".strip()
-            next_away = away or current_away or f"W{rule.get('away_from') or rule.get('away_loser_from') or ''}".strip()
-
-            next_entry = {
-                **slot_entry,
-                "match_id": existing_match_id or str((target_fx or {}).get("id") or "").strip() or str(target),
-                "home": next_home,
-                "away": next_away,
-            }
-            if next_entry != slot_entry:
-                side_slots[slot_key] = next_entry
-                stage_slots[side] = side_slots
-                slots[stage] = stage_slots
-                changed_slots = True
-
-            if isinstance(target_fx, dict):
-                if (
-                    (home and str(target_fx.get("home") or "").strip() != next_home)
-                    or (away and str(target_fx.get("away") or "").strip() != next_away)
-                    or normalize_stage(str(target_fx.get("stage") or "")) != stage
-                    or str(target_fx.get("bracket_slot") or "").strip() != str(slot)
-                ):
-                    if home:
-                        target_fx["home"] = next_home
-                    if away:
-                        target_fx["away"] = next_away
-                    target_fx["stage"] = stage
-                    target_fx["bracket_slot"] = slot
-                    changed_fixtures = True
-            else:
-                new_fixture = {
-                    "id": next_entry["match_id"],
-                    "home": next_home,
-                    "away": next_away,
-                    "utc": "",
-                    "time": "",
-                    "stadium": "",
-                    "group": "",
-                    "stage": stage,
-                    "bracket_slot": slot,
-                }
-                fixtures.append(new_fixture)
-                by_match_no[target] = new_fixture
-                by_fixture_id[str(new_fixture["id"])] = new_fixture
-                changed_fixtures = True
-
-        if changed_slots:
-            _write_json_atomic(_bracket_slots_path(ctx), slots)
-        if changed_fixtures:
+        bracket = bracket_graph.Bracket(
+            graph,
+            fixtures,
+            _read_json(_path(ctx, "fan_winners.json"), {}),
+            _read_json(_bracket_slots_path(ctx), {}),
+        )
+        number = bracket.match_for(fixture_id)
+        if number is None:
+            return []
+        changes = bracket.propagate([number])
+        if bracket.slots_changed:
+            _write_json_atomic(_bracket_slots_path(ctx), bracket.slots)
+        if bracket.fixtures_changed:
             if container is None:
                 _write_json_atomic(_matches_path(ctx), fixtures)
             else:
                 if key:
                     container[key] = fixtures
                 _write_json_atomic(_matches_path(ctx), container)
+        return changes
+
+    def _record_fanzone_winner(f: dict, fixture_id: str, side: str, winner_iso: str = "") -> dict:
+        """Write the fan_winners record and return the data settlement steps run on.
 
-    def _apply_fanzone_declaration(
-        f: dict,
-        fixture_id: str,
-        side: str,
-        winner_iso: str = "",
-        *,
-        replace_existing: bool = False,
-        suppress_owner_dms: bool = False,
-        suppress_public: bool = False,
-        corrected: bool = False,
-    ):
-        """Settle Match Picks and return the data exposed by the admin endpoint.
-
-        Both the legacy declaration endpoint and the fixture score form use this
-        helper so voting locks, snapshots, leaderboards, and notifications can
-        never drift from the official score.
+        The record is what locks Match Picks voting and what repeat score saves
+        compare against, so it is written before the response is returned.
         """
         home = str(f.get("home") or f.get("home_team") or f.get("team1") or "").strip()
         away = str(f.get("away") or f.get("away_team") or f.get("team2") or "").strip()
@@ -2967,30 +2987,61 @@ def create_admin_routes(ctx):
         for alias_id in alias_ids:
             winners[alias_id] = rec
         _write_json_atomic(winners_path, winners)
-        _auto_create_progression_matches()
+        return {
+            "fixture_id": fixture_id,
+            "alias_ids": alias_ids,
+            "fixture": {k: v for k, v in f.items() if k != "live_stats"},
+            "home": home,
+            "away": away,
+            "utc": utc,
+            "winner_side": side,
+            "winner_team": winner_team,
+            "loser_team": loser_team,
+            "winner_iso": winner_iso,
+            # Voter event ids include it, so retried steps find their own events.
+            "declared_at": declared_at,
+            "replace_existing": False,
+            "suppress_owner_dms": False,
+            "suppress_public": False,
+            "corrected": False,
+        }
 
+    def _settlement_votes(d: dict) -> dict:
         votes_blob = _read_json(_fanzone_votes_path(ctx), {"fixtures": {}})
         if not isinstance(votes_blob, dict):
             votes_blob = {"fixtures": {}}
         fixtures_votes = votes_blob.get("fixtures") or {}
         if not isinstance(fixtures_votes, dict):
             fixtures_votes = {}
-        fixture_votes = fixtures_votes.get(fixture_id, {})
+        fixture_votes = fixtures_votes.get(d["fixture_id"], {})
         if not isinstance(fixture_votes, dict):
-            for alias_id in alias_ids:
+            for alias_id in d["alias_ids"]:
                 fixture_votes = fixtures_votes.get(alias_id, {})
                 if isinstance(fixture_votes, dict):
                     break
-        if not isinstance(fixture_votes, dict):
-            fixture_votes = {}
+        return fixture_votes if isinstance(fixture_votes, dict) else {}
 
+    def _settlement_owner_ids(d: dict) -> tuple[list, list, list]:
+        side = d["winner_side"]
+        if side == "draw":
+            draw_owner_ids = list(dict.fromkeys(
+                _owners_for_team(ctx, d["home"]) + _owners_for_team(ctx, d["away"])
+            ))
+            return [], [], draw_owner_ids
+        return _owners_for_team(ctx, d["winner_team"]), _owners_for_team(ctx, d["loser_team"]), []
+
+    # ---- settlement steps (see settlement_jobs); each may run more than once ----
+    def _settle_progression(job):
+        changes = _propagate_bracket(job["data"]["fixture_id"])
+        return {"bracket_matches": [change["match"] for change in changes]}
+
+    def _settle_vote_snapshot(job):
+        d = job["data"]
+        fixture_votes = _settlement_votes(d)
         home_votes = int(fixture_votes.get("home") or 0)
         away_votes = int(fixture_votes.get("away") or 0)
         draw_votes = int(fixture_votes.get("draw") or 0)
         total_votes = max(0, home_votes + away_votes + draw_votes)
-        voters = fixture_votes.get("voters")
-        if not isinstance(voters, dict):
-            voters = {}
 
         snapshots_path = _path(ctx, "fan_vote_snapshots.json")
         snapshots = _read_json(snapshots_path, {"fixtures": {}})
@@ -3000,111 +3051,197 @@ def create_admin_routes(ctx):
         if not isinstance(snapshot_fixtures, dict):
             snapshot_fixtures = {}
             snapshots["fixtures"] = snapshot_fixtures
-        snapshot_fixtures[fixture_id] = {
-            "fixture_id": fixture_id,
-            "home": home,
-            "away": away,
-            "utc": utc,
-            "winner_side": side,
-            "winner_team": winner_team,
-            "loser_team": loser_team,
-            "declared_at": declared_at,
+        snapshot_fixtures[d["fixture_id"]] = {
+            "fixture_id": d["fixture_id"],
+            "home": d["home"],
+            "away": d["away"],
+            "utc": d["utc"],
+            "winner_side": d["winner_side"],
+            "winner_team": d["winner_team"],
+            "loser_team": d["loser_team"],
+            "declared_at": d["declared_at"],
             "home_votes": home_votes,
             "away_votes": away_votes,
             "draw_votes": draw_votes,
             "total": total_votes,
         }
         _write_json_atomic(snapshots_path, snapshots)
+        return {
+            "home_votes": home_votes,
+            "away_votes": away_votes,
+            "draw_votes": draw_votes,
+            "total_votes": total_votes,
+        }
 
-        winner_owner_ids = _owners_for_team(ctx, winner_team) if side in ("home", "away") else []
-        loser_owner_ids = _owners_for_team(ctx, loser_team) if side in ("home", "away") else []
-        draw_owner_ids = []
-        if side == "draw":
-            draw_owner_ids = list(dict.fromkeys(
-                _owners_for_team(ctx, home) + _owners_for_team(ctx, away)
-            ))
-        dm_winner_owner_ids = _filter_notification_ids(ctx, winner_owner_ids, "dms", "matches")
-        dm_loser_owner_ids = _filter_notification_ids(ctx, loser_owner_ids, "dms", "matches")
-        dm_draw_owner_ids = _filter_notification_ids(ctx, draw_owner_ids, "dms", "matches")
-        bell_winner_owner_ids = _filter_notification_ids(ctx, winner_owner_ids, "bell", "matches")
-        bell_loser_owner_ids = _filter_notification_ids(ctx, loser_owner_ids, "bell", "matches")
-        bell_draw_owner_ids = _filter_notification_ids(ctx, draw_owner_ids, "bell", "matches")
-
-        if replace_existing:
+    def _settle_results_feed(job):
+        """Owner and voter events behind the notification bell and leaderboards."""
+        d = job["data"]
+        fixture_id, side = d["fixture_id"], d["winner_side"]
+        home, away, winner_team, loser_team = d["home"], d["away"], d["winner_team"], d["loser_team"]
+        if d["replace_existing"]:
             # Corrections replace website notification/leaderboard events.
             _remove_fanzone_result_events(fixture_id)
-        if suppress_owner_dms:
+        winner_owner_ids, loser_owner_ids, draw_owner_ids = _settlement_owner_ids(d)
+        if side in ("home", "away"):
+            _append_fanzone_results(
+                _filter_notification_ids(ctx, winner_owner_ids, "bell", "matches"),
+                "win", home, away, winner_team, loser_team, fixture_id,
+            )
+            _append_fanzone_results(
+                _filter_notification_ids(ctx, loser_owner_ids, "bell", "matches"),
+                "lose", home, away, winner_team, loser_team, fixture_id,
+            )
+        else:
+            _append_fanzone_results(
+                _filter_notification_ids(ctx, draw_owner_ids, "bell", "matches"),
+                "draw", home, away, winner_team, loser_team, fixture_id,
+            )
+        voters = _settlement_votes(d).get("voters")
+        _append_fanzone_vote_results(
+            _filter_notification_voters(ctx, voters if isinstance(voters, dict) else {}, "matches"),
+            side,
+            winner_team,
+            fixture_id,
+            d["declared_at"],
+        )
+
+    def _settle_match_picks(job):
+        """Queue the Match Picks announcement and owner DMs for the bot."""
+        d, votes = job["data"], job["result"]
+        f = d["fixture"]
+        winner_owner_ids, loser_owner_ids, draw_owner_ids = _settlement_owner_ids(d)
+        if d["suppress_owner_dms"]:
             # Existing settlements may predate saved scores. Never resend owner
             # DMs when backfilling or correcting because old DMs cannot be
             # recalled and a second message may duplicate or contradict them.
-            dm_winner_owner_ids = []
-            dm_loser_owner_ids = []
-            dm_draw_owner_ids = []
+            dm_ids = ([], [], [])
+        else:
+            dm_ids = tuple(
+                _filter_notification_ids(ctx, ids, "dms", "matches")
+                for ids in (winner_owner_ids, loser_owner_ids, draw_owner_ids)
+            )
 
         cfg = _read_json(_path(ctx, "config.json"), {})
-        channel_name = _resolve_fanzone_channel(f, home, away)
+        channel_name = _resolve_fanzone_channel(f, d["home"], d["away"])
         if not channel_name:
             channel_name = str(cfg.get("FANZONE_CHANNEL_NAME") or cfg.get("FANZONE_CHANNEL") or "fanzone")
         _enqueue_command(ctx, "fanzone_winner", {
-            "fixture_id": fixture_id,
-            "home": home,
-            "away": away,
-            "utc": utc,
+            "fixture_id": d["fixture_id"],
+            "home": d["home"],
+            "away": d["away"],
+            "utc": d["utc"],
             "group": str(f.get("group") or ""),
             "stage": str(f.get("stage") or f.get("round") or f.get("phase") or ""),
-            "winner_side": side,
-            "winner_team": winner_team,
-            "loser_team": loser_team,
-            "winner_iso": winner_iso,
+            "winner_side": d["winner_side"],
+            "winner_team": d["winner_team"],
+            "loser_team": d["loser_team"],
+            "winner_iso": d["winner_iso"],
             "loser_iso": "",
-            "winner_owner_ids": dm_winner_owner_ids,
-            "loser_owner_ids": dm_loser_owner_ids,
-            "draw_owner_ids": dm_draw_owner_ids,
+            "winner_owner_ids": dm_ids[0],
+            "loser_owner_ids": dm_ids[1],
+            "draw_owner_ids": dm_ids[2],
             "channel": channel_name,
             "home_score": f.get("home_score"),
             "away_score": f.get("away_score"),
-            "home_votes": home_votes,
-            "away_votes": away_votes,
-            "draw_votes": draw_votes,
-            "total_votes": total_votes,
-            "live_stats": f.get("live_stats") if isinstance(f.get("live_stats"), list) else [],
-            "suppress_public": suppress_public,
-            "corrected": corrected,
+            "home_votes": votes.get("home_votes", 0),
+            "away_votes": votes.get("away_votes", 0),
+            "draw_votes": votes.get("draw_votes", 0),
+            "total_votes": votes.get("total_votes", 0),
+            "suppress_public": d["suppress_public"],
+            "corrected": d["corrected"],
         })
+        return {
+            "channel": channel_name,
+            "winner_owner_ids": winner_owner_ids,
+            "loser_owner_ids": loser_owner_ids,
+        }
 
-        if side in ("home", "away"):
-            _append_fanzone_results(bell_winner_owner_ids, "win", home, away, winner_team, loser_team, fixture_id)
-            _append_fanzone_results(bell_loser_owner_ids, "lose", home, away, winner_team, loser_team, fixture_id)
-        else:
-            _append_fanzone_results(bell_draw_owner_ids, "draw", home, away, winner_team, loser_team, fixture_id)
-        _append_fanzone_vote_results(
-            _filter_notification_voters(ctx, voters, "matches"),
-            side,
-            winner_team,
-            fixture_id,
-            declared_at,
-        )
+    def _settle_fixture_result(job):
+        # The dedicated Fixtures announcement is deliberately separate from
+        # Match Picks settlement so it uses the official full-time score embed.
+        announce = job["data"].get("announce")
+        if announce:
+            _enqueue_command(ctx, "fixture_result", {**announce, "channel": job["result"].get("channel", "")})
+
+    SETTLEMENT_STEPS = (
+        ("progression", _settle_progression),
+        ("vote_snapshot", _settle_vote_snapshot),
+        ("results_feed", _settle_results_feed),
+        ("match_picks", _settle_match_picks),
+        ("fixture_result", _settle_fixture_result),
+    )
+    settlements = settlement_jobs.SettlementQueue(_path(ctx, "settlement_jobs.json"), SETTLEMENT_STEPS)
+    # Jobs left unfinished by the previous launcher run.
+    settlements.resume()
 
+    def _apply_fanzone_declaration(f: dict, fixture_id: str, side: str, winner_iso: str = ""):
+        """Settle Match Picks inline and return the data exposed by the admin endpoint.
+
+        The legacy declaration endpoint answers with vote counts, so it runs the
+        same steps as a fixture score save without going through the queue.
+        """
+        with settlements.lock:
+            data = _record_fanzone_winner(f, fixture_id, side, winner_iso)
+            job = {"id": "", "fixture_id": fixture_id, "data": data, "result": {}}
+            for _name, step in SETTLEMENT_STEPS:
+                job["result"].update(step(job) or {})
+        result = job["result"]
         log.info(
             "Fan zone result settled by %s (fixture_id=%s winner_side=%s winner_team=%s home_votes=%s away_votes=%s draw_votes=%s)",
-            _user_label(), fixture_id, side, winner_team, home_votes, away_votes, draw_votes,
+            _user_label(), fixture_id, side, data["winner_team"],
+            result["home_votes"], result["away_votes"], result["draw_votes"],
         )
         return {
             "ok": True,
             "fixture_id": fixture_id,
             "winner_side": side,
-            "winner_team": winner_team,
-            "loser_team": loser_team,
-            "winner_owner_ids": winner_owner_ids,
-            "loser_owner_ids": loser_owner_ids,
-            "home_votes": home_votes,
-            "away_votes": away_votes,
-            "draw_votes": draw_votes,
-            "total_votes": total_votes,
-            "channel": channel_name,
-            "corrected": corrected,
+            "winner_team": data["winner_team"],
+            "loser_team": data["loser_team"],
+            "winner_owner_ids": result["winner_owner_ids"],
+            "loser_owner_ids": result["loser_owner_ids"],
+            "home_votes": result["home_votes"],
+            "away_votes": result["away_votes"],
+            "draw_votes": result["draw_votes"],
+            "total_votes": result["total_votes"],
+            "channel": result["channel"],
+            "corrected": False,
         }
 
+    @bp.get("/admin/settlements")
+    def admin_settlements_list():
+        resp = require_quick_options()
+        if resp is not None:
+            return resp
+        fixture_id = str(request.args.get("fixture_id") or "").strip()
+        try:
+            limit = max(1, min(int(request.args.get("limit") or 20), settlement_jobs.KEEP_FINISHED))
+        except ValueError:
+            limit = 20
+        return jsonify({"ok": True, "jobs": settlements.list(limit, fixture_id)})
+
+    @bp.get("/admin/settlements/<job_id>")
+    def admin_settlement_get(job_id):
+        resp = require_quick_options()
+        if resp is not None:
+            return resp
+        job = settlements.get(job_id)
+        if job is None:
+            return jsonify({"ok": False, "error": "job_not_found"}), 404
+        return jsonify({"ok": True, "job": job})
+
+    @bp.post("/admin/settlements/<job_id>/retry")
+    def admin_settlement_retry(job_id):
+        resp = require_quick_options()
+        if resp is not None:
+            return resp
+        job = settlements.retry(job_id)
+        if job is None:
+            if settlements.get(job_id) is None:
+                return jsonify({"ok": False, "error": "job_not_found"}), 404
+            return jsonify({"ok": False, "error": "job_not_failed"}), 409
+        log.info("Settlement job retried by %s (job=%s fixture_id=%s)", _user_label(), job_id, job["fixture_id"])
+        return jsonify({"ok": True, "job": job})
+
     @bp.post("/admin/fanzone/declare")
     def fanzone_declare_winner():
         resp = require_admin()
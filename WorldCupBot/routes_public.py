@@ -1,11 +1,24 @@
 from flask import Blueprint, jsonify, send_from_directory, current_app, abort, request, send_file, session, redirect, url_for, make_response
 import os, time, json, datetime, glob, re
+import collections
+import hashlib
 import logging
 import psutil
 import secrets
 import urllib.parse
 import requests
 
+import bracket_graph
+import change_log
+import fixture_index
+import group_scenarios
+import json_codec
+import list_query
+import log_tail
+import notification_prefs
+import ownership_index
+import request_metrics
+import tournament_odds
 from stage_constants import STAGE_CHANNEL_MAP, normalize_stage
 
 log = logging.getLogger("launcher")
@@ -25,18 +38,20 @@ def _load_config(base_dir):
     return {}
 
 def _json_load(path, default):
+    started = time.perf_counter()
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        data, nbytes = json_codec.read_file(path)
+    except FileNotFoundError:
+        return default
     except Exception:
+        request_metrics.metrics.observe_json_load(os.path.basename(path), 0, time.perf_counter() - started, ok=False)
         return default
+    request_metrics.metrics.observe_json_load(os.path.basename(path), nbytes, time.perf_counter() - started)
+    return data
 
 def _json_save(path, data):
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    tmp = path + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-    os.replace(tmp, path)
+    json_codec.write_file(path, data)
+    change_log.record_write(path, data)
 
 def _ensure_dir(p):
     os.makedirs(p, exist_ok=True)
@@ -70,6 +85,8 @@ def _split_requests_log_path(base_dir):
     return os.path.join(_json_dir(base_dir), "split_requests_log.json")
 def _players_path(base_dir):
     return os.path.join(_json_dir(base_dir), "players.json")
+def _ownership_index(base_dir):
+    return ownership_index.get(_players_path(base_dir), lambda path: _json_load(path, {}))
 def _teams_path(base_dir):
     return os.path.join(_json_dir(base_dir), "teams.json")
 def _team_iso_path(base_dir):
@@ -88,6 +105,8 @@ def _fan_zone_results_path(base_dir):
     return os.path.join(_json_dir(base_dir), "fan_zone_results.json")
 def _bet_results_path(base_dir):
     return os.path.join(_json_dir(base_dir), "bet_results.json")
+def _team_meta_path(base_dir):
+    return os.path.join(base_dir, "JSON", "team_meta.json")
 def _swap_requests_path(base_dir):
     return os.path.join(_json_dir(base_dir), "swap_requests.json")
 def _notifications_read_path(base_dir):
@@ -195,6 +214,14 @@ def _standings_live_score(fixture, home, away):
     _build_standings, which prevents live goal events from awarding points a
     second time after staff submit the final result.
     """
+    summary = fixture.get("live_score")
+    if isinstance(summary, dict):
+        # Running score kept by quick options next to the fixture's timeline.
+        try:
+            return int(summary.get("home") or 0), int(summary.get("away") or 0)
+        except (TypeError, ValueError):
+            pass
+    # Fixtures recorded before timelines carry their events inline.
     live_stats = fixture.get("live_stats")
     if not isinstance(live_stats, list):
         # A recently started fixture can be live before staff enter an event;
@@ -359,6 +386,72 @@ def _build_standings(team_meta, matches):
         errors.append("Fixture data is missing or malformed; showing zeroed standings.")
     return {"groups": output, "errors": errors, "completed_matches": completed_matches, "live_matches": live_matches}
 
+request_metrics.metrics.register_cache("odds", tournament_odds.cache_stats)
+request_metrics.metrics.register_cache("scenarios", group_scenarios.cache_stats)
+
+def _team_ratings(base_dir, team_meta):
+    """Strength ratings from the optional team_ratings.json, else from team_meta entries."""
+    ratings = {}
+    groups_blob = team_meta.get("groups") if isinstance(team_meta, dict) else None
+    for entries in (groups_blob.values() if isinstance(groups_blob, dict) else []):
+        for entry in entries if isinstance(entries, list) else []:
+            if isinstance(entry, dict) and isinstance(entry.get("rating"), (int, float)):
+                ratings[_preferred_team_name(entry.get("team") or entry.get("name"))] = float(entry["rating"])
+    blob = _json_load(os.path.join(_json_dir(base_dir), "team_ratings.json"), {})
+    if isinstance(blob, dict) and isinstance(blob.get("ratings"), dict):
+        blob = blob["ratings"]
+    for team, rating in (blob.items() if isinstance(blob, dict) else []):
+        if isinstance(rating, (int, float)) and not isinstance(rating, bool):
+            ratings[_preferred_team_name(team)] = float(rating)
+    return ratings
+
+def _saved_group_tables(team_meta, matches):
+    """Group tables from official results only, plus the fixtures still to be decided.
+
+    Each table row carries ``tiebreak``, its place when nothing separates the
+    teams on the pitch. Fixtures come back as ``(home, away)`` pairs; callers
+    keep the ones between two teams of the same group.
+    """
+    played, remaining = [], []
+    for fixture in matches if isinstance(matches, list) else []:
+        if not isinstance(fixture, dict):
+            continue
+        status = str(fixture.get("status") or fixture.get("state") or "").strip().casefold()
+        if status in _TERMINAL_NON_FINAL_MATCH_STATUSES:
+            continue
+        if _fixture_official_score(fixture, status) is not None:
+            played.append(fixture)
+        else:
+            remaining.append((_preferred_team_name(fixture.get("home")), _preferred_team_name(fixture.get("away"))))
+    standings = _build_standings(team_meta, played)
+    # With no results every table is in its fixed tiebreak order.
+    tiebreak = {
+        row["team"]: index
+        for group in _build_standings(team_meta, [])["groups"]
+        for index, row in enumerate(group["teams"])
+    }
+    groups = {
+        group["group"]: [
+            {"team": row["team"], "pts": row["pts"], "gd": row["gd"], "gf": row["gf"], "tiebreak": tiebreak[row["team"]]}
+            for row in group["teams"]
+        ]
+        for group in standings["groups"]
+    }
+    return groups, remaining
+
+def _odds_tournament(base_dir):
+    """Simulation inputs from the saved tables, the unplayed group fixtures and the bracket."""
+    json_dir = _json_dir(base_dir)
+    team_meta = _json_load(os.path.join(json_dir, "team_meta.json"), {})
+    groups, remaining = _saved_group_tables(team_meta, _json_load(_matches_path(base_dir), []))
+    bracket = bracket_graph.view(json_dir, _json_load)
+    knockout = {
+        item["match"]: {key: item.get(key) for key in ("home", "away", "winner")}
+        for item in bracket["matches"]
+    }
+    graph = bracket_graph.load_graph(bracket_graph.map_path(json_dir))
+    return tournament_odds.Tournament(groups, remaining, _team_ratings(base_dir, team_meta), graph, knockout)
+
 def _player_names_map(base_dir):
     verified_blob = _json_load(_verified_path(base_dir), {})
     players_blob = _json_load(_players_path(base_dir), {})
@@ -393,24 +486,16 @@ def _player_names_map(base_dir):
 
     return out
 
-NOTIFICATION_CATEGORIES = (
-    "splits",
-    "matches",
-    "bets",
-    "stages",
-)
+NOTIFICATION_CATEGORIES = notification_prefs.CATEGORIES
 
 def _load_notifications_read(base_dir):
     try:
-        with open(_notifications_read_path(base_dir), "r", encoding="utf-8") as f:
-            return json.load(f)
+        return json_codec.read_file(_notifications_read_path(base_dir))[0]
     except Exception:
         return {}
 
 def _save_notifications_read(base_dir, data):
-    os.makedirs(os.path.dirname(_notifications_read_path(base_dir)), exist_ok=True)
-    with open(_notifications_read_path(base_dir), "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    json_codec.write_file(_notifications_read_path(base_dir), data)
 
 def _load_notification_settings(base_dir):
     return _json_read(_notification_settings_path(base_dir), {})
@@ -421,37 +506,23 @@ def _save_notification_settings(base_dir, data):
 def _default_notification_categories() -> dict:
     return {key: True for key in NOTIFICATION_CATEGORIES}
 
+def _notification_prefs(base_dir) -> notification_prefs.PrefsSnapshot:
+    return notification_prefs.get(_notification_settings_path(base_dir), lambda p: _json_read(p, {}))
+
 def _notification_record(base_dir, uid: str) -> dict:
-    settings = _load_notification_settings(base_dir)
-    if not isinstance(settings, dict):
-        settings = {}
-    raw = settings.get(str(uid))
-    if isinstance(raw, str):
-        raw = {"channel": raw}
-    if not isinstance(raw, dict):
-        raw = {}
-    channel = str(raw.get("channel") or "").strip().lower()
-    raw_categories = raw.get("categories")
-    categories = _default_notification_categories()
-    if isinstance(raw_categories, dict):
-        for key in NOTIFICATION_CATEGORIES:
-            if key in raw_categories:
-                categories[key] = bool(raw_categories.get(key))
-    return {"channel": channel, "categories": categories}
+    return _notification_prefs(base_dir).record(uid)
 
 def _notification_channel_preference(base_dir, uid: str) -> str:
-    return _notification_record(base_dir, uid).get("channel") or ""
+    return _notification_prefs(base_dir).channel(uid)
 
 def _notification_category_enabled(base_dir, uid: str, category: str) -> bool:
-    rec = _notification_record(base_dir, uid)
-    return bool(rec.get("categories", {}).get(category, True))
+    return _notification_prefs(base_dir).category_enabled(uid, category)
 
 def _json_read(path, default):
     try:
         if not os.path.isfile(path):
             return default
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return json_codec.read_file(path)[0]
     except Exception:
         return default
 
@@ -480,28 +551,54 @@ def _load_primary_guild_id(base_dir) -> str:
     return ""
 
 def _tail_file(path, max_lines=500):
-    if not os.path.isfile(path): return []
-    with open(path, "rb") as f:
+    lines, _ = log_tail.tail(path, max_lines)
+    return lines
+
+# ======================
+# Bootstrap snapshot
+# ======================
+
+# Sections filtered by the clock (the fixtures window) fold the current period
+# into their version, so a cached payload never outlives the cut-off it used.
+BOOTSTRAP_TIME_BUCKET_SECONDS = 60
+
+_BOOTSTRAP_CACHE = {}  # { (base_dir, section): (version, payload) }
+_BOOTSTRAP_CACHE_STATS = {"hits": 0, "misses": 0}
+request_metrics.metrics.register_cache(
+    "bootstrap", lambda: {**_BOOTSTRAP_CACHE_STATS, "size": len(_BOOTSTRAP_CACHE)}
+)
+
+def _files_version(paths, salt=""):
+    """Short digest of each file's (mtime, size, inode); changes whenever one is rewritten."""
+    h = hashlib.blake2b(salt.encode("utf-8"), digest_size=8)
+    for path in paths:
         try:
-            f.seek(0, os.SEEK_END)
-            data = []
-            while len(data) < max_lines and f.tell() > 0:
-                step = min(4096, f.tell())
-                f.seek(-step, os.SEEK_CUR)
-                chunk = f.read(step)
-                f.seek(-step, os.SEEK_CUR)
-                lines = chunk.splitlines()
-                if data:
-                    lines[-1] += data[0]
-                    data = lines[:-1] + data[1:]
-                else:
-                    data = lines
-                if f.tell() == 0:
-                    break
-            return [l.decode("utf-8", "ignore") for l in data[-max_lines:]]
-        except Exception:
-            f.seek(0)
-            return f.read().decode("utf-8", "ignore").splitlines()[-max_lines:]
+            st = os.stat(path)
+            # The inode catches atomic replaces that land within one mtime tick.
+            h.update(f"{path}:{st.st_mtime_ns}:{st.st_size}:{st.st_ino};".encode("utf-8"))
+        except OSError:
+            h.update(f"{path}:-;".encode("utf-8"))
+    return h.hexdigest()
+
+def _parse_version_vector(raw):
+    """``teams:ab12,fixtures:cd34`` -> {"teams": "ab12", "fixtures": "cd34"}."""
+    out = {}
+    for part in str(raw or "").split(","):
+        name, _, version = part.partition(":")
+        if name.strip() and version.strip():
+            out[name.strip()] = version.strip()
+    return out
+
+def _bootstrap_cached(base_dir, section, version, build):
+    key = (base_dir, section)
+    hit = _BOOTSTRAP_CACHE.get(key)
+    if hit is not None and hit[0] == version:
+        _BOOTSTRAP_CACHE_STATS["hits"] += 1
+        return hit[1]
+    _BOOTSTRAP_CACHE_STATS["misses"] += 1
+    payload = build(base_dir)
+    _BOOTSTRAP_CACHE[key] = (version, payload)
+    return payload
 
 # ======================
 # Discord OAuth helpers
@@ -574,6 +671,10 @@ def _session_key():
     return "wc_user"
 
 _AVATAR_CACHE = {}  # { id: {"url": str, "ts": int} }
+_AVATAR_CACHE_STATS = {"hits": 0, "misses": 0}
+request_metrics.metrics.register_cache(
+    "avatars", lambda: {**_AVATAR_CACHE_STATS, "size": len(_AVATAR_CACHE)}
+)
 
 def _discord_avatar_url(user_id: str, avatar_hash: str, size: int = 64) -> str | None:
     if not user_id or not avatar_hash:
@@ -723,6 +824,11 @@ def create_public_routes(ctx):
         if callable(f):
             try: crash_status = f() or {}
             except Exception: crash_status = {}
+        log_stats = {}
+        f = ctx.get("get_log_stats")
+        if callable(f):
+            try: log_stats = f() or {}
+            except Exception: log_stats = {}
         last_start = (ctx.get("bot_last_start_ref") or {}).get("value")
         last_stop  = (ctx.get("bot_last_stop_ref") or {}).get("value")
         now = time.time()
@@ -736,6 +842,7 @@ def create_public_routes(ctx):
             "max_crashes": int(crash_status.get("max_crashes", 3)),
             "last_start": last_start,
             "last_stop": last_stop,
+            "logging": log_stats,
             "ts": int(now)
         })
 
@@ -757,24 +864,28 @@ def create_public_routes(ctx):
         })
 
     # ---------- Teams ----------
-    @api.get("/teams")
-    def api_teams():
-        base = ctx.get("BASE_DIR", "")
+    def _teams_payload(base):
         data = _json_load(_teams_path(base), [])
         if isinstance(data, dict) and "teams" in data:
-            return jsonify(data["teams"])
-        return jsonify(data if isinstance(data, list) else [])
+            return data["teams"]
+        return data if isinstance(data, list) else []
+
+    @api.get("/teams")
+    def api_teams():
+        return jsonify(_teams_payload(ctx.get("BASE_DIR", "")))
 
     @api.get("/guilds")
     def api_guilds():
         data = _json_load(_guilds_path(ctx.get("BASE_DIR","")), {"guild_count": 0, "guilds": []})
         return jsonify(data)
 
+    def _team_stage_payload(base):
+        data = _json_read(_team_stage_path(base), {})
+        return data if isinstance(data, dict) else {}
+
     @api.get("/team_stage")
     def api_team_stage():
-        base = ctx.get("BASE_DIR", "")
-        data = _json_read(_team_stage_path(base), {})
-        resp = make_response(jsonify(data if isinstance(data, dict) else {}))
+        resp = make_response(jsonify(_team_stage_payload(ctx.get("BASE_DIR", ""))))
         resp.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
         resp.headers["Pragma"] = "no-cache"
         resp.headers["Expires"] = "0"
@@ -786,6 +897,17 @@ def create_public_routes(ctx):
         data = _json_read(_bracket_slots_path(base), {})
         return jsonify({"ok": True, "slots": data if isinstance(data, dict) else {}})
 
+    @api.get("/bracket")
+    def api_bracket():
+        """Knockout matches at their bracket positions, resolved from the bracket map and saved results."""
+        base = ctx.get("BASE_DIR", "")
+        try:
+            data = bracket_graph.view(_json_dir(base), _json_load)
+        except ValueError as exc:
+            log.error("Bracket map is invalid: %s", exc)
+            return jsonify({"ok": False, "error": "invalid_bracket_map"}), 500
+        return jsonify({"ok": True, **data})
+
     # ---------- Bot controls ----------
     @api.post("/bot/start")
     def bot_start():
@@ -809,6 +931,9 @@ def create_public_routes(ctx):
     # ---------- Logs ----------
     @api.get("/log/<kind>")
     def log_get(kind):
+        capture = (ctx.get("LOG_CAPTURES") or {}).get(kind)
+        if capture is not None:
+            return jsonify({"ok": True, "lines": capture.ring.tail(500)[0]})
         paths = ctx.get("LOG_PATHS", {})
         fp = paths.get(kind)
         if not fp or not os.path.exists(fp):
@@ -835,9 +960,7 @@ def create_public_routes(ctx):
             return jsonify({"ok": False, "error": str(e)}), 500
 
     # ---------- VERIFIED ----------
-    @api.get("/verified")
-    def api_verified():
-        base = ctx.get("BASE_DIR", "")
+    def _verified_payload(base):
         blob = _json_load(_verified_path(base), {})
         raw = blob.get("verified_users") if isinstance(blob, dict) else blob
         out = []
@@ -886,7 +1009,27 @@ def create_public_routes(ctx):
                     "avatar_url": avatar_url,
                 }
                 out.append(user)
-        return jsonify(out)
+        return out
+
+    verified_list = list_query.ListSpec(
+        id_of=lambda u: u.get("discord_id"),
+        sorts={
+            "name": lambda u: str(u.get("display_name") or u.get("username") or "").casefold(),
+            "id": lambda u: u.get("discord_id"),
+        },
+        filters={"user": list_query.casefold_in(
+            lambda u: u.get("discord_id"), lambda u: u.get("username"),
+            lambda u: u.get("display_name"), lambda u: u.get("habbo_name"),
+        )},
+    )
+
+    @api.get("/verified")
+    def api_verified():
+        try:
+            query = list_query.ListQuery.parse(request.args, verified_list)
+        except list_query.ListQueryError as e:
+            return list_query.error_response(e)
+        return list_query.respond(query.apply(_verified_payload(ctx.get("BASE_DIR", ""))))
 
     @api.get("/avatars")
     def api_avatars():
@@ -905,7 +1048,9 @@ def create_public_routes(ctx):
         def cache_get(uid):
             rec = _AVATAR_CACHE.get(uid)
             if rec and now - rec.get("ts", 0) < 600:
+                _AVATAR_CACHE_STATS["hits"] += 1
                 return rec.get("url")
+            _AVATAR_CACHE_STATS["misses"] += 1
             return None
 
         def cache_put(uid, url):
@@ -957,9 +1102,7 @@ def create_public_routes(ctx):
         return resp
 
     # ---------- Bets (enriched with display_name) ----------
-    @api.get("/bets")
-    def api_bets():
-        base = ctx.get("BASE_DIR", "")
+    def _bets_payload(base):
         bets = _json_load(_bets_path(base), [])
         verified_blob = _json_load(_verified_path(base), {})
         verified = verified_blob.get("verified_users") if isinstance(verified_blob, dict) else verified_blob
@@ -997,7 +1140,35 @@ def create_public_routes(ctx):
             item["option1_display_name"] = o1
             item["option2_display_name"] = o2
             out.append(item)
-        return jsonify(out)
+        return out
+
+    def _bet_status(b):
+        if str(b.get("winner") or "").strip():
+            return "settled"
+        return "claimed" if b.get("option2_user_id") else "open"
+
+    bets_list = list_query.ListSpec(
+        id_of=lambda b: b.get("bet_id"),
+        sorts={
+            "id": lambda b: b.get("bet_id"),
+            "title": lambda b: str(b.get("bet_title") or "").casefold(),
+            "status": _bet_status,
+        },
+        filters={
+            "status": lambda b, values: _bet_status(b) in values,
+            "user": list_query.casefold_in(
+                lambda b: b.get("option1_user_id"), lambda b: b.get("option2_user_id"),
+            ),
+        },
+    )
+
+    @api.get("/bets")
+    def api_bets():
+        try:
+            query = list_query.ListQuery.parse(request.args, bets_list)
+        except list_query.ListQueryError as e:
+            return list_query.error_response(e)
+        return list_query.respond(query.apply(_bets_payload(ctx.get("BASE_DIR", ""))))
 
     @api.get("/my_bets")
     def api_my_bets():
@@ -1219,105 +1390,46 @@ def create_public_routes(ctx):
         return jsonify({"ok": True, "bet": target})
 
     # ---------- Ownership from players ----------
-    @api.get("/ownership_merged")
-    def ownership_merged():
-        base = ctx.get("BASE_DIR", "")
-        try:
-            teams_raw = _json_load(_teams_path(base), [])
-            if isinstance(teams_raw, dict):
-                teams = teams_raw.get("teams", [])
-            elif isinstance(teams_raw, list):
-                teams = teams_raw
-            else:
-                teams = []
-            if not isinstance(teams, list):
-                teams = []
-
-            players = _json_load(_players_path(base), {})
-            verified_blob = _json_load(_verified_path(base), {})
-            id_to_name = {}
-
-            vlist = verified_blob.get("verified_users") if isinstance(verified_blob, dict) else verified_blob
-            if isinstance(vlist, list):
-                for v in vlist:
-                    if not isinstance(v, dict):
-                        continue
-                    did = str(v.get("discord_id") or v.get("id") or v.get("user_id") or "").strip()
-                    dnm = (v.get("display_name")
-                           or v.get("discord_display_name")
-                           or v.get("discord_global_name")
-                           or v.get("discord_username")
-                           or v.get("username")
-                           or v.get("name")
-                           or "").strip()
-                    if did:
-                        id_to_name[did] = dnm or did
+    def _ownership_merged_payload(base):
+        teams_raw = _json_load(_teams_path(base), [])
+        if isinstance(teams_raw, dict):
+            teams = teams_raw.get("teams", [])
+        elif isinstance(teams_raw, list):
+            teams = teams_raw
+        else:
+            teams = []
+        if not isinstance(teams, list):
+            teams = []
 
-            if isinstance(players, dict):
-                for uid, pdata in players.items():
-                    did = str(uid).strip()
-                    if not did or did in id_to_name:
-                        continue
-                    nm = None
-                    if isinstance(pdata, dict):
-                        nm = (pdata.get("display_name") or pdata.get("username") or pdata.get("name"))
-                    id_to_name[did] = str(nm or did)
-
-            country_map = {}
-            if isinstance(players, dict):
-                for uid, pdata in players.items():
-                    if not isinstance(pdata, dict):
-                        continue
-                    for entry in (pdata.get("teams") or []):
-                        if isinstance(entry, dict):
-                            team = entry.get("team")
-                            if not team: 
-                                continue
-                            own = entry.get("ownership") or {}
-                            main_owner = own.get("main_owner")
-                            split_with = own.get("split_with") or []
-                        else:
-                            team = str(entry)
-                            own = {}
-                            main_owner = None
-                            split_with = []
-
-                        rec = country_map.setdefault(team, {"main_owner": None, "split_with": [], "percentages": {}})
-                        if main_owner is not None:
-                            if rec["main_owner"] is None or str(main_owner) == str(uid):
-                                rec["main_owner"] = str(main_owner)
-                        for sid in split_with if isinstance(split_with, list) else [split_with]:
-                            sid = str(sid).strip()
-                            if sid and sid not in rec["split_with"]:
-                                rec["split_with"].append(sid)
-                        percentages = own.get("percentages")
-                        if isinstance(percentages, dict) and percentages:
-                            rec["percentages"] = {
-                                str(owner_id): float(value)
-                                for owner_id, value in percentages.items()
-                                if value is not None
-                            }
-
-            team_names = set([str(t) for t in teams if t]) or set(country_map.keys())
-            rows = []
-            for team in sorted(team_names, key=lambda s: s.lower()):
-                rec = country_map.get(team, {"main_owner": None, "split_with": []})
-                main_id = rec.get("main_owner")
-                split_ids = [sid for sid in rec.get("split_with", []) if sid and sid != str(main_id)]
-
-                rows.append({
-                    "country": team,
-                    "main_owner": None if main_id is None else {
-                        "id": str(main_id),
-                        "username": id_to_name.get(str(main_id))
-                    },
-                    "split_with": [{"id": sid, "username": id_to_name.get(sid)} for sid in split_ids],
-                    "owners_count": (1 if main_id else 0) + len(split_ids),
-                    "percentages": rec.get("percentages") or {}
-                })
+        index = _ownership_index(base)
+        verified_blob = _json_load(_verified_path(base), {})
+        id_to_name = {}
 
-            return jsonify({"rows": rows, "count": len(rows)})
+        vlist = verified_blob.get("verified_users") if isinstance(verified_blob, dict) else verified_blob
+        if isinstance(vlist, list):
+            for v in vlist:
+                if not isinstance(v, dict):
+                    continue
+                did = str(v.get("discord_id") or v.get("id") or v.get("user_id") or "").strip()
+                dnm = (v.get("display_name")
+                       or v.get("discord_display_name")
+                       or v.get("discord_global_name")
+                       or v.get("discord_username")
+                       or v.get("username")
+                       or v.get("name")
+                       or "").strip()
+                if did:
+                    id_to_name[did] = dnm or did
+
+        # Verified display names win; players.json names fill the gaps.
+        names = collections.ChainMap(id_to_name, index.player_names)
+        rows = index.rows(names, set([str(t) for t in teams if t]) or None)
+        return {"rows": rows, "count": len(rows)}
 
+    @api.get("/ownership_merged")
+    def ownership_merged():
+        try:
+            return jsonify(_ownership_merged_payload(ctx.get("BASE_DIR", "")))
         except Exception as e:
             import traceback
             current_app.logger.exception("ownership_merged failed")
@@ -1330,60 +1442,8 @@ def create_public_routes(ctx):
 
     @api.get("/ownership_from_players")
     def ownership_from_players():
-        base = ctx.get("BASE_DIR", "")
-
-        players = _json_load(_players_path(base), {})
-        id_to_name = {}
-        if isinstance(players, dict):
-            for uid, pdata in players.items():
-                if isinstance(pdata, dict):
-                    nm = pdata.get("display_name") or pdata.get("username") or pdata.get("name") or str(uid)
-                else:
-                    nm = str(uid)
-                id_to_name[str(uid)] = str(nm)
-
-        country_map = {}
-        if isinstance(players, dict):
-            for uid, pdata in players.items():
-                if not isinstance(pdata, dict):
-                    continue
-                for entry in (pdata.get("teams") or []):
-                    if not isinstance(entry, dict):
-                        continue
-                    team = entry.get("team")
-                    own = entry.get("ownership") or {}
-                    main_owner = own.get("main_owner")
-                    split_with = [str(x) for x in (own.get("split_with") or [])]
-                    if not team:
-                        continue
-                    rec = country_map.setdefault(team, {"main_owner": None, "split_with": [], "percentages": {}})
-                    if main_owner is not None:
-                        if rec["main_owner"] is None or str(main_owner) == str(uid):
-                            rec["main_owner"] = str(main_owner)
-                    for sid in split_with:
-                        if sid and sid not in rec["split_with"]:
-                            rec["split_with"].append(sid)
-                    percentages = own.get("percentages")
-                    if isinstance(percentages, dict) and percentages:
-                        rec["percentages"] = {
-                            str(owner_id): float(value)
-                            for owner_id, value in percentages.items()
-                            if value is not None
-                        }
-
-        rows = []
-        for team in sorted(country_map.keys(), key=lambda x: x.lower()):
-            rec = country_map[team]
-            main_id = rec.get("main_owner")
-            split_ids = [sid for sid in rec.get("split_with", []) if sid and sid != str(main_id)]
-            rows.append({
-                "country": team,
-                "main_owner": None if main_id is None else {"id": str(main_id),
-                                                            "username": id_to_name.get(str(main_id))},
-                "split_with": [{"id": sid, "username": id_to_name.get(sid)} for sid in split_ids],
-                "owners_count": (1 if main_id else 0) + len(split_ids),
-                "percentages": rec.get("percentages") or {}
-            })
+        index = _ownership_index(ctx.get("BASE_DIR", ""))
+        rows = index.rows(index.player_names, index.teams.keys())
         return jsonify({"rows": rows, "count": len(rows)})
 
     @api.get("/ownerships")
@@ -1480,9 +1540,7 @@ def create_public_routes(ctx):
         return jsonify({"items": items, "ownerships": items})
 
     # ---------- Team ISO ----------
-    @api.get("/team_iso")
-    def api_team_iso():
-        base = ctx.get("BASE_DIR", "")
+    def _team_iso_payload(base):
         data = _json_load(_team_iso_path(base), {})
         if isinstance(data, list):
             out = {}
@@ -1491,17 +1549,21 @@ def create_public_routes(ctx):
                 name = (row.get("team") or row.get("name") or "").strip()
                 code = (row.get("iso") or row.get("code") or "").strip().lower()
                 if name and code: out[name] = code
-            return jsonify(out)
-        return jsonify(data if isinstance(data, dict) else {})
+            return out
+        return data if isinstance(data, dict) else {}
+
+    @api.get("/team_iso")
+    def api_team_iso():
+        return jsonify(_team_iso_payload(ctx.get("BASE_DIR", "")))
+
+    def _team_meta_payload(base):
+        # Unlike the other loaders this one raises, so a broken file is reported.
+        return json_codec.read_file(_team_meta_path(base))[0]
 
     @api.get("/team_meta")
     def get_team_meta():
-        import os, json
-        path = os.path.join(ctx.get("BASE_DIR", ""), "JSON", "team_meta.json")
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            return jsonify(data)
+            return jsonify(_team_meta_payload(ctx.get("BASE_DIR", "")))
         except Exception as e:
             return jsonify({"error": str(e)}), 500
 
@@ -1516,6 +1578,43 @@ def create_public_routes(ctx):
         response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
         return response
 
+    @api.get("/standings/scenarios")
+    def api_standings_scenarios():
+        """Results each team needs from its group's remaining fixtures."""
+        base = ctx.get("BASE_DIR", "")
+        group = str(request.args.get("group") or "").strip().upper()
+        if group not in STANDINGS_GROUPS:
+            return jsonify({"ok": False, "error": "invalid_group"}), 400
+        team_meta = _json_load(os.path.join(_json_dir(base), "team_meta.json"), {})
+        groups, remaining = _saved_group_tables(team_meta, _json_load(_matches_path(base), []))
+        if group not in groups:
+            return jsonify({"ok": False, "error": "group_unavailable"}), 503
+        try:
+            payload = group_scenarios.scenarios(groups[group], remaining)
+        except ValueError as exc:
+            return jsonify({"ok": False, "error": "too_many_fixtures", "detail": str(exc)}), 503
+        response = make_response(jsonify({"ok": True, "group": group, **payload}))
+        response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
+        return response
+
+    @api.get("/odds")
+    def api_odds():
+        """Monte Carlo stage odds per team and per owner, recomputed only when results change."""
+        base = ctx.get("BASE_DIR", "")
+        try:
+            tournament = _odds_tournament(base)
+        except ValueError as exc:
+            return jsonify({"ok": False, "error": "odds_unavailable", "detail": str(exc)}), 503
+        result = tournament_odds.run(tournament, tournament_odds.SIMULATIONS)
+        return jsonify({
+            "ok": True,
+            "simulations": result["simulations"],
+            "fingerprint": result["fingerprint"],
+            "elapsed_ms": result["elapsed_ms"],
+            "teams": result["teams"],
+            "owners": tournament_odds.owner_outcomes(result, _ownership_index(base)),
+        })
+
     # ---------- Minimal split endpoints exposed publicly ----------
     @api.get("/split_requests")
     def split_requests_get():
@@ -2025,25 +2124,27 @@ def create_public_routes(ctx):
     # User-facing APIs (session)
     # ==========================
 
-    @api.get("/me")
-    def me_get():
-        base = ctx.get("BASE_DIR", "")
+    def _me_payload(base):
         cfg = _load_config(base)
         admin_ids = {str(x) for x in (cfg.get("ADMIN_IDS") or [])}
 
         user = session.get(_session_key())
         if not user:
-            return jsonify({"ok": True, "user": None, "is_admin": False, "masquerading_as": None})
+            return {"ok": True, "user": None, "is_admin": False, "masquerading_as": None}
 
         real_uid = str(user.get("discord_id") or "")
         effective_uid = _effective_uid()
 
-        return jsonify({
+        return {
             "ok": True,
             "user": user,
             "is_admin": real_uid in admin_ids,
             "masquerading_as": None if effective_uid == real_uid else effective_uid
-        })
+        }
+
+    @api.get("/me")
+    def me_get():
+        return jsonify(_me_payload(ctx.get("BASE_DIR", "")))
 
     @api.get("/me/notification-settings")
     def me_notification_settings_get():
@@ -2555,32 +2656,13 @@ def create_public_routes(ctx):
         if not user or not user.get("discord_id"):
             return jsonify({"ok": True, "owned": [], "split": []})
 
-        players = _json_load(_players_path(base), {})
         teams_iso = _json_load(_team_iso_path(base), {})
         uid = _effective_uid()
         if not uid:
             return jsonify({"ok": True, "owned": [], "split": []})
 
-        owned_set, split_set = set(), set()
-
-        if isinstance(players, dict):
-            for _, pdata in players.items():
-                if not isinstance(pdata, dict):
-                    continue
-                for entry in (pdata.get("teams") or []):
-                    if not isinstance(entry, dict):
-                        continue
-                    team = entry.get("team")
-                    if not team:
-                        continue
-                    own = entry.get("ownership") or {}
-                    main_owner = str(own.get("main_owner")) if own.get("main_owner") is not None else None
-                    splits = [str(x) for x in (own.get("split_with") or [])]
-
-                    if main_owner == uid:
-                        owned_set.add(team)
-                    elif uid in splits:
-                        split_set.add(team)
+        index = _ownership_index(base)
+        owned_set, split_set = index.owned_by(uid), index.split_by(uid)
 
         def flag(team):
             code = None
@@ -2603,33 +2685,22 @@ def create_public_routes(ctx):
         if not uid:
             return jsonify({"ok": True, "matches": []})
 
-        players = _json_load(_players_path(base), {})
-        owned_set = set()
-        pdata = players.get(uid) if isinstance(players, dict) else None
-        if isinstance(pdata, dict):
-            for entry in (pdata.get("teams") or []):
-                if not isinstance(entry, dict): continue
-                team = entry.get("team"); own = entry.get("ownership") or {}
-                if not team: continue
-                if str(own.get("main_owner")) == uid or uid in [str(x) for x in (own.get("split_with") or [])]:
-                    owned_set.add(team)
-
-        all_matches = _json_load(_matches_path(base), [])
-        out = []
-        for m in all_matches if isinstance(all_matches, list) else []:
-            try:
-                when = m.get("utc") or m.get("time") or ""
-                dt = datetime.datetime.fromisoformat(when.replace("Z","+00:00"))
-                ts = dt.timestamp()
-            except Exception:
-                ts = 0
-            if not ts: 
-                continue
-            if owned_set.intersection(set([m.get("home"), m.get("away")])):
-                out.append(m)
-
-        out.sort(key=lambda x: x.get("utc") or x.get("time") or "")
-        return jsonify({"ok": True, "matches": out})
+        index = _ownership_index(base)
+        teams = sorted(index.owned_by(uid) | index.split_by(uid))
+        fixtures = fixture_index.get(_matches_path(base), lambda path: _json_load(path, []))
+
+        # Only this user's teams and the fixture list feed the response, so
+        # unrelated ownership changes keep the client's copy valid.
+        etag = hashlib.blake2b(
+            "\x1f".join([fixtures.version, *teams]).encode("utf-8"), digest_size=12,
+        ).hexdigest()
+        if request.if_none_match.contains(etag):
+            resp = make_response("", 304)
+        else:
+            resp = jsonify({"ok": True, "matches": fixtures.schedule(teams)})
+        resp.set_etag(etag)
+        resp.headers["Cache-Control"] = "private, no-cache"
+        return resp
 
     # ======================
     # Fan Zone (fixtures + anonymous voting)
@@ -2719,9 +2790,7 @@ def create_public_routes(ctx):
             return f"group-{group.lower()}"
         return ""
 
-    @api.get("/fixtures")
-    def api_fixtures():
-        base = ctx.get("BASE_DIR", "")
+    def _fixtures_payload(base, *, admin_view=False, include_all=False, include_results=False):
         matches = _json_load(_matches_path(base), [])
         iso_map = _load_team_iso_map(base)
 
@@ -2734,15 +2803,14 @@ def create_public_routes(ctx):
 
         user = session.get(_session_key()) or {}
         real_uid = str(user.get("discord_id") or "").strip()
-        wants_admin_view = str(request.args.get("admin_view") or "").strip() in ("1", "true", "yes", "on")
-        # `include_all=1` is used by the world map panel so it can compute each
+        # `include_all` is used by the world map panel so it can compute each
         # country's true next fixture even when kickoff is beyond the fan-zone
-        # 48-hour public window. `include_results=1` keeps scored matches in the
+        # 48-hour public window. `include_results` keeps scored matches in the
         # response so the Results panel does not lose a result immediately after
         # an admin saves it merely because kickoff is past or has no valid time.
-        wants_full_public_list = str(request.args.get("include_all") or "").strip() in ("1", "true", "yes", "on")
-        wants_completed_results = str(request.args.get("include_results") or "").strip() in ("1", "true", "yes", "on")
-        allow_full_fixture_list = wants_admin_view and real_uid and _is_admin(base, real_uid)
+        wants_full_public_list = include_all
+        wants_completed_results = include_results
+        allow_full_fixture_list = admin_view and real_uid and _is_admin(base, real_uid)
 
         fixtures = []
         if isinstance(matches, list):
@@ -2826,12 +2894,40 @@ def create_public_routes(ctx):
                     if winner_side in ("home", "away"):
                         fixtures[-1]["winner_side"] = winner_side
 
-        return jsonify({
+        return {
             "ok": True,
             "fixtures": fixtures,
             "visibility_hours": visibility_hours,
             "admin_override": bool(allow_full_fixture_list),
-        })
+        }
+
+    fixtures_list = list_query.ListSpec(
+        id_of=lambda f: f.get("id"),
+        sorts={"kickoff": lambda f: f.get("utc") or None, "id": lambda f: f.get("id")},
+        filters={
+            "stage": list_query.casefold_in(lambda f: f.get("stage")),
+            "status": list_query.casefold_in(lambda f: f.get("status")),
+            "group": list_query.casefold_in(lambda f: f.get("group")),
+            "team": list_query.casefold_in(lambda f: f.get("home"), lambda f: f.get("away")),
+        },
+    )
+
+    @api.get("/fixtures")
+    def api_fixtures():
+        def flag(name):
+            return str(request.args.get(name) or "").strip() in ("1", "true", "yes", "on")
+
+        try:
+            query = list_query.ListQuery.parse(request.args, fixtures_list)
+        except list_query.ListQueryError as e:
+            return list_query.error_response(e)
+        payload = _fixtures_payload(
+            ctx.get("BASE_DIR", ""),
+            admin_view=flag("admin_view"),
+            include_all=flag("include_all"),
+            include_results=flag("include_results"),
+        )
+        return list_query.respond(query.apply(payload.pop("fixtures")), payload, "fixtures")
 
 
     @api.post("/fanzone/vote")
@@ -3172,7 +3268,6 @@ def create_public_routes(ctx):
                 "loser_iso": loser_iso,
                 "winner_owner_ids": sorted(win_owners),
                 "loser_owner_ids": sorted(lose_owners),
-                "live_stats": (fixture or {}).get("live_stats") if isinstance((fixture or {}).get("live_stats"), list) else [],
                 "channel": channel_name,
             }
         })
@@ -3267,7 +3362,21 @@ def create_public_routes(ctx):
     def api_fanzone_stats_alias(fixture_id):
         return api_fanzone_stats(fixture_id)
 
+    leaderboard_lists = {
+        kind: list_query.ListSpec(
+            id_of=lambda r: r.get("id"),
+            sorts={"rank": lambda r, kind=kind: -r.get(kind, 0), "id": lambda r: r.get("id")},
+            filters={"user": list_query.casefold_in(lambda r: r.get("id"))},
+            default_sort="rank",
+        )
+        for kind in ("wins", "losses")
+    }
+
     def _fanzone_vote_leaderboard(result_kind: str):
+        try:
+            query = list_query.ListQuery.parse(request.args, leaderboard_lists[result_kind])
+        except list_query.ListQueryError as e:
+            return list_query.error_response(e)
         base = ctx.get("BASE_DIR", "")
         winners_blob = _json_load(_fz_winners_path(base), {})
         votes_blob = _json_load(_fz_votes_path(base), {"fixtures": {}})
@@ -3301,9 +3410,9 @@ def create_public_routes(ctx):
                     if (result_kind == "wins" and is_win) or (result_kind == "losses" and not is_win):
                         counts[voter_uid] = counts.get(voter_uid, 0) + 1
 
-        rows = [{"id": uid, result_kind: total} for uid, total in counts.items()]
-        rows.sort(key=lambda x: (-x.get(result_kind, 0), str(x.get("id") or "")))
-        return jsonify({"ok": True, "rows": rows})
+        rows = ({"id": uid, result_kind: total} for uid, total in counts.items())
+        # Ranked by count, ties broken by user id.
+        return list_query.respond(query.apply(rows), {"ok": True}, "rows")
 
     @api.get("/leaderboards/fanzone_wins")
     def api_fanzone_wins_leaderboard():
@@ -3313,4 +3422,112 @@ def create_public_routes(ctx):
     def api_fanzone_losses_leaderboard():
         return _fanzone_vote_leaderboard("losses")
 
+    # ---------- Change feed ----------
+    def _changed_entity_data(base, changes):
+        """Current public shape of each changed entity (None once deleted or not public)."""
+        kinds = {c["kind"] for c in changes if c["op"] != "delete"}
+        index = {}
+        if "fixture" in kinds:
+            payload = _fixtures_payload(base, include_all=True, include_results=True)
+            index["fixture"] = {f["id"]: f for f in payload["fixtures"]}
+        if "bet" in kinds:
+            index["bet"] = {str(b.get("bet_id")): b for b in _bets_payload(base) if b.get("bet_id")}
+        if "ownership" in kinds:
+            index["ownership"] = {r["country"]: r for r in _ownership_merged_payload(base)["rows"]}
+        for c in changes:
+            c["data"] = None if c["op"] == "delete" else index.get(c["kind"], {}).get(c["id"])
+        return changes
+
+    @api.get("/changes")
+    def api_changes():
+        """Fixtures, bets and ownership rows changed after version ``since``.
+
+        ``kinds=fixture,bet,ownership`` narrows the feed. ``resync: true`` (or no
+        ``since``) means the client is too far behind and should reload in full,
+        then continue from the returned ``version``.
+        """
+        base = ctx.get("BASE_DIR", "")
+        try:
+            since = int(request.args["since"])
+        except (KeyError, TypeError, ValueError):
+            since = None
+        kinds = [k.strip() for k in (request.args.get("kinds") or "").split(",") if k.strip() in change_log.KINDS]
+        result = change_log.read_since(_json_dir(base), since, kinds or None)
+        if result["changes"]:
+            _changed_entity_data(base, result["changes"])
+        resp = make_response(jsonify({"ok": True, **result}))
+        resp.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
+        return resp
+
+    # ---------- Bootstrap ----------
+    def _bootstrap_sections(base):
+        """name -> (files the payload is built from, builder).
+
+        ``None`` files mark sections that depend on the session; they are built
+        fresh on every request and carry no version. Other blueprints add their
+        own session sections through ``ctx["BOOTSTRAP_SECTIONS"]``.
+        """
+        sections = {
+            "verified": ((_verified_path(base),), _verified_payload),
+            "player_names": ((_verified_path(base), _players_path(base)), _player_names_map),
+            "team_iso": ((_team_iso_path(base),), _team_iso_payload),
+            "team_meta": ((_team_meta_path(base),), _team_meta_payload),
+            "teams": ((_teams_path(base),), _teams_payload),
+            "ownership_merged": (
+                (_teams_path(base), _players_path(base), _verified_path(base)),
+                _ownership_merged_payload,
+            ),
+            "team_stage": ((_team_stage_path(base),), _team_stage_payload),
+            # Same list as /api/fixtures?include_all=1 (the world map's request).
+            "fixtures": (
+                (_matches_path(base), _team_iso_path(base)),
+                lambda b: _fixtures_payload(b, include_all=True),
+            ),
+            "me": (None, _me_payload),
+        }
+        for name, build in (ctx.get("BOOTSTRAP_SECTIONS") or {}).items():
+            sections.setdefault(name, (None, build))
+        return sections
+
+    @api.get("/bootstrap")
+    def api_bootstrap():
+        """Reference data for the web app's first paint in one response.
+
+        ``sections=a,b`` limits the response to those sections. ``versions=a:v1,b:v2``
+        passes the client's last version vector; sections whose version still
+        matches are listed under ``unchanged`` instead of being sent again.
+        """
+        base = ctx.get("BASE_DIR", "")
+        specs = _bootstrap_sections(base)
+        requested = [name.strip() for name in (request.args.get("sections") or "").split(",") if name.strip()]
+        names = [name for name in requested if name in specs] if requested else list(specs)
+        known = _parse_version_vector(request.args.get("versions"))
+        bucket = str(int(time.time() // BOOTSTRAP_TIME_BUCKET_SECONDS))
+
+        out = {"ok": True, "versions": {}, "sections": {}, "unchanged": [], "errors": {}}
+        for name in names:
+            files, build = specs[name]
+            try:
+                if files is None:
+                    out["versions"][name] = None
+                    out["sections"][name] = build(base)
+                    continue
+                version = _files_version(files, bucket if name == "fixtures" else "")
+                out["versions"][name] = version
+                if known.get(name) == version:
+                    out["unchanged"].append(name)
+                    continue
+                out["sections"][name] = _bootstrap_cached(base, name, version, build)
+            except Exception as e:
+                log.warning("bootstrap section %s failed: %s", name, e)
+                out["versions"].pop(name, None)
+                out["errors"][name] = str(e)
+        unknown = [name for name in requested if name not in specs]
+        if unknown:
+            out["unknown"] = unknown
+
+        resp = make_response(jsonify(out))
+        resp.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
+        return resp
+
     return root, api, auth
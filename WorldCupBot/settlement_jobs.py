@@ -0,0 +1,213 @@
+"""Background settlement of saved fixture results.
+
+Saving a result only records it (matches.json and fan_winners.json) inside the
+admin request. Everything that follows from it, such as bracket progression,
+the Match Picks vote snapshot, results feed and leaderboard events, and the
+Discord announcements, runs as a job of named steps on a worker thread.
+
+Jobs are kept in one JSON file (``job_records``), so a launcher restart picks
+up unfinished ones. Steps run in order and each must be safe to run again: a step's
+completion is saved before the next one starts, and a step that raises is
+retried after ``RETRY_DELAYS``. Once those run out the job is ``failed`` until
+an admin retries it. Jobs for the same fixture run in the order they were
+submitted.
+"""
+import logging
+import os
+import threading
+import time
+import uuid
+
+import job_records
+
+log = logging.getLogger("launcher")
+
+# Seconds before each retry of a failing step.
+RETRY_DELAYS = (2, 10, 30, 120)
+# Finished jobs kept for the admin panel.
+KEEP_FINISHED = 100
+
+ACTIVE = ("queued", "running", "retrying")
+
+
+def _new_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+class SettlementQueue:
+    """Jobs in ``path``, run through ``steps`` (``[(name, fn(job) -> dict | None)]``).
+
+    A step's returned dict is merged into ``job["result"]``. ``lock`` is held
+    while a step runs; request handlers that rewrite the same files take it too.
+    """
+
+    def __init__(self, path, steps, retry_delays=RETRY_DELAYS):
+        self.path = os.fspath(path)
+        self.steps = list(steps)
+        self.retry_delays = tuple(retry_delays)
+        self.lock = threading.RLock()
+        self._cond = threading.Condition()
+        self._records = job_records.JobRecords(
+            self.path, state_key="status", active=ACTIVE, keep=KEEP_FINISHED, on_restart=job_records.RESUME
+        )
+        self._worker: threading.Thread | None = None
+
+    # ---- storage (callers hold _cond) ----
+    def _load(self) -> list[dict]:
+        return self._records.load()
+
+    def _save(self) -> None:
+        self._records.save()
+
+    def _find(self, job_id) -> dict | None:
+        return self._records.find(job_id)
+
+    # ---- public API ----
+    def submit(self, fixture_id: str, data: dict) -> dict:
+        now = int(time.time())
+        job = {
+            "id": _new_id(),
+            "fixture_id": str(fixture_id),
+            "status": "queued",
+            "created_at": now,
+            "updated_at": now,
+            "next_attempt_at": 0,
+            "error": "",
+            "data": data,
+            "result": {},
+            "steps": {name: {"status": "pending", "attempts": 0, "error": ""} for name, _ in self.steps},
+        }
+        with self._cond:
+            self._load().append(job)
+            self._save()
+            self._ensure_worker()
+            self._cond.notify_all()
+            return _public(job)
+
+    def get(self, job_id) -> dict | None:
+        with self._cond:
+            job = self._find(job_id)
+            return _public(job) if job else None
+
+    def list(self, limit: int = 20, fixture_id: str = "") -> list[dict]:
+        """Newest first."""
+        with self._cond:
+            jobs = [job for job in self._load() if not fixture_id or job["fixture_id"] == fixture_id]
+            return [_public(job) for job in reversed(jobs[-limit:] if limit else jobs)]
+
+    def retry(self, job_id) -> dict | None:
+        """Run a failed job again from its first unfinished step."""
+        with self._cond:
+            job = self._find(job_id)
+            if job is None or job.get("status") != "failed":
+                return None
+            for step in job["steps"].values():
+                if step["status"] != "done":
+                    step.update(status="pending", attempts=0, error="")
+            job.update(status="queued", next_attempt_at=0, error="", updated_at=int(time.time()))
+            self._save()
+            self._ensure_worker()
+            self._cond.notify_all()
+            return _public(job)
+
+    def resume(self) -> None:
+        """Start the worker if unfinished jobs were saved (e.g. before a restart)."""
+        with self._cond:
+            if any(job.get("status") in ACTIVE for job in self._load()):
+                self._ensure_worker()
+
+    def wait_idle(self, timeout: float = 10.0) -> bool:
+        """Block until the worker has run out of jobs; mainly for tests."""
+        deadline = time.time() + timeout
+        with self._cond:
+            while time.time() < deadline:
+                if self._worker is None:
+                    return True
+                self._cond.wait(min(0.05, max(0.0, deadline - time.time())))
+            return self._worker is None
+
+    # ---- worker ----
+    def _ensure_worker(self) -> None:
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run, name="settlement", daemon=True)
+            self._worker.start()
+
+    def _next_due(self):
+        """(job, None) for the next runnable job, else (None, seconds until one is due)."""
+        now = time.time()
+        blocked, wait = set(), None
+        for job in self._load():
+            if job.get("status") not in ACTIVE:
+                continue
+            fid = job["fixture_id"]
+            if fid in blocked:
+                continue
+            blocked.add(fid)
+            due = float(job.get("next_attempt_at") or 0)
+            if due <= now:
+                return job, None
+            wait = due - now if wait is None else min(wait, due - now)
+        return None, wait
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                job, wait = self._next_due()
+                if job is None:
+                    if wait is None:
+                        # Nothing left; the next submit starts a new worker.
+                        self._worker = None
+                        self._cond.notify_all()
+                        return
+                    self._cond.wait(wait)
+                    continue
+                job["status"] = "running"
+                self._save()
+            self._run_job(job)
+
+    def _run_job(self, job: dict) -> None:
+        for name, fn in self.steps:
+            step = job["steps"].setdefault(name, {"status": "pending", "attempts": 0, "error": ""})
+            if step["status"] == "done":
+                continue
+            with self._cond:
+                step["status"] = "running"
+                self._save()
+            try:
+                with self.lock:
+                    out = fn(job)
+            except Exception as exc:
+                log.exception("Settlement step %s failed (job=%s fixture_id=%s)", name, job["id"], job["fixture_id"])
+                with self._cond:
+                    step["attempts"] += 1
+                    step["error"] = f"{type(exc).__name__}: {exc}"[:300]
+                    now = int(time.time())
+                    if step["attempts"] > len(self.retry_delays):
+                        step["status"] = "failed"
+                        job.update(status="failed", error=f"{name}: {step['error']}", updated_at=now)
+                    else:
+                        step["status"] = "retrying"
+                        job.update(
+                            status="retrying",
+                            next_attempt_at=now + self.retry_delays[step["attempts"] - 1],
+                            updated_at=now,
+                        )
+                    self._save()
+                return
+            with self._cond:
+                if isinstance(out, dict):
+                    job["result"].update(out)
+                step.update(status="done", error="")
+                job["updated_at"] = int(time.time())
+                self._save()
+        with self._cond:
+            job.update(status="done", error="", updated_at=int(time.time()))
+            self._save()
+
+
+def _public(job: dict) -> dict:
+    """Job as the admin API returns it (without the step inputs)."""
+    return {key: value for key, value in job.items() if key != "data"} | {
+        "steps": {name: dict(step) for name, step in job["steps"].items()},
+        "result": dict(job.get("result") or {}),
+    }
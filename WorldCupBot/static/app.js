@@ -79,6 +79,97 @@
     };
   }
 
+  // First paint used to fire a dozen reference-data requests that each reloaded
+  // overlapping JSON files. One /api/bootstrap round trip now answers them: while
+  // the snapshot is fresh, GETs to the URLs below are served from it, and after
+  // that (or for a section the server could not build) they hit the network.
+  // Any non-GET request may change what the snapshot holds, so it ends the
+  // snapshot's freshness. The session sections (me, auth) answer only the first
+  // request for them; a login must never be answered from a pre-login copy.
+  if (!window.WorldCupBootstrap) {
+    const BOOTSTRAP_TTL_MS = 10000;
+    const BOOTSTRAP_URLS = {
+      '/api/verified': 'verified',
+      '/api/player_names': 'player_names',
+      '/api/team_iso': 'team_iso',
+      '/api/team_meta': 'team_meta',
+      '/api/teams': 'teams',
+      '/api/ownership_merged': 'ownership_merged',
+      '/api/team_stage': 'team_stage',
+      '/api/fixtures?include_all=1': 'fixtures',
+      '/admin/auth/status': 'auth',
+      '/api/me': 'me',
+    };
+    const SESSION_SECTIONS = new Set(['auth', 'me']);
+    const nativeFetch = window.fetch.bind(window);
+    // generation counts mutations; a load that started before one is discarded.
+    const snapshot = { sections: {}, versions: {}, loadedAt: 0, pending: null, generation: 0, sessionUsed: new Set() };
+
+    function invalidateBootstrap() {
+      snapshot.generation += 1;
+      snapshot.loadedAt = 0;
+      SESSION_SECTIONS.forEach(name => snapshot.sessionUsed.add(name));
+    }
+
+    // Pass section names to refresh only those; known versions are sent along so
+    // the server skips anything that has not changed since the last load.
+    function loadBootstrap(sections) {
+      const params = new URLSearchParams();
+      if (sections && sections.length) params.set('sections', sections.join(','));
+      const known = Object.entries(snapshot.versions)
+        .filter(([name, version]) => version && name in snapshot.sections)
+        .map(([name, version]) => `${name}:${version}`);
+      if (known.length) params.set('versions', known.join(','));
+      const query = params.toString();
+      const generation = snapshot.generation;
+      snapshot.pending = nativeFetch(`/api/bootstrap${query ? `?${query}` : ''}`, { credentials: 'include', cache: 'no-store' })
+        .then(r => (r.ok ? r.json() : null))
+        .then(data => {
+          if (data && data.sections && generation === snapshot.generation) {
+            Object.assign(snapshot.sections, data.sections);
+            Object.assign(snapshot.versions, data.versions || {});
+            for (const name of Object.keys(data.errors || {})) delete snapshot.sections[name];
+            snapshot.loadedAt = Date.now();
+          }
+          return data;
+        })
+        .catch(() => null)
+        .finally(() => { snapshot.pending = null; });
+      return snapshot.pending;
+    }
+
+    window.fetch = function (input, init) {
+      const method = String((init && init.method) || (input && input.method) || 'GET').toUpperCase();
+      const url = String(typeof input === 'string' ? input : (input && input.url) || '').replace(location.origin, '');
+      if (method !== 'GET' && method !== 'HEAD') {
+        invalidateBootstrap();
+        return nativeFetch(input, init);
+      }
+      const section = BOOTSTRAP_URLS[url];
+      if (!section) return nativeFetch(input, init);
+      return Promise.resolve(snapshot.pending).then(() => {
+        const fresh = Date.now() - snapshot.loadedAt < BOOTSTRAP_TTL_MS;
+        const session = SESSION_SECTIONS.has(section);
+        if (fresh && !(session && snapshot.sessionUsed.has(section))
+            && Object.prototype.hasOwnProperty.call(snapshot.sections, section)) {
+          if (session) snapshot.sessionUsed.add(section);
+          return new Response(JSON.stringify(snapshot.sections[section]), {
+            status: 200,
+            headers: { 'Content-Type': 'application/json' },
+          });
+        }
+        return nativeFetch(input, init);
+      });
+    };
+
+    window.WorldCupBootstrap = {
+      load: loadBootstrap,
+      get: (name) => snapshot.sections[name],
+      versions: () => ({ ...snapshot.versions }),
+    };
+    loadBootstrap();
+  }
+
   const state = {
     admin:false,
     helper:false,
@@ -86,6 +177,9 @@
     pollingId: null,
     logsKind: 'bot',
     logsInit: false,
+    logsLines: [],
+    logsCursor: null,
+    logsStream: null,
     userId: null,
     lastBotRunning: null,
     lastHealth: null,
@@ -362,6 +456,48 @@ function stagePill(stage){
     }finally{ clearTimeout(to); }
   }
 
+  // Slow admin actions answer 202 with a background job; poll it until it
+  // finishes and hand back its result like the inline response.
+  async function awaitJob(data, {intervalMs=1000, timeoutMs=300000}={}){
+    if(!data?.pending || !data?.job?.id) return data;
+    const deadline = Date.now() + timeoutMs;
+    while(Date.now() < deadline){
+      await sleep(intervalMs);
+      const {job} = await fetchJSON(`/admin/jobs/${encodeURIComponent(data.job.id)}`);
+      if(job.state === 'done') return {ok: true, ...(job.result || {}), job};
+      if(job.state === 'failed' || job.state === 'cancelled') throw new Error(job.error || job.state);
+    }
+    throw new Error('job_timeout');
+  }
+  window.awaitJob = awaitJob;
+
+  // Polling loops ask /api/changes whether anything they render moved since
+  // the last check instead of re-downloading whole documents. prime() records
+  // the current version (call it before the full load); changed() resolves
+  // true when the caller should reload (changes, resync, or the check failed).
+  function watchChanges(kinds){
+    let version = null;
+    async function check(){
+      const params = new URLSearchParams({ kinds: kinds.join(',') });
+      if (version !== null) params.set('since', String(version));
+      const data = await fetchJSON(`/api/changes?${params}`);
+      const before = version;
+      version = data.version;
+      return { before, data };
+    }
+    return {
+      async prime(){ try { await check(); } catch { version = null; } },
+      async changed(){
+        try{
+          const { before, data } = await check();
+          return before === null || data.resync || (data.changes || []).length > 0;
+        }catch{
+          return true;
+        }
+      },
+    };
+  }
+
   
     function showPage(page) {
       
@@ -383,6 +519,7 @@ function stagePill(stage){
       if (page === 'ownership') loadOwnership().catch(()=>{});
       if (page === 'bets') loadBets().catch(()=>{});
       if (page === 'log' && state.admin) loadLogs().catch(()=>{});
+      if (page !== 'log') stopLogStream();
       if (page === 'cogs' && state.admin) loadCogs().catch(()=>{});
       if (page === 'backups' && state.admin) loadBackups().catch(()=>{});
       if (page === 'splits') loadSplits().catch(()=>{});
@@ -911,7 +1048,8 @@ function stagePill(stage){
       const pingP = fetchJSON('/api/ping');
       const sysP = isAdminUI() ? fetchJSON('/api/system') : Promise.resolve(null);
       const healthP = fetchJSON('/api/health').catch(() => null);
-      const [up, ping, sys, health] = await Promise.all([upP, pingP, sysP, healthP]);
+      const metricsP = isAdminUI() ? fetchJSON('/admin/metrics.json').catch(() => null) : Promise.resolve(null);
+      const [up, ping, sys, health, metrics] = await Promise.all([upP, pingP, sysP, healthP, metricsP]);
       const latency = Math.max(0, Math.round(performance.now() - t0));
 
       const running = (up && typeof up.bot_running === 'boolean')
@@ -922,6 +1060,7 @@ function stagePill(stage){
       renderUptime(up, running);
       renderPing(ping, latency);
       if(isAdminUI() && sys) renderSystem(sys); else clearSystem();
+      renderRouteLatency(isAdminUI() ? metrics : null);
       writeDashCache({ up, ping, sys, health, running, latencyMs: latency });
 
       if (!running) {
@@ -1112,6 +1251,7 @@ function stagePill(stage){
     const host = document.getElementById('dashboard-live-games');
     if (!host || !isQuickAnnouncementContext()) return;
     host.innerHTML = '<div class="muted">Loading ongoing games…</div>';
+    loadDashboardSettlements();
     try {
       const data = await fetchJSON('/admin/fixtures');
       const fixtures = ongoingDashboardFixtures(data?.fixtures);
@@ -1133,8 +1273,7 @@ function stagePill(stage){
               data-away="${esc(fixture.away)}"
               data-stage="${esc(fixture.stage || '')}"
               data-home-score="${esc(fixture.home_score ?? 0)}"
-              data-away-score="${esc(fixture.away_score ?? 0)}"
-              data-live-stats="${esc(JSON.stringify(fixture.live_stats || []))}">Options</button>
+              data-away-score="${esc(fixture.away_score ?? 0)}">Options</button>
           </div>`;
       }).join('');
     } catch (error) {
@@ -1142,6 +1281,80 @@ function stagePill(stage){
     }
   }
 
+  const SETTLEMENT_STEP_LABELS = {
+    progression: 'Bracket',
+    vote_snapshot: 'Picks snapshot',
+    results_feed: 'Results & leaderboards',
+    match_picks: 'Match Picks post',
+    fixture_result: 'Result post'
+  };
+  const settlementWatches = new Set();
+
+  function renderSettlementJob(job) {
+    const steps = Object.entries(job.steps || {}).map(([name, step]) => `
+      <span class="settlement-step settlement-${esc(step.status)}" title="${esc(step.error || step.status)}">${esc(SETTLEMENT_STEP_LABELS[name] || name)}</span>`).join('');
+    const retry = job.status === 'failed'
+      ? `<button class="btn btn-outline sm settlement-retry" type="button" data-job-id="${esc(job.id)}">Retry</button>`
+      : '';
+    return `
+      <div class="dashboard-settlement">
+        <div class="dashboard-live-meta">${esc(job.fixture_id)} · ${esc(job.status)}</div>
+        <div class="settlement-steps">${steps}</div>
+        ${retry}
+      </div>`;
+  }
+
+  async function loadDashboardSettlements() {
+    const host = document.getElementById('dashboard-settlements');
+    if (!host || !isQuickAnnouncementContext()) return [];
+    try {
+      const data = await fetchJSON('/admin/settlements?limit=5');
+      const jobs = Array.isArray(data?.jobs) ? data.jobs : [];
+      host.innerHTML = jobs.length
+        ? `<div class="card-title">Result settlements</div>${jobs.map(renderSettlementJob).join('')}`
+        : '';
+      return jobs;
+    } catch (_) {
+      host.innerHTML = '';
+      return [];
+    }
+  }
+
+  // Saved results settle in the background; follow the job until it finishes
+  // so staff hear about a failed step without reloading the dashboard.
+  async function watchSettlement(job) {
+    if (!job?.id || settlementWatches.has(job.id)) return;
+    settlementWatches.add(job.id);
+    try {
+      for (let i = 0; i < 120; i += 1) {
+        const data = await fetchJSON(`/admin/settlements/${encodeURIComponent(job.id)}`).catch(() => null);
+        const status = data?.job?.status;
+        await loadDashboardSettlements();
+        if (status === 'done') return;
+        if (status === 'failed') {
+          notify(`Result settlement failed (${data.job.error || 'unknown error'})`, false);
+          return;
+        }
+        await sleep(1500);
+      }
+    } finally {
+      settlementWatches.delete(job.id);
+    }
+  }
+  window.watchSettlement = watchSettlement;
+
+  async function retrySettlement(button) {
+    button.disabled = true;
+    try {
+      const data = await fetchJSON(`/admin/settlements/${encodeURIComponent(button.dataset.jobId)}/retry`, { method: 'POST' });
+      notify('Settlement retry queued', true);
+      watchSettlement(data?.job);
+    } catch (error) {
+      notify(`Unable to retry settlement: ${error.message}`, false);
+      button.disabled = false;
+    }
+  }
+
   function closeQuickAnnouncementModal() {
     const backdrop = document.getElementById('quick-announce-backdrop');
     if (backdrop) backdrop.style.display = 'none';
@@ -1167,10 +1380,16 @@ function stagePill(stage){
     const fullTimeOpenButton = document.getElementById('quick-full-time-open');
     const countryOptions = document.getElementById('quick-country-options');
     if (!backdrop || !modal || !countryOptions) return;
+    // The fixture list only carries the running score; load the event
+    // timeline when an operator opens the match.
+    const fixtureId = String(button.dataset.fixtureId || '');
     let liveStats = [];
-    try { liveStats = JSON.parse(button.dataset.liveStats || '[]'); } catch (_) { liveStats = []; }
+    try {
+      const data = await fetchJSON(`/admin/fixtures/${encodeURIComponent(fixtureId)}/timeline`);
+      liveStats = Array.isArray(data?.live_stats) ? data.live_stats : [];
+    } catch (_) { liveStats = []; }
     quickAnnouncementFixture = {
-      id: String(button.dataset.fixtureId || ''),
+      id: fixtureId,
       home: String(button.dataset.home || ''),
       away: String(button.dataset.away || ''),
       stage: String(button.dataset.stage || ''),
@@ -1411,6 +1630,7 @@ function stagePill(stage){
         notify(data?.unchanged ? 'Full-time result already saved' : 'Full-time result posted', true);
         closeQuickAnnouncementModal();
         await loadDashboardLiveGames();
+        watchSettlement(data?.settlement);
       } catch (error) {
         if (status) status.textContent = `Unable to save result: ${error.message}`;
       } finally {
@@ -1422,6 +1642,8 @@ function stagePill(stage){
     const openButton = event.target.closest('.dashboard-quick-announce');
     if (openButton) openQuickAnnouncementModal(openButton);
     if (event.target.id === 'dashboard-live-refresh') loadDashboardLiveGames();
+    const retryButton = event.target.closest('.settlement-retry');
+    if (retryButton) retrySettlement(retryButton);
     if (
       event.target.id === 'quick-announce-close'
       || event.target.id === 'quick-announce-cancel'
@@ -1459,6 +1681,20 @@ function stagePill(stage){
     }
   });
 
+  // One-line summary of the slowest route by p95 from the launcher's request metrics.
+  function renderRouteLatency(metrics){
+    const el = qs('#route-latency-summary');
+    if (!el) return;
+    const routes = Object.entries(metrics?.routes || {}).filter(([, r]) => r && r.p95_ms != null);
+    if (!routes.length){
+      el.textContent = '';
+      return;
+    }
+    routes.sort((a, b) => b[1].p95_ms - a[1].p95_ms);
+    const [name, r] = routes[0];
+    el.textContent = `Slowest: ${name} p95 ${Math.round(r.p95_ms)} ms (${r.count} requests)`;
+  }
+
   function clearSystem(){
     ['mem-bar','cpu-bar','disk-bar'].forEach(id=>{
       const el = qs('#'+id); if(el) el.setAttribute('stroke-dasharray','0,125.66');
@@ -3535,7 +3771,7 @@ window.loadSplits = loadSplits;
 
         qs('#backup-all').onclick = async () => {
           try{
-            await fetchJSON('/api/backups/create', { method:'POST', body: JSON.stringify({}) });
+            await awaitJob(await fetchJSON('/api/backups/create', { method:'POST', body: JSON.stringify({}) }));
             notify('Backup created');
             await loadBackups();
           }catch(e){
@@ -3547,7 +3783,7 @@ window.loadSplits = loadSplits;
           try{
             if (!files[0]) return notify('No backups to restore', false);
             const latest = [...files].sort((a,b) => (b.mtime||b.ts||0) - (a.mtime||a.ts||0))[0];
-            await fetchJSON('/api/backups/restore', { method:'POST', body: JSON.stringify({ name: latest.name }) });
+            await awaitJob(await fetchJSON('/api/backups/restore', { method:'POST', body: JSON.stringify({ name: latest.name }) }));
             notify('Restored latest backup');
           }catch(e){
             notify(`Restore failed: ${e.message}`, false);
@@ -4242,7 +4478,7 @@ window.loadSplits = loadSplits;
               }
               setStatus('');
               try {
-                await fetchJSON('/admin/embed', {
+                await awaitJob(await fetchJSON('/admin/embed', {
                   method: 'POST',
                   body: JSON.stringify({
                     channel_id: channelId,
@@ -4257,7 +4493,7 @@ window.loadSplits = loadSplits;
                     color: (colorInput?.value || '').trim(),
                     content: (contentInput?.value || '').trim()
                   })
-                });
+                }));
                 notify('Embed sent');
               } catch (e) {
                 notify(`Failed to send embed: ${e.message}`, false);
@@ -4278,6 +4514,8 @@ window.loadSplits = loadSplits;
       }
     }
 
+    const LOG_VIEW_LINES = 2000;
+
     async function loadLogs(){
       if (!state.logsInit){
         buildLogsCard();
@@ -4305,7 +4543,14 @@ window.loadSplits = loadSplits;
             <button id="log-kind-health" class="btn btn-chip" data-kind="health">Health</button>
             <button id="log-kind-launcher" class="btn btn-chip" data-kind="launcher">Launcher</button>
           </div>
+          <select id="log-level" class="btn" aria-label="Minimum level">
+            <option value="">All levels</option>
+            <option value="INFO">Info+</option>
+            <option value="WARNING">Warning+</option>
+            <option value="ERROR">Error+</option>
+          </select>
           <button id="log-refresh" class="btn">Refresh</button>
+          <button id="log-live" class="btn">Live</button>
           <button id="log-clear" class="btn">Clear</button>
           <a id="log-download" class="btn" href="/api/log/bot/download">Download</a>
           <input id="log-search" type="text" placeholder="Search">
@@ -4333,40 +4578,100 @@ window.loadSplits = loadSplits;
           btn.classList.add('pill-ok');
           const a = document.getElementById('log-download');
           if (a) a.href = `/admin/log/${state.logsKind}/download`;
-          fetchAndRenderLogs();
+          resetLogView();
         });
       });
       const active = head.querySelector(`#log-kind-${state.logsKind}`);
       if (active) active.classList.add('pill-ok');
 
-      document.getElementById('log-refresh').addEventListener('click', fetchAndRenderLogs);
+      document.getElementById('log-refresh').addEventListener('click', () => fetchAndRenderLogs());
+      document.getElementById('log-level').addEventListener('change', resetLogView);
+      document.getElementById('log-live').addEventListener('click', () => {
+        if (state.logsStream) stopLogStream();
+        else startLogStream();
+      });
 
       document.getElementById('log-clear').addEventListener('click', async ()=>{
         try{
           await fetch(`/admin/log/${state.logsKind}/clear`, { method: 'POST' });
         }catch{}
-        fetchAndRenderLogs();
+        resetLogView();
       });
 
       document.getElementById('log-search').addEventListener('input', filterLogs);
     }
 
+    function logQuery(){
+      const params = new URLSearchParams();
+      const level = document.getElementById('log-level')?.value || '';
+      if (level) params.set('level', level);
+      if (state.logsCursor !== null) params.set('cursor', String(state.logsCursor));
+      return params.toString();
+    }
+
+    // Switching kind or level invalidates the cursor, so drop the cached
+    // window and reload (restarting the live tail if it was on).
+    function resetLogView(){
+      const live = !!state.logsStream;
+      stopLogStream();
+      state.logsLines = [];
+      state.logsCursor = null;
+      if (live) startLogStream();
+      else fetchAndRenderLogs();
+    }
+
+    function applyLogChunk(j){
+      const lines = Array.isArray(j.lines) ? j.lines : [];
+      if (typeof j.cursor === 'number') state.logsCursor = j.cursor;
+      if (j.reset || !state.logsLines.length){
+        state.logsLines = lines.slice(-LOG_VIEW_LINES);
+        renderLogLines(state.logsLines);
+      }else if (lines.length){
+        state.logsLines = state.logsLines.concat(lines).slice(-LOG_VIEW_LINES);
+        prependLogRows(lines);
+      }
+      filterLogs();
+    }
+
     async function fetchAndRenderLogs(){
       const tb = document.getElementById('log-tbody');
       if (!tb) return;
       try{
-        const lines = await fetchLogs(state.logsKind);
-        renderLogLines(lines);
-        filterLogs();
+        const j = await fetchLogs(state.logsKind);
+        if (state.logsCursor === null) j.reset = true;
+        applyLogChunk(j);
       }catch(e){
         tb.innerHTML = `<tr><td colspan="2" class="muted">Failed to load logs.</td></tr>`;
       }
     }
 
     async function fetchLogs(kind){
-      const r = await fetch(`/admin/log/${kind}`);
+      const qs = logQuery();
+      const r = await fetch(`/admin/log/${kind}${qs ? `?${qs}` : ''}`);
       const j = await r.json();
-      return Array.isArray(j.lines) ? j.lines : [];
+      if (!r.ok) throw new Error(j.error || `HTTP ${r.status}`);
+      return j;
+    }
+
+    function startLogStream(){
+      if (state.logsStream || typeof EventSource === 'undefined') return;
+      const qs = logQuery();
+      const es = new EventSource(`/admin/log/${state.logsKind}/stream${qs ? `?${qs}` : ''}`);
+      es.addEventListener('lines', (ev) => {
+        try{
+          applyLogChunk(JSON.parse(ev.data));
+        }catch{}
+      });
+      state.logsStream = es;
+      document.getElementById('log-live')?.classList.add('pill-ok');
+    }
+
+    function stopLogStream(){
+      if (state.logsStream){
+        state.logsStream.close();
+        state.logsStream = null;
+      }
+      document.getElementById('log-live')?.classList.remove('pill-ok');
     }
 
     
@@ -4405,6 +4710,17 @@ window.loadSplits = loadSplits;
       return [...lines].reverse();
     }
 
+    function logRow(raw){
+      const [time, msg] = splitTimeMsg(raw);
+      const tr = document.createElement('tr');
+      tr.dataset.text = raw.toLowerCase();
+      tr.innerHTML = `
+        <td class="mono">${escapeHTML(time)}</td>
+        <td class="mono">${escapeHTML(msg)}</td>
+      `;
+      return tr;
+    }
+
     function renderLogLines(lines){
       const tb = document.getElementById('log-tbody');
       tb.innerHTML = '';
@@ -4414,17 +4730,22 @@ window.loadSplits = loadSplits;
       }
       const ordered = orderLogLines(lines);
       for (const raw of ordered){
-        const [time, msg] = splitTimeMsg(raw);
-        const tr = document.createElement('tr');
-        tr.dataset.text = raw.toLowerCase();
-        tr.innerHTML = `
-          <td class="mono">${escapeHTML(time)}</td>
-          <td class="mono">${escapeHTML(msg)}</td>
-        `;
-        tb.appendChild(tr);
+        tb.appendChild(logRow(raw));
       }
     }
 
+    // New lines arrive oldest-first; the table shows newest-first.
+    function prependLogRows(lines){
+      const tb = document.getElementById('log-tbody');
+      if (!tb) return;
+      const placeholder = tb.querySelector('td.muted');
+      if (placeholder) tb.innerHTML = '';
+      const frag = document.createDocumentFragment();
+      for (let i = lines.length - 1; i >= 0; i--) frag.appendChild(logRow(lines[i]));
+      tb.insertBefore(frag, tb.firstChild);
+      while (tb.rows.length > LOG_VIEW_LINES) tb.deleteRow(tb.rows.length - 1);
+    }
+
     function filterLogs(){
       const q = (document.getElementById('log-search')?.value || '').trim().toLowerCase();
       document.querySelectorAll('#log-tbody tr').forEach(tr=>{
@@ -4760,9 +5081,16 @@ async function getCogStatus(name){
   function startTablesAutoRefresh(){
     if (tablesState.refreshTimer) return;
     // Poll while the Tables page is visible so goals submitted from the admin
-    // quick actions are reflected without a manual refresh.
-    tablesState.refreshTimer = setInterval(() => {
-      if (state.currentPage === 'tables') loadTables({ force: true });
+    // quick actions are reflected without a manual refresh. Ticks only reload
+    // when a fixture changed; every sixth one reloads anyway because the live
+    // window moves with the clock, not with the file.
+    const fixtures = watchChanges(['fixture']);
+    fixtures.prime();
+    let ticks = 0;
+    tablesState.refreshTimer = setInterval(async () => {
+      if (state.currentPage !== 'tables') return;
+      ticks += 1;
+      if (ticks % 6 === 0 || await fixtures.changed()) loadTables({ force: true });
     }, 10000);
   }
 
@@ -6830,17 +7158,12 @@ document.addEventListener('DOMContentLoaded', () => {
     return list;
   }
 
-  // --- Knockout auto-progression (Round of 16 onward) ---
-  // This computes derived bracket slot teams from prior match winners.
-  // Manual admin-edited slot values remain authoritative and are not overwritten.
   function parseMatchNumber(raw) {
     const text = String(raw || '').trim();
     if (!text) return null;
 
     if (/^\d{1,3}$/.test(text)) return Number(text);
     // Imported knockout fixtures may arrive as M73/W74 instead of plain 73.
-    // Accept those stable prefixes so browser-side auto-progression mirrors
-    // the server and updates the bracket immediately after a result is saved.
     const m = text.match(/^(?:match\s*#?\s*|[mw])(\d{1,3})$/i);
     if (!m) return null;
     return Number(m[1]);
@@ -6881,312 +7204,6 @@ document.addEventListener('DOMContentLoaded', () => {
     return '';
   }
 
-  function ensureSlotPath(slots, stage, side) {
-    if (!slots[stage] || typeof slots[stage] !== 'object') slots[stage] = {};
-    if (!slots[stage][side] || typeof slots[stage][side] !== 'object') slots[stage][side] = {};
-    return slots[stage][side];
-  }
-
-  function isUnresolvedSlotTeam(raw) {
-    // Slots often start life as "TBD". Treat that as unresolved so declared
-    // winners can flow into the next round when progression runs.
-    const text = String(raw || '').trim().toLowerCase();
-    return !text || text === 'tbd' || text === 'to be decided';
-  }
-
-  function autoProgressionSlots(fixtures, winnersMap, currentSlots) {
-    const byMatchNumber = new Map();
-    const fixturesById = new Map();
-    (Array.isArray(fixtures) ? fixtures : []).forEach((fixture) => {
-      const fid = String(fixture?.id || '').trim();
-      if (fid) fixturesById.set(fid, fixture);
-      // Some feeds use `id`, others may expose a separate match-number key.
-      const matchNo = parseMatchNumber(fixture?.id)
-        ?? parseMatchNumber(fixture?.match_id)
-        ?? parseMatchNumber(fixture?.match);
-      if (!Number.isFinite(matchNo)) return;
-      byMatchNumber.set(matchNo, fixture);
-    });
-
-    const targetMeta = {
-      89: { stage: 'Round of 16', side: 'left', slot: 1 },
-      90: { stage: 'Round of 16', side: 'left', slot: 2 },
-      91: { stage: 'Round of 16', side: 'right', slot: 1 },
-      92: { stage: 'Round of 16', side: 'right', slot: 2 },
-      93: { stage: 'Round of 16', side: 'left', slot: 3 },
-      94: { stage: 'Round of 16', side: 'left', slot: 4 },
-      95: { stage: 'Round of 16', side: 'right', slot: 3 },
-      96: { stage: 'Round of 16', side: 'right', slot: 4 },
-      97: { stage: 'Quarter-finals', side: 'left', slot: 1 },
-      98: { stage: 'Quarter-finals', side: 'left', slot: 2 },
-      99: { stage: 'Quarter-finals', side: 'right', slot: 1 },
-      100: { stage: 'Quarter-finals', side: 'right', slot: 2 },
-      101: { stage: 'Semi-finals', side: 'left', slot: 1 },
-      102: { stage: 'Semi-finals', side: 'right', slot: 1 },
-      103: { stage: 'Third Place Play-off', side: 'center', slot: 1 },
-      104: { stage: 'Final', side: 'center', slot: 1 },
-    };
-
-    const progression = [
-      { target: 89, homeFrom: 74, awayFrom: 77 },
-      { target: 90, homeFrom: 73, awayFrom: 75 },
-      { target: 91, homeFrom: 76, awayFrom: 78 },
-      { target: 92, homeFrom: 79, awayFrom: 80 },
-      { target: 93, homeFrom: 83, awayFrom: 84 },
-      { target: 94, homeFrom: 81, awayFrom: 82 },
-      { target: 95, homeFrom: 86, awayFrom: 88 },
-      { target: 96, homeFrom: 85, awayFrom: 87 },
-      { target: 97, homeFrom: 89, awayFrom: 90 },
-      { target: 98, homeFrom: 93, awayFrom: 94 },
-      { target: 99, homeFrom: 91, awayFrom: 92 },
-      { target: 100, homeFrom: 95, awayFrom: 96 },
-      { target: 101, homeFrom: 97, awayFrom: 98 },
-      { target: 102, homeFrom: 99, awayFrom: 100 },
-      // Third-place play-off takes semi-final losers.
-      { target: 103, homeLoserFrom: 101, awayLoserFrom: 102 },
-      { target: 104, homeFrom: 101, awayFrom: 102 },
-    ];
-
-    const winnerLoserTeams = (matchNo) => {
-      const fixture = byMatchNumber.get(matchNo);
-      if (!fixture) return { winner: '', loser: '' };
-      const side = winnerSideForFixture(fixture, winnersMap);
-      const home = String(fixture.home || '').trim();
-      const away = String(fixture.away || '').trim();
-      if (side === 'home') return { winner: home, loser: away };
-      if (side === 'away') return { winner: away, loser: home };
-      return { winner: '', loser: '' };
-    };
-
-    const merged = (currentSlots && typeof currentSlots === 'object')
-      ? JSON.parse(JSON.stringify(currentSlots))
-      : {};
-
-    progression.forEach((rule) => {
-      const meta = targetMeta[rule.target];
-      if (!meta) return;
-      const home = Number.isFinite(rule.homeFrom)
-        ? winnerLoserTeams(rule.homeFrom).winner
-        : (Number.isFinite(rule.homeLoserFrom) ? winnerLoserTeams(rule.homeLoserFrom).loser : '');
-      const away = Number.isFinite(rule.awayFrom)
-        ? winnerLoserTeams(rule.awayFrom).winner
-        : (Number.isFinite(rule.awayLoserFrom) ? winnerLoserTeams(rule.awayLoserFrom).loser : '');
-      if (!home && !away) return;
-      const sideSlots = ensureSlotPath(merged, meta.stage, meta.side);
-      const key = String(meta.slot);
-      const existing = (sideSlots[key] && typeof sideSlots[key] === 'object') ? sideSlots[key] : {};
-      const targetFixture = byMatchNumber.get(rule.target);
-      const canonicalMatchId = String(targetFixture?.id || '').trim();
-      const existingMatchId = String(existing.match_id || existing.matchId || '').trim();
-
-      // Preserve manual/admin-authored values when present; only fill blanks.
-      const nextSlot = {
-        ...existing,
-        home: isUnresolvedSlotTeam(existing.home) ? (home || '') : String(existing.home || '').trim(),
-        away: isUnresolvedSlotTeam(existing.away) ? (away || '') : String(existing.away || '').trim(),
-      };
-      // Only stamp match_id when we can align to a known fixture ID format.
-      // Avoid synthetic "Match N" IDs because stage lookup uses exact fixture.id.
-      if (existingMatchId) {
-        nextSlot.match_id = existingMatchId;
-      } else if (canonicalMatchId) {
-        nextSlot.match_id = canonicalMatchId;
-      }
-      sideSlots[key] = nextSlot;
-    });
-
-    // Fallback progression by bracket structure (stage/side/slot) so environments
-    // that use non-numeric fixture IDs can still advance teams.
-    const slotRules = [
-      // Round of 32 -> Round of 16 (left)
-      { from: ['Round of 32', 'left', 1, 'winner'], to: ['Round of 16', 'left', 1, 'home'] },
-      { from: ['Round of 32', 'left', 2, 'winner'], to: ['Round of 16', 'left', 1, 'away'] },
-      { from: ['Round of 32', 'left', 3, 'winner'], to: ['Round of 16', 'left', 2, 'home'] },
-      { from: ['Round of 32', 'left', 4, 'winner'], to: ['Round of 16', 'left', 2, 'away'] },
-      { from: ['Round of 32', 'left', 5, 'winner'], to: ['Round of 16', 'left', 3, 'home'] },
-      { from: ['Round of 32', 'left', 6, 'winner'], to: ['Round of 16', 'left', 3, 'away'] },
-      { from: ['Round of 32', 'left', 7, 'winner'], to: ['Round of 16', 'left', 4, 'home'] },
-      { from: ['Round of 32', 'left', 8, 'winner'], to: ['Round of 16', 'left', 4, 'away'] },
-      // Round of 32 -> Round of 16 (right)
-      { from: ['Round of 32', 'right', 1, 'winner'], to: ['Round of 16', 'right', 1, 'home'] },
-      { from: ['Round of 32', 'right', 2, 'winner'], to: ['Round of 16', 'right', 1, 'away'] },
-      { from: ['Round of 32', 'right', 3, 'winner'], to: ['Round of 16', 'right', 2, 'home'] },
-      { from: ['Round of 32', 'right', 4, 'winner'], to: ['Round of 16', 'right', 2, 'away'] },
-      { from: ['Round of 32', 'right', 5, 'winner'], to: ['Round of 16', 'right', 3, 'home'] },
-      { from: ['Round of 32', 'right', 6, 'winner'], to: ['Round of 16', 'right', 3, 'away'] },
-      { from: ['Round of 32', 'right', 7, 'winner'], to: ['Round of 16', 'right', 4, 'home'] },
-      { from: ['Round of 32', 'right', 8, 'winner'], to: ['Round of 16', 'right', 4, 'away'] },
-      // Round of 16 -> Quarter-finals
-      { from: ['Round of 16', 'left', 1, 'winner'], to: ['Quarter-finals', 'left', 1, 'home'] },
-      { from: ['Round of 16', 'left', 2, 'winner'], to: ['Quarter-finals', 'left', 1, 'away'] },
-      { from: ['Round of 16', 'left', 3, 'winner'], to: ['Quarter-finals', 'left', 2, 'home'] },
-      { from: ['Round of 16', 'left', 4, 'winner'], to: ['Quarter-finals', 'left', 2, 'away'] },
-      { from: ['Round of 16', 'right', 1, 'winner'], to: ['Quarter-finals', 'right', 1, 'home'] },
-      { from: ['Round of 16', 'right', 2, 'winner'], to: ['Quarter-finals', 'right', 1, 'away'] },
-      { from: ['Round of 16', 'right', 3, 'winner'], to: ['Quarter-finals', 'right', 2, 'home'] },
-      { from: ['Round of 16', 'right', 4, 'winner'], to: ['Quarter-finals', 'right', 2, 'away'] },
-      // Quarter-finals -> Semi-finals
-      { from: ['Quarter-finals', 'left', 1, 'winner'], to: ['Semi-finals', 'left', 1, 'home'] },
-      { from: ['Quarter-finals', 'left', 2, 'winner'], to: ['Semi-finals', 'left', 1, 'away'] },
-      { from: ['Quarter-finals', 'right', 1, 'winner'], to: ['Semi-finals', 'right', 1, 'home'] },
-      { from: ['Quarter-finals', 'right', 2, 'winner'], to: ['Semi-finals', 'right', 1, 'away'] },
-      // Semi-finals -> Final + Third Place
-      { from: ['Semi-finals', 'left', 1, 'winner'], to: ['Final', 'center', 1, 'home'] },
-      { from: ['Semi-finals', 'right', 1, 'winner'], to: ['Final', 'center', 1, 'away'] },
-      { from: ['Semi-finals', 'left', 1, 'loser'], to: ['Third Place Play-off', 'center', 1, 'home'] },
-      { from: ['Semi-finals', 'right', 1, 'loser'], to: ['Third Place Play-off', 'center', 1, 'away'] },
-    ];
-
-    const slotFixture = (stage, side, slot) => {
-      const cfg = merged?.[stage]?.[side]?.[String(slot)] || {};
-      const matchId = String(cfg.match_id || cfg.matchId || '').trim();
-      if (matchId && fixturesById.has(matchId)) return fixturesById.get(matchId);
-      const expectedStage = normalizeStage(stage) || stage;
-      const teamA = String(cfg.home || '').trim();
-      const teamB = String(cfg.away || '').trim();
-      return (Array.isArray(fixtures) ? fixtures : []).find((f) => {
-        if (!f || normalizeStage(f.stage || '') !== expectedStage) return false;
-        if (Number(f.bracket_slot) !== Number(slot)) return false;
-        if (teamA && teamB) {
-          const fh = String(f.home || '').trim();
-          const fa = String(f.away || '').trim();
-          return (fh === teamA && fa === teamB) || (fh === teamB && fa === teamA);
-        }
-        return true;
-      }) || null;
-    };
-
-    const slotTeam = (stage, side, slot, kind) => {
-      const fx = slotFixture(stage, side, slot);
-      if (!fx) return '';
-      const winner = winnerSideForFixture(fx, winnersMap);
-      const home = String(fx.home || '').trim();
-      const away = String(fx.away || '').trim();
-      if (winner === 'home') return kind === 'winner' ? home : away;
-      if (winner === 'away') return kind === 'winner' ? away : home;
-      return '';
-    };
-
-    slotRules.forEach((rule) => {
-      const [fs, fside, fslot, fkind] = rule.from;
-      const [ts, tside, tslot, pos] = rule.to;
-      const team = slotTeam(fs, fside, fslot, fkind);
-      if (!team) return;
-      const sideSlots = ensureSlotPath(merged, ts, tside);
-      const slotKey = String(tslot);
-      const existing = (sideSlots[slotKey] && typeof sideSlots[slotKey] === 'object') ? sideSlots[slotKey] : {};
-      const next = { ...existing };
-      if (pos === 'home' && isUnresolvedSlotTeam(existing.home)) next.home = team;
-      if (pos === 'away' && isUnresolvedSlotTeam(existing.away)) next.away = team;
-      sideSlots[slotKey] = next;
-    });
-
-    return merged;
-  }
-
-
-  function matchNumberFromSlotEntry(entry) {
-    // Complex imported fixture IDs (for example BRKT-R16-L1-W74-W77) are
-    // valuable stable IDs but are not themselves match numbers. Keep trying
-    // later fields so an entry can pair that ID with a parseable label (M89).
-    for (const field of ['match_id', 'matchId', 'id', 'label']) {
-      const matchNo = parseMatchNumber(entry?.[field]);
-      if (Number.isFinite(matchNo)) return matchNo;
-    }
-    return null;
-  }
-
-  function cloneSlotEntry(entry) {
-    return entry && typeof entry === 'object' ? { ...entry } : null;
-  }
-
-  function officialSlotEntry(slots, stage, matchNo) {
-    const stageSlots = slots?.[stage];
-    if (!stageSlots || typeof stageSlots !== 'object') return null;
-    for (const side of ['left', 'right', 'center']) {
-      const sideSlots = stageSlots[side];
-      if (!sideSlots || typeof sideSlots !== 'object') continue;
-      for (const entry of Object.values(sideSlots)) {
-        if (matchNumberFromSlotEntry(entry) === matchNo) return cloneSlotEntry(entry);
-      }
-    }
-    return null;
-  }
-
-  const OFFICIAL_KNOCKOUT_FEEDERS = {
-    89: [74, 77], 90: [73, 75], 91: [76, 78], 92: [79, 80],
-    93: [83, 84], 94: [81, 82], 95: [86, 88], 96: [85, 87],
-    97: [89, 90], 98: [93, 94], 99: [91, 92], 100: [95, 96],
-    101: [97, 98], 102: [99, 100],
-  };
-
-  function winnerPlaceholderNumber(raw) {
-    const m = String(raw || '').trim().match(/^W(?:inner)?\s*(\d{1,3})$/i);
-    return m ? Number(m[1]) : null;
-  }
-
-  function slotEntryMatchesFeeders(entry, matchNo) {
-    const feeders = OFFICIAL_KNOCKOUT_FEEDERS[matchNo];
-    if (!entry || !feeders) return true;
-    const homeNo = winnerPlaceholderNumber(entry.home || entry.country_a);
-    const awayNo = winnerPlaceholderNumber(entry.away || entry.country_b);
-    // Admin-entered country names cannot be inferred here, so preserve them.
-    // Winner placeholders, however, are machine-readable and must match FIFA's
-    // feeder matches before old saved data is allowed to populate this slot.
-    if (Number.isFinite(homeNo) && homeNo !== feeders[0]) return false;
-    if (Number.isFinite(awayNo) && awayNo !== feeders[1]) return false;
-    return true;
-  }
-
-  function defaultOfficialSlot(matchNo) {
-    const feeders = OFFICIAL_KNOCKOUT_FEEDERS[matchNo] || [];
-    return {
-      match_id: String(matchNo),
-      home: feeders[0] ? `W${feeders[0]}` : '',
-      away: feeders[1] ? `W${feeders[1]}` : '',
-    };
-  }
-
-  function buildOfficialSideSlots(slots, stage, side, matchNumbers) {
-    const existing = slots?.[stage]?.[side];
-    const out = {};
-    matchNumbers.forEach((matchNo, idx) => {
-      const slotKey = String(idx + 1);
-      const direct = officialSlotEntry(slots, stage, matchNo);
-      const fallback = cloneSlotEntry(existing?.[slotKey]);
-      const entry = direct || (slotEntryMatchesFeeders(fallback, matchNo) ? fallback : null) || defaultOfficialSlot(matchNo);
-      const savedMatchId = String(entry?.match_id || entry?.matchId || '').trim();
-      // Preserve real imported fixture IDs so stageMatches can find the exact
-      // matches.json fixture instead of falling back to a synthetic card.
-      out[slotKey] = { ...entry, match_id: savedMatchId || String(matchNo) };
-    });
-    return out;
-  }
-
-  function alignSlotsToOfficialPathways(slots) {
-    if (!slots || typeof slots !== 'object') return slots;
-    const aligned = JSON.parse(JSON.stringify(slots));
-    // FIFA's 2026 bracket keeps M89/M90 with M93/M94 in one half and
-    // M91/M92 with M95/M96 in the other. Older saved slot data put M91/M92
-    // on the left, which made the visible Knockout Pathways table inaccurate.
-    aligned['Round of 16'] = {
-      ...(aligned['Round of 16'] || {}),
-      left: buildOfficialSideSlots(slots, 'Round of 16', 'left', [89, 90, 93, 94]),
-      right: buildOfficialSideSlots(slots, 'Round of 16', 'right', [91, 92, 95, 96]),
-    };
-    aligned['Quarter-finals'] = {
-      ...(aligned['Quarter-finals'] || {}),
-      left: buildOfficialSideSlots(slots, 'Quarter-finals', 'left', [97, 98]),
-      right: buildOfficialSideSlots(slots, 'Quarter-finals', 'right', [99, 100]),
-    };
-    aligned['Semi-finals'] = {
-      ...(aligned['Semi-finals'] || {}),
-      left: buildOfficialSideSlots(slots, 'Semi-finals', 'left', [101]),
-      right: buildOfficialSideSlots(slots, 'Semi-finals', 'right', [102]),
-    };
-    return aligned;
-  }
-
   function bracketTeamMarkup(name, isoByName, explicitIso = ''){
     const label = String(name || 'TBD').trim() || 'TBD';
     // Resolve bracket flags from fixture ISO fields first, then from /api/team_iso
@@ -7310,9 +7327,8 @@ document.addEventListener('DOMContentLoaded', () => {
     host.appendChild(svg);
   }
 
-  function renderBracket(host, fixtures, slots, isoByName = {}){
+  function renderBracket(host, fixtures, displaySlots, isoByName = {}){
     if (!host) return;
-    const displaySlots = alignSlotsToOfficialPathways(slots);
     const r32Slots = displaySlots?.['Round of 32'];
     const r16Slots = displaySlots?.['Round of 16'];
     const qfSlots = displaySlots?.['Quarter-finals'];
@@ -7444,7 +7460,8 @@ document.addEventListener('DOMContentLoaded', () => {
         fetchJSON('/api/fixtures?include_results=1'),
         fetchJSON('/api/team_stage'),
         fetchJSON('/api/fanzone/winners'),
-        fetchJSON('/api/bracket_slots'),
+        // Knockout slots come resolved from the server's bracket model.
+        fetchJSON('/api/bracket'),
         fetchJSON('/api/team_iso'),
         fetchJSON('/api/team_meta')
       ]);
@@ -7513,8 +7530,7 @@ document.addEventListener('DOMContentLoaded', () => {
     updateResultsView();
     ensureSummaryToggle();
     ensureResultsToggle();
-    const resolvedSlots = autoProgressionSlots(fixtures, winners, bracketSlots);
-    renderBracket(bracketHost, fixtures, resolvedSlots, isoByName);
+    renderBracket(bracketHost, fixtures, bracketSlots, isoByName);
     updateFixturesTimes();
   }
 
@@ -7655,7 +7671,7 @@ document.addEventListener('DOMContentLoaded', () => {
     }
 
     try {
-      await fetchJSON('/admin/fixtures/result', {
+      const data = await fetchJSON('/admin/fixtures/result', {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({
@@ -7668,6 +7684,7 @@ document.addEventListener('DOMContentLoaded', () => {
       notify('Result saved', true);
       closeResultModal();
       loadFixtures();
+      window.watchSettlement?.(data?.settlement);
     } catch (err) {
       notify(`Failed to save result: ${err.message || err}`, false);
     }
@@ -7908,11 +7925,12 @@ document.addEventListener('DOMContentLoaded', () => {
       utc: utcValue || '',
     };
     try {
-      await fetchJSON('/admin/bracket_slots', {
+      const saved = await fetchJSON('/admin/bracket_slots', {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify(payload)
       });
+      await window.awaitJob?.(saved);
       notify('Bracket slot updated', true);
       closeSlotModal();
       clearSlotForm();
@@ -508,7 +508,8 @@
 }
 
     async function jgetAuth(url){
-        const r = await fetch(url, { credentials: 'include', cache: 'no-store' });
+        // no-cache (not no-store) lets endpoints with an ETag answer 304.
+        const r = await fetch(url, { credentials: 'include', cache: 'no-cache' });
         if(!r.ok) throw new Error(`GET ${url} ${r.status}`);
      return r.json();
     }
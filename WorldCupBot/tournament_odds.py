@@ -0,0 +1,357 @@
+"""Monte Carlo odds for the rest of the tournament.
+
+``Tournament`` holds what is known: the group tables built from the results
+saved so far, the group fixtures still to play, a strength rating per team
+and the knockout matches whose teams or winners are already known.
+``simulate`` plays the rest of the tournament many times. It returns, for
+each team, the share of runs in which it reached each stage.
+
+Nothing loops per simulation. Every run is a row of NumPy arrays:
+
+- Group matches draw Poisson goals from the two ratings. Each team's table
+  position is a single integer key that follows ``_build_standings``
+  (points, goal difference, goals, then the table's fixed tiebreak); the
+  effect of every score on that key is looked up and summed over the
+  fixtures with one matrix product per side.
+- The best third-placed teams are matched to their round-of-32 slots. The
+  lookup table for this is built once per bracket, with one row for each
+  possible set of qualifying groups.
+- Knockout matches are resolved in bracket order (``bracket_graph``), one
+  vectorised coin flip per match weighted by the Elo win expectancy.
+
+Results are cached by a fingerprint of the inputs. Saving a result or
+editing ratings gives a new fingerprint, while unrelated edits to
+matches.json (kickoff times, live stats) reuse the cached run. The random
+seed comes from the fingerprint, so the same state always gives the same
+odds.
+"""
+import collections
+import functools
+import hashlib
+import itertools
+import threading
+import time
+
+import numpy as np
+
+import json_codec
+
+SIMULATIONS = 100_000
+# Simulations per batch; bounds the size of the intermediate arrays.
+CHUNK = 25_000
+DEFAULT_RATING = 1500.0
+# Mean goals per team in an even match, and the rating gap that multiplies
+# the stronger side's expected goals by ten relative to the weaker side's.
+AVG_GOALS = 1.35
+GOAL_SCALE = 800.0
+# Goals per team are capped here; the chance of more is negligible.
+MAX_GOALS = 10
+GOAL_BUCKETS = 4096
+# Fingerprints whose results are kept.
+KEEP = 8
+
+_PTS, _GD, _GF = 1 << 24, 1 << 16, 1 << 8
+
+STAGES = ("Round of 32", "Round of 16", "Quarter-finals", "Semi-finals", "Final", "Winner")
+
+
+class Tournament:
+    """Inputs of a simulation.
+
+    ``groups`` maps each group letter to its teams as ``{"team", "pts", "gd",
+    "gf", "tiebreak"}`` (lower ``tiebreak`` ranks higher when everything else
+    is level). ``remaining`` lists the group fixtures still to play as
+    ``(home, away)``. ``knockout`` maps a match number to the ``home``,
+    ``away`` and ``winner`` already known for it; unknown teams are skipped.
+    """
+
+    def __init__(self, groups: dict, remaining, ratings: dict, graph, knockout: dict | None = None):
+        sizes = {len(rows) for rows in groups.values()}
+        if not groups or len(sizes) != 1 or sizes.pop() < 3:
+            raise ValueError("every group needs the same number of teams (at least three)")
+        self.groups = dict(sorted(groups.items()))
+        self.graph = graph
+        self.teams = [row["team"] for rows in self.groups.values() for row in rows]
+        self.index = {team: i for i, team in enumerate(self.teams)}
+        self.group_of = {row["team"]: group for group, rows in self.groups.items() for row in rows}
+        self.remaining = [
+            (home, away) for home, away in remaining
+            if home in self.index and away in self.index and self.group_of[home] == self.group_of[away]
+        ]
+        self.ratings = {team: float(ratings.get(team, DEFAULT_RATING)) for team in self.teams}
+        self.knockout = {
+            int(number): {key: state.get(key) for key in ("home", "away", "winner") if state.get(key) in self.index}
+            for number, state in (knockout or {}).items()
+            if int(number) in graph.nodes
+        }
+        letters = set(self.groups)
+        for node in graph.nodes.values():
+            for place, eligible in node.seeds.values():
+                if not set(eligible) <= letters:
+                    raise ValueError(f"match {node.match} is seeded from a group that has no table")
+
+    def fingerprint(self, simulations: int) -> str:
+        state = {
+            "simulations": simulations,
+            "groups": self.groups,
+            "remaining": self.remaining,
+            "ratings": self.ratings,
+            "knockout": self.knockout,
+            "bracket": [
+                (number, sorted(node.feeds.items()), sorted(node.seeds.items()))
+                for number, node in sorted(self.graph.nodes.items())
+            ],
+            "model": (AVG_GOALS, GOAL_SCALE),
+        }
+        return hashlib.blake2b(json_codec.dumps(state), digest_size=12).hexdigest()
+
+
+@functools.lru_cache(maxsize=4)
+def _third_place_table(n_groups: int, slots: tuple) -> np.ndarray:
+    """Group assigned to each third-place slot, for every set of qualifying groups (as a bitmask)."""
+    table = np.zeros((1 << n_groups, len(slots)), dtype=np.int64)
+    for combo in itertools.combinations(range(n_groups), len(slots)):
+        mask = sum(1 << g for g in combo)
+        table[mask] = _assign_thirds(combo, slots)
+    return table
+
+
+def _assign_thirds(combo, slots) -> list[int]:
+    # Fill the most constrained slot first; every set FIFA allows has a match.
+    order = sorted(range(len(slots)), key=lambda k: len(set(slots[k]) & set(combo)))
+    chosen = [None] * len(slots)
+
+    def place(i, free):
+        if i == len(order):
+            return True
+        k = order[i]
+        for group in sorted(free & set(slots[k])):
+            chosen[k] = group
+            if place(i + 1, free - {group}):
+                return True
+        return False
+
+    if not place(0, set(combo)):
+        return list(combo)
+    return chosen
+
+
+def _goal_table(lam) -> np.ndarray:
+    """Goals for each of ``GOAL_BUCKETS`` equal slices of the Poisson CDF, one row per expected-goals value.
+
+    Sampling a goal count is then one random bucket and one lookup. Each
+    bucket takes the count at its midpoint, so every probability is within
+    half a bucket of the exact Poisson value.
+    """
+    k = np.arange(MAX_GOALS)
+    log_pmf = -lam[:, None] + k[None, :] * np.log(lam)[:, None] - np.cumsum(np.log(np.maximum(k, 1)))[None, :]
+    cdf = np.cumsum(np.exp(log_pmf), axis=1)
+    midpoints = (np.arange(GOAL_BUCKETS) + 0.5) / GOAL_BUCKETS
+    return (cdf[:, None, :] < midpoints[None, :, None]).sum(axis=2).astype(np.int16)
+
+
+def _goals(rng, table, c) -> np.ndarray:
+    # 12 random bits per draw; Generator.poisson is several times slower.
+    buckets = np.frombuffer(rng.bytes(2 * c * table.shape[0]), dtype=np.uint16).reshape(c, -1) >> 4
+    return table.ravel()[buckets + np.arange(table.shape[0], dtype=np.int32) * GOAL_BUCKETS]
+
+
+def _win_probability(home_rating, away_rating):
+    return 1.0 / (1.0 + np.power(10.0, (away_rating - home_rating) / 400.0))
+
+
+def simulate(tournament: Tournament, simulations: int = SIMULATIONS, seed: int | None = None) -> dict:
+    """Stage-reach probabilities per team over ``simulations`` runs."""
+    t = tournament
+    rng = np.random.default_rng(seed)
+    n_teams = len(t.teams)
+    letters = list(t.groups)
+    group_size = len(t.groups[letters[0]])
+    # One extra "unknown team" column absorbs slots no simulated team fills.
+    sink = n_teams
+    rating = np.array([t.ratings[team] for team in t.teams] + [DEFAULT_RATING])
+    rows = [row for group in letters for row in t.groups[group]]
+    tiebreak = np.argsort(np.argsort([row["tiebreak"] for row in rows], kind="stable"), kind="stable")
+    # Table order as one number: points, goal difference, goals scored and the
+    # fixed tiebreak each get a byte. A result adds to the first three
+    # linearly, so a batch of fixtures is one matrix product per side.
+    base_key = np.array(
+        [row["pts"] * _PTS + row["gd"] * _GD + row["gf"] * _GF for row in rows], dtype=np.float64
+    ) + (255 - tiebreak)
+    goals = np.arange(MAX_GOALS + 1)
+    scored, conceded = np.meshgrid(goals, goals, indexing="ij")
+    points = np.where(scored > conceded, 3, np.where(scored == conceded, 1, 0))
+    # Indexed by the score: home goals * (MAX_GOALS + 1) + away goals.
+    home_delta = (points * _PTS + (scored - conceded) * _GD + scored * _GF).ravel().astype(np.float64)
+    away_delta = (points.T * _PTS + (conceded - scored) * _GD + conceded * _GF).ravel().astype(np.float64)
+
+    m = len(t.remaining)
+    home_idx = np.array([t.index[home] for home, _ in t.remaining], dtype=np.int64)
+    away_idx = np.array([t.index[away] for _, away in t.remaining], dtype=np.int64)
+    home_incidence = np.zeros((m, n_teams))
+    home_incidence[np.arange(m), home_idx] = 1.0
+    away_incidence = np.zeros((m, n_teams))
+    away_incidence[np.arange(m), away_idx] = 1.0
+    win_matrix = _win_probability(rating[:, None], rating[None, :])
+    gap = rating[home_idx] - rating[away_idx]
+    # Home goals are stored pre-multiplied so the two draws add up to the score index.
+    home_goals = _goal_table(AVG_GOALS * np.power(10.0, gap / (2 * GOAL_SCALE))) * (MAX_GOALS + 1)
+    away_goals = _goal_table(AVG_GOALS * np.power(10.0, -gap / (2 * GOAL_SCALE)))
+
+    third_slots = [
+        (number, position, eligible)
+        for number in t.graph.order
+        for position, (place, eligible) in sorted(t.graph.nodes[number].seeds.items())
+        if place == 3
+    ]
+    table = _third_place_table(len(letters), tuple(tuple(letters.index(g) for g in eligible) for _, _, eligible in third_slots))
+    third_slot_of = {(number, position): k for k, (number, position, _) in enumerate(third_slots)}
+
+    stage_counts = np.zeros((len(STAGES), n_teams + 1), dtype=np.int64)
+    group_winner = np.zeros(n_teams + 1, dtype=np.int64)
+    stage_row = {stage: i for i, stage in enumerate(STAGES)}
+    final_match = next((n for n in reversed(t.graph.order) if t.graph.nodes[n].stage == "Final"), None)
+
+    done = 0
+    while done < simulations:
+        c = min(CHUNK, simulations - done)
+        done += c
+        if m:
+            score = _goals(rng, home_goals, c) + _goals(rng, away_goals, c)
+            key = base_key + home_delta[score] @ home_incidence + away_delta[score] @ away_incidence
+        else:
+            key = np.broadcast_to(base_key, (c, n_teams))
+        key = key.reshape(c, len(letters), group_size)
+        order = np.argsort(-key, axis=2, kind="stable")
+        placed = order + (np.arange(len(letters)) * group_size)[None, :, None]
+        group_winner += np.bincount(placed[:, :, 0].ravel(), minlength=n_teams + 1)
+
+        if third_slots:
+            third_keys = np.take_along_axis(key, order[:, :, 2:3], axis=2)[:, :, 0]
+            best = np.argsort(-third_keys, axis=1, kind="stable")[:, :len(third_slots)]
+            masks = np.bitwise_or.reduce(np.left_shift(1, best), axis=1)
+            thirds = np.take_along_axis(placed[:, :, 2], table[masks], axis=1)
+            # A third-placed team already drawn into a slot swaps with the
+            # team the computed matching put there, so nobody plays twice.
+            for (number, position), k in third_slot_of.items():
+                team = t.knockout.get(number, {}).get(position)
+                if team is not None:
+                    thirds = np.where(thirds == t.index[team], thirds[:, k:k + 1], thirds)
+                    thirds[:, k] = t.index[team]
+
+        winners, losers = {}, {}
+        for number in t.graph.order:
+            node = t.graph.nodes[number]
+            known = t.knockout.get(number, {})
+            sides = []
+            for position in ("home", "away"):
+                if position in known:
+                    team = np.full(c, t.index[known[position]], dtype=np.int64)
+                elif position in node.feeds:
+                    outcome, feeder = node.feeds[position]
+                    team = (winners if outcome == "W" else losers)[feeder]
+                elif position in node.seeds:
+                    place, eligible = node.seeds[position]
+                    if place == 3:
+                        team = thirds[:, third_slot_of[(number, position)]]
+                    else:
+                        team = placed[:, letters.index(eligible[0]), place - 1]
+                else:
+                    team = np.full(c, sink, dtype=np.int64)
+                sides.append(team)
+            home, away = sides
+            if "winner" in known:
+                winner = np.full(c, t.index[known["winner"]], dtype=np.int64)
+                loser = np.where(winner == home, away, home)
+            else:
+                home_wins = rng.random(c) < win_matrix[home, away]
+                winner = np.where(home_wins, home, away)
+                loser = np.where(home_wins, away, home)
+            winners[number], losers[number] = winner, loser
+            row = stage_row.get(node.stage)
+            if row is not None:
+                stage_counts[row] += np.bincount(home, minlength=n_teams + 1) + np.bincount(away, minlength=n_teams + 1)
+            if number == final_match:
+                stage_counts[stage_row["Winner"]] += np.bincount(winner, minlength=n_teams + 1)
+
+    teams = []
+    for i, team in enumerate(t.teams):
+        teams.append({
+            "team": team,
+            "group": t.group_of[team],
+            "rating": t.ratings[team],
+            "group_winner": round(float(group_winner[i]) / simulations, 4),
+            "stages": {stage: round(float(stage_counts[row, i]) / simulations, 4) for stage, row in stage_row.items()},
+        })
+    teams.sort(key=lambda item: tuple(-item["stages"][stage] for stage in reversed(STAGES)) + (item["team"],))
+    return {"simulations": simulations, "teams": teams}
+
+
+def owner_outcomes(result: dict, ownership) -> list[dict]:
+    """Per-owner totals over their teams, weighted by ownership share.
+
+    ``ownership`` is an ``ownership_index.OwnershipIndex``. ``champion`` is
+    the chance that one of the owner's teams wins the tournament; the
+    ``expected`` stage counts weight each team by the owner's share of it.
+    """
+    by_fold = {item["team"].casefold(): item for item in result["teams"]}
+    owners: dict[str, dict] = {}
+    for rec in ownership.teams.values():
+        odds = by_fold.get(rec.team.casefold())
+        owner_ids = rec.owner_ids
+        if odds is None or not owner_ids:
+            continue
+        for uid in owner_ids:
+            try:
+                share = float(rec.percentages[uid]) / 100 if uid in rec.percentages else 1 / len(owner_ids)
+            except (TypeError, ValueError):
+                share = 1 / len(owner_ids)
+            out = owners.setdefault(uid, {
+                "owner_id": uid,
+                "username": ownership.player_names.get(uid, uid),
+                "teams": [],
+                "champion": 0.0,
+                "expected": dict.fromkeys(STAGES, 0.0),
+            })
+            out["teams"].append({"team": odds["team"], "share": round(share, 4)})
+            out["champion"] += odds["stages"]["Winner"]
+            for stage in STAGES:
+                out["expected"][stage] += share * odds["stages"][stage]
+    rows = sorted(owners.values(), key=lambda row: (-row["champion"], row["username"].casefold()))
+    for row in rows:
+        row["champion"] = round(row["champion"], 4)
+        row["expected"] = {stage: round(value, 4) for stage, value in row["expected"].items()}
+    return rows
+
+
+_cache: collections.OrderedDict = collections.OrderedDict()
+_lock = threading.Lock()
+# Held while a run is computed, so concurrent requests for one state share it.
+_run_lock = threading.Lock()
+stats = {"hits": 0, "misses": 0}
+
+
+def cache_stats() -> dict:
+    return {**stats, "size": len(_cache)}
+
+
+def run(tournament: Tournament, simulations: int = SIMULATIONS) -> dict:
+    """``simulate`` for ``tournament``, cached by fingerprint."""
+    fingerprint = tournament.fingerprint(simulations)
+    with _run_lock:
+        with _lock:
+            hit = _cache.get(fingerprint)
+            if hit is not None:
+                _cache.move_to_end(fingerprint)
+                stats["hits"] += 1
+                return hit
+            stats["misses"] += 1
+        started = time.perf_counter()
+        result = simulate(tournament, simulations, seed=int(fingerprint[:16], 16))
+        result["fingerprint"] = fingerprint
+        result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        with _lock:
+            _cache[fingerprint] = result
+            while len(_cache) > KEEP:
+                _cache.popitem(last=False)
+    return result
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""Compare JSON backends and on-disk formats on synthetic tournament data.
+
+For each document this times serialize/parse and reports the file size for
+the previous format (stdlib, indent=2) and the compact format on every
+available backend of json_codec.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "WorldCupBot"))
+
+import json_codec  # noqa: E402
+
+TEAMS = [f"Team {i:02d}" for i in range(48)]
+STAGES = ["Group Stage", "Round of 32", "Round of 16", "Quarter-finals", "Semi-finals", "Final"]
+
+
+def _uid(rng):
+    return str(rng.randrange(10 ** 17, 10 ** 18))
+
+
+def make_matches(rng, count):
+    matches = []
+    for i in range(count):
+        home, away = rng.sample(TEAMS, 2)
+        events = [{
+            "minute": rng.randrange(1, 95),
+            "type": rng.choice(["goal", "yellow", "red", "sub", "var"]),
+            "team": rng.choice([home, away]),
+            "player": f"Player {rng.randrange(1, 27)}",
+            "note": "Synthetic event",
+        } for _ in range(rng.randrange(10, 40))]
+        matches.append({
+            "id": f"m{i + 1}",
+            "home": home,
+            "away": away,
+            "utc": f"2026-06-{11 + i % 20:02d}T{12 + i % 9:02d}:00:00Z",
+            "stage": STAGES[min(i // 72, len(STAGES) - 1)],
+            "group": chr(ord("A") + i % 12),
+            "stadium": "Synthetic Stadium",
+            "home_score": rng.randrange(0, 5),
+            "away_score": rng.randrange(0, 5),
+            "live_stats": {
+                "possession": [rng.randrange(30, 70), None],
+                "shots": [rng.randrange(0, 25), rng.randrange(0, 25)],
+                "xg": [round(rng.random() * 3, 2), round(rng.random() * 3, 2)],
+                "events": events,
+            },
+        })
+    return matches
+
+
+def make_fan_votes(rng, fixtures, voters):
+    users = [_uid(rng) for _ in range(voters)]
+    return {"fixtures": {
+        f"m{i + 1}": {"votes": {uid: rng.choice(["home", "away", "draw"]) for uid in rng.sample(users, voters // 2)}}
+        for i in range(fixtures)
+    }}
+
+
+def make_audit_log(rng, count):
+    return [{
+        "id": f"{rng.getrandbits(128):032x}",
+        "timestamp": f"2026-06-{rng.randrange(1, 30):02d}T{rng.randrange(0, 24):02d}:00:00+00:00",
+        "action": rng.choice(["message_edit", "member_join", "role_update", "bet_created"]),
+        "category": "discord",
+        "actor": {"id": _uid(rng), "display_name": f"User {rng.randrange(5000)}"},
+        "target": {"id": _uid(rng), "display_name": f"User {rng.randrange(5000)}"},
+        "details": {"before": "Lorem ipsum " * 4, "after": "Dolor sit amet " * 4},
+    } for _ in range(count)]
+
+
+def make_players(rng, count):
+    return {_uid(rng): {
+        "display_name": f"User {n}",
+        "teams": [{"team": team, "ownership": {"main_owner": None, "split_with": []}}
+                  for team in rng.sample(TEAMS, rng.randrange(1, 4))],
+    } for n in range(count)}
+
+
+def _best(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def bench(doc, repeat):
+    rows = []
+    legacy = json.dumps(doc, indent=2, ensure_ascii=False).encode("utf-8")
+    rows.append(("stdlib indent=2 (old)", len(legacy),
+                 _best(lambda: json.dumps(doc, indent=2, ensure_ascii=False).encode("utf-8"), repeat),
+                 _best(lambda: json.loads(legacy), repeat)))
+    backends = ["json"] + (["orjson"] if json_codec.orjson is not None else [])
+    previous = json_codec.backend()
+    try:
+        for name in backends:
+            json_codec.set_backend(name)
+            compact = json_codec.dumps(doc)
+            rows.append((f"{name} compact", len(compact),
+                         _best(lambda: json_codec.dumps(doc), repeat),
+                         _best(lambda: json_codec.loads(compact), repeat)))
+    finally:
+        json_codec.set_backend(previous)
+    return rows
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark json_codec backends on synthetic tournament data.")
+    parser.add_argument("--matches", type=int, default=104, help="Fixtures in matches.json.")
+    parser.add_argument("--voters", type=int, default=4000, help="Fan zone voters.")
+    parser.add_argument("--audit", type=int, default=10000, help="Audit log entries.")
+    parser.add_argument("--players", type=int, default=3000, help="Entries in players.json.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is reported).")
+    parser.add_argument("--seed", type=int, default=2026, help="Random seed for the synthetic data.")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    rng = random.Random(args.seed)
+    docs = {
+        "matches.json": make_matches(rng, args.matches),
+        "fan_votes.json": make_fan_votes(rng, args.matches, args.voters),
+        "audit_log.json": make_audit_log(rng, args.audit),
+        "players.json": make_players(rng, args.players),
+    }
+    if json_codec.orjson is None:
+        print("orjson is not installed; only the stdlib backend is measured.")
+    print(f"{'file':<16} {'format':<24} {'size KB':>9} {'saved':>6} {'dump ms':>9} {'load ms':>9}")
+    for name, doc in docs.items():
+        rows = bench(doc, args.repeat)
+        baseline = rows[0][1]
+        for label, size, dump_ms, load_ms in rows:
+            saved = 100 * (baseline - size) / baseline
+            print(f"{name:<16} {label:<24} {size / 1024:>9.1f} {saved:>5.0f}% {dump_ms:>9.2f} {load_ms:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Time tournament_odds.simulate on a synthetic 48-team tournament.
+
+Two states are measured: before the first match (every group fixture is
+simulated) and after the second round of group matches (only the last
+round is left). The shipped bracket map supplies the knockout rounds.
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "WorldCupBot"))
+
+import bracket_graph  # noqa: E402
+import tournament_odds  # noqa: E402
+
+GROUPS = "ABCDEFGHIJKL"
+
+
+def make_tournament(rng, played_rounds):
+    graph = bracket_graph.load_graph()
+    groups, ratings, remaining = {}, {}, []
+    order = 0
+    for letter in GROUPS:
+        rows = []
+        for i in range(4):
+            team = f"Team {letter}{i + 1}"
+            ratings[team] = rng.gauss(1650, 180)
+            rows.append({"team": team, "pts": 0, "gd": 0, "gf": 0, "tiebreak": order})
+            order += 1
+        # Three rounds of two matches: (0-1, 2-3), (0-2, 1-3), (0-3, 1-2).
+        rounds = [((0, 1), (2, 3)), ((0, 2), (1, 3)), ((0, 3), (1, 2))]
+        for number, pairs in enumerate(rounds):
+            for a, b in pairs:
+                if number >= played_rounds:
+                    remaining.append((rows[a]["team"], rows[b]["team"]))
+                    continue
+                home, away = rng.randrange(4), rng.randrange(4)
+                rows[a]["gf"] += home
+                rows[b]["gf"] += away
+                rows[a]["gd"] += home - away
+                rows[b]["gd"] += away - home
+                rows[a]["pts"] += 3 if home > away else 1 if home == away else 0
+                rows[b]["pts"] += 3 if away > home else 1 if home == away else 0
+        groups[letter] = rows
+    return tournament_odds.Tournament(groups, remaining, ratings, graph)
+
+
+def _best(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the Monte Carlo tournament simulator.")
+    parser.add_argument("--simulations", type=int, default=tournament_odds.SIMULATIONS, help="Runs per simulation.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported).")
+    parser.add_argument("--seed", type=int, default=2026, help="Random seed for the synthetic data.")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    rng = random.Random(args.seed)
+    states = {
+        "before kickoff": make_tournament(rng, 0),
+        "after matchday 2": make_tournament(rng, 2),
+    }
+    print(f"{'state':<18} {'fixtures':>8} {'simulations':>12} {'best ms':>9} {'runs/s':>10}")
+    for name, tournament in states.items():
+        # The first call also builds the third-place table; keep it out of the timing.
+        tournament_odds.simulate(tournament, 1000, seed=args.seed)
+        ms = _best(lambda: tournament_odds.simulate(tournament, args.simulations, seed=args.seed), args.repeat)
+        rate = args.simulations / (ms / 1000)
+        print(f"{name:<18} {len(tournament.remaining):>8} {args.simulations:>12} {ms:>9.1f} {rate:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
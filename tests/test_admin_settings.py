@@ -4,7 +4,9 @@ from pathlib import Path
 
 from flask import Flask
 
-from routes_admin import create_admin_routes
+import match_timeline
+import routes_admin
+from routes_admin import _auto_backup_if_due, create_admin_routes
 
 
 def _build_admin_client(tmp_path: Path):
@@ -39,6 +41,20 @@ def _build_admin_client(tmp_path: Path):
     return client, json_dir
 
 
+def _timeline(json_dir: Path, fixture_id: str) -> list:
+    return match_timeline.load(json_dir / "match_timelines", fixture_id).view()
+
+
+def _settle(client) -> list:
+    """Wait for queued result settlements to finish and return the jobs."""
+    deadline = time.time() + 10
+    while True:
+        jobs = client.get("/admin/settlements").get_json()["jobs"]
+        if all(job["status"] in ("done", "failed") for job in jobs) or time.time() > deadline:
+            return jobs
+        time.sleep(0.01)
+
+
 def test_enabling_maintenance_mode_enqueues_announcement_command(tmp_path):
     """Enabling maintenance mode should enqueue a Discord announcements message."""
     client, json_dir = _build_admin_client(tmp_path)
@@ -130,6 +146,7 @@ def test_admin_fixture_result_updates_match_scores(tmp_path):
     assert payload["away_score"] == 1
     assert payload["winner_side"] == "home"
 
+    # The result and winner are recorded before the response returns.
     stored = json.loads(matches_path.read_text(encoding="utf-8"))
     assert stored[0]["home_score"] == 2
     assert stored[0]["away_score"] == 1
@@ -141,6 +158,12 @@ def test_admin_fixture_result_updates_match_scores(tmp_path):
     assert winners["M73"]["winner_side"] == "home"
     assert winners["M73"]["winner_team"] == "2A"
 
+    jobs = _settle(client)
+    assert [job["id"] for job in jobs] == [payload["settlement"]["id"]]
+    assert jobs[0]["status"] == "done"
+    assert {step["status"] for step in jobs[0]["steps"].values()} == {"done"}
+    assert jobs[0]["result"]["channel"] == "fanzone"
+
     snapshots = json.loads((json_dir / "fan_vote_snapshots.json").read_text(encoding="utf-8"))
     assert snapshots["fixtures"]["M73"]["home_votes"] == 1
     assert snapshots["fixtures"]["M73"]["away_votes"] == 1
@@ -187,6 +210,7 @@ def test_admin_fixture_result_unchanged_save_is_idempotent(tmp_path):
     payload = {"match_id": "M73", "home_score": 2, "away_score": 1}
     first = client.post("/admin/fixtures/result", json=payload)
     second = client.post("/admin/fixtures/result", json=payload)
+    _settle(client)
 
     assert first.status_code == 200
     assert second.status_code == 200
@@ -219,6 +243,7 @@ def test_knockout_progression_accepts_prefixed_match_ids(tmp_path):
         "/admin/fixtures/result",
         json={"match_id": "M77", "home_score": 1, "away_score": 3},
     )
+    _settle(client)
 
     assert first.status_code == 200
     assert second.status_code == 200
@@ -279,6 +304,7 @@ def test_knockout_progression_partially_updates_and_preserves_real_fixture_id(tm
         json={"match_id": "BRKT-R32-L2-GER-PAR", "home_score": 1, "away_score": 1, "winner_side": "away"},
     )
     assert first.status_code == 200
+    _settle(client)
     slots = json.loads((json_dir / "bracket_slots.json").read_text(encoding="utf-8"))
     assert slots["Round of 16"]["left"]["1"]["match_id"] == real_id
     assert slots["Round of 16"]["left"]["1"]["home"] == "Paraguay"
@@ -296,6 +322,7 @@ def test_knockout_progression_partially_updates_and_preserves_real_fixture_id(tm
         json={"match_id": "BRKT-R32-L5-SWE-NOR", "home_score": 0, "away_score": 2},
     )
     assert second.status_code == 200
+    _settle(client)
     slots = json.loads((json_dir / "bracket_slots.json").read_text(encoding="utf-8"))
     assert slots["Round of 16"]["left"]["1"]["home"] == "Paraguay"
     assert slots["Round of 16"]["left"]["1"]["away"] == "Sweden"
@@ -305,6 +332,7 @@ def test_knockout_progression_partially_updates_and_preserves_real_fixture_id(tm
         json={"match_id": "BRKT-R32-L2-GER-PAR", "home_score": 2, "away_score": 0},
     )
     assert correction.status_code == 200
+    _settle(client)
     slots = json.loads((json_dir / "bracket_slots.json").read_text(encoding="utf-8"))
     assert slots["Round of 16"]["left"]["1"]["home"] == "Germany"
     assert slots["Round of 16"]["left"]["1"]["away"] == "Sweden"
@@ -406,13 +434,17 @@ def test_quick_match_announcement_uses_group_channel(tmp_path):
     assert command["data"]["channel"] == "group-j"
 
     stored = json.loads((json_dir / "matches.json").read_text(encoding="utf-8"))
-    assert len(stored[0]["live_stats"]) == 1
-    assert stored[0]["live_stats"][0]["event_type"] == "goal"
-    assert stored[0]["live_stats"][0]["label"] == "Goal"
-    assert stored[0]["live_stats"][0]["message"] == "Argentina 1 - 0 Algeria"
-    assert stored[0]["live_stats"][0]["country"] == "Argentina"
-    assert stored[0]["live_stats"][0]["match_time"] == "23"
-    assert isinstance(stored[0]["live_stats"][0]["ts"], int)
+    assert stored[0]["live_score"] == {"home": 1, "away": 0}
+    assert "live_stats" not in stored[0]
+    assert "live_stats" not in command["data"]
+    timeline = _timeline(json_dir, "M12")
+    assert len(timeline) == 1
+    assert timeline[0]["event_type"] == "goal"
+    assert timeline[0]["label"] == "Goal"
+    assert timeline[0]["message"] == "Argentina 1 - 0 Algeria"
+    assert timeline[0]["country"] == "Argentina"
+    assert timeline[0]["match_time"] == "23"
+    assert isinstance(timeline[0]["ts"], int)
 
 
 def test_quick_match_announcement_uses_knockout_channel(tmp_path):
@@ -496,9 +528,8 @@ def test_half_time_quick_announcement_does_not_require_country_or_match_time(tmp
     )
 
     assert response.status_code == 200
-    saved_match = json.loads((json_dir / "matches.json").read_text(encoding="utf-8"))[0]
     half_time = next(
-        event for event in saved_match["live_stats"]
+        event for event in _timeline(json_dir, "M12")
         if event["event_type"] == "half_time"
     )
     assert half_time["country"] == ""
@@ -535,16 +566,17 @@ def test_quick_announcement_persists_late_event_in_match_clock_order(tmp_path):
     )
 
     assert response.status_code == 200
-    saved_match = json.loads((json_dir / "matches.json").read_text(encoding="utf-8"))[0]
+    timeline = _timeline(json_dir, "M12")
     assert [
         (event["event_type"], event["match_time"])
-        for event in saved_match["live_stats"]
+        for event in timeline
     ] == [
         ("yellow_card", "34"),
         ("half_time", ""),
         ("goal", "66"),
     ]
-    assert response.get_json()["live_stats"] == saved_match["live_stats"]
+    assert response.get_json()["live_stats"] == timeline
+    assert client.get("/admin/fixtures/M12/timeline").get_json()["live_stats"] == timeline
 
 
 def test_fixture_result_includes_penalty_score_in_command(tmp_path):
@@ -568,6 +600,7 @@ def test_fixture_result_includes_penalty_score_in_command(tmp_path):
         "home_penalties": 5,
         "away_penalties": 4,
     })
+    _settle(client)
 
     assert response.status_code == 200
     commands = [
@@ -580,8 +613,8 @@ def test_fixture_result_includes_penalty_score_in_command(tmp_path):
     assert fixture_command["data"]["away_penalties"] == 4
 
 
-def test_full_time_result_command_includes_persisted_live_stats(tmp_path):
-    """Full time should automatically attach recorded events to the result embed payload."""
+def test_full_time_result_commands_leave_live_stats_to_the_timeline(tmp_path):
+    """Result commands name the fixture; the announcer loads its events when building embeds."""
     client, json_dir = _build_admin_client(tmp_path)
     live_stats = [
         {
@@ -612,6 +645,7 @@ def test_full_time_result_command_includes_persisted_live_stats(tmp_path):
         "/admin/fixtures/result",
         json={"match_id": "M20", "home_score": 2, "away_score": 1},
     )
+    _settle(client)
 
     assert response.status_code == 200
     commands = [
@@ -620,9 +654,15 @@ def test_full_time_result_command_includes_persisted_live_stats(tmp_path):
         if line.strip()
     ]
     result_command = next(command for command in commands if command["kind"] == "fixture_result")
-    assert result_command["data"]["live_stats"] == live_stats
+    assert result_command["data"]["fixture_id"] == "M20"
+    assert "live_stats" not in result_command["data"]
     settlement_command = next(command for command in commands if command["kind"] == "fanzone_winner")
-    assert settlement_command["data"]["live_stats"] == live_stats
+    assert settlement_command["data"]["fixture_id"] == "M20"
+    assert "live_stats" not in settlement_command["data"]
+    # Events recorded before timelines existed are still found through matches.json.
+    saved_match = json.loads((json_dir / "matches.json").read_text(encoding="utf-8"))[0]
+    timeline = match_timeline.load(json_dir / "match_timelines", "M20", saved_match.get("live_stats"))
+    assert timeline.view() == live_stats
 
 
 def test_admin_fixture_result_correction_replaces_events_without_owner_dms(tmp_path):
@@ -665,6 +705,7 @@ def test_admin_fixture_result_correction_replaces_events_without_owner_dms(tmp_p
         "/admin/fixtures/result",
         json={"match_id": "M73", "home_score": 1, "away_score": 2},
     )
+    _settle(client)
 
     assert first.status_code == 200
     assert correction.status_code == 200
@@ -815,8 +856,8 @@ def test_admin_fixture_result_rejects_penalty_winner_for_group_match(tmp_path):
     assert resp.get_json()["error"] == "winner_side_requires_knockout_match"
 
 
-def test_auto_backup_runs_on_any_admin_request_when_due(tmp_path):
-    """Auto backup should run from admin traffic without opening the backups page."""
+def test_auto_backup_scheduler_creates_snapshot_when_due(tmp_path):
+    """Auto backups run from the scheduler thread, not from admin requests."""
     client, json_dir = _build_admin_client(tmp_path)
     settings_path = json_dir / "admin_settings.json"
     now = int(time.time())
@@ -825,7 +866,7 @@ def test_auto_backup_runs_on_any_admin_request_when_due(tmp_path):
             {
                 "AUTO_BACKUP_ENABLED": True,
                 "AUTO_BACKUP_INTERVAL_HOURS": 6,
-                # Make the next request clearly overdue.
+                # Make the next scheduler tick clearly overdue.
                 "AUTO_BACKUP_LAST_TS": now - (7 * 3600),
             }
         ),
@@ -834,10 +875,13 @@ def test_auto_backup_runs_on_any_admin_request_when_due(tmp_path):
 
     resp = client.get("/admin/auth/status")
     assert resp.status_code == 200
+    manifests_dir = tmp_path / "BACKUPS" / "manifests"
+    assert not list(manifests_dir.glob("*.json")), "admin requests must not run backups inline"
 
-    backups_dir = tmp_path / "BACKUPS"
-    backups = list(backups_dir.glob("*.zip"))
-    assert backups, "expected a backup zip to be created by the before_request scheduler"
+    name = _auto_backup_if_due({"BASE_DIR": str(tmp_path)})
+    assert name
+    assert (manifests_dir / f"{name}.json").is_file()
+    assert _auto_backup_if_due({"BASE_DIR": str(tmp_path)}) is None
 
 
 def test_admin_stage_placement_update_queues_discord_embed_command(tmp_path):
@@ -1080,7 +1124,7 @@ def test_penalty_quick_announcement_records_decision_without_goal(tmp_path):
 
     assert response.status_code == 200
     saved_match = json.loads((json_dir / "matches.json").read_text(encoding="utf-8"))[0]
-    assert [(event["event_type"], event.get("country"), event.get("match_time")) for event in saved_match["live_stats"]] == [
+    assert [(event["event_type"], event.get("country"), event.get("match_time")) for event in _timeline(json_dir, saved_match["id"])] == [
         ("goal", "B", "10"),
         ("penalty", "A", "52"),
     ]
@@ -1112,7 +1156,7 @@ def test_referee_decision_quick_options_record_without_changing_score(tmp_path):
 
     assert response.status_code == 200
     saved_match = json.loads((json_dir / "matches.json").read_text(encoding="utf-8"))[0]
-    assert [(event["event_type"], event.get("country"), event.get("match_time")) for event in saved_match["live_stats"]] == [
+    assert [(event["event_type"], event.get("country"), event.get("match_time")) for event in _timeline(json_dir, saved_match["id"])] == [
         ("goal", "A", "10"),
         ("var_decision", "B", "61"),
     ]
@@ -1144,7 +1188,7 @@ def test_extra_time_quick_announcement_is_match_state_without_country_or_time(tm
 
     assert response.status_code == 200
     saved_match = json.loads((json_dir / "matches.json").read_text(encoding="utf-8"))[0]
-    assert [(event["event_type"], event.get("country"), event.get("match_time")) for event in saved_match["live_stats"]] == [
+    assert [(event["event_type"], event.get("country"), event.get("match_time")) for event in _timeline(json_dir, saved_match["id"])] == [
         ("goal", "A", "10"),
         ("extra_time", "", ""),
     ]
@@ -1180,12 +1224,13 @@ def test_disallowed_goal_rolls_back_latest_goal_and_announces_score(tmp_path):
     saved_match = json.loads((json_dir / "matches.json").read_text(encoding="utf-8"))[0]
     assert [
         (event["event_type"], event.get("country"), event.get("match_time"))
-        for event in saved_match["live_stats"]
+        for event in _timeline(json_dir, "M12")
     ] == [
         ("goal", "A", "12"),
         ("goal", "B", "20"),
         ("disallowed_goal", "A", "29"),
     ]
+    assert saved_match["live_score"] == {"home": 1, "away": 1}
     command = json.loads(
         (json_dir / "bot_commands.jsonl").read_text(encoding="utf-8").splitlines()[-1]
     )
@@ -1318,3 +1363,91 @@ def test_quick_fixture_delay_rejects_invalid_hours(tmp_path):
     assert response.status_code == 400
     assert response.get_json()["error"] == "invalid_hours"
     assert json.loads((json_dir / "matches.json").read_text(encoding="utf-8")) == original
+
+
+def test_admin_log_returns_only_lines_after_cursor(tmp_path):
+    """Polling with the returned cursor should only ship newly appended lines."""
+    client, _ = _build_admin_client(tmp_path)
+    log_path = tmp_path / "logs" / "launcher.log"
+    log_path.parent.mkdir()
+    log_path.write_text(
+        "2026-06-11 18:00:00,000 INFO launcher app.boot:1: started\n"
+        "2026-06-11 18:00:01,000 ERROR launcher app.boot:2: failed\n",
+        encoding="utf-8",
+    )
+
+    first = client.get("/admin/log/launcher").get_json()
+    assert len(first["lines"]) == 2
+    assert first["cursor"] == log_path.stat().st_size
+
+    with log_path.open("a", encoding="utf-8") as f:
+        f.write("2026-06-11 18:00:02,000 WARNING launcher app.tick:3: slow\n")
+    polled = client.get(f"/admin/log/launcher?cursor={first['cursor']}").get_json()
+    assert polled["lines"] == ["2026-06-11 18:00:02,000 WARNING launcher app.tick:3: slow"]
+    assert polled["reset"] is False
+
+    filtered = client.get("/admin/log/launcher?level=ERROR").get_json()
+    assert [line.split(": ")[-1] for line in filtered["lines"]] == ["failed"]
+
+    bad = client.get("/admin/log/launcher?q=(")
+    assert bad.status_code == 400
+    assert bad.get_json()["error"] == "invalid_regex"
+
+
+def test_admin_split_history_pages_and_filters(tmp_path):
+    """History keeps its legacy limit contract and pages with the shared list parameters."""
+    client, json_dir = _build_admin_client(tmp_path)
+    (json_dir / "verified.json").write_text(json.dumps({"verified_users": [
+        {"discord_id": "100", "display_name": "Siren"},
+        {"discord_id": "200", "display_name": "Owner"},
+    ]}), encoding="utf-8")
+    (json_dir / "split_requests_log.json").write_text(json.dumps([
+        {"request_id": f"r{n}", "status": "accepted" if n % 2 else "declined", "team": "Brazil",
+         "requester_id": 100, "main_owner_id": 200, "timestamp": f"2026-06-0{n}T12:00:00+00:00"}
+        for n in range(1, 6)
+    ]), encoding="utf-8")
+
+    legacy = client.get("/admin/splits/history?limit=2").get_json()
+    assert [e["request_id"] for e in legacy["events"]] == ["r4", "r5"]
+    assert legacy["events"][0]["from_username"] == "Siren"
+
+    page = client.get("/admin/splits/history?status=accepted&sort=-time&limit=2&fields=request_id,to").get_json()
+    assert page["events"] == [{"request_id": "r5", "to": "Owner"}, {"request_id": "r3", "to": "Owner"}]
+    assert page["total"] == 3
+    rest = client.get(f"/admin/splits/history?status=accepted&sort=-time&limit=2&cursor={page['next_cursor']}").get_json()
+    assert [e["request_id"] for e in rest["events"]] == ["r1"]
+    assert rest["next_cursor"] is None
+
+
+def test_backup_actions_run_as_jobs_and_can_be_polled(tmp_path, monkeypatch):
+    """Backups answer inline when quick and hand back a job id otherwise."""
+    client, json_dir = _build_admin_client(tmp_path)
+    (json_dir / "players.json").write_text(json.dumps({}), encoding="utf-8")
+
+    created = client.post("/api/backups/create", json={})
+    assert created.status_code == 200
+    name = created.get_json()["created"]
+    assert created.get_json()["job"]["kind"] == "backups_create"
+    assert (tmp_path / "BACKUPS" / "manifests" / f"{name}.json").is_file()
+
+    missing = client.post("/api/backups/restore", json={"name": "nope"})
+    assert missing.status_code == 404
+
+    monkeypatch.setattr(routes_admin, "JOB_INLINE_WAIT_SECONDS", 0)
+    pending = client.post("/admin/jobs", json={"kind": "backups_restore", "params": {"name": name}})
+    assert pending.status_code == 202
+    job_id = pending.get_json()["job"]["id"]
+    deadline = time.time() + 5
+    job = {}
+    while time.time() < deadline:
+        job = client.get(f"/admin/jobs/{job_id}").get_json()["job"]
+        if job["state"] not in ("queued", "running"):
+            break
+        time.sleep(0.01)
+    assert job["state"] == "done"
+    assert job["result"] == {"restored": name}
+
+    kinds = [job["kind"] for job in client.get("/admin/jobs").get_json()["jobs"]]
+    assert kinds == ["backups_restore", "backups_restore", "backups_create"]
+    assert client.post("/admin/jobs", json={"kind": "admin_embed_post"}).status_code == 400
+    assert client.post("/admin/jobs/unknown/cancel").status_code == 404
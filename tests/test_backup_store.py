@@ -0,0 +1,145 @@
+import io
+import json
+import os
+import threading
+import zipfile
+
+import pytest
+
+import backup_store
+
+
+def _setup(tmp_path):
+    json_dir = tmp_path / "JSON"
+    json_dir.mkdir()
+    (json_dir / "players.json").write_text(json.dumps({"1": {"teams": []}}), encoding="utf-8")
+    (json_dir / "bets.json").write_text("[]", encoding="utf-8")
+    return str(json_dir), str(tmp_path / "BACKUPS")
+
+
+def _blob_count(backup_dir):
+    return sum(len(files) for _, _, files in os.walk(os.path.join(backup_dir, "blobs")))
+
+
+def test_unchanged_files_are_not_stored_twice(tmp_path):
+    json_dir, backup_dir = _setup(tmp_path)
+
+    backup_store.create_snapshot(json_dir, backup_dir)
+    assert _blob_count(backup_dir) == 2
+
+    backup_store.create_snapshot(json_dir, backup_dir)
+    assert _blob_count(backup_dir) == 2
+
+    (tmp_path / "JSON" / "bets.json").write_text('[{"bet_id": "1"}]', encoding="utf-8")
+    backup_store.create_snapshot(json_dir, backup_dir)
+    assert _blob_count(backup_dir) == 3
+    assert len(backup_store.list_snapshots(backup_dir)) == 3
+
+
+def test_export_zip_and_restore_round_trip(tmp_path):
+    json_dir, backup_dir = _setup(tmp_path)
+    name = backup_store.create_snapshot(json_dir, backup_dir)
+
+    buf, download_name = backup_store.export_zip(backup_dir, name)
+    assert download_name == f"{name}.zip"
+    with zipfile.ZipFile(io.BytesIO(buf.read())) as z:
+        assert sorted(z.namelist()) == ["bets.json", "players.json"]
+        assert z.read("bets.json") == b"[]"
+        # Stored compact, exported pretty-printed for people opening the zip.
+        assert z.read("players.json").decode("utf-8") == json.dumps({"1": {"teams": []}}, indent=2)
+
+    (tmp_path / "JSON" / "bets.json").write_text("broken", encoding="utf-8")
+    backup_store.restore(json_dir, backup_dir, name)
+    assert (tmp_path / "JSON" / "bets.json").read_text(encoding="utf-8") == "[]"
+    assert (tmp_path / "JSON.bak.restore" / "bets.json").read_text(encoding="utf-8") == "broken"
+
+
+def test_prune_applies_retention_and_collects_unreferenced_blobs(tmp_path):
+    json_dir, backup_dir = _setup(tmp_path)
+    bets = tmp_path / "JSON" / "bets.json"
+    for i in range(4):
+        bets.write_text(json.dumps([i]), encoding="utf-8")
+        backup_store.create_snapshot(json_dir, backup_dir)
+    assert _blob_count(backup_dir) == 5
+
+    backup_store.prune(backup_dir, keep=2)
+
+    assert len(backup_store.list_snapshots(backup_dir)) == 2
+    # players.json blob plus the two retained bets.json versions.
+    assert _blob_count(backup_dir) == 3
+
+
+def test_legacy_zip_backups_are_still_listed_and_exported(tmp_path):
+    _, backup_dir = _setup(tmp_path)
+    os.makedirs(backup_dir)
+    with zipfile.ZipFile(os.path.join(backup_dir, "01-06_10-00-00.zip"), "w") as z:
+        z.writestr("bets.json", "[]")
+
+    listed = backup_store.list_snapshots(backup_dir)
+    assert [(b["name"], b["kind"]) for b in listed] == [("01-06_10-00-00.zip", "zip")]
+    assert backup_store.export_zip(backup_dir, "../secret.zip") is None
+    assert backup_store.export_zip(backup_dir, "01-06_10-00-00.zip")[1] == "01-06_10-00-00.zip"
+
+
+def test_file_replaced_during_a_snapshot_is_stored_under_its_own_hash(tmp_path, monkeypatch):
+    import builtins
+    import gzip
+    import hashlib
+
+    json_dir, backup_dir = _setup(tmp_path)
+    players = tmp_path / "JSON" / "players.json"
+    real_open = builtins.open
+    replaced = []
+
+    def racing_open(path, mode="r", *args, **kwargs):
+        handle = real_open(path, mode, *args, **kwargs)
+        if str(path) == str(players) and "r" in mode and not replaced:
+            # The bot swaps in a new version after the snapshot opened the old one.
+            tmp = tmp_path / "players.new"
+            tmp.write_text(json.dumps({"1": {"teams": ["Spain"]}}), encoding="utf-8")
+            os.replace(tmp, players)
+            replaced.append(True)
+        return handle
+
+    monkeypatch.setattr(backup_store, "open", racing_open, raising=False)
+    name = backup_store.create_snapshot(json_dir, backup_dir)
+
+    assert replaced
+    for root, _, files in os.walk(os.path.join(backup_dir, "blobs")):
+        for fn in files:
+            with gzip.open(os.path.join(root, fn), "rb") as f:
+                assert hashlib.sha256(f.read()).hexdigest() == fn[:-3]
+    buf, _ = backup_store.export_zip(backup_dir, name)
+    with zipfile.ZipFile(buf) as z:
+        assert json.loads(z.read("players.json")) == {"1": {"teams": ["Spain"]}}
+
+
+def test_restore_holds_the_snapshot_lock_and_reads_every_blob_first(tmp_path, monkeypatch):
+    json_dir, backup_dir = _setup(tmp_path)
+    name = backup_store.create_snapshot(json_dir, backup_dir)
+    bets = tmp_path / "JSON" / "bets.json"
+    players = tmp_path / "JSON" / "players.json"
+    bets.write_text("changed", encoding="utf-8")
+    players.write_text("changed", encoding="utf-8")
+
+    read_blob = backup_store._read_blob
+    lock_free = []
+    reads = []
+
+    def checked_read(backup_dir, digest):
+        # Prune runs on another thread; it must not get the lock mid-restore.
+        probe = threading.Thread(target=lambda: lock_free.append(backup_store._lock.acquire(blocking=False)))
+        probe.start()
+        probe.join()
+        reads.append(digest)
+        if len(reads) == 2:
+            raise FileNotFoundError(digest)
+        return read_blob(backup_dir, digest)
+
+    monkeypatch.setattr(backup_store, "_read_blob", checked_read)
+    with pytest.raises(FileNotFoundError):
+        backup_store.restore(json_dir, backup_dir, name)
+
+    assert lock_free == [False, False]
+    # The second blob was missing, so no file was replaced.
+    assert bets.read_text(encoding="utf-8") == players.read_text(encoding="utf-8") == "changed"
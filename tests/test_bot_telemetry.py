@@ -0,0 +1,112 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from types import SimpleNamespace
+
+import bot_telemetry
+from bot_telemetry import Telemetry, timed_loop
+
+
+def test_timed_loop_records_ticks_and_errors(tmp_path):
+    telemetry = Telemetry(str(tmp_path))
+
+    class Cog:
+        def __init__(self):
+            self.bot = SimpleNamespace(telemetry=telemetry)
+
+        @timed_loop("Cog._loop")
+        async def _loop(self, fail=False):
+            if fail:
+                raise RuntimeError("boom")
+            return "ok"
+
+    cog = Cog()
+    assert asyncio.run(cog._loop()) == "ok"
+    try:
+        asyncio.run(cog._loop(fail=True))
+    except RuntimeError:
+        pass
+
+    summary = telemetry.snapshot()["loops"]["Cog._loop"]
+    assert summary["count"] == 2 and summary["errors"] == 1
+    assert summary["p95_ms"] is not None
+
+
+def test_consumer_lag_reports_bytes_and_age_of_oldest_unread_command(tmp_path):
+    queue = tmp_path / "bot_commands.jsonl"
+    first = json.dumps({"ts": int(time.time()) - 120, "kind": "a", "data": {}}) + "\n"
+    second = json.dumps({"ts": int(time.time()), "kind": "b", "data": {}}) + "\n"
+    queue.write_text(first + second, encoding="utf-8")
+
+    telemetry = Telemetry(str(tmp_path))
+    offsets = {"caught_up": len((first + second).encode()), "behind": 0}
+    telemetry.register_consumer("caught_up", str(queue), lambda: offsets["caught_up"])
+    telemetry.register_consumer("behind", str(queue), lambda: offsets["behind"])
+
+    lag = telemetry.consumer_lag()
+    assert lag["caught_up"] == {"offset": offsets["caught_up"], "bytes_behind": 0, "seconds_behind": 0.0}
+    assert lag["behind"]["bytes_behind"] == offsets["caught_up"]
+    assert lag["behind"]["seconds_behind"] >= 119
+
+
+def test_http_wrapper_and_rate_limit_counter(tmp_path):
+    class FakeHTTP:
+        async def request(self, route, **kwargs):
+            if kwargs.get("fail"):
+                raise type("HTTPException", (Exception,), {"status": 403})()
+            return {"ok": True}
+
+    bot = SimpleNamespace(http=FakeHTTP(), latency=0.042)
+    telemetry = Telemetry(str(tmp_path))
+    telemetry.attach(bot)
+    route = SimpleNamespace(method="POST", path="/channels/{channel_id}/messages")
+
+    asyncio.run(bot.http.request(route))
+    try:
+        asyncio.run(bot.http.request(route, fail=True))
+    except Exception:
+        pass
+    logging.getLogger("discord.http").warning("We are being rate limited. POST /x responded with 429.")
+
+    snap = telemetry.snapshot()
+    assert snap["gateway_latency_ms"] == 42.0
+    assert snap["http"]["routes"]["POST /channels/{channel_id}/messages"]["count"] == 2
+    assert snap["http"]["status"] == {"403": 1}
+    assert snap["http"]["rate_limited"] == 1
+    logging.getLogger("discord.http").removeFilter(telemetry._count_rate_limits)
+
+
+def test_published_snapshot_is_readable_by_the_launcher(tmp_path):
+    telemetry = Telemetry(str(tmp_path))
+    telemetry.register_source("outbound", lambda: {"in_flight": 2})
+    telemetry.record_tick("bot._command_watcher", 0.25)
+    asyncio.run(telemetry.publish())
+
+    snap = bot_telemetry.read_snapshot(str(tmp_path))
+    assert snap["outbound"] == {"in_flight": 2}
+    assert snap["age_seconds"] >= 0
+    gauges = bot_telemetry.snapshot_gauges(snap)
+    assert gauges["loop_max_tick_ms"] == 250.0
+    assert bot_telemetry.read_snapshot(str(tmp_path / "missing")) is None
+
+
+def test_consumer_lag_is_measured_off_the_event_loop(tmp_path, monkeypatch):
+    queue = tmp_path / "bot_commands.jsonl"
+    queue.write_text(json.dumps({"ts": int(time.time()), "kind": "a", "data": {}}) + "\n", encoding="utf-8")
+    telemetry = Telemetry(str(tmp_path))
+    telemetry.register_consumer("watcher", str(queue), lambda: 0)
+    threads = []
+    consumer_lag = telemetry.consumer_lag
+
+    def recording_lag(*args):
+        threads.append(threading.current_thread())
+        return consumer_lag(*args)
+
+    monkeypatch.setattr(telemetry, "consumer_lag", recording_lag)
+    asyncio.run(telemetry.publish())
+
+    assert threads and threads[0] is not threading.main_thread()
+    assert bot_telemetry.read_snapshot(str(tmp_path))["consumers"]["watcher"]["bytes_behind"] == queue.stat().st_size
+    assert telemetry.snapshot()["consumers"] == {}
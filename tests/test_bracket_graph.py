@@ -0,0 +1,99 @@
+import json
+
+import pytest
+
+import bracket_graph
+from bracket_graph import Bracket, BracketGraph
+
+
+def _graph():
+    return bracket_graph.load_graph()
+
+
+def test_shipped_map_is_the_official_knockout_dag():
+    graph = _graph()
+    assert sorted(graph.nodes) == list(range(73, 105))
+    assert graph.order.index(104) > graph.order.index(101)
+    assert [target for target, _, _ in graph.downstream[101]] == [103, 104]
+    assert graph.nodes[103].feeds == {"home": ("L", 101), "away": ("L", 102)}
+    # M89/M90 share a half with M93/M94; M91/M92 with M95/M96.
+    assert {number: graph.nodes[number].side for number in (89, 90, 93, 94)} == dict.fromkeys((89, 90, 93, 94), "left")
+    assert {number: graph.nodes[number].side for number in (91, 92, 95, 96)} == dict.fromkeys((91, 92, 95, 96), "right")
+
+
+def test_invalid_maps_are_rejected():
+    with pytest.raises(ValueError, match="unknown match"):
+        BracketGraph.from_doc({"matches": [{"match": 1, "stage": "Final", "home": "W2"}]})
+    with pytest.raises(ValueError, match="cycle"):
+        BracketGraph.from_doc({"matches": [
+            {"match": 1, "stage": "Final", "home": "W2"},
+            {"match": 2, "stage": "Final", "home": "W1"},
+        ]})
+
+
+def test_result_propagates_only_along_its_path():
+    fixtures = [
+        {"id": "101", "home": "Spain", "away": "Brazil", "stage": "Semi-finals", "bracket_slot": 1},
+        {"id": "102", "home": "France", "away": "Japan", "stage": "Semi-finals", "bracket_slot": 1},
+        {"id": "97", "home": "Spain", "away": "Italy", "stage": "Quarter-finals", "bracket_slot": 1},
+    ]
+    winners = {"101": {"winner_side": "away"}, "97": {"winner_side": "home"}}
+    bracket = Bracket(_graph(), fixtures, winners, {})
+
+    changes = bracket.propagate([101])
+
+    assert [change["match"] for change in changes] == [103, 104]
+    assert all(change.get("created") for change in changes)
+    final = next(f for f in fixtures if f["id"] == "104")
+    third = next(f for f in fixtures if f["id"] == "103")
+    assert (final["home"], final["away"]) == ("Brazil", "W102")
+    assert (third["home"], third["away"]) == ("Spain", "L102")
+    # M97 was decided too, but only M101's path is walked.
+    assert [f["id"] for f in fixtures] == ["101", "102", "97", "103", "104"]
+    assert bracket.slots["Final"]["center"]["1"]["home"] == "Brazil"
+    assert bracket.propagate([101]) == []
+
+
+def test_changed_team_is_carried_through_later_results():
+    fixtures = [
+        {"id": "M74", "home": "Germany", "away": "Paraguay", "status": "final", "home_score": 2, "away_score": 0},
+        {"id": "89", "home": "Paraguay", "away": "Sweden", "status": "final", "home_score": 1, "away_score": 0},
+        {"id": "97", "home": "Paraguay", "away": "W90"},
+    ]
+    bracket = Bracket(_graph(), fixtures, {}, {})
+
+    changes = bracket.propagate([bracket.match_for("M74")])
+
+    assert [change["match"] for change in changes] == [89, 97]
+    assert changes[0]["fixture"] == {"id": "89", "home": "Germany", "stage": "Round of 16", "bracket_slot": 1}
+    assert fixtures[2]["home"] == "Germany"
+
+
+def test_saved_slots_are_moved_to_their_official_positions():
+    slots = {"Round of 16": {"left": {"3": {"match_id": "91", "home": "W76", "away": "W78", "utc": "2026-07-04T17:00:00Z"}}}}
+    fixtures = [{"id": "76", "home": "Mexico", "away": "Ghana", "status": "final", "home_score": 3, "away_score": 1}]
+    bracket = Bracket(_graph(), fixtures, {}, slots)
+
+    bracket.propagate([76])
+
+    assert slots["Round of 16"]["left"] == {}
+    assert slots["Round of 16"]["right"]["1"] == {
+        "match_id": "91", "home": "Mexico", "away": "W78", "utc": "2026-07-04T17:00:00Z",
+    }
+
+
+def test_view_is_cached_until_a_file_changes(tmp_path):
+    (tmp_path / "matches.json").write_text(json.dumps([
+        {"id": "M74", "home": "Germany", "away": "Paraguay"},
+    ]), encoding="utf-8")
+    first = bracket_graph.view(tmp_path)
+    assert bracket_graph.view(tmp_path) is first
+    assert first["slots"]["Round of 32"]["left"]["1"]["home"] == "Germany"
+    assert first["slots"]["Round of 16"]["left"]["1"]["home"] == "W74"
+
+    (tmp_path / "fan_winners.json").write_text(json.dumps({"M74": {"winner_side": "away"}}), encoding="utf-8")
+    second = bracket_graph.view(tmp_path)
+    assert second["version"] != first["version"]
+    assert second["slots"]["Round of 16"]["left"]["1"]["home"] == "Paraguay"
+    match = next(m for m in second["matches"] if m["match"] == 74)
+    assert (match["winner"], match["loser"]) == ("Paraguay", "Germany")
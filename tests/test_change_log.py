@@ -0,0 +1,92 @@
+import json
+
+import change_log
+from change_log import ChangeLog
+
+
+def _write(json_dir, name, doc):
+    path = json_dir / name
+    path.write_text(json.dumps(doc), encoding="utf-8")
+    change_log.record_write(path, doc)
+
+
+def test_first_write_seeds_baseline_and_forces_resync(tmp_path):
+    _write(tmp_path, "matches.json", [{"id": "m1", "home": "USA"}])
+
+    assert change_log.read_since(str(tmp_path), 0) == {"version": 1, "resync": True, "changes": []}
+    assert change_log.read_since(str(tmp_path), 1) == {"version": 1, "resync": False, "changes": []}
+
+
+def test_writes_log_only_changed_entities(tmp_path):
+    _write(tmp_path, "matches.json", [{"id": "m1", "home_score": None}, {"id": "m2"}])
+    base = change_log.read_since(str(tmp_path), None)["version"]
+
+    _write(tmp_path, "matches.json", [{"id": "m1", "home_score": 2}, {"id": "m2"}, {"id": "m3"}])
+    _write(tmp_path, "matches.json", [{"id": "m1", "home_score": 3}, {"id": "m3"}])
+
+    result = change_log.read_since(str(tmp_path), base)
+    assert result["resync"] is False
+    # Newest op per entity, oldest first.
+    assert [(c["id"], c["op"]) for c in result["changes"]] == [("m3", "upsert"), ("m1", "upsert"), ("m2", "delete")]
+    assert result["version"] == base + 4
+
+
+def test_unchanged_rewrite_does_not_bump_version(tmp_path):
+    doc = {"bets": [{"bet_id": "b1", "wager": "10"}]}
+    _write(tmp_path, "bets.json", doc)
+    version = change_log.read_since(str(tmp_path), None)["version"]
+
+    _write(tmp_path, "bets.json", doc)
+    assert change_log.read_since(str(tmp_path), None)["version"] == version
+
+
+def test_ownership_rows_are_keyed_by_team(tmp_path):
+    players = {"1": {"teams": [{"team": "Brazil", "ownership": {"main_owner": "1", "split_with": []}}]}}
+    _write(tmp_path, "players.json", players)
+    base = change_log.read_since(str(tmp_path), None)["version"]
+
+    players["2"] = {"teams": [{"team": "Spain", "ownership": {"main_owner": "2"}}]}
+    _write(tmp_path, "players.json", players)
+
+    changes = change_log.read_since(str(tmp_path), base)["changes"]
+    assert [(c["kind"], c["id"]) for c in changes] == [("ownership", "Spain")]
+
+
+def test_kinds_filter_and_untracked_files(tmp_path):
+    _write(tmp_path, "matches.json", [{"id": "m1"}])
+    _write(tmp_path, "bets.json", [{"bet_id": "b1"}])
+    base = change_log.read_since(str(tmp_path), None)["version"]
+
+    _write(tmp_path, "bets.json", [{"bet_id": "b1", "settled": True}])
+    _write(tmp_path, "admin_settings.json", {"x": 1})
+
+    assert change_log.read_since(str(tmp_path), base, kinds=["fixture"])["changes"] == []
+    assert [c["id"] for c in change_log.read_since(str(tmp_path), base, kinds=["bet"])["changes"]] == ["b1"]
+
+
+def test_resync_when_behind_compaction_or_after_reset(tmp_path, monkeypatch):
+    monkeypatch.setattr(change_log, "MAX_LOG_BYTES", 400)
+    monkeypatch.setattr(change_log, "KEEP_AFTER_COMPACT", 3)
+    _write(tmp_path, "matches.json", [{"id": "m1", "n": 0}])
+    for n in range(1, 10):
+        _write(tmp_path, "matches.json", [{"id": "m1", "n": n}])
+
+    current = change_log.read_since(str(tmp_path), None)["version"]
+    assert change_log.read_since(str(tmp_path), 1)["resync"] is True
+    assert change_log.read_since(str(tmp_path), current - 1)["changes"][0]["id"] == "m1"
+    assert change_log.read_since(str(tmp_path), current + 5)["resync"] is True
+
+    change_log.record_reset(str(tmp_path))
+    assert change_log.read_since(str(tmp_path), current)["resync"] is True
+
+
+def test_version_is_shared_across_instances(tmp_path):
+    # Two processes (launcher and bot) each hold their own ChangeLog for the same directory.
+    bot_side, launcher_side = ChangeLog(str(tmp_path)), ChangeLog(str(tmp_path))
+    bot_side.record("bets.json", [{"bet_id": "b1"}])
+    launcher_side.record("bets.json", [{"bet_id": "b1"}, {"bet_id": "b2"}])
+    bot_side.record("bets.json", [{"bet_id": "b2"}])
+
+    result = launcher_side.read_since(1)
+    assert result["version"] == 3
+    assert [(c["id"], c["op"]) for c in result["changes"]] == [("b2", "upsert"), ("b1", "delete")]
@@ -0,0 +1,147 @@
+import asyncio
+
+import pytest
+
+discord = pytest.importorskip("discord")
+
+import embed_refresher
+from embed_refresher import EmbedRefresher, leaderboard_pages
+
+
+class DummyPartial:
+    def __init__(self, channel, message_id):
+        self.channel = channel
+        self.id = message_id
+
+    async def edit(self, **kwargs):
+        if self.channel.fail_with:
+            raise self.channel.fail_with.pop(0)
+        self.channel.edits.append((self.id, kwargs))
+
+
+class DummyChannel:
+    def __init__(self, fail_with=None):
+        self.edits = []
+        self.fail_with = list(fail_with or [])
+
+    def get_partial_message(self, message_id):
+        return DummyPartial(self, message_id)
+
+    async def fetch_message(self, message_id):
+        raise AssertionError("messages must not be fetched")
+
+
+class DummyBot:
+    def __init__(self, channel):
+        self.channel = channel
+
+    def get_channel(self, cid):
+        return self.channel
+
+    async def fetch_channel(self, cid):
+        return self.channel
+
+
+class DummyResponse:
+    def __init__(self, status):
+        self.status = status
+        self.reason = "error"
+
+
+def _embed(text):
+    return discord.Embed(title="Tracker", description=text)
+
+
+def test_requests_in_one_window_become_one_edit_with_the_latest_render():
+    channel = DummyChannel()
+    renders = []
+
+    def render(text):
+        def build():
+            renders.append(text)
+            return _embed(text)
+        return build
+
+    async def run():
+        refresher = EmbedRefresher(DummyBot(channel), window=0.05)
+        futures = [refresher.request(1, 10, render(f"v{n}")) for n in range(5)]
+        assert all(future is futures[0] for future in futures)
+        assert await futures[0] == embed_refresher.EDITED
+        return refresher
+
+    refresher = asyncio.run(run())
+
+    assert renders == ["v4"]
+    assert len(channel.edits) == 1
+    message_id, kwargs = channel.edits[0]
+    assert message_id == 10
+    assert kwargs["embeds"][0].description == "v4"
+    assert refresher.stats()["counters"]["coalesced"] == 4
+
+
+def test_unchanged_content_is_not_edited_unless_forced():
+    channel = DummyChannel()
+
+    async def run():
+        refresher = EmbedRefresher(DummyBot(channel), window=0)
+        refresher.remember(10, _embed("same"))
+        first = await refresher.request(1, 10, lambda: _embed("same"))
+        forced = await refresher.request(1, 10, lambda: [_embed("same")], force=True, view=None)
+        return first, forced
+
+    assert asyncio.run(run()) == (embed_refresher.UNCHANGED, embed_refresher.EDITED)
+    assert len(channel.edits) == 1
+    assert channel.edits[0][1]["view"] is None
+
+
+def test_deleted_message_calls_on_missing_and_retries_rate_limits(monkeypatch):
+    monkeypatch.setattr(embed_refresher, "retry_delay", lambda *a, **k: 0.0)
+    reposted = []
+    gone = DummyChannel(fail_with=[discord.NotFound(DummyResponse(404), "gone")])
+    limited = DummyChannel(fail_with=[discord.HTTPException(DummyResponse(429), "slow down")])
+
+    async def repost():
+        reposted.append(True)
+
+    async def run():
+        missing = await EmbedRefresher(DummyBot(gone), window=0).request(1, 10, lambda: _embed("x"), on_missing=repost)
+        retried = await EmbedRefresher(DummyBot(limited), window=0).request(1, 11, lambda: _embed("x"))
+        return missing, retried
+
+    assert asyncio.run(run()) == (embed_refresher.MISSING, embed_refresher.EDITED)
+    assert reposted == [True]
+    assert len(limited.edits) == 1
+
+
+def test_leaderboard_is_split_into_pages_within_discord_limits():
+    lines = [f"<@{10 ** 17 + n}> - **{n % 7}** entries" for n in range(400)]
+
+    pages = leaderboard_pages("Entry Tracker", lines, description="Everyone", footer="Updated live")
+
+    assert len(pages) > 1
+    assert [page.title for page in pages] == [f"Entry Tracker ({n}/{len(pages)})" for n in range(1, len(pages) + 1)]
+    assert pages[0].description == "Everyone" and pages[1].description is None
+    assert pages[-1].footer.text == "Updated live" and pages[0].footer.text is None
+    for page in pages:
+        assert len(page.fields) <= embed_refresher.FIELDS_PER_EMBED
+        assert len(page) <= embed_refresher.EMBED_TOTAL_LIMIT
+        assert all(len(field.value) <= embed_refresher.FIELD_VALUE_LIMIT for field in page.fields)
+    shown = [line for page in pages for field in page.fields for line in field.value.split("\n")]
+    assert shown == lines
+    first_field = len(pages[0].fields[0].value.split("\n"))
+    assert pages[0].fields[1].name.startswith(f"Leaderboard ({first_field + 1}-")
+    assert [page.title for page in leaderboard_pages("Entry Tracker", lines[:3])] == ["Entry Tracker"]
+
+
+def test_discarded_refresh_is_not_applied():
+    channel = DummyChannel()
+
+    async def run():
+        refresher = EmbedRefresher(DummyBot(channel), window=0.01)
+        future = refresher.request(1, 10, lambda: _embed("x"))
+        refresher.discard(1, 10)
+        await asyncio.sleep(0.03)
+        return await future
+
+    assert asyncio.run(run()) == embed_refresher.MISSING
+    assert channel.edits == []
@@ -0,0 +1,109 @@
+import asyncio
+import json
+
+import pytest
+
+discord = pytest.importorskip("discord")
+
+from COGS import EntriesTracker as entries_tracker_module
+from COGS.EntriesTracker import EntriesTracker
+from embed_refresher import EmbedRefresher
+
+
+class DummyMessage:
+    def __init__(self, channel, message_id):
+        self.channel = channel
+        self.id = message_id
+
+    async def edit(self, **kwargs):
+        self.channel.edits.append(self.id)
+
+    async def delete(self):
+        self.channel.deleted.append(self.id)
+
+
+class DummyChannel:
+    def __init__(self):
+        self.id = 5
+        self.name = "entries"
+        self.sent = []
+        self.edits = []
+        self.deleted = []
+
+    async def send(self, embed=None):
+        await asyncio.sleep(0)
+        self.sent.append(1000 + len(self.sent))
+        return DummyMessage(self, self.sent[-1])
+
+    def get_partial_message(self, message_id):
+        return DummyMessage(self, message_id)
+
+
+class DummyCategory:
+    def __init__(self, channel):
+        self.name = "World Cup Admin"
+        self.text_channels = [channel]
+
+
+class DummyGuild:
+    def __init__(self, channel):
+        self.id = 1
+        self.categories = [DummyCategory(channel)]
+
+
+class DummyBot:
+    def __init__(self, channel):
+        self.channel = channel
+        self.embeds = EmbedRefresher(self, window=0.01)
+
+    def get_channel(self, channel_id):
+        return self.channel
+
+
+@pytest.fixture
+def tracker(tmp_path, monkeypatch):
+    players = {str(10 ** 17 + n): {"username": f"p{n}", "teams": [{"team": "x"}] * (n % 3)} for n in range(400)}
+    (tmp_path / "players.json").write_text(json.dumps(players), encoding="utf-8")
+    monkeypatch.setattr(entries_tracker_module, "PLAYERS_FILE", tmp_path / "players.json")
+    monkeypatch.setattr(entries_tracker_module, "TRACKER_FILE", tmp_path / "entries_tracker.json")
+    channel = DummyChannel()
+    cog = EntriesTracker(DummyBot(channel))
+    builds = []
+    build_embeds = cog.build_embeds
+
+    async def counting_build():
+        builds.append(True)
+        return await build_embeds()
+
+    cog.build_embeds = counting_build
+    return cog, channel, DummyGuild(channel), builds, tmp_path / "entries_tracker.json"
+
+
+def test_concurrent_reposts_post_one_set_of_tracker_messages(tracker):
+    cog, channel, guild, _builds, tracker_file = tracker
+
+    async def run():
+        await asyncio.gather(*(cog.refresh_entries_embed(guild) for _ in range(4)))
+
+    asyncio.run(run())
+    recorded = json.loads(tracker_file.read_text(encoding="utf-8"))["1"]["message_ids"]
+    assert len(recorded) > 1
+    # Nothing was posted besides the recorded set, so nothing is orphaned.
+    assert channel.sent == recorded
+
+
+def test_a_burst_of_requests_renders_the_tracker_once(tracker):
+    cog, channel, guild, builds, _tracker_file = tracker
+
+    async def run():
+        await cog.refresh_entries_embed(guild)
+        builds.clear()
+        futures = [await cog.update_entries_embed(guild) for _ in range(5)]
+        assert all(future is futures[0] for future in futures)
+        return await futures[0]
+
+    outcomes = asyncio.run(run())
+    assert len(builds) == 1
+    assert len(outcomes) == len(channel.sent) > 1
+    # The freshly posted pages are unchanged, so no edit was needed.
+    assert channel.edits == []
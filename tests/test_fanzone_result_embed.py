@@ -1,7 +1,10 @@
+import json
+
 import pytest
 
 discord = pytest.importorskip("discord")
 
+import match_timeline
 from COGS.FanZoneAnnouncer import FanZoneAnnouncer
 
 
@@ -325,3 +328,52 @@ def test_owner_draw_dm_embed_uses_full_time_match_stats():
 
     assert embed.fields[0].name == "Match Stats"
     assert embed.fields[0].value == "**Half Time** - 45'"
+
+
+def test_result_embeds_load_live_stats_from_the_fixture_timeline(tmp_path):
+    """Queued results name the fixture; its events come from the timeline, or matches.json before one exists."""
+    announcer = FanZoneAnnouncer.__new__(FanZoneAnnouncer)
+    announcer.matches_path = str(tmp_path / "matches.json")
+    announcer.timelines_dir = str(tmp_path / "match_timelines")
+    legacy = [{"event_type": "goal", "label": "Goal", "country": "A", "match_time": "12"}]
+    (tmp_path / "matches.json").write_text(
+        json.dumps([{"id": "M1", "home": "A", "away": "B", "live_stats": legacy}]),
+        encoding="utf-8",
+    )
+
+    assert announcer._load_live_stats({"fixture_id": "M1"}) == legacy
+    assert announcer._load_live_stats({"fixture_id": "M1", "live_stats": []}) == []
+
+    match_timeline.seed(announcer.timelines_dir, "M1", legacy)
+    match_timeline.append(announcer.timelines_dir, "M1", {"event_type": "red_card", "label": "Red Card", "country": "B", "match_time": "5"})
+
+    assert [event["event_type"] for event in announcer._load_live_stats({"fixture_id": "M1"})] == ["red_card", "goal"]
+
+
+def test_owner_of_both_sides_gets_the_win_and_the_loss_dm(tmp_path):
+    """A split can leave one owner on both sides; neither DM may be deduped away."""
+    import asyncio
+    from types import SimpleNamespace
+
+    from outbound_scheduler import OutboundScheduler
+
+    announcer = FanZoneAnnouncer.__new__(FanZoneAnnouncer)
+    announcer.bot = SimpleNamespace()
+    announcer.bot.outbound = OutboundScheduler(announcer.bot, str(tmp_path))
+    win = announcer._dm_embed(True, "Spain", "Japan", None)
+    lose = announcer._dm_embed(False, "Japan", "Spain", None)
+
+    async def run():
+        announcer._dm_owners("fanzone_winner:M1:1", "win", ["7", "8"], win)
+        announcer._dm_owners("fanzone_winner:M1:1", "lose", ["7"], lose)
+        announcer._dm_owners("fanzone_winner:M1:1", "lose", ["7"], lose)
+        jobs = sorted(announcer.bot.outbound._jobs)
+        await announcer.bot.outbound.stop()
+        return jobs
+
+    assert asyncio.run(run()) == [
+        "fanzone_winner:M1:1:lose:7",
+        "fanzone_winner:M1:1:win:7",
+        "fanzone_winner:M1:1:win:8",
+    ]
+    assert announcer.bot.outbound.counters["deduped"] == 1
@@ -0,0 +1,81 @@
+import itertools
+
+import pytest
+
+import group_scenarios
+
+
+def _rows(table):
+    return [
+        {"team": team, "pts": pts, "gd": gd, "gf": gf, "tiebreak": order}
+        for order, (team, pts, gd, gf) in enumerate(table)
+    ]
+
+
+LAST_MATCHDAY = _rows([("Spain", 6, 4, 5), ("Japan", 3, 0, 2), ("Peru", 3, -1, 2), ("Ghana", 0, -3, 1)])
+
+
+def _guarantees(result, team, place):
+    item = next(item for item in result["teams"] if item["team"] == team)
+    return {tuple(entry["results"]): entry["by"] for entry in item["guarantees"][place]}
+
+
+def test_last_matchday_reports_what_each_team_needs():
+    result = group_scenarios.scenarios(LAST_MATCHDAY, [("Spain", "Ghana"), ("Japan", "Peru"), ("Spain", "Wales")])
+
+    assert result["fixtures"] == [{"home": "Spain", "away": "Ghana"}, {"home": "Japan", "away": "Peru"}]
+    assert result["goals"] == group_scenarios.MAX_GOALS
+    assert len(result["outcomes"]) == 9
+    spain = _guarantees(result, "Spain", "first")
+    # A win or a draw is enough on points; after a defeat only a Japan-Peru draw helps.
+    assert {results: by for results, by in spain.items() if results[0] != "away"} == dict.fromkeys(
+        itertools.product(("home", "draw"), ("home", "draw", "away")), "points")
+    assert spain[("away", "draw")] == "points"
+    assert ("away", "home") not in spain
+    # Japan and Peru level on four points: Japan stays ahead on goal difference.
+    assert _guarantees(result, "Japan", "top_two")[("home", "draw")] == "goals"
+    japan = next(item for item in result["teams"] if item["team"] == "Japan")
+    # Goal-based guarantees carry the bound they were checked up to.
+    assert all(entry["goals"] == group_scenarios.MAX_GOALS
+               for entry in japan["guarantees"]["top_two"] if entry["by"] == "goals")
+    assert ("home", "draw") not in _guarantees(result, "Peru", "top_two")
+    ghana = next(item for item in result["teams"] if item["team"] == "Ghana")
+    assert (ghana["best"], ghana["worst"], ghana["clinched"]) == (3, 4, None)
+    assert next(item for item in result["teams"] if item["team"] == "Spain")["clinched"] == "top_two"
+    assert {item["team"]: item["qualification"] for item in result["teams"]} == {
+        "Spain": "qualified", "Japan": None, "Peru": None, "Ghana": None,
+    }
+
+
+def test_a_settled_third_place_is_not_reported_as_qualified():
+    final = group_scenarios.scenarios(_rows([("A", 9, 6, 7), ("B", 6, 1, 4), ("C", 3, -2, 2), ("D", 0, -5, 0)]), [])
+
+    # Third place only goes through as one of the best thirds, decided by the other groups.
+    assert [item["qualification"] for item in final["teams"]] == ["qualified", "qualified", "third", "eliminated"]
+    assert final["teams"][2]["clinched"] == "top_three"
+
+
+def test_goal_bound_shrinks_with_the_fixtures_left():
+    assert [group_scenarios.goal_bound(k) for k in (1, 2, 4, 6)] == [5, 5, 3, 1]
+    with pytest.raises(ValueError):
+        group_scenarios.goal_bound(12)
+
+    result = group_scenarios.scenarios(_rows([(team, 0, 0, 0) for team in "ABCD"]), list(itertools.combinations("ABCD", 2)))
+
+    assert result["scorelines"] == 4 ** 6
+    assert len(result["outcomes"]) == 3 ** 6
+    assert all(item["clinched"] is None and (item["best"], item["worst"]) == (1, 4) for item in result["teams"])
+
+
+def test_scenarios_are_memoised_by_group_state():
+    fixtures = [("Spain", "Ghana"), ("Japan", "Peru")]
+    first = group_scenarios.scenarios(LAST_MATCHDAY, fixtures)
+    hits = group_scenarios.stats["hits"]
+
+    assert group_scenarios.scenarios([dict(row) for row in LAST_MATCHDAY], list(fixtures)) is first
+    assert group_scenarios.stats["hits"] == hits + 1
+    finished = group_scenarios.scenarios(LAST_MATCHDAY, [])
+    assert finished is not first
+    assert finished["outcomes"] == [{"results": [], "positions": {
+        "Spain": [1, 1], "Japan": [2, 2], "Peru": [3, 3], "Ghana": [4, 4],
+    }}]
@@ -0,0 +1,133 @@
+import asyncio
+
+import pytest
+
+discord = pytest.importorskip("discord")
+
+from guild_ops import (
+    PROGRESS_EVERY,
+    BulkExecutor,
+    channel_overwrite_ops,
+    overwrites_match,
+    plan_missing_roles,
+    plan_role_grants,
+    role_grant_ops,
+)
+
+
+class DummyRole:
+    def __init__(self, role_id, name=""):
+        self.id = role_id
+        self.name = name
+
+
+class DummyMember:
+    def __init__(self, member_id, roles):
+        self.id = member_id
+        self.roles = list(roles)
+        self.calls = []
+
+    async def add_roles(self, *roles, reason=None, atomic=True):
+        self.calls.append((tuple(r.id for r in roles), atomic))
+        self.roles.extend(roles)
+
+
+class DummyGuild:
+    def __init__(self, members, roles):
+        self.members = {m.id: m for m in members}
+        self.roles = {r.id: r for r in roles}
+
+    def get_member(self, member_id):
+        return self.members.get(member_id)
+
+    def get_role(self, role_id):
+        return self.roles.get(role_id)
+
+
+def test_correct_guild_plans_no_role_grants():
+    country, group = DummyRole(1, "Brazil"), DummyRole(2, "Group C")
+    member = DummyMember(10, [country, group])
+    guild = DummyGuild([member], [country, group])
+
+    assert plan_role_grants(guild, {10: {1, 2}}) == {}
+    assert role_grant_ops(guild, {}, "test") == []
+
+
+def test_missing_roles_for_one_member_are_granted_in_one_call():
+    country, group = DummyRole(1, "Brazil"), DummyRole(2, "Group C")
+    member = DummyMember(10, [])
+    absent = 99
+    guild = DummyGuild([member], [country, group])
+
+    missing = plan_role_grants(guild, {10: {1, 2}, absent: {1}})
+    assert missing == {10: [1, 2]}
+
+    result = asyncio.run(BulkExecutor("job").run(role_grant_ops(guild, missing, "test")))
+    assert result == {"applied": 2, "failed": 0}
+    assert member.calls == [((1, 2), False)]
+    assert plan_role_grants(guild, {10: {1, 2}}) == {}
+
+
+def test_progress_is_reported_every_batch_and_at_the_end():
+    roles = [DummyRole(1)]
+    members = [DummyMember(10 + n, []) for n in range(PROGRESS_EVERY * 2 + 3)]
+    guild = DummyGuild(members, roles)
+    seen = []
+
+    async def on_progress(done, total):
+        seen.append((done, total))
+
+    ops = role_grant_ops(guild, {m.id: [1] for m in members}, "test")
+    asyncio.run(BulkExecutor("job").run(ops, on_progress=on_progress))
+    total = len(members)
+    assert seen == [(PROGRESS_EVERY, total), (PROGRESS_EVERY * 2, total), (total, total)]
+
+
+def test_rerun_after_a_failure_applies_whatever_the_fresh_diff_contains():
+    role = DummyRole(5)
+    show = {role: discord.PermissionOverwrite(view_channel=True)}
+    hide = {role: discord.PermissionOverwrite(view_channel=False)}
+
+    class FlakyChannel:
+        def __init__(self, channel_id, fail=False):
+            self.id = channel_id
+            self.overwrites = {}
+            self.fail = fail
+
+        async def edit(self, overwrites):
+            if self.fail:
+                self.fail = False
+                raise RuntimeError("boom")
+            self.overwrites = overwrites
+
+    channels = [FlakyChannel(1), FlakyChannel(2, fail=True)]
+
+    def stage(overwrites):
+        return asyncio.run(BulkExecutor("stage").run(channel_overwrite_ops((c, overwrites) for c in channels)))
+
+    assert stage(show) == {"applied": 1, "failed": 1}
+    assert stage(hide) == {"applied": 2, "failed": 0}
+    # Channel 1 was shown by the failed run, but hiding it since means it needs showing again.
+    assert stage(show) == {"applied": 2, "failed": 0}
+    assert all(overwrites_match(c.overwrites, show) for c in channels)
+
+
+def test_plan_missing_roles_dedupes_and_keeps_order():
+    assert plan_missing_roles({"Group A"}, ["Group A", "Group B", "Brazil", "Group B"]) == ["Group B", "Brazil"]
+
+
+def test_channel_ops_skip_channels_with_matching_overwrites():
+    role = DummyRole(5)
+    desired = {role: discord.PermissionOverwrite(view_channel=True, send_messages=False)}
+
+    class DummyChannel:
+        def __init__(self, channel_id, overwrites):
+            self.id = channel_id
+            self.overwrites = overwrites
+
+    same = DummyChannel(1, {DummyRole(5): discord.PermissionOverwrite(send_messages=False, view_channel=True)})
+    different = DummyChannel(2, {DummyRole(5): discord.PermissionOverwrite(view_channel=False)})
+
+    assert overwrites_match(same.overwrites, desired)
+    ops = channel_overwrite_ops([(same, desired), (different, desired)])
+    assert [op.route for op in ops] == ["channel:2"]
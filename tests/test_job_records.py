@@ -0,0 +1,29 @@
+import json
+
+import job_records
+from job_records import JobRecords
+
+
+def _write(path, records):
+    path.write_text(json.dumps({"jobs": records}), encoding="utf-8")
+
+
+def test_restart_fails_or_resumes_interrupted_records_per_queue(tmp_path):
+    path = tmp_path / "jobs.json"
+    _write(path, [{"id": "a", "s": "running"}, {"id": "b", "s": "queued"}, {"id": "c", "s": "done"}])
+
+    failed = JobRecords(path, state_key="s", active=("queued", "running"), keep=10, on_restart=job_records.FAIL)
+    assert [r["s"] for r in failed.load()] == ["failed", "failed", "done"]
+    assert failed.find("a")["error"] == "interrupted by a launcher restart"
+
+    resumed = JobRecords(path, state_key="s", active=("queued", "running"), keep=10, on_restart=job_records.RESUME)
+    assert [r["s"] for r in resumed.load()] == ["queued", "queued", "done"]
+
+
+def test_save_keeps_active_records_and_the_newest_finished_ones(tmp_path):
+    path = tmp_path / "sub" / "jobs.json"
+    records = JobRecords(path, state_key="s", active=("queued",), keep=2, on_restart=job_records.RESUME)
+    records.load().extend([{"id": str(n), "s": "queued" if n == 0 else "done"} for n in range(5)])
+    records.save()
+    stored = json.loads(path.read_text(encoding="utf-8"))["jobs"]
+    assert [r["id"] for r in stored] == ["0", "3", "4"]
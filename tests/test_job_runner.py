@@ -0,0 +1,95 @@
+import json
+import threading
+
+import pytest
+
+import job_runner
+from job_runner import JobError, JobRunner
+
+
+def test_jobs_report_progress_and_results(tmp_path):
+    runner = JobRunner(tmp_path / "jobs.json", workers=1)
+
+    def work(job):
+        job.progress(1, 2, "half way")
+        return {"total": job.params["a"] + job.params["b"], "square": job.offload(pow, 3, 2)}
+
+    runner.register("add", work)
+    record = runner.submit("add", {"a": 2, "b": 3}, user="admin (1)")
+    assert record["state"] in ("queued", "running")
+
+    done = runner.wait(record["id"], 5)
+    assert done["state"] == "done"
+    assert done["result"] == {"total": 5, "square": 9}
+    assert done["progress"] == {"done": 1, "total": 2, "message": "half way"}
+    stored = json.loads((tmp_path / "jobs.json").read_text(encoding="utf-8"))["jobs"]
+    assert stored[0]["state"] == "done" and stored[0]["user"] == "admin (1)"
+
+
+def test_duplicate_keys_share_the_active_job_and_queued_jobs_cancel(tmp_path):
+    runner = JobRunner(tmp_path / "jobs.json", workers=1)
+    release = threading.Event()
+    started = threading.Event()
+
+    def slow(job):
+        started.set()
+        release.wait(5)
+        job.check_cancelled()
+        return "finished"
+
+    runner.register("slow", slow)
+    first = runner.submit("slow", key="backups")
+    assert started.wait(5)
+    assert runner.submit("slow", key="backups")["id"] == first["id"]
+    queued = runner.submit("slow", key="other")
+
+    assert runner.cancel(queued["id"])["state"] == "cancelled"
+    assert runner.cancel(first["id"])["cancel_requested"] is True
+    release.set()
+
+    assert runner.wait(first["id"], 5)["state"] == "cancelled"
+    assert runner.wait(queued["id"], 5)["state"] == "cancelled"
+    assert runner.cancel("missing") is None
+    after = runner.submit("slow", key="backups")
+    assert after["id"] != first["id"]
+    assert runner.wait(after["id"], 5)["result"] == "finished"
+
+
+def test_failures_keep_their_error_and_details(tmp_path):
+    runner = JobRunner(tmp_path / "jobs.json", workers=1)
+
+    def discord(job):
+        raise JobError("discord_error (403)", status=403)
+
+    def missing(job):
+        raise FileNotFoundError("Backup not found")
+
+    runner.register("post", discord)
+    runner.register("restore", missing)
+
+    posted = runner.wait(runner.submit("post")["id"], 5)
+    assert posted["state"] == "failed"
+    assert posted["error"] == "discord_error (403)"
+    assert posted["result"] == {"status": 403}
+
+    restored = runner.wait(runner.submit("restore")["id"], 5)
+    assert restored["error"] == "Backup not found"
+    assert restored["error_type"] == "FileNotFoundError"
+
+
+def test_unfinished_jobs_are_failed_after_a_restart(tmp_path, monkeypatch):
+    path = tmp_path / "jobs.json"
+    path.write_text(json.dumps({"jobs": [
+        {"id": "a", "kind": "post", "state": "running"},
+        {"id": "b", "kind": "post", "state": "done", "result": {"message_id": "9"}},
+    ]}), encoding="utf-8")
+
+    runner = JobRunner(path)
+    assert runner.get("a")["state"] == "failed"
+    assert runner.get("a")["error"] == "interrupted by a launcher restart"
+    assert [record["id"] for record in runner.list()] == ["b", "a"]
+
+    monkeypatch.setattr(job_runner, "MAX_QUEUED", 0)
+    runner.register("post", lambda job: None)
+    with pytest.raises(job_runner.QueueFull):
+        runner.submit("post")
@@ -0,0 +1,53 @@
+import json
+
+import pytest
+
+import json_codec
+
+BACKENDS = ["json"] + (["orjson"] if json_codec.orjson is not None else [])
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    previous = json_codec.backend()
+    json_codec.set_backend(request.param)
+    yield request.param
+    json_codec.set_backend(previous)
+
+
+def test_compact_by_default_and_pretty_on_request(backend):
+    doc = {"team": "Côte d'Ivoire", "scores": [1, 2], "live_stats": {"xg": 1.5}}
+
+    compact = json_codec.dumps(doc)
+    assert b"\n" not in compact and b": " not in compact
+    assert compact.decode("utf-8") == json.dumps(doc, ensure_ascii=False, separators=(",", ":"))
+
+    pretty = json_codec.dumps(doc, pretty=True)
+    assert pretty.count(b"\n") > 3
+    assert json_codec.loads(pretty) == json_codec.loads(compact) == doc
+
+
+def test_backends_read_each_others_files_and_legacy_stdlib_output(backend):
+    doc = {"1": {"teams": ["Brazil"]}, "nan": float("nan")}
+    # Files written by the old stdlib writer (indented, NaN literal).
+    legacy = json.dumps(doc, indent=4)
+    loaded = json_codec.loads(legacy)
+    assert loaded["1"] == {"teams": ["Brazil"]} and loaded["nan"] != loaded["nan"]
+
+    with pytest.raises(ValueError):
+        json_codec.loads("{not json")
+
+
+def test_non_string_keys_and_wide_integers(backend):
+    assert json_codec.loads(json_codec.dumps({1: "a"})) == {"1": "a"}
+    assert json_codec.loads(json_codec.dumps({"id": 2 ** 70})) == {"id": 2 ** 70}
+
+
+def test_write_file_is_atomic_and_reports_size(backend, tmp_path):
+    path = tmp_path / "nested" / "matches.json"
+    size = json_codec.write_file(path, [{"id": "m1"}])
+
+    assert path.read_bytes() == b'[{"id":"m1"}]'
+    assert size == path.stat().st_size
+    assert not (tmp_path / "nested" / "matches.json.tmp").exists()
+    assert json_codec.read_file(path) == ([{"id": "m1"}], size)
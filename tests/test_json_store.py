@@ -0,0 +1,184 @@
+import asyncio
+import json
+import os
+
+from json_store import JsonStore, clone
+from queue_utils import read_queue_chunk
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_read_missing_or_invalid_returns_copy_of_default(tmp_path):
+    store = JsonStore()
+    default = {"items": []}
+
+    doc = _run(store.read(tmp_path / "missing.json", default))
+    doc["items"].append(1)
+    assert default == {"items": []}
+
+    bad = tmp_path / "bad.json"
+    bad.write_text("{not json", encoding="utf-8")
+    assert _run(store.read(bad, [])) == []
+    assert store.stats["load_errors"] == 1
+
+
+def test_read_caches_until_file_changes(tmp_path):
+    store = JsonStore()
+    path = tmp_path / "doc.json"
+    path.write_text(json.dumps({"a": 1}), encoding="utf-8")
+
+    assert _run(store.read(path)) == {"a": 1}
+    assert _run(store.read(path)) == {"a": 1}
+    assert store.stats["loads"] == 1
+    assert store.stats["cache_hits"] == 1
+
+    # Written by another process (e.g. the launcher).
+    path.write_text(json.dumps({"a": 2, "b": [1]}), encoding="utf-8")
+    assert _run(store.read(path)) == {"a": 2, "b": [1]}
+    assert store.stats["loads"] == 2
+
+
+def test_reads_are_isolated_unless_copy_disabled(tmp_path):
+    store = JsonStore()
+    path = tmp_path / "doc.json"
+    path.write_text(json.dumps({"list": [1]}), encoding="utf-8")
+
+    first = _run(store.read(path))
+    first["list"].append(2)
+    assert _run(store.read(path)) == {"list": [1]}
+
+    shared = _run(store.read(path, copy=False))
+    assert shared is _run(store.read(path, copy=False))
+
+
+def test_write_is_atomic_and_primes_cache(tmp_path):
+    store = JsonStore()
+    path = tmp_path / "nested" / "doc.json"
+    data = {"x": [1, 2]}
+
+    written = _run(store.write(path, data))
+    data["x"].append(3)
+
+    st = os.stat(path)
+    assert written == (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    assert json.loads(path.read_text(encoding="utf-8")) == {"x": [1, 2]}
+    assert not (tmp_path / "nested" / "doc.json.tmp").exists()
+    assert _run(store.read(path)) == {"x": [1, 2]}
+    assert store.stats["loads"] == 0
+
+
+def test_concurrent_updates_are_serialized(tmp_path):
+    store = JsonStore(max_workers=4)
+    path = tmp_path / "counter.json"
+
+    def bump(doc):
+        doc["n"] = doc.get("n", 0) + 1
+
+    async def main():
+        await asyncio.gather(*(store.update(path, bump, {}) for _ in range(25)))
+        await store.stop()
+
+    _run(main())
+    assert json.loads(path.read_text(encoding="utf-8")) == {"n": 25}
+
+
+def test_update_accepts_replacement_document(tmp_path):
+    store = JsonStore()
+    path = tmp_path / "list.json"
+
+    result = _run(store.update(path, lambda doc: doc + [1], []))
+    assert result == [1]
+    assert json.loads(path.read_text(encoding="utf-8")) == [1]
+
+
+def test_deferred_writes_coalesce_and_flush(tmp_path):
+    store = JsonStore(flush_interval=60)
+    path = tmp_path / "log.json"
+
+    async def main():
+        store.start()
+        for i in range(3):
+            await store.update(path, lambda doc, i=i: doc + [i], [], defer=True)
+        # Visible to readers before it reaches the disk.
+        assert await store.read(path) == [0, 1, 2]
+        assert not path.exists()
+        await store.flush()
+        assert json.loads(path.read_text(encoding="utf-8")) == [0, 1, 2]
+        await store.stop()
+
+    _run(main())
+    assert store.stats["deferred"] == 3
+    assert store.stats["coalesced"] == 2
+    assert store.stats["writes"] == 1
+
+
+def test_write_through_supersedes_pending_deferred_write(tmp_path):
+    store = JsonStore(flush_interval=60)
+    path = tmp_path / "doc.json"
+
+    async def main():
+        store.start()
+        await store.write(path, {"v": "old"}, defer=True)
+        await store.write(path, {"v": "new"})
+        await store.stop()
+
+    _run(main())
+    assert json.loads(path.read_text(encoding="utf-8")) == {"v": "new"}
+    assert store.snapshot()["pending"] == 0
+
+
+def test_defer_without_flush_loop_writes_immediately(tmp_path):
+    store = JsonStore()
+    path = tmp_path / "doc.json"
+
+    _run(store.write(path, {"a": 1}, defer=True))
+    assert json.loads(path.read_text(encoding="utf-8")) == {"a": 1}
+
+
+def test_stop_flushes_pending_writes(tmp_path):
+    store = JsonStore(flush_interval=60)
+    path = tmp_path / "doc.json"
+
+    async def main():
+        store.start()
+        await store.write(path, {"a": 1}, defer=True)
+        await store.stop()
+
+    _run(main())
+    assert json.loads(path.read_text(encoding="utf-8")) == {"a": 1}
+    assert store.snapshot()["write_behind"] is False
+
+
+def test_ensure_creates_missing_file(tmp_path):
+    store = JsonStore()
+    path = tmp_path / "verified.json"
+
+    assert _run(store.ensure(path, {"verified_users": []})) == {"verified_users": []}
+    assert json.loads(path.read_text(encoding="utf-8")) == {"verified_users": []}
+    path.write_text(json.dumps({"verified_users": [1]}), encoding="utf-8")
+    assert _run(store.ensure(path, {"verified_users": []})) == {"verified_users": [1]}
+
+
+def test_clone_copies_nested_containers():
+    doc = {"a": [{"b": 1}], "c": "x"}
+    copied = clone(doc)
+    copied["a"][0]["b"] = 2
+    assert doc == {"a": [{"b": 1}], "c": "x"}
+
+
+def test_read_queue_chunk_tracks_offset_and_resets_after_truncation(tmp_path):
+    queue = tmp_path / "bot_commands.jsonl"
+    assert read_queue_chunk(str(queue), 0) == (None, 0)
+
+    queue.write_text('{"kind": "a"}\n', encoding="utf-8")
+    chunk, offset = read_queue_chunk(str(queue), 0)
+    assert chunk == '{"kind": "a"}\n'
+    assert offset == queue.stat().st_size
+
+    assert read_queue_chunk(str(queue), offset) == ("", offset)
+
+    queue.write_text("", encoding="utf-8")
+    assert read_queue_chunk(str(queue), offset) == ("", 0)
@@ -0,0 +1,80 @@
+import pytest
+
+from list_query import ListQuery, ListQueryError, ListSpec, casefold_in
+
+ITEMS = [
+    {"id": "m3", "stage": "Group Stage", "utc": "2026-06-13T18:00:00Z", "home": "Spain"},
+    {"id": "m1", "stage": "Group Stage", "utc": "2026-06-11T18:00:00Z", "home": "Mexico"},
+    {"id": "m4", "stage": "Round of 32", "utc": None, "home": "Brazil"},
+    {"id": "m2", "stage": "Group Stage", "utc": "2026-06-11T18:00:00Z", "home": "Canada"},
+]
+
+SPEC = ListSpec(
+    id_of=lambda f: f["id"],
+    sorts={"kickoff": lambda f: f.get("utc"), "id": lambda f: f["id"]},
+    filters={"stage": casefold_in(lambda f: f.get("stage"))},
+)
+
+
+def _walk(args):
+    pages, cursor = [], None
+    while True:
+        query = ListQuery.parse({**args, **({"cursor": cursor} if cursor else {})}, SPEC)
+        page = query.apply(iter(ITEMS))
+        pages.append([item["id"] for item in page.items])
+        cursor = page.next_cursor
+        if not cursor:
+            return pages
+
+
+def test_plain_query_keeps_source_order():
+    page = ListQuery.parse({}, SPEC).apply(ITEMS)
+    assert [item["id"] for item in page.items] == ["m3", "m1", "m4", "m2"]
+    assert page.next_cursor is None and page.total == 4 and not page.paged
+
+
+def test_cursor_pages_cover_sorted_list_once():
+    # Equal kickoffs fall back to the id; missing kickoffs sort last.
+    assert _walk({"sort": "kickoff", "limit": "2"}) == [["m1", "m2"], ["m3", "m4"]]
+    assert _walk({"sort": "-kickoff", "limit": "3"}) == [["m4", "m3", "m2"], ["m1"]]
+    assert _walk({"limit": "3"}) == [["m3", "m1", "m4"], ["m2"]]
+
+
+def test_filters_and_projection():
+    query = ListQuery.parse({"stage": "group stage", "fields": "id,home", "sort": "id"}, SPEC)
+    page = query.apply(ITEMS)
+    assert page.items == [{"id": "m1", "home": "Mexico"}, {"id": "m2", "home": "Canada"}, {"id": "m3", "home": "Spain"}]
+    assert page.total == 3
+
+
+def test_transform_runs_on_page_before_projection():
+    seen = []
+
+    def enrich(page):
+        seen.extend(item["id"] for item in page)
+        return [{**item, "label": item["home"].upper()} for item in page]
+
+    query = ListQuery.parse({"limit": "1", "sort": "id", "fields": "label"}, SPEC)
+    assert query.apply(ITEMS, transform=enrich).items == [{"label": "MEXICO"}]
+    assert seen == ["m1"]
+
+
+@pytest.mark.parametrize("args", [
+    {"limit": "abc"},
+    {"limit": "0"},
+    {"sort": "colour"},
+    {"cursor": "not-a-cursor"},
+])
+def test_bad_parameters_raise(args):
+    with pytest.raises(ListQueryError):
+        ListQuery.parse(args, SPEC)
+
+
+def test_cursor_is_tied_to_its_sort_order():
+    page = ListQuery.parse({"sort": "id", "limit": "1"}, SPEC).apply(ITEMS)
+    with pytest.raises(ListQueryError):
+        ListQuery.parse({"sort": "kickoff", "cursor": page.next_cursor}, SPEC)
+
+
+def test_limit_is_capped():
+    assert ListQuery.parse({"limit": "10000"}, SPEC, max_limit=50).limit == 50
@@ -0,0 +1,84 @@
+import gzip
+import io
+import logging
+
+from log_capture import BotLogCapture, LogRing
+from log_tail import LogFilter
+
+FMT = "%(asctime)s %(levelname)s %(name)s %(module)s.%(funcName)s:%(lineno)d: %(message)s"
+
+
+def test_ring_cursor_returns_only_new_lines_and_detects_overflow():
+    ring = LogRing(maxlen=3)
+    for i in range(2):
+        ring.append(f"line {i}")
+    lines, cursor = ring.tail(10)
+    assert lines == ["line 0", "line 1"] and cursor == 2
+
+    ring.append("line 2")
+    assert ring.read_since(cursor) == (["line 2"], 3, False)
+
+    # Four more lines push the cursor's position out of the buffer.
+    for i in range(3, 7):
+        ring.append(f"line {i}")
+    assert ring.read_since(3) == ([], 7, True)
+    assert ring.tail(2) == (["line 5", "line 6"], 7)
+
+
+def test_ring_tail_applies_filter():
+    ring = LogRing()
+    ring.append("2026-06-11 18:00:00,000 | INFO | WorldCupBot | bot.run:1 | ok")
+    ring.append("2026-06-11 18:00:01,000 | ERROR | WorldCupBot | bot.run:2 | bad")
+    lines, _ = ring.tail(10, LogFilter(level="ERROR"))
+    assert [line.rsplit("| ", 1)[-1] for line in lines] == ["bad"]
+
+
+def test_ring_verdict_judges_lines_after_the_cursor_by_the_header_before_it():
+    ring = LogRing(maxlen=10)
+    ring.append("2026-06-11 18:00:01,000 | ERROR | WorldCupBot | fanzone.post:22 | boom")
+    ring.append("Traceback (most recent call last):")
+    cursor = 2
+    ring.append('  File "fanzone.py", line 22, in post')
+
+    assert ring.verdict(LogFilter(level="ERROR"), cursor)
+    assert not ring.verdict(LogFilter(logger="discord"), cursor)
+    assert LogRing().verdict(LogFilter(level="ERROR"), 0) is False
+
+
+def test_capture_pumps_child_output_and_launcher_records_through_one_writer(tmp_path):
+    path = tmp_path / "bot.log"
+    capture = BotLogCapture(path, FMT)
+    logger = logging.getLogger("test_log_capture.bot")
+    logger.propagate = False
+    for h in capture.handlers:
+        logger.addHandler(h)
+
+    logger.warning("Started bot.py")
+    capture.attach(io.BytesIO(b"2026 | INFO | WorldCupBot | bot.run:1 | ready\r\nsecond\n")).join(timeout=5)
+
+    lines, _ = capture.ring.tail(10)
+    assert lines[0].endswith("Started bot.py")
+    assert lines[1:] == ["2026 | INFO | WorldCupBot | bot.run:1 | ready", "second"]
+    assert path.read_text(encoding="utf-8").splitlines() == lines
+
+    capture.clear()
+    assert capture.ring.tail(10)[0] == []
+    capture.write_line("after clear")
+    assert path.read_text(encoding="utf-8") == "after clear\n"
+    for h in capture.handlers:
+        logger.removeHandler(h)
+    capture.file_handler.close()
+
+
+def test_capture_rotates_and_compresses(tmp_path):
+    path = tmp_path / "bot.log"
+    capture = BotLogCapture(path, FMT, max_bytes=100, backup_count=2, compress=True)
+    for i in range(30):
+        capture.write_line(f"line {i:02d} " + "x" * 20)
+    capture.file_handler.close()
+
+    assert path.stat().st_size <= 100
+    rotated = sorted(p.name for p in tmp_path.iterdir() if p.name != "bot.log")
+    assert rotated == ["bot.log.1.gz", "bot.log.2.gz"]
+    with gzip.open(tmp_path / "bot.log.1.gz", "rt", encoding="utf-8") as f:
+        assert f.read().startswith("line ")
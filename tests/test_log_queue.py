@@ -0,0 +1,111 @@
+import json
+import logging
+import threading
+
+from log_queue import POLICY_DROP_OLDEST, AsyncLogging, JsonFormatter, parse_sample_rates
+from log_tail import LogFilter
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+
+    def emit(self, record):
+        self.lines.append(self.format(record))
+
+
+class _BlockingHandler(_ListHandler):
+    def __init__(self, gate):
+        super().__init__()
+        self.gate = gate
+
+    def emit(self, record):
+        self.gate.wait(timeout=5)
+        super().emit(record)
+
+
+def _logger(name, handler):
+    logger = logging.getLogger(name)
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    return logger
+
+
+def test_records_are_written_by_their_own_route():
+    async_log = AsyncLogging()
+    first, second = _ListHandler(), _ListHandler()
+    a = _logger("test_log_queue.a", async_log.handler(first))
+    b = _logger("test_log_queue.b", async_log.handler(second))
+    async_log.start()
+    a.info("one %s", 1)
+    b.warning("two")
+    async_log.stop()
+
+    assert first.lines == ["one 1"]
+    assert second.lines == ["two"]
+    assert async_log.snapshot()["enqueued"] == 2
+
+
+def test_full_queue_drops_instead_of_blocking():
+    gate = threading.Event()
+    target = _BlockingHandler(gate)
+    async_log = AsyncLogging(maxsize=2)
+    logger = _logger("test_log_queue.full", async_log.handler(target))
+    async_log.start()
+    for i in range(10):
+        logger.info("msg %d", i)
+    gate.set()
+    async_log.stop()
+
+    stats = async_log.snapshot()
+    assert stats["dropped"] > 0
+    assert stats["dropped"] + len(target.lines) == 10
+
+
+def test_drop_oldest_keeps_the_newest_records():
+    target = _ListHandler()
+    async_log = AsyncLogging(maxsize=3, policy=POLICY_DROP_OLDEST)
+    logger = _logger("test_log_queue.oldest", async_log.handler(target))
+    for i in range(6):
+        logger.info("msg %d", i)
+    async_log.start()
+    async_log.stop()
+
+    assert target.lines == ["msg 3", "msg 4", "msg 5"]
+    assert async_log.snapshot()["dropped"] == 3
+
+
+def test_sampling_thins_noisy_loggers_but_keeps_warnings():
+    target = _ListHandler()
+    async_log = AsyncLogging(sample_rates="test_log_queue.noisy=5")
+    handler = async_log.handler(target)
+    noisy = _logger("test_log_queue.noisy.child", handler)
+    quiet = _logger("test_log_queue.quiet", handler)
+    async_log.start()
+    for _ in range(20):
+        noisy.info("tick")
+    noisy.warning("slow tick")
+    quiet.info("kept")
+    async_log.stop()
+
+    assert target.lines.count("tick") == 4
+    assert "slow tick" in target.lines and "kept" in target.lines
+    assert async_log.snapshot()["sampled_out"] == 16
+    assert parse_sample_rates({"werkzeug": "10", "x": 1, "y": "bad"}) == {"werkzeug": 10}
+
+
+def test_json_formatter_lines_are_filterable():
+    target = _ListHandler()
+    target.setFormatter(JsonFormatter())
+    async_log = AsyncLogging()
+    logger = _logger("test_log_queue.json", async_log.handler(target))
+    async_log.start()
+    logger.error("boom")
+    logger.info("fine")
+    async_log.stop()
+
+    payload = json.loads(target.lines[0])
+    assert (payload["level"], payload["logger"], payload["msg"]) == ("ERROR", "test_log_queue.json", "boom")
+    assert LogFilter(level="ERROR", logger="test_log_queue").apply(target.lines) == target.lines[:1]
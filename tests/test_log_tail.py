@@ -0,0 +1,92 @@
+import log_tail
+
+BOT_LINES = [
+    "2026-06-11 18:00:00,000 | INFO | WorldCupBot | bot.setup_hook:10 | ready",
+    "2026-06-11 18:00:01,000 | ERROR | WorldCupBot.cogs | fanzone.post:22 | boom",
+    "Traceback (most recent call last):",
+    '  File "fanzone.py", line 22, in post',
+    "2026-06-11 18:00:02,000 | INFO | discord.gateway | gateway.poll:5 | heartbeat",
+]
+
+
+def _write(tmp_path, lines, trailing=True):
+    path = tmp_path / "bot.log"
+    path.write_text("\n".join(lines) + ("\n" if trailing else ""), encoding="utf-8")
+    return str(path)
+
+
+def test_tail_reads_across_block_boundaries(tmp_path, monkeypatch):
+    monkeypatch.setattr(log_tail, "BLOCK_SIZE", 16)
+    lines = [f"line {i:04d} " + "x" * (i % 7) for i in range(200)]
+    path = _write(tmp_path, lines)
+
+    tail, cursor = log_tail.tail(path, 25)
+
+    assert tail == lines[-25:]
+    assert cursor == (tmp_path / "bot.log").stat().st_size
+
+
+def test_read_since_returns_complete_lines_and_detects_truncation(tmp_path):
+    path = _write(tmp_path, BOT_LINES[:1])
+    _, cursor = log_tail.tail(path, 10)
+
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(BOT_LINES[1] + "\n" + "partial")
+    lines, cursor, reset = log_tail.read_since(path, cursor)
+    assert lines == [BOT_LINES[1]] and not reset
+
+    # The half-written line is held back until its newline arrives.
+    assert log_tail.read_since(path, cursor) == ([], cursor, False)
+
+    open(path, "w").close()
+    assert log_tail.read_since(path, cursor) == ([], 0, True)
+
+
+def test_filter_keeps_traceback_with_its_record(tmp_path):
+    path = _write(tmp_path, BOT_LINES)
+
+    errors, _ = log_tail.tail(path, 10, log_tail.LogFilter(level="error"))
+    assert errors == BOT_LINES[1:4]
+
+    gateway, _ = log_tail.tail(path, 10, log_tail.LogFilter(logger="discord"))
+    assert gateway == BOT_LINES[4:]
+
+    assert log_tail.LogFilter(level="WARNING").apply(BOT_LINES) == BOT_LINES[1:4]
+    assert log_tail.LogFilter(pattern="heart").apply(BOT_LINES) == BOT_LINES[4:]
+
+
+def test_filter_parses_launcher_format_and_rejects_bad_input():
+    line = "2026-06-11 18:00:00,000 WARNING launcher launcher.watchdog:40: bot restarted"
+    assert log_tail.LogFilter(level="WARNING", logger="launcher").apply([line]) == [line]
+
+    for kwargs, error in (({"pattern": "("}, "invalid_regex"), ({"level": "LOUD"}, "invalid_level")):
+        try:
+            log_tail.LogFilter(**kwargs)
+        except ValueError as e:
+            assert str(e) == error
+        else:
+            raise AssertionError("expected ValueError")
+
+
+def test_read_since_advances_past_a_line_longer_than_one_read(tmp_path):
+    path = _write(tmp_path, ["x" * 100], trailing=False)
+
+    lines, cursor, _ = log_tail.read_since(path, 0, max_bytes=64)
+    assert lines == ["x" * 64] and cursor == 64
+    # What is left fits in one read but is still unfinished, so it waits.
+    assert log_tail.read_since(path, cursor, max_bytes=64) == ([], 64, False)
+
+
+def test_traceback_split_across_polls_keeps_its_record_verdict(tmp_path):
+    path = _write(tmp_path, BOT_LINES[:3])
+    flt = log_tail.LogFilter(level="error")
+    _, cursor = log_tail.tail(path, 10, flt)
+
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("\n".join(BOT_LINES[3:]) + "\n")
+    lines, _, _ = log_tail.read_since(path, cursor)
+    assert flt.apply(lines, flt.verdict_at(path, cursor)) == [BOT_LINES[3]]
+
+    # Continuation lines after a rejected record stay out.
+    info_cursor = len((BOT_LINES[0] + "\n").encode("utf-8"))
+    assert not flt.verdict_at(path, info_cursor)
@@ -0,0 +1,59 @@
+import asyncio
+import time
+import traceback
+
+from loop_monitor import StallDetector, cog_from_stack
+
+
+def _blocking_json_load():
+    time.sleep(0.3)
+
+
+def test_detects_stall_and_captures_blocking_stack():
+    detector = StallDetector(threshold=0.1, interval=0.02)
+
+    async def main():
+        detector.start()
+        await asyncio.sleep(0.1)
+
+        async def offender():
+            _blocking_json_load()
+
+        await asyncio.create_task(offender(), name="fanzone-loop")
+        await asyncio.sleep(0.1)
+        await detector.stop()
+
+    asyncio.run(main())
+    snap = detector.snapshot()
+
+    assert snap["stalls"] >= 1
+    assert snap["max_stall_ms"] >= 250
+    event = snap["recent"][-1]
+    assert event["task"] == "fanzone-loop"
+    assert event["duration_ms"] >= 250
+    assert "_blocking_json_load" in "".join(event["stack"])
+    assert event["where"].startswith("test_loop_monitor.py")
+
+
+def test_healthy_loop_records_lag_without_stalls():
+    detector = StallDetector(threshold=0.2, interval=0.01)
+
+    async def main():
+        detector.start()
+        await asyncio.sleep(0.15)
+        await detector.stop()
+
+    asyncio.run(main())
+    snap = detector.snapshot()
+    assert snap["beats"] > 5
+    assert snap["stalls"] == 0 and snap["recent"] == []
+
+
+def test_cog_from_stack_picks_innermost_cog_frame():
+    frames = [
+        traceback.FrameSummary("/app/WorldCupBot/bot.py", 10, "run"),
+        traceback.FrameSummary("/app/WorldCupBot/COGS/SplitOwnership.py", 20, "cleanup_requests"),
+        traceback.FrameSummary("/usr/lib/python3.11/json/__init__.py", 293, "load"),
+    ]
+    assert cog_from_stack(frames) == "SplitOwnership"
+    assert cog_from_stack(frames[:1]) is None
@@ -0,0 +1,81 @@
+import json
+
+import match_timeline
+
+
+def _kinds(timeline):
+    return [(event["event_type"], event.get("match_time")) for event in timeline.view()]
+
+
+def test_load_falls_back_to_legacy_events_until_seeded(tmp_path):
+    calls = []
+    legacy = [
+        {"event_type": "goal", "country": "A", "match_time": "50"},
+        {"event_type": "half_time", "match_time": ""},
+    ]
+
+    def load_legacy():
+        calls.append(1)
+        return legacy
+
+    timeline = match_timeline.load(tmp_path, "M1", load_legacy)
+    assert not timeline.logged
+    assert _kinds(timeline) == [("half_time", ""), ("goal", "50")]
+
+    seeded = match_timeline.seed(tmp_path, "M1", legacy)
+    assert seeded.logged and all(event.get("id") for event in seeded.events)
+    assert _kinds(match_timeline.load(tmp_path, "M1", load_legacy)) == [("half_time", ""), ("goal", "50")]
+    assert len(calls) == 1
+
+
+def test_appends_are_read_incrementally_in_match_clock_order(tmp_path):
+    match_timeline.seed(tmp_path, "M2")
+    match_timeline.append(tmp_path, "M2", {"event_type": "goal", "country": "A", "match_time": "66"})
+    first = match_timeline.append(tmp_path, "M2", {"event_type": "yellow_card", "country": "B", "match_time": "34"})
+    assert _kinds(first) == [("yellow_card", "34"), ("goal", "66")]
+
+    # Another process appends a line, then starts one it has not finished.
+    path = match_timeline.path_for(tmp_path, "M2")
+    with open(path, "ab") as f:
+        f.write(json.dumps({"id": "x1", "event_type": "goal", "country": "B", "match_time": "45+2"}).encode() + b"\n")
+        f.write(b'{"id": "x2", "event_type": "red')
+    second = match_timeline.load(tmp_path, "M2")
+    assert second is not first
+    assert _kinds(second) == [("yellow_card", "34"), ("goal", "45+2"), ("goal", "66")]
+    assert _kinds(first) == [("yellow_card", "34"), ("goal", "66")]
+    assert match_timeline.load(tmp_path, "M2") is second
+
+    with open(path, "ab") as f:
+        f.write(b'_card", "country": "A", "match_time": "80"}\n')
+    assert _kinds(match_timeline.load(tmp_path, "M2"))[-1] == ("red_card", "80")
+
+
+def test_voiding_event_removes_the_goal_and_scores_follow(tmp_path):
+    timeline = match_timeline.seed(tmp_path, "M3", [
+        {"event_type": "goal", "country": "A", "match_time": "12"},
+        {"event_type": "goal", "country": "B", "match_time": "20"},
+        {"event_type": "goal", "country": "A", "match_time": "27"},
+    ])
+    goal = timeline.latest("goal", "A")
+    assert goal["match_time"] == "27"
+    assert timeline.score("A", "B") == {"home": 2, "away": 1}
+    assert timeline.goals("A", first_half=True) == 2
+
+    timeline = match_timeline.append(tmp_path, "M3", {
+        "event_type": "disallowed_goal", "country": "A", "match_time": "29", "voids": goal["id"],
+    })
+
+    assert _kinds(timeline) == [("goal", "12"), ("goal", "20"), ("disallowed_goal", "29")]
+    assert timeline.score("A", "B") == {"home": 1, "away": 1}
+    lines = match_timeline.path_for(tmp_path, "M3")
+    assert len(open(lines, encoding="utf-8").read().splitlines()) == 4
+
+
+def test_view_keeps_the_latest_events(tmp_path):
+    match_timeline.seed(tmp_path, "M4", [
+        {"event_type": "yellow_card", "country": "A", "match_time": str(minute)} for minute in range(1, 111)
+    ])
+    view = match_timeline.load(tmp_path, "M4").view()
+    assert len(view) == match_timeline.LIMIT
+    assert view[-1]["match_time"] == "110"
+    assert match_timeline.path_for(tmp_path, "a/b c").endswith("a_b_c.jsonl")
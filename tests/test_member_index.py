@@ -0,0 +1,82 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+from member_index import MATCH_EXACT, MATCH_PREFIX, MATCH_SUBSTRING, MemberIndex
+
+
+class _FakeMember:
+    def __init__(self, member_id, name, display_name, global_name=None, guild=None):
+        self.id = member_id
+        self.name = name
+        self.display_name = display_name
+        self.global_name = global_name
+        self.guild = guild
+
+    def __str__(self):
+        return f"{self.name}#0001"
+
+
+def _guild(*members):
+    guild = SimpleNamespace(id=1, members=list(members))
+    for m in members:
+        m.guild = guild
+    guild.get_member = lambda mid: next((m for m in guild.members if m.id == mid), None)
+    return guild
+
+
+def test_ranks_exact_then_prefix_then_substring():
+    guild = _guild(
+        _FakeMember(1, "noahsfan", "Big Noah"),
+        _FakeMember(2, "noah", "Noah"),
+        _FakeMember(3, "noahh1", "Noah H"),
+    )
+    results = MemberIndex().find(guild, "noah")
+
+    assert [(kind, m.id) for kind, m in results] == [
+        (MATCH_EXACT, 2),
+        (MATCH_PREFIX, 3),
+        (MATCH_PREFIX, 1),
+    ]
+
+
+def test_substring_match_and_mentions():
+    guild = _guild(_FakeMember(1, "runner", "Noah"), _FakeMember(2, "speedster", "Speed Queen"))
+    index = MemberIndex()
+
+    assert [(k, m.id) for k, m in index.find(guild, "queen")] == [(MATCH_SUBSTRING, 2)]
+    assert index.find(guild, "<@!1>")[0][1].id == 1
+    assert index.find(guild, "speedster#0001")[0] == (MATCH_EXACT, guild.members[1])
+
+
+def test_listeners_keep_index_current():
+    guild = _guild(_FakeMember(1, "runner", "Noah"))
+    index = MemberIndex()
+    assert index.find(guild, "noah")
+
+    renamed = _FakeMember(1, "runner", "Captain", guild=guild)
+    asyncio.run(index._on_member_update(guild.members[0], renamed))
+    assert index.find(guild, "noah") == []
+    assert index.find(guild, "capt")[0][1] is renamed
+
+    joined = _FakeMember(2, "newbie", "Fresh", guild=guild)
+    asyncio.run(index._on_member_join(joined))
+    assert index.find(guild, "fresh")[0][1] is joined
+
+    asyncio.run(index._on_member_remove(joined))
+    assert index.find(guild, "fresh") == []
+
+
+def test_lookup_in_large_guild_is_fast():
+    members = [_FakeMember(i, f"user{i}", f"Player {i}", f"Global {i}") for i in range(20000)]
+    guild = _guild(*members)
+    index = MemberIndex()
+    index.for_guild(guild)
+
+    started = time.perf_counter()
+    for _ in range(100):
+        results = index.find(guild, "player 19999")
+    elapsed = (time.perf_counter() - started) / 100
+
+    assert results[0][1].id == 19999
+    assert elapsed < 0.005
@@ -0,0 +1,78 @@
+import json
+import os
+
+import notification_prefs
+from notification_prefs import PrefsSnapshot
+
+SETTINGS = {
+    "1": {"channel": "bell"},
+    "2": {"channel": "dms", "categories": {"bets": False}},
+    "3": "none",
+    "4": {"categories": {"matches": False, "unknown": False}},
+    "5": {"channel": "carrier pigeon"},
+    " ": {"channel": "bell"},
+}
+
+
+def test_records_match_the_settings_endpoint_shape():
+    prefs = PrefsSnapshot(SETTINGS)
+
+    assert prefs.record("2") == {
+        "channel": "dms",
+        "categories": {"splits": True, "matches": True, "bets": False, "stages": True},
+    }
+    assert prefs.record("3")["channel"] == "none"
+    assert prefs.record("missing") == {
+        "channel": "",
+        "categories": {key: True for key in notification_prefs.CATEGORIES},
+    }
+
+
+def test_allows_combines_channel_and_category():
+    prefs = PrefsSnapshot(SETTINGS)
+
+    assert prefs.allows("1", "bell", "bets")
+    assert not prefs.allows("1", "dms", "bets")
+    assert prefs.allows("2", "dms", "matches")
+    assert not prefs.allows("2", "dms", "bets")
+    assert not prefs.allows("3", "bell", "splits")
+    assert prefs.allows("4", "dms", "bets") and not prefs.allows("4", "bell", "matches")
+    assert not prefs.allows("5", "bell", "bets")
+    assert prefs.allows("missing", "dms", "stages")
+    assert not prefs.allows("1", "email", "bets")
+
+
+def test_filters_keep_order_and_strip_ids():
+    prefs = PrefsSnapshot(SETTINGS)
+    ids = [" 4 ", "1", "", None, "2", "3", "9"]
+
+    assert prefs.filter(ids, "bell", "matches") == ["1", "9"]
+    assert prefs.filter(ids, "dms", "bets") == ["4", "9"]
+    assert prefs.filter(ids, "sms", "bets") == []
+    assert prefs.filter_mapping({"1": "home", "2": "away", 9: "draw"}, "bell", "matches") == {
+        "1": "home",
+        "9": "draw",
+    }
+
+
+def test_get_recompiles_only_when_the_file_changes(tmp_path):
+    path = tmp_path / "notification_settings.json"
+    path.write_text(json.dumps({"1": {"channel": "dms"}}), encoding="utf-8")
+    loads = []
+
+    def load(p):
+        loads.append(p)
+        return json.loads(open(p, encoding="utf-8").read())
+
+    first = notification_prefs.get(path, load)
+    assert notification_prefs.get(path, load) is first
+    assert len(loads) == 1
+    assert not first.allows("1", "bell", "bets")
+
+    path.write_text(json.dumps({"1": {"channel": "bell", "categories": {"bets": True}}}), encoding="utf-8")
+    os.utime(path, ns=(1, 1))
+    second = notification_prefs.get(path, load)
+    assert second is not first and second.allows("1", "bell", "bets")
+
+    missing = notification_prefs.get(tmp_path / "absent.json")
+    assert missing.allows("anyone", "dms", "splits")
@@ -0,0 +1,176 @@
+import asyncio
+import json
+
+import pytest
+
+discord = pytest.importorskip("discord")
+
+from outbound_scheduler import (
+    LANE_CHANNEL,
+    LANE_DM,
+    OutboundScheduler,
+    is_retryable,
+    retry_delay,
+)
+
+
+class DummyTarget:
+    def __init__(self, name, sent, fail_with=None):
+        self.name = name
+        self.sent = sent
+        self.fail_with = list(fail_with or [])
+
+    async def send(self, **kwargs):
+        if self.fail_with:
+            raise self.fail_with.pop(0)
+        self.sent.append((self.name, kwargs))
+
+
+class DummyBot:
+    def __init__(self, targets):
+        self.targets = targets
+
+    def get_user(self, uid):
+        return self.targets.get(("user", uid))
+
+    def get_channel(self, cid):
+        return self.targets.get(("channel", cid))
+
+    async def fetch_user(self, uid):
+        return self.targets.get(("user", uid))
+
+    async def fetch_channel(self, cid):
+        return self.targets.get(("channel", cid))
+
+
+class DummyResponse:
+    def __init__(self, status):
+        self.status = status
+        self.reason = "error"
+
+
+def _http_error(status):
+    return discord.HTTPException(DummyResponse(status), "error")
+
+
+async def _drain(scheduler, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while scheduler._jobs and asyncio.get_running_loop().time() < deadline:
+        await asyncio.sleep(0.01)
+    await scheduler.stop()
+
+
+def test_duplicate_keys_are_ignored(tmp_path):
+    scheduler = OutboundScheduler(DummyBot({}), str(tmp_path))
+    embed = discord.Embed(title="Result")
+
+    assert scheduler.enqueue_dm("1", embed=embed, key="fz:1:1") is True
+    assert scheduler.enqueue_dm("1", embed=embed, key="fz:1:1") is False
+    assert scheduler.stats()["counters"]["deduped"] == 1
+
+
+def test_identical_payloads_are_stored_once(tmp_path):
+    scheduler = OutboundScheduler(DummyBot({}), str(tmp_path))
+    embed = discord.Embed(title="Winner")
+    for uid in range(50):
+        scheduler.enqueue_dm(uid, embed=embed, key=f"fz:{uid}")
+    scheduler.flush()
+
+    data = json.loads((tmp_path / "outbound_pending.json").read_text(encoding="utf-8"))
+    assert len(data["jobs"]) == 50
+    assert len(data["payloads"]) == 1
+
+
+def test_pending_jobs_survive_restart(tmp_path):
+    first = OutboundScheduler(DummyBot({}), str(tmp_path))
+    first.enqueue_dm("42", embed=discord.Embed(title="Hi"), key="k1", batch="b1")
+    first.flush()
+
+    second = OutboundScheduler(DummyBot({}), str(tmp_path))
+    assert second.stats()["pending"] == {"channel": 0, "dm": 1}
+    assert second.enqueue_dm("42", embed=discord.Embed(title="Hi"), key="k1") is False
+
+
+def test_batch_totals_survive_restart(tmp_path):
+    sent = []
+    first = OutboundScheduler(DummyBot({("user", 1): DummyTarget("one", sent)}), str(tmp_path), concurrency=1, rate_per_sec=0)
+    for uid in (1, 2, 3):
+        first.enqueue_dm(uid, content="x", key=f"k{uid}", batch="fz")
+    first._finish(first._jobs["k1"], ok=True)
+    first.flush()
+
+    bot = DummyBot({("user", 2): DummyTarget("two", sent), ("user", 3): DummyTarget("three", sent)})
+    second = OutboundScheduler(bot, str(tmp_path), concurrency=1, rate_per_sec=0)
+    batch = second.stats()["batches"]["fz"]
+    assert (batch["total"], batch["sent"], batch["finished"]) == (3, 1, None)
+
+    async def run():
+        second.start()
+        await _drain(second)
+
+    asyncio.run(run())
+    batch = second.stats()["batches"]["fz"]
+    assert (batch["total"], batch["sent"]) == (3, 3)
+    assert batch["finished"] is not None
+
+    # A file written before batches were persisted: totals come from the pending jobs.
+    data = json.loads((tmp_path / "outbound_pending.json").read_text(encoding="utf-8"))
+    data.pop("batches")
+    data["jobs"] = [{"key": "k9", "lane": 1, "target": "user", "target_id": 9, "payload": "p", "batch": "old"}]
+    data["payloads"] = {"p": {"content": "x", "embed": None}}
+    (tmp_path / "outbound_pending.json").write_text(json.dumps(data), encoding="utf-8")
+    assert OutboundScheduler(DummyBot({}), str(tmp_path)).stats()["batches"]["old"]["total"] == 1
+
+
+def test_channel_posts_are_delivered_before_dms(tmp_path):
+    sent = []
+    bot = DummyBot({
+        ("user", 1): DummyTarget("dm1", sent),
+        ("user", 2): DummyTarget("dm2", sent),
+        ("channel", 9): DummyTarget("public", sent),
+    })
+    scheduler = OutboundScheduler(bot, str(tmp_path), concurrency=1, rate_per_sec=0)
+    scheduler.enqueue_dm(1, content="a", key="a")
+    scheduler.enqueue_dm(2, content="b", key="b")
+    scheduler.enqueue_channel(9, content="c", key="c")
+
+    async def run():
+        scheduler.start()
+        await _drain(scheduler)
+
+    asyncio.run(run())
+    assert [name for name, _ in sent] == ["public", "dm1", "dm2"]
+
+
+def test_batch_metrics_count_permanent_failures(tmp_path, monkeypatch):
+    monkeypatch.setattr("outbound_scheduler.retry_delay", lambda *a, **k: 0.0)
+    sent = []
+    forbidden = discord.Forbidden(DummyResponse(403), "Cannot send messages to this user")
+    bot = DummyBot({
+        ("user", 1): DummyTarget("ok", sent, fail_with=[_http_error(503)]),
+        ("user", 2): DummyTarget("closed", sent, fail_with=[forbidden]),
+    })
+    scheduler = OutboundScheduler(bot, str(tmp_path), rate_per_sec=0)
+    scheduler.enqueue_dm(1, content="x", key="x1", batch="fz")
+    scheduler.enqueue_dm(2, content="x", key="x2", batch="fz")
+
+    async def run():
+        scheduler.start()
+        await _drain(scheduler)
+
+    asyncio.run(run())
+    batch = scheduler.stats()["batches"]["fz"]
+    assert (batch["total"], batch["sent"], batch["failed"]) == (2, 1, 1)
+    assert batch["finished"] is not None
+    assert scheduler.stats()["counters"]["retried"] == 1
+
+
+def test_retry_classification_and_backoff():
+    assert is_retryable(_http_error(429))
+    assert is_retryable(_http_error(502))
+    assert not is_retryable(_http_error(400))
+    assert not is_retryable(discord.Forbidden(DummyResponse(403), "no"))
+    assert retry_delay(1, rng=lambda: 0.0) == 1.0
+    assert retry_delay(3, rng=lambda: 0.5) == 8.0
+    assert retry_delay(1, retry_after=30, rng=lambda: 0.0) == 30.0
+    assert LANE_CHANNEL < LANE_DM
@@ -0,0 +1,130 @@
+import json
+
+import json_codec
+import ownership_index
+from ownership_index import OwnershipIndex
+
+PLAYERS = {
+    "1": {"display_name": "Ana", "teams": [
+        {"team": "Brazil", "ownership": {"main_owner": "1", "split_with": ["2"], "percentages": {"1": 60, "2": "40"}},
+         "public_message_id": 99},
+        {"team": "Spain", "ownership": {"main_owner": "1", "split_with": []}},
+    ]},
+    "2": {"username": "bo", "teams": [
+        {"team": "Brazil", "ownership": {"main_owner": "1", "split_with": []}, "public_message_id": 99},
+        "Japan",
+    ]},
+    "3": {"teams": [{"pending": True}]},
+    "4": "broken",
+}
+
+
+def test_build_merges_team_and_owner_views():
+    idx = OwnershipIndex.build(PLAYERS)
+
+    brazil = idx.team("Brazil")
+    assert brazil.main_owner == "1"
+    assert brazil.split_owners == ["2"]
+    assert brazil.public_message_id == 99
+    assert list(brazil.holders) == ["1", "2"]
+    assert idx.owned_by(1) == {"Brazil", "Spain"}
+    assert idx.split_by("2") == {"Brazil"}
+    assert idx.assigned_teams() == {"Brazil", "Spain", "Japan"}
+    assert idx.owner_ids(" brazil ") == ["1", "2"]
+    assert idx.player_names == {"1": "Ana", "2": "bo", "3": "3", "4": "4"}
+
+    rows = idx.rows(idx.player_names)
+    assert [r["country"] for r in rows] == ["Brazil", "Japan", "Spain"]
+    assert rows[0]["percentages"] == {"1": 60.0, "2": 40.0}
+    assert rows[0]["split_with"] == [{"id": "2", "username": "bo"}]
+    assert rows[1]["main_owner"] is None and rows[1]["owners_count"] == 0
+
+
+def test_patch_matches_full_rebuild():
+    players = json.loads(json.dumps(PLAYERS))
+    idx = OwnershipIndex.build(players)
+
+    # Reassign Brazil to player 3 (keeping 2 as a split owner) and give Spain a split.
+    players["1"]["teams"] = [e for e in players["1"]["teams"] if e["team"] != "Brazil"]
+    players["2"]["teams"] = [e for e in players["2"]["teams"] if not isinstance(e, dict)]
+    players["2"]["teams"].append({"team": "Brazil", "ownership": {"main_owner": "3", "split_with": []}})
+    players["3"]["teams"].append({"team": "Brazil", "ownership": {"main_owner": "3", "split_with": ["2"]}})
+    players["1"]["teams"][0]["ownership"]["split_with"] = ["5"]
+    players["5"] = {"display_name": "Eve", "teams": [{"team": "Spain", "ownership": {"main_owner": "1"}}]}
+
+    patched = idx.patched(players, ["Brazil", "Spain"], ["3", "5"])
+    rebuilt = OwnershipIndex.build(players)
+    assert patched.rows(patched.player_names) == rebuilt.rows(rebuilt.player_names)
+    assert patched.owned == rebuilt.owned
+    assert patched.split == rebuilt.split
+    assert patched.by_fold == rebuilt.by_fold
+    # The original snapshot is untouched.
+    assert idx.team("Brazil").main_owner == "1"
+
+
+def _save(path, players):
+    st = json_codec.write_file_stat(path, players)
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+def test_get_reuses_index_until_file_changes(tmp_path):
+    path = tmp_path / "players.json"
+    path.write_text(json.dumps(PLAYERS), encoding="utf-8")
+    loads = []
+
+    def load(p):
+        loads.append(p)
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    first = ownership_index.get(path, load)
+    assert ownership_index.get(path, load) is first
+    assert len(loads) == 1
+
+    players, loaded = ownership_index.read(path, load)
+    assert loaded == first.signature
+    assert ownership_index.current(path, players, loaded) is first
+    players["9"] = {"teams": [{"team": "Mexico", "ownership": {"main_owner": "9"}}]}
+    updated = ownership_index.update(path, players, ["Mexico"], ["9"], base=first, loaded=loaded, written=_save(path, players))
+    assert updated.owned_by("9") == {"Mexico"}
+    assert ownership_index.get(path, load) is updated
+    assert len(loads) == 2
+
+
+def test_update_rebuilds_when_the_other_process_wrote_before_the_load(tmp_path):
+    path = tmp_path / "players.json"
+    path.write_text(json.dumps(PLAYERS), encoding="utf-8")
+    index = ownership_index.get(path)
+
+    # The launcher assigns Mexico after the bot built its index...
+    launcher = json.loads(json.dumps(PLAYERS))
+    launcher["8"] = {"teams": [{"team": "Mexico", "ownership": {"main_owner": "8"}}]}
+    path.write_text(json.dumps(launcher), encoding="utf-8")
+
+    # ...and the bot then loads that version and assigns Peru.
+    players, loaded = ownership_index.read(path)
+    assert loaded != index.signature
+    players["9"] = {"teams": [{"team": "Peru", "ownership": {"main_owner": "9"}}]}
+    updated = ownership_index.update(path, players, ["Peru"], ["9"], base=index, loaded=loaded, written=_save(path, players))
+
+    assert updated.owned_by("8") == {"Mexico"} and updated.owned_by("9") == {"Peru"}
+    assert ownership_index.get(path) is updated
+    assert {"Mexico", "Peru"} <= ownership_index.get(path).assigned_teams()
+
+
+def test_a_write_by_the_other_process_after_the_save_is_not_taken_as_current(tmp_path):
+    path = tmp_path / "players.json"
+    path.write_text(json.dumps(PLAYERS), encoding="utf-8")
+    players, loaded = ownership_index.read(path)
+    index = ownership_index.current(path, players, loaded)
+
+    players["9"] = {"teams": [{"team": "Peru", "ownership": {"main_owner": "9"}}]}
+    written = _save(path, players)
+    # The launcher writes between the bot's save and its index update.
+    launcher = json.loads(json.dumps(players))
+    launcher["8"] = {"teams": [{"team": "Mexico", "ownership": {"main_owner": "8"}}]}
+    path.write_text(json.dumps(launcher) + " ", encoding="utf-8")
+    updated = ownership_index.update(path, players, ["Peru"], ["9"], base=index, loaded=loaded, written=written)
+
+    assert updated.signature == written
+    assert ownership_index.get(path) is not updated
+    assert ownership_index.get(path).owned_by("8") == {"Mexico"}
@@ -799,10 +799,13 @@ def test_bet_page_announcer_handles_runtime_bet_commands():
 
 
 def test_bet_page_announcer_uses_single_sidecar_tmp_file():
-    """State writes should use one deterministic .tmp sidecar file."""
+    """State writes should use one deterministic .tmp sidecar file (via the shared JSON store and codec)."""
     cog_py = (ROOT / "WorldCupBot" / "COGS" / "BetPageAnnouncer.py").read_text(encoding="utf-8")
-    assert 'tmp_path = f"{path}.tmp"' in cog_py
-    assert "tempfile.mkstemp" not in cog_py
+    store_py = (ROOT / "WorldCupBot" / "json_store.py").read_text(encoding="utf-8")
+    store_py += (ROOT / "WorldCupBot" / "json_codec.py").read_text(encoding="utf-8")
+    assert "await store.write(self.state_path" in cog_py
+    assert 'tmp = f"{path}.tmp"' in store_py
+    assert "tempfile.mkstemp" not in cog_py + store_py
 
 
 def test_bet_page_announcer_skips_redundant_state_writes():
@@ -1169,6 +1172,87 @@ def test_fixtures_api_exposes_penalty_winner_for_tied_result(client, app):
     assert fixture["winner_side"] == "away"
 
 
+def test_bracket_api_resolves_knockout_slots_from_results(client, app):
+    """The bracket page renders /api/bracket instead of rebuilding progression itself."""
+    base_dir = Path(app.config["BASE_DIR"])
+    json_dir = base_dir / "JSON"
+    json_dir.mkdir(parents=True, exist_ok=True)
+    (json_dir / "matches.json").write_text(
+        json.dumps([
+            {"id": "M101", "home": "Spain", "away": "Brazil", "home_score": 1, "away_score": 1,
+             "winner_side": "away", "status": "final"},
+        ]),
+        encoding="utf-8",
+    )
+
+    resp = client.get("/api/bracket")
+
+    assert resp.status_code == 200
+    payload = resp.get_json()
+    assert payload["slots"]["Semi-finals"]["left"]["1"]["match_id"] == "M101"
+    assert payload["slots"]["Final"]["center"]["1"]["home"] == "Brazil"
+    assert payload["slots"]["Third Place Play-off"]["center"]["1"]["home"] == "Spain"
+    assert payload["slots"]["Round of 16"]["right"]["1"]["away"] == "W78"
+    final = next(match for match in payload["matches"] if match["match"] == 104)
+    assert final["feeds"] == {"home": "W101", "away": "W102"}
+    app_js = (ROOT / "WorldCupBot" / "static" / "app.js").read_text(encoding="utf-8")
+    assert "fetchJSON('/api/bracket')" in app_js
+    assert "autoProgressionSlots" not in app_js
+
+
+def test_standings_scenarios_enumerate_the_remaining_group_fixtures(client, app):
+    _seed_standings_data(app, [
+        {"id": "1", "group": "A", "home": "South Korea", "away": "Czechia", "home_score": 2, "away_score": 0, "status": "final"},
+        {"id": "2", "group": "A", "home": "Turkey", "away": "Cape Verde", "home_score": 1, "away_score": 1, "status": "final"},
+        {"id": "3", "group": "A", "home": "South Korea", "away": "Turkey", "status": "scheduled"},
+        {"id": "4", "group": "B", "home": "B Team 1", "away": "B Team 2", "status": "scheduled"},
+    ])
+
+    resp = client.get("/api/standings/scenarios?group=a")
+
+    assert resp.status_code == 200
+    payload = resp.get_json()
+    assert payload["group"] == "A"
+    assert payload["fixtures"] == [{"home": "South Korea", "away": "Turkey"}]
+    assert [outcome["results"] for outcome in payload["outcomes"]] == [["home"], ["draw"], ["away"]]
+    korea = next(team for team in payload["teams"] if team["team"] == "South Korea")
+    assert korea["pts"] == 3
+    assert {tuple(entry["results"]): entry["by"] for entry in korea["guarantees"]["first"]} == {("home",): "points", ("draw",): "points"}
+    assert korea["qualification"] == "qualified"
+    assert client.get("/api/standings/scenarios?group=Z").status_code == 400
+
+
+def test_odds_api_simulates_from_saved_results_and_reports_owners(client, app, monkeypatch):
+    import tournament_odds
+
+    monkeypatch.setattr(tournament_odds, "SIMULATIONS", 2000)
+    groups = _seed_standings_data(app, [
+        {"id": "1", "group": "A", "home": "South Korea", "away": "Turkey", "home_score": 2, "away_score": 0, "status": "final"},
+        {"id": "2", "group": "A", "home": "Czech Republic", "away": "Cape Verde", "status": "scheduled"},
+    ])
+    json_dir = Path(app.config["BASE_DIR"]) / "JSON"
+    (json_dir / "team_ratings.json").write_text(json.dumps({"ratings": {"Cape Verde": 1300}}), encoding="utf-8")
+    (json_dir / "players.json").write_text(json.dumps({
+        "7": {"display_name": "Ana", "teams": [{"team": "South Korea", "ownership": {"main_owner": "7", "split_with": []}}]},
+    }), encoding="utf-8")
+
+    resp = client.get("/api/odds")
+
+    assert resp.status_code == 200
+    payload = resp.get_json()
+    assert payload["simulations"] == 2000
+    odds = {team["team"]: team for team in payload["teams"]}
+    assert set(odds) == {team for names in groups.values() for team in names}
+    assert odds["Cape Verde"]["rating"] == 1300
+    assert odds["South Korea"]["group_winner"] > odds["Turkey"]["group_winner"]
+    assert payload["owners"][0]["owner_id"] == "7"
+    assert payload["owners"][0]["champion"] == odds["South Korea"]["stages"]["Winner"]
+    assert client.get("/api/odds").get_json()["fingerprint"] == payload["fingerprint"]
+
+    (json_dir / "team_meta.json").write_text(json.dumps({"groups": {"A": ["South Korea"]}}), encoding="utf-8")
+    assert client.get("/api/odds").status_code == 503
+
+
 def test_fixtures_include_all_query_returns_future_matches_beyond_48_hours(client, app):
     """include_all=1 should expose all future fixtures for world-map next-match rendering."""
     import datetime
@@ -1251,20 +1335,32 @@ def test_bracket_slot_metadata_overrides_generated_fixture_placeholders():
     assert "if (away && isGeneratedBracketTeam(match.away)) match.away = away;" in app_js
 
 
-def test_knockout_pathway_alignment_preserves_partial_slots_and_real_fixture_ids():
+def test_knockout_pathway_alignment_preserves_partial_slots_and_real_fixture_ids(client, app):
     """Bracket alignment should reject only conflicting W-placeholders and keep imported fixture IDs."""
+    json_dir = Path(app.config["BASE_DIR"]) / "JSON"
+    json_dir.mkdir(parents=True, exist_ok=True)
+    (json_dir / "bracket_slots.json").write_text(json.dumps({
+        "Round of 16": {
+            "left": {
+                # Older saves put M91 where M93 belongs, and a stale W-placeholder pair in slot 4.
+                "3": {"match_id": "BRKT-R16-L3-W76-W78", "label": "M91", "home": "Mexico", "away": "W78"},
+                "4": {"match_id": "", "home": "W79", "away": "W80"},
+                "1": {"match_id": "BRKT-R16-L1-W74-W77", "home": "Paraguay", "away": "W77"},
+            },
+        },
+    }), encoding="utf-8")
+
+    slots = client.get("/api/bracket").get_json()["slots"]["Round of 16"]
+
+    assert slots["right"]["1"]["match_id"] == "BRKT-R16-L3-W76-W78"
+    assert (slots["right"]["1"]["home"], slots["right"]["1"]["away"]) == ("Mexico", "W78")
+    assert slots["left"]["1"]["match_id"] == "BRKT-R16-L1-W74-W77"
+    assert (slots["left"]["1"]["home"], slots["left"]["1"]["away"]) == ("Paraguay", "W77")
+    assert (slots["left"]["3"]["match_id"], slots["left"]["3"]["home"]) == ("93", "W83")
+    assert (slots["left"]["4"]["match_id"], slots["left"]["4"]["home"]) == ("94", "W81")
     app_js = (ROOT / "WorldCupBot" / "static" / "app.js").read_text(encoding="utf-8")
-    assert "for (const field of ['match_id', 'matchId', 'id', 'label'])" in app_js
-    assert "if (Number.isFinite(homeNo) && homeNo !== feeders[0]) return false;" in app_js
-    assert "if (Number.isFinite(awayNo) && awayNo !== feeders[1]) return false;" in app_js
-    assert "return homeNo === feeders[0] && awayNo === feeders[1];" not in app_js
-    assert "const savedMatchId = String(entry?.match_id || entry?.matchId || '').trim();" in app_js
-    assert "match_id: savedMatchId || String(matchNo)" in app_js
     assert "match = matchId ? byId.get(matchId) : null;" in app_js
     assert "makePlaceholderMatch(stage, home || 'TBD', away || 'TBD', matchId || slotLabel || `Slot ${slot}`, slot)" in app_js
-    assert "left: buildOfficialSideSlots(slots, 'Round of 16', 'left', [89, 90, 93, 94])" in app_js
-    assert "right: buildOfficialSideSlots(slots, 'Quarter-finals', 'right', [99, 100])" in app_js
-    assert "left: buildOfficialSideSlots(slots, 'Semi-finals', 'left', [101])" in app_js
 
 def test_fixtures_page_removes_manual_declare_country_controls():
     """Adding a score should replace the separate Declare COUNTRY controls."""
@@ -1323,3 +1419,188 @@ def test_quick_event_success_uses_toast_without_inline_confirmation():
     assert "Saving match event…" not in app_js
     assert "Saving result and posting full time…" not in app_js
     assert "if (status) status.textContent = '';" in app_js
+
+
+def test_bootstrap_returns_reference_sections_with_version_vector(client, app):
+    """First paint should get every reference section from one request."""
+    json_dir = Path(app.config["BASE_DIR"]) / "JSON"
+    json_dir.mkdir(parents=True, exist_ok=True)
+    (json_dir / "teams.json").write_text(json.dumps(["Brazil", "Spain"]), encoding="utf-8")
+    (json_dir / "team_iso.json").write_text(json.dumps({"Brazil": "br"}), encoding="utf-8")
+    (json_dir / "verified.json").write_text(json.dumps({"verified_users": [
+        {"discord_id": "1", "display_name": "Ana"},
+    ]}), encoding="utf-8")
+    (json_dir / "players.json").write_text(json.dumps({
+        "1": {"teams": [{"team": "Brazil", "ownership": {"main_owner": "1", "split_with": []}}]},
+    }), encoding="utf-8")
+
+    resp = client.get("/api/bootstrap")
+    assert resp.status_code == 200
+    data = resp.get_json()
+    sections = data["sections"]
+
+    assert sections["teams"] == client.get("/api/teams").get_json()
+    assert sections["team_iso"] == {"Brazil": "br"}
+    assert sections["player_names"] == {"1": "Ana"}
+    assert sections["verified"] == client.get("/api/verified").get_json()
+    assert sections["ownership_merged"] == client.get("/api/ownership_merged").get_json()
+    assert sections["fixtures"] == client.get("/api/fixtures?include_all=1").get_json()
+    assert sections["me"] == {"ok": True, "user": None, "is_admin": False, "masquerading_as": None}
+    assert data["versions"]["me"] is None
+    assert all(data["versions"][name] for name in ("teams", "team_iso", "verified", "fixtures"))
+    # team_meta.json is missing here; the section reports the error instead of failing the response.
+    assert "team_meta" in data["errors"]
+    assert "team_meta" not in sections
+
+
+def test_bootstrap_sections_filter_and_skip_unchanged_versions(client, app):
+    """Clients pass their version vector so only changed sections come back."""
+    json_dir = Path(app.config["BASE_DIR"]) / "JSON"
+    json_dir.mkdir(parents=True, exist_ok=True)
+    (json_dir / "teams.json").write_text(json.dumps(["Brazil"]), encoding="utf-8")
+    (json_dir / "team_stage.json").write_text(json.dumps({"Brazil": "Group Stage"}), encoding="utf-8")
+
+    first = client.get("/api/bootstrap?sections=teams,team_stage,nope").get_json()
+    assert set(first["sections"]) == {"teams", "team_stage"}
+    assert first["unknown"] == ["nope"]
+
+    (json_dir / "team_stage.json").write_text(json.dumps({"Brazil": "Round of 32"}), encoding="utf-8")
+    vector = ",".join(f"{name}:{version}" for name, version in first["versions"].items())
+    second = client.get(f"/api/bootstrap?sections=teams,team_stage&versions={vector}").get_json()
+
+    assert second["unchanged"] == ["teams"]
+    assert second["sections"] == {"team_stage": {"Brazil": "Round of 32"}}
+    assert second["versions"]["teams"] == first["versions"]["teams"]
+    assert second["versions"]["team_stage"] != first["versions"]["team_stage"]
+
+
+def test_app_js_serves_first_paint_requests_from_bootstrap():
+    app_js = (ROOT / "WorldCupBot" / "static" / "app.js").read_text(encoding="utf-8")
+    assert "/api/bootstrap" in app_js
+    assert "'/api/fixtures?include_all=1': 'fixtures'" in app_js
+    assert "window.WorldCupBootstrap" in app_js
+
+
+def test_app_js_bootstrap_snapshot_never_outlives_a_mutation_or_the_first_session_check():
+    app_js = (ROOT / "WorldCupBot" / "static" / "app.js").read_text(encoding="utf-8")
+    wrapper = app_js[app_js.index("window.fetch = function"):app_js.index("window.WorldCupBootstrap = {")]
+    assert "invalidateBootstrap();" in wrapper
+    assert "const SESSION_SECTIONS = new Set(['auth', 'me']);" in app_js
+    assert "snapshot.sessionUsed.add(section)" in wrapper
+    assert "generation === snapshot.generation" in app_js
+
+
+def test_changes_feed_returns_changed_entities_with_public_data(client, app):
+    """Polling clients fetch only the fixtures/ownership rows touched since their version."""
+    import change_log
+    import datetime
+
+    json_dir = Path(app.config["BASE_DIR"]) / "JSON"
+    json_dir.mkdir(parents=True, exist_ok=True)
+    kickoff = (datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(days=3)).replace(microsecond=0)
+    utc = kickoff.isoformat().replace("+00:00", "Z")
+
+    def save(name, doc):
+        (json_dir / name).write_text(json.dumps(doc), encoding="utf-8")
+        change_log.record_write(json_dir / name, doc)
+
+    save("matches.json", [{"id": "m1", "home": "USA", "away": "Canada", "utc": utc}])
+    save("players.json", {})
+
+    first = client.get("/api/changes").get_json()
+    assert first["resync"] is True
+    version = first["version"]
+
+    save("matches.json", [{"id": "m1", "home": "USA", "away": "Canada", "utc": utc, "stadium": "MetLife"}])
+    save("players.json", {"7": {"teams": [{"team": "USA", "ownership": {"main_owner": "7"}}]}})
+
+    data = client.get(f"/api/changes?since={version}").get_json()
+    assert data["resync"] is False
+    by_kind = {c["kind"]: c for c in data["changes"]}
+    assert by_kind["fixture"]["id"] == "m1"
+    assert by_kind["fixture"]["data"]["stadium"] == "MetLife"
+    assert by_kind["ownership"]["data"]["main_owner"]["id"] == "7"
+
+    only_fixtures = client.get(f"/api/changes?since={version}&kinds=fixture").get_json()
+    assert [c["kind"] for c in only_fixtures["changes"]] == ["fixture"]
+    assert client.get(f"/api/changes?since={data['version']}").get_json()["changes"] == []
+
+
+def test_list_endpoints_support_projection_filters_and_cursor_pages(client, app):
+    """Heavy lists can be paged and trimmed while plain requests keep their shape."""
+    json_dir = Path(app.config["BASE_DIR"]) / "JSON"
+    json_dir.mkdir(parents=True, exist_ok=True)
+    (json_dir / "verified.json").write_text(json.dumps({"verified_users": [
+        {"discord_id": str(n), "display_name": f"User {n}"} for n in range(1, 6)
+    ]}), encoding="utf-8")
+    (json_dir / "bets.json").write_text(json.dumps([
+        {"bet_id": "b1", "bet_title": "A", "option1_user_id": "1"},
+        {"bet_id": "b2", "bet_title": "B", "option1_user_id": "1", "option2_user_id": "2"},
+        {"bet_id": "b3", "bet_title": "C", "option1_user_id": "3", "option2_user_id": "1", "winner": "option1"},
+    ]), encoding="utf-8")
+
+    plain = client.get("/api/verified")
+    assert isinstance(plain.get_json(), list) and len(plain.get_json()) == 5
+
+    first = client.get("/api/verified?limit=2&sort=-id&fields=discord_id")
+    assert first.get_json() == [{"discord_id": "5"}, {"discord_id": "4"}]
+    assert first.headers["X-Total-Count"] == "5"
+    cursor = first.headers["X-Next-Cursor"]
+    second = client.get(f"/api/verified?limit=2&sort=-id&fields=discord_id&cursor={cursor}")
+    assert second.get_json() == [{"discord_id": "3"}, {"discord_id": "2"}]
+
+    open_bets = client.get("/api/bets?status=open,claimed&fields=bet_id").get_json()
+    assert open_bets == [{"bet_id": "b1"}, {"bet_id": "b2"}]
+    assert [b["bet_id"] for b in client.get("/api/bets?user=2").get_json()] == ["b2"]
+
+    bad = client.get("/api/bets?limit=nope")
+    assert bad.status_code == 400
+    assert bad.get_json()["ok"] is False
+
+    fixtures = client.get("/api/fixtures?include_all=1").get_json()
+    assert "next_cursor" not in fixtures
+    paged = client.get("/api/fixtures?include_all=1&limit=1&fields=id").get_json()
+    assert paged["next_cursor"] is None and paged["total"] == len(fixtures["fixtures"])
+    assert paged["fixtures"] == [{"id": f["id"]} for f in fixtures["fixtures"][:1]]
+
+
+
+def test_me_matches_merges_owned_team_fixtures_with_slim_payload_and_etag(client, app):
+    """A user's schedule comes from the team indexes, trimmed, and revalidates with 304."""
+    json_dir = Path(app.config["BASE_DIR"]) / "JSON"
+    json_dir.mkdir(parents=True, exist_ok=True)
+    players_path = json_dir / "players.json"
+    players_path.write_text(json.dumps({
+        "7": {"teams": [{"team": "Brazil", "ownership": {"main_owner": "7", "split_with": []}}]},
+        "8": {"teams": [{"team": "Spain", "ownership": {"main_owner": "8", "split_with": ["7"]}}]},
+    }), encoding="utf-8")
+    (json_dir / "matches.json").write_text(json.dumps([
+        {"id": "m3", "home": "Spain", "away": "Japan", "utc": "2026-06-20T18:00:00Z", "live_stats": {"shots": [1, 2]}},
+        {"id": "m1", "home": "Brazil", "away": "Spain", "utc": "2026-06-12T18:00:00Z", "stadium": "MetLife"},
+        {"id": "m2", "home": "Mexico", "away": "Japan", "utc": "2026-06-13T18:00:00Z"},
+        {"id": "m4", "home": "Brazil", "away": "Japan", "utc": "not a time"},
+    ]), encoding="utf-8")
+    with client.session_transaction() as sess:
+        sess["wc_user"] = {"discord_id": "7", "username": "seven"}
+
+    resp = client.get("/api/me/matches")
+    assert resp.status_code == 200
+    matches = resp.get_json()["matches"]
+    assert [m["id"] for m in matches] == ["m1", "m3"]
+    assert matches[0]["stadium"] == "MetLife"
+    assert "live_stats" not in matches[1]
+    etag = resp.headers["ETag"]
+
+    assert client.get("/api/me/matches", headers={"If-None-Match": etag}).status_code == 304
+
+    # Someone else's ownership changing does not invalidate this user's copy.
+    players = json.loads(players_path.read_text(encoding="utf-8"))
+    players["9"] = {"teams": [{"team": "Mexico", "ownership": {"main_owner": "9", "split_with": []}}]}
+    players_path.write_text(json.dumps(players), encoding="utf-8")
+    assert client.get("/api/me/matches", headers={"If-None-Match": etag}).status_code == 304
+
+    players["7"]["teams"].append({"team": "Japan", "ownership": {"main_owner": "7", "split_with": []}})
+    players_path.write_text(json.dumps(players), encoding="utf-8")
+    changed = client.get("/api/me/matches", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert [m["id"] for m in changed.get_json()["matches"]] == ["m1", "m2", "m3"]
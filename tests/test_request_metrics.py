@@ -0,0 +1,81 @@
+
+from flask import Flask, jsonify
+
+import request_metrics
+from routes_admin import create_admin_routes
+
+
+def _app(registry, tmp_path, config=None):
+    app = Flask(__name__)
+    app.secret_key = "test-secret"
+    request_metrics.install(app, registry)
+    ctx = {"BASE_DIR": str(tmp_path), "CONFIG": config or {}}
+    app.register_blueprint(create_admin_routes(ctx))
+
+    @app.get("/api/fanzone/<fixture_id>")
+    def fanzone(fixture_id):
+        return jsonify({"id": fixture_id})
+
+    @app.get("/boom")
+    def boom():
+        raise RuntimeError("boom")
+
+    return app
+
+
+def test_routes_are_labelled_by_template_with_status_and_bytes(tmp_path):
+    registry = request_metrics.RequestMetrics()
+    client = _app(registry, tmp_path).test_client()
+    for fixture_id in ("1", "2", "3"):
+        assert client.get(f"/api/fanzone/{fixture_id}").status_code == 200
+    client.get("/nope")
+    client.get("/boom")
+
+    snap = registry.snapshot()
+    route = snap["routes"]["GET /api/fanzone/<fixture_id>"]
+    assert route["count"] == 3 and route["errors"] == 0 and route["bytes"] > 0
+    assert route["p95_ms"] is not None
+    assert snap["routes"]["GET /boom"]["errors"] == 1
+    assert "GET <unmatched>" in snap["routes"]
+    assert snap["in_flight"] == 0
+
+    text = registry.render_prometheus()
+    assert 'wc_http_request_duration_seconds_count{method="GET",route="/api/fanzone/<fixture_id>"} 3' in text
+    assert 'wc_http_responses_total{route="/boom",status="500"} 1' in text
+    assert 'le="+Inf"' in text
+
+
+def test_histogram_quantiles_and_json_and_cache_stats():
+    registry = request_metrics.RequestMetrics()
+    for _ in range(90):
+        registry.end("GET", "/fast", 200, 0.004, 10)
+    for _ in range(10):
+        registry.end("GET", "/fast", 200, 0.8, 10)
+    registry.observe_json_load("matches.json", 2048, 0.002)
+    registry.observe_json_load("bets.json", 0, 0.001, ok=False)
+    registry.register_cache("avatars", lambda: {"hits": 3, "misses": 1, "size": 2})
+
+    snap = registry.snapshot()
+    assert snap["routes"]["GET /fast"]["p50_ms"] <= 5
+    assert snap["routes"]["GET /fast"]["p99_ms"] > 500
+    assert snap["json_documents"]["matches.json"]["bytes"] == 2048
+    assert snap["json_documents"]["bets.json"]["errors"] == 1
+    assert snap["caches"]["avatars"]["hits"] == 3
+    assert 'wc_cache_hits{cache="avatars"} 3' in registry.render_prometheus()
+
+
+def test_metrics_endpoint_requires_admin_or_token(tmp_path):
+    registry = request_metrics.RequestMetrics()
+    client = _app(registry, tmp_path, config={"metrics_token": "s3cret"}).test_client()
+
+    assert client.get("/admin/metrics").status_code == 401
+    assert client.get("/admin/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+
+    ok = client.get("/admin/metrics", headers={"Authorization": "Bearer s3cret"})
+    assert ok.status_code == 200
+    assert ok.mimetype == "text/plain"
+
+    with client.session_transaction() as sess:
+        sess["wc_user"] = {"discord_id": "123", "username": "admin", "roles": ["Referee"]}
+    data = client.get("/admin/metrics.json").get_json()
+    assert data["ok"] is True and "routes" in data
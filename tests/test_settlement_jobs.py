@@ -0,0 +1,93 @@
+import json
+
+import settlement_jobs
+from settlement_jobs import SettlementQueue
+
+
+def test_failing_step_is_retried_without_repeating_finished_steps(tmp_path):
+    calls = []
+    failures = [RuntimeError("disk full")]
+
+    def first(job):
+        calls.append("first")
+        return {"votes": 3}
+
+    def flaky(job):
+        calls.append("flaky")
+        if failures:
+            raise failures.pop()
+        return {"channel": job["data"]["channel"]}
+
+    queue = SettlementQueue(tmp_path / "jobs.json", [("first", first), ("flaky", flaky)], retry_delays=(0,))
+    submitted = queue.submit("M1", {"channel": "group-a"})
+    assert "data" not in submitted
+    assert queue.wait_idle()
+
+    job = queue.get(submitted["id"])
+    assert job["status"] == "done"
+    assert job["steps"]["flaky"] == {"status": "done", "attempts": 1, "error": ""}
+    assert job["result"] == {"votes": 3, "channel": "group-a"}
+    assert calls == ["first", "flaky", "flaky"]
+
+
+def test_job_fails_after_retries_and_can_be_retried(tmp_path):
+    broken = [True]
+
+    def step(job):
+        if broken[0]:
+            raise ValueError("bad fixture")
+
+    queue = SettlementQueue(tmp_path / "jobs.json", [("announce", step)], retry_delays=(0, 0))
+    job_id = queue.submit("M2", {})["id"]
+    assert queue.wait_idle()
+
+    job = queue.get(job_id)
+    assert job["status"] == "failed"
+    assert job["steps"]["announce"]["attempts"] == 3
+    assert job["error"] == "announce: ValueError: bad fixture"
+    assert queue.retry("missing") is None
+
+    broken[0] = False
+    assert queue.retry(job_id)["status"] == "queued"
+    assert queue.wait_idle()
+    assert queue.get(job_id)["status"] == "done"
+    assert queue.retry(job_id) is None
+
+
+def test_jobs_for_a_fixture_run_in_order_and_resume_after_restart(tmp_path):
+    path = tmp_path / "jobs.json"
+    path.write_text(json.dumps({"jobs": [
+        {
+            "id": "a", "fixture_id": "M3", "status": "running", "data": {"n": 1}, "result": {},
+            "steps": {"record": {"status": "running", "attempts": 0, "error": ""}},
+        },
+        {
+            "id": "b", "fixture_id": "M3", "status": "queued", "data": {"n": 2}, "result": {},
+            "steps": {"record": {"status": "pending", "attempts": 0, "error": ""}},
+        },
+        {
+            "id": "c", "fixture_id": "M4", "status": "done", "data": {"n": 3}, "result": {},
+            "steps": {"record": {"status": "done", "attempts": 0, "error": ""}},
+        },
+    ]}), encoding="utf-8")
+    seen = []
+
+    queue = SettlementQueue(path, [("record", lambda job: seen.append(job["data"]["n"]))])
+    queue.resume()
+    assert queue.wait_idle()
+
+    assert seen == [1, 2]
+    assert [job["id"] for job in queue.list()] == ["c", "b", "a"]
+    assert [job["id"] for job in queue.list(fixture_id="M3")] == ["b", "a"]
+    stored = json.loads(path.read_text(encoding="utf-8"))["jobs"]
+    assert [job["status"] for job in stored] == ["done", "done", "done"]
+
+
+def test_finished_jobs_are_pruned(tmp_path, monkeypatch):
+    monkeypatch.setattr(settlement_jobs, "KEEP_FINISHED", 2)
+    queue = SettlementQueue(tmp_path / "jobs.json", [("noop", lambda job: None)])
+    for n in range(4):
+        queue.submit(f"M{n}", {})
+        assert queue.wait_idle()
+
+    assert [job["fixture_id"] for job in queue.list()] == ["M3", "M2"]
@@ -141,3 +141,29 @@ def test_effective_split_percentages_preserve_existing_custom_split_shares():
 
     assert requested_share == 25.0
     assert percentages == {"200": 50.0, "300": 25.0, "100": 25.0}
+
+
+def test_split_log_keeps_entries_appended_by_the_launcher(tmp_path, monkeypatch):
+    """The launcher writes the split log too; a bot append must not overwrite its entries."""
+    import asyncio
+    import json
+
+    import COGS.SplitOwnership as split_ownership
+    from json_store import JsonStore
+
+    store = JsonStore(flush_interval=60)
+    path = tmp_path / "split_requests_log.json"
+    monkeypatch.setattr(split_ownership, "store", store)
+    monkeypatch.setattr(split_ownership, "SPLIT_REQUESTS_LOG_FILE", path)
+
+    async def main():
+        store.start()
+        await split_ownership.append_log({"id": "bot-1"})
+        # The launcher appends straight to the file, as routes_public does.
+        logs = json.loads(path.read_text(encoding="utf-8"))
+        path.write_text(json.dumps(logs + [{"id": "launcher"}]), encoding="utf-8")
+        await split_ownership.append_log({"id": "bot-2"})
+        await store.stop()
+
+    asyncio.run(main())
+    assert [item["id"] for item in json.loads(path.read_text(encoding="utf-8"))] == ["bot-1", "launcher", "bot-2"]
@@ -45,11 +45,10 @@ def test_get_group_role_for_country_uses_linked_group_role_id(monkeypatch):
     cog = TeamsDistribution(bot=object())
     guild = DummyGuild()
 
-    monkeypatch.setattr(
-        teams_distribution_module,
-        "load_json",
-        lambda _path: {"France": {"group": "Group B", "group_role_id": 9876}},
-    )
+    async def fake_load_json(_path):
+        return {"France": {"group": "Group B", "group_role_id": 9876}}
+
+    monkeypatch.setattr(teams_distribution_module, "load_json", fake_load_json)
 
     role = asyncio.run(cog.get_group_role_for_country(guild, "France"))
     assert role == "role-9876"
@@ -4,6 +4,7 @@ import pytest
 
 discord = pytest.importorskip("discord")
 
+import match_timeline
 from COGS.TextQuickOptions import TextQuickOptions
 
 
@@ -17,6 +18,10 @@ def _cog(tmp_path):
     return TextQuickOptions(DummyBot(tmp_path))
 
 
+def _timeline(cog, fixture_id):
+    return match_timeline.load(cog.timelines_dir, fixture_id).view()
+
+
 def test_parse_event_details_accepts_multi_word_country(tmp_path):
     cog = _cog(tmp_path)
 
@@ -95,10 +100,12 @@ def test_disallowed_goal_event_removes_latest_matching_goal(tmp_path):
     import asyncio
     asyncio.run(cog._queue_event_for_fixture(DummyCtx(), fixture, fixtures, None, "", "disallowed_goal", "A 31"))
 
-    assert [(event["event_type"], event.get("match_time")) for event in fixture["live_stats"]] == [
+    assert [(event["event_type"], event.get("match_time")) for event in _timeline(cog, "M1")] == [
         ("goal", "10"),
         ("disallowed_goal", "31"),
     ]
+    assert "live_stats" not in fixture
+    assert fixture["live_score"] == {"home": 1, "away": 0}
     record = json.loads((tmp_path / "JSON" / "bot_commands.jsonl").read_text(encoding="utf-8").splitlines()[-1])
     assert record["data"]["event_label"] == "Goal Disallowed"
     assert record["data"]["home_score"] == 1
@@ -127,7 +134,7 @@ def test_penalty_event_records_decision_without_changing_score(tmp_path):
     import asyncio
     asyncio.run(cog._queue_event_for_fixture(DummyCtx(), fixture, fixtures, None, "", "penalty", "A 52"))
 
-    assert [(event["event_type"], event.get("country"), event.get("match_time")) for event in fixture["live_stats"]] == [
+    assert [(event["event_type"], event.get("country"), event.get("match_time")) for event in _timeline(cog, "M1")] == [
         ("goal", "B", "10"),
         ("penalty", "A", "52"),
     ]
@@ -161,7 +168,7 @@ def test_var_decision_event_records_without_changing_score(tmp_path):
     import asyncio
     asyncio.run(cog._queue_event_for_fixture(DummyCtx(), fixture, fixtures, None, "", "var_decision", "B 64"))
 
-    assert [(event["event_type"], event.get("country"), event.get("match_time")) for event in fixture["live_stats"]] == [
+    assert [(event["event_type"], event.get("country"), event.get("match_time")) for event in _timeline(cog, "M1")] == [
         ("goal", "A", "9"),
         ("var_decision", "B", "64"),
     ]
@@ -195,7 +202,7 @@ def test_extra_time_event_records_without_country_or_score_change(tmp_path):
     import asyncio
     asyncio.run(cog._queue_event_for_fixture(DummyCtx(), fixture, fixtures, None, "", "extra_time", ""))
 
-    assert [(event["event_type"], event.get("country"), event.get("match_time")) for event in fixture["live_stats"]] == [
+    assert [(event["event_type"], event.get("country"), event.get("match_time")) for event in _timeline(cog, "M1")] == [
         ("goal", "B", "88"),
         ("extra_time", "", ""),
     ]
@@ -205,7 +212,7 @@ def test_extra_time_event_records_without_country_or_score_change(tmp_path):
     assert record["data"]["message"] == "A 0 - 1 B"
 
 
-def test_queue_fixture_result_embed_uses_saved_score_and_stats(tmp_path):
+def test_queue_fixture_result_embed_uses_saved_score(tmp_path):
     cog = _cog(tmp_path)
     fixture = {
         "id": "M2",
@@ -232,7 +239,6 @@ def test_queue_fixture_result_embed_uses_saved_score_and_stats(tmp_path):
         "away_score": 2,
         "winner_side": "home",
         "channel": "belgium-senegal",
-        "live_stats": [{"event_type": "extra_time", "label": "Extra Time", "match_time": ""}],
     }
 
 
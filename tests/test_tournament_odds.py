@@ -0,0 +1,90 @@
+import itertools
+
+import pytest
+
+import bracket_graph
+import tournament_odds
+from ownership_index import OwnershipIndex
+from tournament_odds import STAGES, Tournament
+
+
+def _tournament(played=False, knockout=None, ratings=None):
+    groups, remaining = {}, []
+    order = 0
+    for letter in "ABCDEFGHIJKL":
+        rows = []
+        for i in range(4):
+            rows.append({"team": f"{letter}{i + 1}", "pts": 0, "gd": 0, "gf": 0, "tiebreak": order})
+            order += 1
+        if played:
+            # Every result is in: the first team won all three matches.
+            for row, (pts, gd, gf) in zip(rows, [(9, 6, 6), (6, 1, 3), (3, -2, 2), (0, -5, 1)]):
+                row.update(pts=pts, gd=gd, gf=gf)
+        else:
+            remaining += [(a["team"], b["team"]) for a, b in itertools.combinations(rows, 2)]
+        groups[letter] = rows
+    return Tournament(groups, remaining, ratings or {}, bracket_graph.load_graph(), knockout)
+
+
+def test_stage_odds_account_for_every_slot():
+    result = tournament_odds.simulate(_tournament(ratings={"A1": 2100}), 4000, seed=7)
+
+    totals = {stage: sum(team["stages"][stage] for team in result["teams"]) for stage in STAGES}
+    assert totals == pytest.approx({"Round of 32": 32, "Round of 16": 16, "Quarter-finals": 8,
+                                    "Semi-finals": 4, "Final": 2, "Winner": 1}, abs=5e-3)
+    assert sum(team["group_winner"] for team in result["teams"]) == pytest.approx(12, abs=5e-3)
+    assert result["teams"][0]["team"] == "A1"
+    assert result["teams"][0]["group_winner"] > 0.5
+
+
+def test_finished_groups_and_known_winners_are_not_resimulated():
+    tournament = _tournament(played=True, knockout={
+        "79": {"home": "A1", "away": "C3", "winner": "C3"},
+        "104": {"home": "W101", "away": "W102"},
+    })
+    result = tournament_odds.simulate(tournament, 2000, seed=1)
+    odds = {team["team"]: team for team in result["teams"]}
+
+    assert odds["A1"]["group_winner"] == 1.0
+    assert odds["A1"]["stages"]["Round of 32"] == 1.0
+    assert odds["A1"]["stages"]["Round of 16"] == 0.0
+    assert odds["C3"]["stages"]["Round of 16"] == 1.0
+    assert all(value <= 1.0 for team in odds.values() for value in team["stages"].values())
+    assert odds["A4"]["stages"]["Round of 32"] == 0.0
+    # Eight of the twelve third-placed teams go through.
+    assert sum(odds[f"{letter}3"]["stages"]["Round of 32"] for letter in "ABCDEFGHIJKL") == pytest.approx(8)
+
+
+def test_run_is_cached_by_fingerprint(monkeypatch):
+    monkeypatch.setattr(tournament_odds, "_cache", type(tournament_odds._cache)())
+    first = tournament_odds.run(_tournament(), 500)
+    hits = tournament_odds.stats["hits"]
+
+    assert tournament_odds.run(_tournament(), 500) is first
+    assert tournament_odds.stats["hits"] == hits + 1
+    changed = tournament_odds.run(_tournament(ratings={"B2": 1800}), 500)
+    assert changed["fingerprint"] != first["fingerprint"]
+    # The seed comes from the fingerprint, so the same state gives the same odds.
+    assert tournament_odds.simulate(_tournament(), 500, seed=int(first["fingerprint"][:16], 16))["teams"] == first["teams"]
+
+
+def test_owner_outcomes_weight_split_teams_by_share():
+    result = {"teams": [
+        {"team": "A1", "stages": dict(zip(STAGES, (1.0, 0.8, 0.6, 0.4, 0.3, 0.2)))},
+        {"team": "B1", "stages": dict(zip(STAGES, (1.0, 0.5, 0.2, 0.1, 0.05, 0.1)))},
+    ]}
+    ownership = OwnershipIndex.build({
+        "1": {"display_name": "Ana", "teams": [
+            {"team": "A1", "ownership": {"main_owner": "1", "split_with": ["2"], "percentages": {"1": 75, "2": 25}}},
+            {"team": "B1", "ownership": {"main_owner": "1", "split_with": []}},
+        ]},
+        "2": {"display_name": "Bo", "teams": []},
+    })
+
+    owners = tournament_odds.owner_outcomes(result, ownership)
+
+    assert [owner["owner_id"] for owner in owners] == ["1", "2"]
+    assert owners[0]["champion"] == pytest.approx(0.3)
+    assert owners[0]["expected"]["Winner"] == pytest.approx(0.75 * 0.2 + 0.1)
+    assert owners[1]["teams"] == [{"team": "A1", "share": 0.25}]
+    assert owners[1]["expected"]["Round of 16"] == pytest.approx(0.2)